@@ -21,6 +21,8 @@ class Args:
 @click.option('--check', is_flag=True, help='Check available components')
 @click.option('--index', is_flag=True, help='Build/rebuild vector index')
 @click.option('--force', is_flag=True, help='Force rebuild index')
+@click.option('--incremental', is_flag=True,
+              help='Re-embed only added/changed files when indexing')
 @click.option('--provider', type=click.Choice(['local', 'openai', 'voyage']),
               help='Embedding provider')
 @click.option('--no-lsp', is_flag=True, help='Disable LSP integration')
@@ -29,7 +31,7 @@ class Args:
               type=click.Choice(['text', 'yaml', 'json']), default='text',
               help='Output format')
 @click.pass_context
-def context(ctx, project, query, budget, check, index, force, provider,
+def context(ctx, project, query, budget, check, index, force, incremental, provider,
             no_lsp, no_vector, output_format):
     """Retrieve and display project context."""
     from agentforge.cli.commands.context import run_context
@@ -41,6 +43,7 @@ def context(ctx, project, query, budget, check, index, force, provider,
     args.check = check
     args.index = index
     args.force = force
+    args.incremental = incremental
     args.provider = provider
     args.no_lsp = no_lsp
     args.no_vector = no_vector
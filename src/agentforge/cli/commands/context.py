@@ -34,7 +34,7 @@ def run_context(args):
         if args.check:
             _run_check(retriever)
         elif args.index:
-            _run_index(retriever, args.force)
+            _run_index(retriever, args.force, getattr(args, 'incremental', False))
             if args.query:
                 _run_query(retriever, args)
         elif args.query:
@@ -102,12 +102,14 @@ def _print_vector_status(vec):
         click.echo("    Install: pip install sentence-transformers faiss-cpu")
 
 
-def _run_index(retriever, force: bool):
+def _run_index(retriever, force: bool, incremental: bool = False):
     """Build vector index."""
     click.echo("\nBuilding vector index...")
-    stats = retriever.index(force_rebuild=force)
+    stats = retriever.index(force_rebuild=force, incremental=incremental)
     click.echo(f"  Files indexed: {stats.file_count}")
     click.echo(f"  Chunks created: {stats.chunk_count}")
+    click.echo(f"  Chunks reused: {stats.reused_chunks}")
+    click.echo(f"  Chunks re-embedded: {stats.embedded_chunks}")
     click.echo(f"  Duration: {stats.duration_ms}ms")
     if stats.errors:
         click.echo(f"  Errors: {len(stats.errors)}")
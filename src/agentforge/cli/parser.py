@@ -126,6 +126,8 @@ def _add_context_command(subparsers, h):
     p.add_argument('--check', action='store_true', help='Check available components')
     p.add_argument('--index', action='store_true', help='Build/rebuild vector index')
     p.add_argument('--force', action='store_true', help='Force rebuild index')
+    p.add_argument('--incremental', action='store_true',
+                   help='Re-embed only added/changed files when indexing')
     p.add_argument('--provider', choices=['local', 'openai', 'voyage'], help='Embedding provider')
     p.add_argument('--no-lsp', action='store_true', help='Disable LSP')
     p.add_argument('--no-vector', action='store_true', help='Disable vector search')
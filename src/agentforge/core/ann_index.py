@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+ANN Index Factory
+=================
+
+Chooses, builds and tunes the FAISS index behind VectorSearch.
+
+Index types (semantic.index.type in context_retrieval.yaml):
+    auto     - pick by corpus size (default, see choose_factory)
+    flat     - exact inner-product search
+    hnsw     - graph index; fast, no compression, no per-id removal
+    ivf      - inverted lists over uncompressed vectors
+    ivf_sq8  - inverted lists, 8-bit scalar quantized (4x smaller)
+    ivf_pq   - inverted lists, product quantized (8x+ smaller)
+A raw FAISS factory string can be given instead via semantic.index.factory.
+
+Approximate indexes are calibrated after building: recall@k is measured
+against exact search on a sample of the indexed vectors (each query's own
+id left out of both result lists), and the smallest
+nprobe / efSearch reaching the target recall is kept. FAISS persists these
+parameters with the index, so searches after a reload use them too.
+"""
+
+import math
+
+import numpy as np
+
+FLAT_MAX_VECTORS = 10_000
+SQ8_MAX_VECTORS = 1_000_000
+MIN_POINTS_PER_CENTROID = 39  # FAISS warns below this when training k-means
+
+DEFAULT_TARGET_RECALL = 0.95
+DEFAULT_CALIBRATION_QUERIES = 200
+DEFAULT_CALIBRATION_K = 10
+
+
+def _nlist_for(n: int) -> int:
+    """Number of inverted lists: ~4*sqrt(n), bounded by training-set size."""
+    return max(1, min(int(4 * math.sqrt(n)), n // MIN_POINTS_PER_CENTROID))
+
+
+def _pq_m_for(dimension: int) -> int:
+    """Largest sub-quantizer count <= dimension/4 that divides the dimension."""
+    for m in range(max(1, dimension // 4), 0, -1):
+        if dimension % m == 0:
+            return m
+    return 1
+
+
+def choose_factory(n: int, dimension: int, config: dict | None = None) -> str:
+    """
+    Return the FAISS factory string for a corpus of n vectors.
+
+    auto picks exact search for small corpora, IVF+SQ8 for medium ones and
+    IVF+PQ beyond SQ8_MAX_VECTORS. Quantized types fall back to exact search
+    when there are too few vectors to train them.
+    """
+    config = config or {}
+    if config.get("factory"):
+        return config["factory"]
+
+    index_type = config.get("type", "auto")
+    if index_type == "auto":
+        if n < FLAT_MAX_VECTORS:
+            index_type = "flat"
+        elif n < SQ8_MAX_VECTORS:
+            index_type = "ivf_sq8"
+        else:
+            index_type = "ivf_pq"
+
+    nlist = config.get("nlist") or _nlist_for(n)
+    if index_type == "flat" or (index_type.startswith("ivf") and n < MIN_POINTS_PER_CENTROID * 2):
+        return "Flat"
+    if index_type == "hnsw":
+        return f"HNSW{config.get('hnsw_m', 32)},Flat"
+    if index_type == "ivf":
+        return f"IVF{nlist},Flat"
+    if index_type == "ivf_sq8":
+        return f"IVF{nlist},SQ8"
+    if index_type == "ivf_pq":
+        if n < 256 * MIN_POINTS_PER_CENTROID:  # PQ trains 256 centroids per sub-quantizer
+            return f"IVF{nlist},SQ8"
+        return f"IVF{nlist},PQ{config.get('pq_m') or _pq_m_for(dimension)}"
+    raise ValueError(
+        f"Unknown index type: {index_type}. "
+        "Available: auto, flat, hnsw, ivf, ivf_sq8, ivf_pq"
+    )
+
+
+def build_index(vectors: np.ndarray, ids: np.ndarray, config: dict | None = None):
+    """
+    Build, train and fill an id-mapped inner-product index.
+
+    Returns:
+        (index, factory string)
+    """
+    import faiss
+
+    n, dimension = vectors.shape
+    factory = choose_factory(n, dimension, config)
+    inner = faiss.index_factory(dimension, factory, faiss.METRIC_INNER_PRODUCT)
+    if not inner.is_trained:
+        inner.train(vectors)
+    index = faiss.IndexIDMap(inner)
+    index.add_with_ids(vectors, ids)
+    return index, factory
+
+
+def _tunable_parameter(index) -> tuple[str, list[int]] | None:
+    """Name and candidate values of the index's recall/latency knob."""
+    import faiss
+
+    inner = faiss.downcast_index(index.index) if hasattr(index, "id_map") else index
+    try:
+        ivf = faiss.extract_index_ivf(inner)
+    except RuntimeError:
+        ivf = None
+    if ivf is not None:
+        values = [1]
+        while values[-1] < ivf.nlist:
+            values.append(min(values[-1] * 2, ivf.nlist))
+        return "nprobe", values
+    if hasattr(inner, "hnsw"):
+        return "efSearch", [16, 32, 64, 128, 256, 512]
+    return None
+
+
+def _without(found: np.ndarray, exclude: np.ndarray | None, k: int) -> np.ndarray:
+    """First k ids of each row, skipping that row's excluded id."""
+    if exclude is None:
+        return found[:, :k]
+    return np.array([[i for i in row if i != ex][:k] for row, ex in zip(found, exclude, strict=True)])
+
+
+def exact_neighbors(vectors: np.ndarray, ids: np.ndarray, queries: np.ndarray, k: int,
+                    exclude: np.ndarray | None = None) -> np.ndarray:
+    """Ids of the true top-k neighbors of each query (brute force), skipping exclude[i] for query i."""
+    import faiss
+
+    exact = faiss.IndexFlatIP(vectors.shape[1])
+    exact.add(vectors)
+    _, positions = exact.search(queries, k if exclude is None else k + 1)
+    return _without(ids[positions], exclude, k)
+
+
+def measure_recall(index, queries: np.ndarray, truth: np.ndarray, exclude: np.ndarray | None = None) -> float:
+    """Mean recall@k of index given exact neighbor ids (k = truth.shape[1]), skipping exclude[i] for query i."""
+    k = truth.shape[1]
+    _, found = index.search(queries, k if exclude is None else k + 1)
+    found = _without(found, exclude, k)
+    hits = sum(len(set(t) & set(f)) for t, f in zip(truth, found, strict=True))
+    return hits / truth.size
+
+
+def calibrate(index, vectors: np.ndarray, ids: np.ndarray, config: dict | None = None) -> dict:
+    """
+    Pick the cheapest search parameter that reaches the target recall.
+
+    Queries are a random sample of the indexed vectors. Each query's own id
+    is left out of both the exact and the approximate neighbors, since an
+    index finds a stored vector far more easily than its true neighbors.
+    The chosen value is set on the index (and persisted when the index is
+    written).
+
+    Returns:
+        {"parameter": name, "value": v, "recall": r}, or {} for exact indexes
+    """
+    import faiss
+
+    config = config or {}
+    tunable = _tunable_parameter(index)
+    if tunable is None or len(vectors) < 2:
+        return {}
+
+    name, values = tunable
+    target = config.get("target_recall", DEFAULT_TARGET_RECALL)
+    k = min(config.get("calibration_k", DEFAULT_CALIBRATION_K), len(vectors) - 1)
+    sample = min(config.get("calibration_queries", DEFAULT_CALIBRATION_QUERIES), len(vectors))
+    rng = np.random.default_rng(0)
+    picked = rng.choice(len(vectors), size=sample, replace=False)
+    queries, own_ids = vectors[picked], ids[picked]
+
+    truth = exact_neighbors(vectors, ids, queries, k, exclude=own_ids)
+
+    params = faiss.ParameterSpace()
+    recall = 0.0
+    for value in values:
+        params.set_index_parameter(index, name, value)
+        recall = measure_recall(index, queries, truth, exclude=own_ids)
+        if recall >= target:
+            break
+    return {"parameter": name, "value": value, "recall": round(recall, 4)}
+
+
+def supports_removal(index) -> bool:
+    """Whether vectors can be removed by id (HNSW graphs cannot)."""
+    import faiss
+
+    inner = faiss.downcast_index(index.index) if hasattr(index, "id_map") else index
+    return not hasattr(inner, "hnsw")
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Chunk Store
+===========
+
+Compact on-disk chunk metadata for the vector index.
+
+Replaces the single JSON document of full chunks with a columnar layout
+that can be opened without parsing chunk content:
+
+    chunks.json  - header: project hash, counts, and the (small) string
+                   tables for file paths, contexts, languages and symbols
+    chunks.npy   - fixed-width rows (id, file, lines, content offset/length,
+                   token estimate), sorted by FAISS id, opened with mmap
+    chunks.blob  - UTF-8 chunk content, concatenated, opened with mmap
+
+Only the Chunks a search actually returns are materialized.
+
+Usage:
+    ChunkStore.write(index_dir, header, chunks)        # {faiss_id: Chunk}
+    store = ChunkStore.open(index_dir)
+    chunk = store.get(faiss_id)
+"""
+
+import json
+import mmap
+import os
+from pathlib import Path
+
+import numpy as np
+
+try:
+    from .vector_types import Chunk
+except ImportError:
+    from vector_types import Chunk
+
+
+ROW_DTYPE = np.dtype([
+    ("id", np.int64),
+    ("offset", np.int64),
+    ("length", np.int32),
+    ("file", np.int32),
+    ("context", np.int32),
+    ("language", np.int16),
+    ("symbol", np.int32),
+    ("start_line", np.int32),
+    ("end_line", np.int32),
+    ("tokens", np.int32),
+])
+
+HEADER_FILE = "chunks.json"
+ROWS_FILE = "chunks.npy"
+BLOB_FILE = "chunks.blob"
+
+
+class ChunkStore:
+    """Read-only, memory-mapped view of a written chunk store."""
+
+    FORMAT_VERSION = 2
+    COMPACT_RATIO = 0.5  # Rewrite the blob when less than this fraction is live
+
+    def __init__(self, directory: Path, header: dict, rows: np.ndarray, blob: mmap.mmap | None):
+        self.directory = Path(directory)
+        self.header = header
+        self.rows = rows
+        self._blob = blob
+        self._files: list[str] = header["files"]
+        self._contexts: list[str] = header["contexts"]
+        self._languages: list[str] = header["languages"]
+        self._symbols: list[str] = header["symbols"]
+
+    # -------------------------------------------------------------------------
+    # Opening
+    # -------------------------------------------------------------------------
+
+    @staticmethod
+    def read_header(directory: Path) -> dict | None:
+        """Read only the header (cheap; used for cache validation)."""
+        try:
+            with open(Path(directory) / HEADER_FILE, encoding="utf-8") as f:
+                header = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return header if header.get("version") == ChunkStore.FORMAT_VERSION else None
+
+    @classmethod
+    def open(cls, directory: Path) -> "ChunkStore | None":
+        """Map a chunk store, or return None if missing or inconsistent."""
+        directory = Path(directory)
+        header = cls.read_header(directory)
+        if header is None:
+            return None
+        try:
+            rows = np.load(directory / ROWS_FILE, mmap_mode="r")
+            blob = None
+            if (directory / BLOB_FILE).stat().st_size > 0:
+                with open(directory / BLOB_FILE, "rb") as f:
+                    blob = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+        if rows.dtype != ROW_DTYPE or len(rows) != header["count"]:
+            return None
+        return cls(directory, header, rows, blob)
+
+    @staticmethod
+    def exists(directory: Path) -> bool:
+        return (Path(directory) / HEADER_FILE).exists()
+
+    # -------------------------------------------------------------------------
+    # Lookup
+    # -------------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    @property
+    def ids(self) -> np.ndarray:
+        return self.rows["id"]
+
+    @property
+    def total_tokens(self) -> int:
+        return int(self.rows["tokens"].sum())
+
+    def _row_position(self, chunk_id: int) -> int | None:
+        ids = self.rows["id"]
+        pos = int(np.searchsorted(ids, chunk_id))
+        if pos < len(ids) and ids[pos] == chunk_id:
+            return pos
+        return None
+
+    def __contains__(self, chunk_id: int) -> bool:
+        return self._row_position(chunk_id) is not None
+
+    def get(self, chunk_id: int) -> Chunk | None:
+        """Materialize a single chunk by FAISS id."""
+        pos = self._row_position(chunk_id)
+        return None if pos is None else self._chunk_at(pos)
+
+    def _content_at(self, pos: int) -> str:
+        row = self.rows[pos]
+        offset, length = int(row["offset"]), int(row["length"])
+        if not length:
+            return ""
+        return self._blob[offset:offset + length].decode("utf-8")
+
+    def _chunk_at(self, pos: int) -> Chunk:
+        row = self.rows[pos]
+        return Chunk(
+            file_path=self._files[row["file"]],
+            content=self._content_at(pos),
+            start_line=int(row["start_line"]),
+            end_line=int(row["end_line"]),
+            context=self._contexts[row["context"]],
+            language=self._languages[row["language"]],
+            symbol=self._symbols[row["symbol"]],
+        )
+
+    def iter_chunks(self):
+        """Yield (id, Chunk) for every stored chunk."""
+        for pos in range(len(self.rows)):
+            yield int(self.rows[pos]["id"]), self._chunk_at(pos)
+
+    def close(self) -> None:
+        if self._blob is not None:
+            self._blob.close()
+            self._blob = None
+
+    # -------------------------------------------------------------------------
+    # Writing
+    # -------------------------------------------------------------------------
+
+    @classmethod
+    def write(cls, directory: Path, header: dict, chunks: dict[int, Chunk],
+              base: "ChunkStore | None" = None, drop_ids=None) -> "ChunkStore":
+        """
+        Write a chunk store and return it opened.
+
+        Args:
+            directory: Index directory
+            header: Extra header fields (project_hash, file_count, ...)
+            chunks: New chunks by FAISS id
+            base: Existing store to carry rows over from (incremental update).
+                New content is appended to its blob instead of rewriting it.
+                It is left open: searches may still be reading it, so the
+                caller swaps in the returned store and drops the old one,
+                whose mmap closes once its last reader lets go.
+            drop_ids: FAISS ids of base rows to leave out
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+
+        if base is not None:
+            keep = ~np.isin(base.rows["id"], np.asarray(list(drop_ids or ()), dtype=np.int64))
+            kept = base.rows[keep]
+            live_bytes = int(kept["length"].sum())
+            blob_bytes = len(base._blob) if base._blob is not None else 0
+            if blob_bytes and live_bytes < blob_bytes * cls.COMPACT_RATIO:
+                kept_chunks = {int(base.rows[pos]["id"]): base._chunk_at(pos)
+                               for pos in np.flatnonzero(keep)}
+                return cls.write(directory, header, {**kept_chunks, **chunks})
+            tables = {
+                "files": list(base._files),
+                "contexts": list(base._contexts),
+                "languages": list(base._languages),
+                "symbols": list(base._symbols),
+            }
+        else:
+            kept = np.zeros(0, dtype=ROW_DTYPE)
+            tables = {"files": [], "contexts": [], "languages": [], "symbols": []}
+
+        lookups = {name: {s: i for i, s in enumerate(values)} for name, values in tables.items()}
+
+        def intern(table: str, value: str) -> int:
+            index = lookups[table].get(value)
+            if index is None:
+                index = len(tables[table])
+                tables[table].append(value)
+                lookups[table][value] = index
+            return index
+
+        # Incremental writes append past the live end of the existing blob
+        # (readers only follow offsets from the committed header); full
+        # writes go to a temp file that replaces the blob.
+        new_rows = np.zeros(len(chunks), dtype=ROW_DTYPE)
+        blob_path = directory / BLOB_FILE
+        tmp_blob = directory / "chunks.blob.tmp"
+        with open(blob_path if base is not None else tmp_blob, "ab" if base is not None else "wb") as f:
+            offset = f.tell()
+            for i, (chunk_id, chunk) in enumerate(chunks.items()):
+                data = chunk.content.encode("utf-8")
+                f.write(data)
+                new_rows[i] = (
+                    chunk_id, offset, len(data),
+                    intern("files", chunk.file_path),
+                    intern("contexts", chunk.context),
+                    intern("languages", chunk.language),
+                    intern("symbols", chunk.symbol),
+                    chunk.start_line, chunk.end_line, chunk.token_estimate,
+                )
+                offset += len(data)
+        if base is None:
+            os.replace(tmp_blob, blob_path)
+
+        rows = np.concatenate([kept, new_rows])
+        if len(rows) > 1 and not np.all(rows["id"][1:] > rows["id"][:-1]):
+            rows = rows[np.argsort(rows["id"], kind="stable")]
+
+        tmp_rows = directory / "chunks.tmp.npy"
+        np.save(tmp_rows, rows)
+        os.replace(tmp_rows, directory / ROWS_FILE)
+
+        full_header = {**header, **tables, "version": cls.FORMAT_VERSION, "count": len(rows)}
+        tmp_header = directory / "chunks.json.tmp"
+        with open(tmp_header, "w", encoding="utf-8") as f:
+            json.dump(full_header, f)
+        os.replace(tmp_header, directory / HEADER_FILE)
+
+        return cls.open(directory)
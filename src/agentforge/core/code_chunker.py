@@ -6,13 +6,16 @@ Code Chunker
 Splits code into meaningful chunks for embedding.
 
 Strategy:
-1. Try to split at function/class boundaries (AST-aware)
-2. Fall back to sliding window for non-parseable files
-3. Include context (imports, class name) with each chunk
+1. Python: one chunk per function, class and method, from the real AST,
+   named by qualified symbol (see Chunk.stable_id)
+2. Other languages: split at function/class boundaries (regex)
+3. Fall back to sliding window for non-parseable files
+4. Include context (imports, class name) with each chunk
 
 Extracted from vector_search.py for modularity.
 """
 
+import ast
 import re
 
 try:
@@ -26,9 +29,10 @@ class CodeChunker:
     Splits code into meaningful chunks for embedding.
 
     Strategy:
-    1. Try to split at function/class boundaries (AST-aware)
-    2. Fall back to sliding window for non-parseable files
-    3. Include context (imports, class name) with each chunk
+    1. Python: AST chunks per function, class and method
+    2. Other languages: split at function/class boundaries (regex)
+    3. Fall back to sliding window for non-parseable files
+    4. Include context (imports, class name) with each chunk
     """
 
     def __init__(self, chunk_size: int = 500, overlap: int = 50):
@@ -58,6 +62,11 @@ class CodeChunker:
         """
         context = self._extract_context(content, language)
 
+        if language == "python":
+            chunks = self._chunk_python_ast(file_path, content, context)
+            if chunks:
+                return chunks
+
         if language in ("csharp", "python", "typescript", "javascript", "java"):
             chunks = self._chunk_by_structure(file_path, content, context, language)
             if chunks:
@@ -144,6 +153,103 @@ class CodeChunker:
 
         return chunks
 
+    def _chunk_python_ast(self, file_path: str, content: str, context: str) -> list[Chunk] | None:
+        """
+        Chunk Python by AST: one chunk per top-level function, per class
+        (its body minus methods and nested classes) and per method, spanning
+        decorators, multi-line signatures and a comment block directly
+        above. Remaining module-level code and comments are grouped into
+        "<module>" chunks. Oversized chunks are sub-chunked.
+
+        Returns None if the file does not parse.
+        """
+        try:
+            tree = ast.parse(content)
+        except (SyntaxError, ValueError):
+            return None
+
+        lines = content.split('\n')
+        chunks: list[Chunk] = []
+
+        def span(node) -> tuple[int, int]:
+            first = min([node.lineno] + [d.lineno for d in node.decorator_list])
+            return first, node.end_lineno
+
+        def with_comments(first: int, floor: int) -> int:
+            """Move `first` up over the comment lines directly above it (not past `floor`)."""
+            while first - 1 > floor and lines[first - 2].lstrip().startswith("#"):
+                first -= 1
+            return first
+
+        def emit(symbol: str, start: int, end: int, numbers: list[int] | None = None) -> None:
+            """Emit lines start..end, or only the file lines in `numbers` (a synthesized body)."""
+            numbers = numbers or list(range(start, end + 1))
+            text = '\n'.join(lines[n - 1] for n in numbers)
+            if len(text) > self.chunk_size_chars * 2:
+                for sub in self._chunk_sliding_window(file_path, text, context, "python"):
+                    # Window lines index into `numbers`, which may skip file lines
+                    sub.start_line = numbers[sub.start_line - 1]
+                    sub.end_line = numbers[sub.end_line - 1]
+                    sub.symbol = symbol
+                    chunks.append(sub)
+            else:
+                chunks.append(Chunk(
+                    file_path=file_path, content=text, start_line=start, end_line=end,
+                    context=context, language="python", symbol=symbol,
+                ))
+
+        def visit_class(node: ast.ClassDef, prefix: str, start: int | None = None) -> None:
+            qualname = f"{prefix}{node.name}"
+            first, end = span(node)
+            start = start or first
+            covered: set[int] = set()
+            for child in node.body:
+                if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                    child_start, child_end = span(child)
+                    covered.update(range(child_start, child_end + 1))
+            header = [n for n in range(start, end + 1) if n not in covered and lines[n - 1].strip()]
+            if header:
+                emit(qualname, start, header[-1], header)
+            for child in node.body:
+                if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                    emit(f"{qualname}.{child.name}", *span(child))
+                elif isinstance(child, ast.ClassDef):
+                    visit_class(child, f"{qualname}.")
+
+        module_run: list[int] = []
+
+        def add_module_lines(first: int, last: int) -> None:
+            module_run.extend(n for n in range(first, last + 1) if lines[n - 1].strip())
+
+        def flush_module() -> None:
+            text = '\n'.join(lines[n - 1] for n in module_run)
+            if len(text.strip()) >= 50:
+                emit("<module>", module_run[0], module_run[-1], list(module_run))
+            module_run.clear()
+
+        previous_end = 0
+        for node in tree.body:
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                first, end = span(node)
+                start = with_comments(first, previous_end)
+                add_module_lines(previous_end + 1, start - 1)
+                if module_run:
+                    flush_module()
+                if isinstance(node, ast.ClassDef):
+                    visit_class(node, "", start)
+                else:
+                    emit(node.name, start, end)
+            else:
+                end = node.end_lineno
+                add_module_lines(previous_end + 1, end)
+            previous_end = end
+        add_module_lines(previous_end + 1, len(lines))
+        if module_run:
+            flush_module()
+
+        chunks.sort(key=lambda c: c.start_line)
+        return chunks
+
     def _chunk_sliding_window(self, file_path: str, content: str, context: str,
                                language: str, start_line_offset: int = 0) -> list[Chunk]:
         """Chunk using sliding window with overlap."""
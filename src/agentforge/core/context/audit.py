@@ -58,6 +58,8 @@ from typing import Any, Optional
 
 import yaml
 
+from ..token_counter import count_tokens
+
 
 class ContextAuditLogger:
     """
@@ -130,12 +132,12 @@ class ContextAuditLogger:
                 encoding="utf-8",
             )
             audit_entry["thinking_file"] = thinking_path.name
-            thinking_tokens = len(thinking) // 4
+            thinking_tokens = count_tokens(thinking)
             audit_entry["thinking_tokens"] = thinking_tokens
             self._total_thinking_tokens += thinking_tokens
 
         if response:
-            audit_entry["response_tokens"] = len(response) // 4
+            audit_entry["response_tokens"] = count_tokens(response)
 
         # Save audit entry
         self._save_yaml(f"step_{step}.yaml", audit_entry)
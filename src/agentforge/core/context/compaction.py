@@ -19,6 +19,10 @@ Strategy (low value → high value):
 6. Remove precomputed entirely
 7. LLM summarization (last resort)
 
+Sizes are tracked per top-level section: measured once per compaction
+with the shared token counter (over a YAML-shaped rendering, without
+running yaml.dump), then re-measured only for the section a rule changed.
+
 Usage:
     ```python
     manager = CompactionManager(threshold=0.90, max_budget=4000)
@@ -44,6 +48,8 @@ from typing import Any, Protocol
 
 import yaml
 
+from ..token_counter import count_tokens, get_counter
+
 
 class Summarizer(Protocol):
     """Protocol for LLM-based summarization."""
@@ -110,6 +116,47 @@ DEFAULT_RULES: list[CompactionRule] = [
 PRESERVED_SECTIONS = frozenset(["fingerprint", "task", "phase"])
 
 
+def _render_lines(value: Any, indent: str, out: list[str]) -> None:
+    """Append YAML block-style lines for a nested value (sizes only, not valid YAML)."""
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if isinstance(item, (dict, list)) and item:
+                out.append(f"{indent}{key}:")
+                _render_lines(item, indent + "  ", out)
+            else:
+                out.append(f"{indent}{key}: {_render_scalar(item, indent)}")
+    elif isinstance(value, list):
+        for item in value:
+            if isinstance(item, (dict, list)) and item:
+                start = len(out)
+                _render_lines(item, indent + "  ", out)
+                out[start] = f"{indent}- {out[start][len(indent) + 2:]}"
+            else:
+                out.append(f"{indent}- {_render_scalar(item, indent)}")
+    else:
+        out.append(f"{indent}{_render_scalar(value, indent)}")
+
+
+def _render_scalar(value: Any, indent: str) -> str:
+    if value is None:
+        return "null"
+    if isinstance(value, dict):
+        return "{}"
+    if isinstance(value, list):
+        return "[]"
+    text = str(value)
+    if "\n" in text:
+        return "|\n" + "\n".join(indent + "  " + line for line in text.splitlines())
+    return text
+
+
+def section_tokens(key: str, value: Any) -> int:
+    """Tokens in one top-level context section (key included)."""
+    out: list[str] = []
+    _render_lines({key: value}, "", out)
+    return count_tokens("\n".join(out))
+
+
 @dataclass
 class CompactionAudit:
     """Audit information for a compaction operation."""
@@ -165,8 +212,7 @@ class CompactionManager:
 
     def estimate_tokens(self, context: dict[str, Any]) -> int:
         """Estimate total tokens in a context dictionary."""
-        yaml_str = yaml.dump(context, default_flow_style=False)
-        return len(yaml_str) // 4
+        return sum(self.get_section_tokens(context).values())
 
     def needs_compaction(self, context: dict[str, Any]) -> bool:
         """
@@ -195,7 +241,8 @@ class CompactionManager:
             Tuple of (compacted context, audit info)
         """
         preserve_set = set(preserve or []) | PRESERVED_SECTIONS
-        original_tokens = self.estimate_tokens(context)
+        sizes = self.get_section_tokens(context)
+        original_tokens = current_tokens = sum(sizes.values())
 
         rules_applied: list[dict[str, Any]] = []
         result = dict(context)
@@ -206,14 +253,19 @@ class CompactionManager:
                 continue
 
             # Check if we're under budget
-            current_tokens = self.estimate_tokens(result)
             if current_tokens <= self.max_budget:
                 break
 
             # Try to apply the rule
             new_result, applied = self._apply_rule(result, rule)
             if applied:
-                tokens_after = self.estimate_tokens(new_result)
+                # Only the rule's top-level section changed
+                top = rule.section.split(".", 1)[0]
+                if top in new_result:
+                    sizes[top] = section_tokens(top, new_result[top])
+                else:
+                    sizes.pop(top, None)
+                tokens_after = current_tokens = sum(sizes.values())
                 rules_applied.append(
                     {
                         "section": rule.section,
@@ -224,10 +276,9 @@ class CompactionManager:
                 )
                 result = new_result
 
-        final_tokens = self.estimate_tokens(result)
         audit = CompactionAudit(
             original_tokens=original_tokens,
-            final_tokens=final_tokens,
+            final_tokens=current_tokens,
             budget=self.max_budget,
             rules_applied=rules_applied,
         )
@@ -368,26 +419,22 @@ class CompactionManager:
 
     def _truncate(self, value: str, max_tokens: int) -> str:
         """Truncate string to fit token budget."""
-        max_chars = max_tokens * 4
-        if len(value) > max_chars:
-            return value[:max_chars] + "... (truncated)"
+        if count_tokens(value) > max_tokens:
+            return get_counter().truncate(value, max_tokens) + "... (truncated)"
         return value
 
     def _truncate_middle(self, value: str, max_tokens: int) -> str:
         """Truncate middle of string, keeping start and end."""
-        max_chars = max_tokens * 4
-        if len(value) > max_chars:
-            keep = max_chars // 2
-            return value[:keep] + "\n...(middle truncated)...\n" + value[-keep:]
+        if count_tokens(value) > max_tokens:
+            counter = get_counter()
+            keep = max_tokens // 2
+            return (counter.truncate(value, keep) + "\n...(middle truncated)...\n"
+                    + counter.truncate(value, keep, keep_end=True))
         return value
 
     def get_section_tokens(self, context: dict[str, Any]) -> dict[str, int]:
         """Get token breakdown by top-level section."""
-        breakdown: dict[str, int] = {}
-        for key, value in context.items():
-            section_yaml = yaml.dump({key: value}, default_flow_style=False)
-            breakdown[key] = len(section_yaml) // 4
-        return breakdown
+        return {key: section_tokens(key, value) for key, value in context.items()}
 
     def set_summarizer(self, summarizer: Summarizer) -> None:
         """
@@ -10,6 +10,7 @@ Project Fingerprint Generator
 Generates compact, high-signal project context (~500 tokens) that:
 - Identifies project language, framework, patterns
 - Caches per project, invalidates on significant changes
+- Persists to .agentforge/fingerprint_cache.json across processes
 - Adds task-specific constraints at runtime
 - Replaces verbose static system prompts
 
@@ -30,10 +31,20 @@ Usage:
     # Get compact YAML for LLM context
     context_yaml = fingerprint.to_context_yaml()
     ```
+
+Cache validation:
+    A cached fingerprint records (size, mtime_ns, inode) of each
+    SIGNIFICANT_FILES entry. A lookup is those few stat calls; significant
+    files are read and hashed only when a stat differs, or when a file was
+    modified too close to the last check for its mtime to be trusted.
 """
 
+import contextlib
 import hashlib
+import json
+import os
 import re
+import time
 from datetime import UTC, datetime
 from pathlib import Path
 from typing import Any, ClassVar
@@ -41,6 +52,8 @@ from typing import Any, ClassVar
 import yaml
 from pydantic import BaseModel, Field
 
+from ..token_counter import count_tokens
+
 
 class ProjectIdentity(BaseModel):
     """Basic project identification."""
@@ -137,8 +150,8 @@ class ProjectFingerprint(BaseModel):
         return yaml.dump(output, default_flow_style=False, sort_keys=False)
 
     def estimate_tokens(self) -> int:
-        """Estimate token count (chars / 4)."""
-        return len(self.to_context_yaml()) // 4
+        """Token count of the context YAML."""
+        return count_tokens(self.to_context_yaml())
 
     def with_task_context(
         self,
@@ -175,6 +188,13 @@ class FingerprintGenerator:
     # Class-level cache
     _cache: ClassVar[dict[str, ProjectFingerprint]] = {}
     _cache_hashes: ClassVar[dict[str, str]] = {}
+    _cache_stats: ClassVar[dict[str, dict[str, Any]]] = {}  # {"stats", "checked_ns"}
+
+    CACHE_FILE = Path(".agentforge") / "fingerprint_cache.json"
+    CACHE_VERSION = 1
+    # A file modified within this long before the last check may change again
+    # without its mtime changing (coarse timestamps), so it is re-hashed.
+    RACY_WINDOW_NS = 2_000_000_000
 
     # Files that trigger cache invalidation
     SIGNIFICANT_FILES = [
@@ -188,8 +208,16 @@ class FingerprintGenerator:
         ".agentforge/AGENT.md",
     ]
 
-    def __init__(self, project_path: Path):
+    def __init__(self, project_path: Path, persist: bool = True):
+        """
+        Initialize generator.
+
+        Args:
+            project_path: Project root
+            persist: Keep fingerprints in <project>/.agentforge/fingerprint_cache.json
+        """
         self.project_path = Path(project_path).resolve()
+        self.persist = persist
 
     def generate(self, force_refresh: bool = False) -> ProjectFingerprint:
         """
@@ -202,14 +230,16 @@ class FingerprintGenerator:
             ProjectFingerprint for this project
         """
         project_key = str(self.project_path)
-        current_hash = self._compute_content_hash()
+        stats = self._stat_significant_files()
 
-        # Check cache validity
-        if not force_refresh and project_key in self._cache:
-            if self._cache_hashes.get(project_key) == current_hash:
+        if not force_refresh:
+            if project_key not in self._cache:
+                self._load_persisted(project_key)
+            if project_key in self._cache and self._still_valid(project_key, stats):
                 return self._cache[project_key]
 
         # Generate new fingerprint
+        current_hash = self._compute_content_hash()
         fingerprint = ProjectFingerprint(
             identity=self._detect_identity(current_hash),
             technical=self._detect_technical(),
@@ -220,6 +250,8 @@ class FingerprintGenerator:
         # Cache it
         self._cache[project_key] = fingerprint
         self._cache_hashes[project_key] = current_hash
+        self._cache_stats[project_key] = {"stats": stats, "checked_ns": time.time_ns()}
+        self._persist(project_key)
 
         return fingerprint
 
@@ -241,20 +273,87 @@ class FingerprintGenerator:
         """
         Compute hash of significant files for cache invalidation.
 
-        Includes file content and modification time.
+        Content only: a touched but unchanged file keeps the hash.
         """
         hasher = hashlib.sha256()
 
         for filename in self.SIGNIFICANT_FILES:
             filepath = self.project_path / filename
             if filepath.exists():
-                # Include content
+                hasher.update(filename.encode() + b"\0")
                 hasher.update(filepath.read_bytes())
-                # Include mtime for change detection
-                hasher.update(str(filepath.stat().st_mtime).encode())
 
         return hasher.hexdigest()[:16]
 
+    def _stat_significant_files(self) -> dict[str, list[int] | None]:
+        """filename -> [size, mtime_ns, inode], or None if missing."""
+        stats: dict[str, list[int] | None] = {}
+        for filename in self.SIGNIFICANT_FILES:
+            try:
+                st = os.stat(self.project_path / filename)
+                stats[filename] = [st.st_size, st.st_mtime_ns, st.st_ino]
+            except OSError:
+                stats[filename] = None
+        return stats
+
+    def _still_valid(self, project_key: str, stats: dict[str, list[int] | None]) -> bool:
+        """
+        Check the cached fingerprint against current stats.
+
+        Matching stats are trusted unless a file's mtime is within
+        RACY_WINDOW_NS of the last check; otherwise the content hash decides
+        (and a match refreshes the recorded stats).
+        """
+        recorded = self._cache_stats.get(project_key)
+        if recorded is not None and recorded["stats"] == stats:
+            racy_after = recorded["checked_ns"] - self.RACY_WINDOW_NS
+            if all(st is None or st[1] < racy_after for st in stats.values()):
+                return True
+
+        checked_ns = time.time_ns()
+        if self._compute_content_hash() != self._cache_hashes.get(project_key):
+            return False
+        self._cache_stats[project_key] = {"stats": stats, "checked_ns": checked_ns}
+        self._persist(project_key)
+        return True
+
+    def _load_persisted(self, project_key: str) -> None:
+        """Load the persisted fingerprint (if any) into the class-level cache."""
+        if not self.persist:
+            return
+        try:
+            with open(self.project_path / self.CACHE_FILE, encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != self.CACHE_VERSION:
+                return
+            fingerprint = ProjectFingerprint.model_validate(data["fingerprint"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return
+        self._cache[project_key] = fingerprint
+        self._cache_hashes[project_key] = data["content_hash"]
+        self._cache_stats[project_key] = {"stats": data["stats"], "checked_ns": data["checked_ns"]}
+
+    def _persist(self, project_key: str) -> None:
+        """Write the cached fingerprint for this project (atomic replace, best effort)."""
+        if not self.persist:
+            return
+        path = self.project_path / self.CACHE_FILE
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        data = {
+            "version": self.CACHE_VERSION,
+            "content_hash": self._cache_hashes[project_key],
+            **self._cache_stats[project_key],
+            "fingerprint": self._cache[project_key].model_dump(mode="json"),
+        }
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f, separators=(",", ":"))
+            os.replace(tmp, path)
+        except OSError:
+            with contextlib.suppress(OSError):
+                tmp.unlink()
+
     def _detect_identity(self, content_hash: str) -> ProjectIdentity:
         """Detect project identity."""
         return ProjectIdentity(
@@ -470,6 +569,7 @@ class FingerprintGenerator:
 
     @classmethod
     def clear_cache(cls) -> None:
-        """Clear all cached fingerprints."""
+        """Clear all in-memory cached fingerprints (persisted files are revalidated on load)."""
         cls._cache.clear()
         cls._cache_hashes.clear()
+        cls._cache_stats.clear()
@@ -35,6 +35,7 @@ from typing import Any
 
 import yaml
 
+from ...token_counter import count_tokens, get_counter
 from ..fingerprint import ProjectFingerprint
 from .models import (
     CompactionLevel,
@@ -345,15 +346,14 @@ reasoning: brief explanation
     def _truncate_to_budget(self, value: Any, max_tokens: int) -> Any:
         """Truncate a value to fit within token budget."""
         if isinstance(value, str):
-            max_chars = max_tokens * 4
-            if len(value) > max_chars:
-                return value[:max_chars] + "... (truncated)"
+            if count_tokens(value) > max_tokens:
+                return get_counter().truncate(value, max_tokens) + "... (truncated)"
         elif isinstance(value, list):
             # Estimate tokens per item
             if len(value) == 0:
                 return value
             sample = yaml.dump(value[0], default_flow_style=False)
-            tokens_per_item = len(sample) // 4
+            tokens_per_item = count_tokens(sample)
             max_items = max(1, max_tokens // max(1, tokens_per_item))
             return value[:max_items]
 
@@ -362,4 +362,4 @@ reasoning: brief explanation
     def estimate_context_tokens(self, context: dict[str, Any]) -> int:
         """Estimate total tokens in a context dictionary."""
         yaml_str = yaml.dump(context, default_flow_style=False)
-        return len(yaml_str) // 4
+        return count_tokens(yaml_str)
@@ -10,13 +10,16 @@ Context Assembler
 =================
 
 Merges structural (LSP) and semantic (Vector) retrieval results.
-Enforces token budget with intelligent prioritization.
+Enforces token budget with intelligent prioritization. Tokens are counted
+with the shared token counter, so files are truncated once, to the exact
+remaining budget.
 
 Strategy:
 1. LSP: Get precise structural information (symbols, definitions, references)
 2. Vector: Get semantically related code chunks
-3. Merge: Combine results, deduplicate, rank by relevance
-4. Budget: Truncate to fit token limit with priority ordering
+3. Merge: Combine results into symbol/chunk-sized units with a value each
+4. Budget: Pack units by value per token (see context_packing), each
+   file's imports header included once
 
 Priority Order:
 1. Exact symbol matches from query
@@ -37,7 +40,16 @@ try:
         PatternMatch,
         SymbolInfo,
     )
+    from .context_packing import (
+        HEAD_BYTES,
+        UNIT_SEPARATOR,
+        ContextPacker,
+        PackUnit,
+        imports_header,
+        symbol_block,
+    )
     from .context_patterns import detect_patterns
+    from .token_counter import count_tokens, get_counter
 except ImportError:
     from context_assembler_types import (
         ArchitectureLayer,
@@ -46,7 +58,16 @@ except ImportError:
         PatternMatch,
         SymbolInfo,
     )
+    from context_packing import (
+        HEAD_BYTES,
+        UNIT_SEPARATOR,
+        ContextPacker,
+        PackUnit,
+        imports_header,
+        symbol_block,
+    )
     from context_patterns import detect_patterns
+    from token_counter import count_tokens, get_counter
 
 # Re-export types for backwards compatibility
 __all__ = [
@@ -63,6 +84,10 @@ class ContextAssembler:
     manages token budget, and formats for LLM consumption.
     """
 
+    ENTRY_POINT_BOOST = 1.0
+    QUERY_SYMBOL_BOOST = 0.5
+    LSP_SYMBOL_VALUE = 0.25  # Base value of an LSP hit not covered by a vector chunk
+
     def __init__(self, project_path: str, config: dict = None):
         """
         Initialize assembler.
@@ -148,8 +173,8 @@ class ContextAssembler:
         return ext_map.get(ext, "text")
 
     def estimate_tokens(self, text: str) -> int:
-        """Estimate token count (~4 chars per token)."""
-        return len(text) // 4
+        """Token count (shared, memoized token counter)."""
+        return count_tokens(text)
 
     def _process_vector_results(
         self, vector_results: list[Any], file_data: dict[str, dict[str, Any]]
@@ -175,9 +200,13 @@ class ContextAssembler:
 
             if result.chunk not in file_data[file_path]["content"]:
                 if file_data[file_path]["content"]:
-                    file_data[file_path]["content"] += "\n\n// ...\n\n"
+                    file_data[file_path]["content"] += UNIT_SEPARATOR
                 file_data[file_path]["content"] += result.chunk
 
+            start, end = getattr(result, "start_line", None), getattr(result, "end_line", None)
+            if isinstance(start, int) and isinstance(end, int):
+                file_data[file_path].setdefault("chunks", []).append((start, end, result.chunk, result.score))
+
     def _process_lsp_symbols(
         self, lsp_symbols: list[Any], query: str, file_data: dict[str, dict[str, Any]]
     ) -> None:
@@ -202,11 +231,13 @@ class ContextAssembler:
 
             symbol_name = getattr(symbol, 'name', '').lower()
             if symbol_name and symbol_name in query_lower:
-                file_data[file_path]["score"] += 0.5
+                file_data[file_path]["score"] += self.QUERY_SYMBOL_BOOST
 
+            end_line = getattr(loc, 'end_line', None)
             file_data[file_path]["symbols"].append(SymbolInfo(
                 name=getattr(symbol, 'name', ''), kind=getattr(symbol, 'kind', ''),
                 file_path=file_path, line=getattr(loc, 'line', 0) if loc else 0,
+                end_line=end_line if isinstance(end_line, int) else None,
             ))
 
     def _apply_entry_point_boosts(
@@ -220,7 +251,7 @@ class ContextAssembler:
             entry_lower = entry.lower()
             for file_path, data in file_data.items():
                 if entry_lower in file_path.lower():
-                    data["score"] += 1.0
+                    data["score"] += self.ENTRY_POINT_BOOST
 
     def _get_file_content(self, file_path: str, cached_content: str) -> str:
         """Get file content, loading from disk if not cached."""
@@ -246,33 +277,126 @@ class ContextAssembler:
         if remaining < 200:
             return None, 0
 
-        return self._truncate_content(content, remaining), remaining
+        content = self._truncate_content(content, remaining)
+        return content, self.estimate_tokens(content)
 
-    def _build_file_contexts(
+    def _read_head(self, file_path: str) -> str:
+        """First HEAD_BYTES of a file (enough for its imports)."""
+        try:
+            with open(self.project_path / file_path, encoding='utf-8', errors='replace') as f:
+                return f.read(HEAD_BYTES)
+        except OSError:
+            return ""
+
+    def _symbol_value(self, symbol: SymbolInfo, query_lower: str, entry_names: set[str]) -> float:
+        """Extra value a symbol adds to the unit containing it."""
+        name = symbol.name.lower()
+        value = self.QUERY_SYMBOL_BOOST if name and name in query_lower else 0.0
+        if name in entry_names:
+            value += self.ENTRY_POINT_BOOST
+        return value
+
+    def _build_units(
+        self,
+        file_data: dict[str, dict[str, Any]],
+        query: str,
+        entry_points: list[str] | None,
+    ) -> list[PackUnit]:
+        """
+        Turn retrieval hits into packable units.
+
+        Vector chunks become units as they are (no disk read); LSP symbols
+        inside a chunk add to its value, other symbols become units spanning
+        their LSP range (or indentation block), read from the file.
+        """
+        query_lower = query.lower()
+        entries = [e.lower() for e in entry_points or []]
+        entry_names = set(entries)
+        units: list[PackUnit] = []
+
+        for file_path, data in file_data.items():
+            file_boost = self.ENTRY_POINT_BOOST * sum(1 for e in entries if e in file_path.lower())
+            chunk_units = [
+                PackUnit(file_path, start, end, text, score + file_boost)
+                for start, end, text, score in data.get("chunks", [])
+            ]
+            orphans = []
+            for symbol in data.get("symbols", []):
+                line = symbol.line + 1  # LSP lines are 0-based
+                unit = next((u for u in chunk_units if u.start_line <= line <= u.end_line), None)
+                if unit is None:
+                    orphans.append(symbol)
+                    continue
+                unit.value += self._symbol_value(symbol, query_lower, entry_names)
+                unit.symbols.append(symbol.name)
+            units.extend(chunk_units)
+
+            if not chunk_units and not orphans:
+                # No line ranges to go on: the file (or merged chunk text) as one unit
+                content = self._get_file_content(file_path, data["content"])
+                if content:
+                    units.append(PackUnit(file_path, 1, content.count("\n") + 1, content, data["score"],
+                                          symbols=[s.name for s in data.get("symbols", [])]))
+                continue
+            if not orphans:
+                continue
+            lines = self._get_file_content(file_path, "").splitlines()
+            for symbol in orphans:
+                if not 0 <= symbol.line < len(lines):
+                    continue
+                first, last = symbol_block(lines, symbol.line)
+                if symbol.end_line is not None and symbol.end_line > symbol.line:
+                    last = min(symbol.end_line, len(lines) - 1)
+                units.append(PackUnit(
+                    file_path, first + 1, last + 1, "\n".join(lines[first:last + 1]),
+                    self.LSP_SYMBOL_VALUE + file_boost + self._symbol_value(symbol, query_lower, entry_names),
+                    symbols=[symbol.name],
+                ))
+        return units
+
+    def _pack_file_contexts(
         self,
-        sorted_files: list[tuple],
+        file_data: dict[str, dict[str, Any]],
+        query: str,
+        entry_points: list[str] | None,
         budget: int,
-        context: CodeContext
+        context: CodeContext,
     ) -> int:
-        """Build FileContext objects within token budget. Returns tokens used."""
-        current_tokens = 0
-        seen_symbols: set[str] = set()
+        """Pack the most valuable units into FileContexts. Returns tokens used."""
+        headers: dict[str, str] = {}
 
-        for file_path, data in sorted_files:
-            content = self._get_file_content(file_path, data["content"])
-            if not content:
-                continue
+        def header_for(file_path: str) -> str:
+            if file_path not in headers:
+                headers[file_path] = imports_header(self._read_head(file_path))
+            return headers[file_path]
 
-            content, tokens = self._fit_content_to_budget(content, current_tokens, budget)
-            if content is None:
-                continue
+        units = self._build_units(file_data, query, entry_points)
+        packer = ContextPacker(self.estimate_tokens, header_for, self._truncate_content)
+        packed, _ = packer.pack(units, budget)
+
+        by_file: dict[str, list[PackUnit]] = {}
+        for unit in packed:
+            by_file.setdefault(unit.file_path, []).append(unit)
+
+        current_tokens = 0
+        seen_symbols: set[str] = set()
+        ranked = sorted(by_file, key=lambda f: file_data[f]["score"], reverse=True)
+        for file_path in ranked:
+            file_units = sorted(by_file[file_path], key=lambda u: u.start_line)
+            parts = [u.text for u in file_units]
+            header = headers.get(file_path, "")
+            if header and file_units[0].start_line > 1:
+                parts.insert(0, header)
+            content = UNIT_SEPARATOR.join(parts)
+            tokens = self.estimate_tokens(content)
 
+            data = file_data[file_path]
             context.files.append(FileContext(
                 path=file_path,
                 language=self.detect_language(file_path),
                 content=content,
                 layer=self.detect_layer(file_path),
-                relevance_score=data["score"],
+                relevance_score=max(data["score"], max(u.value for u in file_units)),
                 symbols=data["symbols"],
                 token_count=tokens,
             ))
@@ -283,9 +407,8 @@ class ContextAssembler:
                     context.symbols.append(sym)
                     seen_symbols.add(sym.name)
 
-            if current_tokens >= budget:
-                break
-
+        context.retrieval_metadata["units_considered"] = len(units)
+        context.retrieval_metadata["units_packed"] = len(packed)
         return current_tokens
 
     def assemble(
@@ -324,13 +447,7 @@ class ContextAssembler:
         self._process_lsp_symbols(lsp_symbols, query, file_data)
         self._apply_entry_point_boosts(entry_points, file_data)
 
-        sorted_files = sorted(
-            file_data.items(),
-            key=lambda x: x[1]["score"],
-            reverse=True
-        )
-
-        current_tokens = self._build_file_contexts(sorted_files, budget, context)
+        current_tokens = self._pack_file_contexts(file_data, query, entry_points, budget, context)
 
         context.patterns = self._detect_patterns(context)
         context.total_tokens = current_tokens
@@ -338,17 +455,17 @@ class ContextAssembler:
         return context
 
     def _truncate_content(self, content: str, max_tokens: int) -> str:
-        """Truncate content to fit token budget."""
-        max_chars = max_tokens * 4
-        if len(content) <= max_chars:
+        """Truncate content to fit token budget (truncation marker included)."""
+        if self.estimate_tokens(content) <= max_tokens:
             return content
 
-        truncated = content[:max_chars]
+        marker = "\n// ... (truncated)"
+        truncated = get_counter().truncate(content, max_tokens - self.estimate_tokens(marker))
         last_newline = truncated.rfind("\n")
-        if last_newline > max_chars * 0.8:
+        if last_newline > len(truncated) * 0.8:
             truncated = truncated[:last_newline]
 
-        return truncated + "\n// ... (truncated)"
+        return truncated + marker
 
     def _detect_patterns(self, context: CodeContext) -> list[PatternMatch]:
         """Detect architectural patterns in the assembled context."""
@@ -383,7 +500,7 @@ class ContextAssembler:
                 if remaining < 200:
                     continue
                 content = self._truncate_content(content, remaining)
-                tokens = remaining
+                tokens = self.estimate_tokens(content)
 
             file_ctx = FileContext(
                 path=file_path,
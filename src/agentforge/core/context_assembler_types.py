@@ -14,7 +14,7 @@ Data classes for context assembly.
 Extracted from context_assembler.py for modularity.
 """
 
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field
 from enum import Enum
 from typing import Any
 
@@ -38,6 +38,7 @@ class SymbolInfo:
     signature: str | None = None
     docstring: str | None = None
     parent: str | None = None
+    end_line: int | None = None  # Last line of the symbol's range, when LSP reports one
 
     def to_dict(self) -> dict:
         return {
@@ -109,6 +110,25 @@ class CodeContext:
         import yaml
         return yaml.dump(self.to_dict(), default_flow_style=False, sort_keys=False)
 
+    def to_cache_dict(self) -> dict:
+        """Lossless dict form (to_dict() is the summarized view for prompts)."""
+        return asdict(self)
+
+    @classmethod
+    def from_cache_dict(cls, data: dict) -> "CodeContext":
+        """Rebuild a context from to_cache_dict() output."""
+        files = [
+            FileContext(**{**f, "symbols": [SymbolInfo(**s) for s in f.get("symbols", [])]})
+            for f in data.get("files", [])
+        ]
+        return cls(
+            files=files,
+            symbols=[SymbolInfo(**s) for s in data.get("symbols", [])],
+            patterns=[PatternMatch(**p) for p in data.get("patterns", [])],
+            total_tokens=data.get("total_tokens", 0),
+            retrieval_metadata=dict(data.get("retrieval_metadata", {})),
+        )
+
     def _group_files_by_layer(self) -> dict[str, list["FileContext"]]:
         """Group files by architecture layer."""
         by_layer: dict[str, list[FileContext]] = {}
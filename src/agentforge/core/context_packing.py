@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Context Packing
+===============
+
+Fills a token budget with symbol- and chunk-sized units instead of whole
+files. Extracted from context_assembler.py for modularity.
+
+Units come from vector chunk boundaries and LSP symbol ranges. Each unit
+has a value (relevance) and a cost (tokens, plus the file's imports header
+the first time a unit of that file is packed). Units are packed greedily
+by value per token, skipping what no longer fits; a unit overlapping
+packed lines (a class around a packed method) is charged for and emits
+only its unpacked lines. The result is
+compared against the single most valuable unit (the usual guard that
+keeps greedy knapsack within half of the optimum).
+
+Only file heads (for imports) and files with LSP-only hits are read from
+disk; vector chunks carry their own text.
+"""
+
+import re
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+UNIT_SEPARATOR = "\n\n// ...\n\n"
+HEAD_BYTES = 8192  # Imports are looked for in this much of a file
+HEADER_MAX_LINES = 30
+SYMBOL_MAX_LINES = 200
+
+_IMPORT_LINE = re.compile(
+    r"^\s*(?:import\s|from\s+\S+\s+import\b|using\s+[\w.=\s]+;|package\s|#include\b|"
+    r"export\s+(?:\*|\{[^}]*\})\s+from\b|(?:const|let|var)\s+.+=\s*require\()"
+)
+_DEFINITION_LINE = re.compile(
+    r"^\s*(?:(?:public|private|protected|internal|static|abstract|sealed|partial|export|default|async)\s+)*"
+    r"(?:def|class|interface|struct|record|enum|function|func|fn|namespace)\b"
+)
+_BRACKETS = {"(": ")", "{": "}"}
+
+
+@dataclass
+class PackUnit:
+    """A symbol- or chunk-sized piece of one file."""
+    file_path: str
+    start_line: int  # 1-based, inclusive
+    end_line: int
+    text: str
+    value: float
+    tokens: int = 0
+    symbols: list[str] = field(default_factory=list)
+
+    def covered_by(self, ranges: list[tuple[int, int]]) -> bool:
+        return any(start <= self.start_line and self.end_line <= end for start, end in ranges)
+
+    def uncovered(self, ranges: list[tuple[int, int]]) -> list["PackUnit"]:
+        """
+        The parts of this unit outside already-packed line ranges.
+
+        [self] when nothing overlaps, [] when fully covered. An enclosing
+        unit (a class around a packed method) or an overlapping chunk is
+        split into the runs of lines not yet packed, so no line is emitted
+        or charged twice. Value is shared out by line count.
+        """
+        overlapping = [(start, end) for start, end in ranges
+                       if start <= self.end_line and self.start_line <= end]
+        if not overlapping:
+            return [self]
+        if self.covered_by(overlapping):
+            return []
+        lines = self.text.split("\n")
+        if len(lines) != self.end_line - self.start_line + 1:
+            return [self]  # Text doesn't map onto the range (e.g. truncated)
+
+        pieces: list[PackUnit] = []
+        run: list[int] = []
+        for number in range(self.start_line, self.end_line + 2):
+            covered = number > self.end_line or any(start <= number <= end for start, end in overlapping)
+            if not covered:
+                run.append(number)
+                continue
+            if any(lines[n - self.start_line].strip() for n in run):
+                text = "\n".join(lines[n - self.start_line] for n in run)
+                pieces.append(PackUnit(self.file_path, run[0], run[-1], text,
+                                       self.value * len(run) / len(lines), symbols=self.symbols))
+            run = []
+        return pieces
+
+
+def imports_header(head: str, max_lines: int = HEADER_MAX_LINES) -> str:
+    """Import/using/package lines from the top of a file (multi-line imports kept whole)."""
+    header: list[str] = []
+    closer = None
+    for line in head.splitlines():
+        if closer is not None:
+            header.append(line)
+            if closer in line:
+                closer = None
+            continue
+        if _IMPORT_LINE.match(line):
+            header.append(line)
+            for opener, close in _BRACKETS.items():
+                if line.count(opener) > line.count(close):
+                    closer = close
+            continue
+        if _DEFINITION_LINE.match(line):
+            break
+    return "\n".join(header[:max_lines])
+
+
+def symbol_block(lines: list[str], start: int, max_lines: int = SYMBOL_MAX_LINES) -> tuple[int, int]:
+    """
+    0-based (first, last) line of the definition starting at lines[start].
+
+    The block ends before the next non-blank line indented no deeper than
+    the definition; a closing bracket at that indentation is included, and
+    a brace on the line after the signature (C#/Java style) is followed.
+    Decorators/attributes directly above are included.
+    """
+    first = start
+    while first > 0 and lines[first - 1].strip().startswith(("@", "[")):
+        first -= 1
+    indent = len(lines[start]) - len(lines[start].lstrip())
+    last = start
+    for j in range(start + 1, min(len(lines), start + max_lines)):
+        stripped = lines[j].strip()
+        if not stripped:
+            continue
+        if len(lines[j]) - len(lines[j].lstrip()) > indent:
+            last = j
+            continue
+        if stripped.startswith("{") and last == start:
+            last = j
+            continue
+        if stripped[0] in "}])" or stripped == "end":
+            last = j
+        break
+    return first, last
+
+
+class ContextPacker:
+    """Greedy value-per-token packer over PackUnits."""
+
+    MIN_TRUNCATED_TOKENS = 200  # Smaller leftovers aren't worth a truncated unit
+
+    def __init__(self, count: Callable[[str], int], header_for: Callable[[str], str],
+                 truncate: Callable[[str, int], str]):
+        """
+        Initialize packer.
+
+        Args:
+            count: Token counter
+            header_for: file path -> imports header ("" if none), called lazily
+            truncate: (text, max_tokens) -> text that fits
+        """
+        self.count = count
+        self.header_for = header_for
+        self.truncate = truncate
+        self.separator_tokens = count(UNIT_SEPARATOR)
+        self._header_tokens: dict[str, int] = {}
+
+    def header_tokens(self, file_path: str) -> int:
+        if file_path not in self._header_tokens:
+            header = self.header_for(file_path)
+            self._header_tokens[file_path] = self.count(header) + self.separator_tokens if header else 0
+        return self._header_tokens[file_path]
+
+    def _cost(self, unit: PackUnit, files: set[str]) -> int:
+        cost = unit.tokens + self.separator_tokens
+        if unit.file_path not in files:
+            cost += self.header_tokens(unit.file_path)
+        return cost
+
+    def _greedy(self, order: list[PackUnit], budget: int,
+                seed: tuple[PackUnit, ...] = ()) -> tuple[list[PackUnit], int]:
+        selected: list[PackUnit] = []
+        files: set[str] = set()
+        ranges: dict[str, list[tuple[int, int]]] = {}
+        seen: set[int] = set()
+        used = 0
+        for unit in (*seed, *order):
+            if id(unit) in seen:
+                continue
+            pieces = self._uncovered(unit, ranges)
+            if not pieces:
+                continue
+            seen.add(id(unit))
+            cost = sum(piece.tokens + self.separator_tokens for piece in pieces)
+            if unit.file_path not in files:
+                cost += self.header_tokens(unit.file_path)
+            if used + cost > budget:
+                continue
+            selected.extend(pieces)
+            files.add(unit.file_path)
+            ranges.setdefault(unit.file_path, []).extend((p.start_line, p.end_line) for p in pieces)
+            used += cost
+        return selected, used
+
+    def _uncovered(self, unit: PackUnit, ranges: dict[str, list[tuple[int, int]]]) -> list[PackUnit]:
+        """Unit pieces not yet packed, with their tokens counted."""
+        pieces = unit.uncovered(ranges.get(unit.file_path, []))
+        for piece in pieces:
+            if piece is not unit:
+                piece.tokens = self.count(piece.text)
+        return pieces
+
+    def pack(self, units: list[PackUnit], budget: int) -> tuple[list[PackUnit], int]:
+        """
+        Choose units for the budget.
+
+        Returns:
+            (packed units, tokens used including headers and separators)
+        """
+        for unit in units:
+            unit.tokens = self.count(unit.text)
+        order = sorted(units, key=lambda u: (u.value / max(1, u.tokens), u.value), reverse=True)
+        selected, used = self._greedy(order, budget)
+
+        # Greedy by density can lose to one large, valuable unit
+        best = max((u for u in units if self._cost(u, set()) <= budget), key=lambda u: u.value, default=None)
+        if best is not None and all(u is not best for u in selected) \
+                and best.value > sum(u.value for u in selected):
+            selected, used = self._greedy(order, budget, seed=(best,))
+
+        return self._fill_with_truncated(order, selected, used, budget)
+
+    def _fill_with_truncated(self, order: list[PackUnit], selected: list[PackUnit],
+                             used: int, budget: int) -> tuple[list[PackUnit], int]:
+        """Spend a large leftover on the most valuable unit that didn't fit, truncated."""
+        files = {u.file_path for u in selected}
+        packed = {id(u) for u in selected}
+        ranges: dict[str, list[tuple[int, int]]] = {}
+        for unit in selected:
+            ranges.setdefault(unit.file_path, []).append((unit.start_line, unit.end_line))
+        candidates = [u for u in order if id(u) not in packed and not u.covered_by(ranges.get(u.file_path, []))]
+        if not candidates:
+            return selected, used
+
+        unit = max(candidates, key=lambda u: u.value)
+        selected = list(selected)
+        for piece in unit.uncovered(ranges.get(unit.file_path, [])):
+            room = budget - used - self.separator_tokens
+            if piece.file_path not in files:
+                room -= self.header_tokens(piece.file_path)
+            if room < self.MIN_TRUNCATED_TOKENS:
+                break
+            text = self.truncate(piece.text, room)
+            truncated = PackUnit(piece.file_path, piece.start_line, piece.end_line, text, piece.value,
+                                 self.count(text), piece.symbols)
+            selected.append(truncated)
+            used += self._cost(truncated, files)
+            files.add(piece.file_path)
+        return selected, used
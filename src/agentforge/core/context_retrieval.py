@@ -15,6 +15,19 @@ Implements "Correctness is Upstream" - agents need real code to write accurate s
 This is the main entry point that combines:
 - LSP: Compiler-accurate structural information (symbols, definitions, references)
 - Vector: Semantic similarity search (related code, concepts)
+- Lexical: BM25 over identifier tokens, fused with vector results by
+  reciprocal rank. Identifier-only queries ("OrderService") are answered
+  from the lexical index alone, without loading the embedding model.
+
+LSP and search sources run concurrently. With a deadline, retrieve()
+assembles whatever sources finished in time; the rest keep running in
+the background (warming caches and indexes) and their results are dropped.
+
+Assembled contexts are cached per project (see retrieval_cache): a repeated
+request is answered without touching any source until the vector index or
+one of the files the context was built from changes. Contexts missing a
+source (it timed out, failed, or its server was still indexing) are not
+cached.
 
 Usage:
     from agentforge.core.context_retrieval import ContextRetriever
@@ -32,8 +45,12 @@ Dependencies:
 """
 
 import contextlib
+import contextvars
 import sys
-from dataclasses import dataclass
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass, replace
 from pathlib import Path
 from typing import Any
 
@@ -45,6 +62,42 @@ from agentforge.core.context_assembler import (
     ContextAssembler,
     FileContext,
 )
+from agentforge.core.lexical_index import is_identifier_query
+from agentforge.core.retrieval_cache import (
+    DEFAULT_MAX_ENTRIES,
+    RetrievalCache,
+    cache_enabled,
+    normalize_query,
+)
+
+# Sources that failed or answered incompletely during the current retrieve()
+_failed_sources: contextvars.ContextVar[list[str] | None] = contextvars.ContextVar("failed_sources", default=None)
+
+
+def _source_failed(name: str) -> None:
+    """Record that a source's results are missing or incomplete (nothing is cached)."""
+    failed = _failed_sources.get()
+    if failed is not None and name not in failed:
+        failed.append(name)
+
+
+def reciprocal_rank_fusion(result_lists: list[list], k: int = 60) -> list:
+    """
+    Merge ranked SearchResult lists by reciprocal rank: sum of 1 / (k + rank).
+
+    Results are keyed by (file, start line, end line). Fused scores are
+    scaled so a result ranked first in every list scores 1.0.
+    """
+    fused: dict[tuple, list] = {}
+    for results in result_lists:
+        for rank, result in enumerate(results, 1):
+            key = (result.file_path, result.start_line, result.end_line)
+            entry = fused.setdefault(key, [0.0, result])
+            entry[0] += 1.0 / (k + rank)
+
+    scale = (k + 1) / len(result_lists)
+    ranked = sorted(fused.values(), key=lambda entry: entry[0], reverse=True)
+    return [replace(result, score=score * scale) for score, result in ranked]
 
 
 @dataclass
@@ -54,6 +107,8 @@ class IndexStats:
     chunk_count: int = 0
     symbol_count: int = 0
     duration_ms: int = 0
+    reused_chunks: int = 0
+    embedded_chunks: int = 0
     errors: list[str] = None
 
     def __post_init__(self):
@@ -92,6 +147,7 @@ class ContextRetriever:
         self._lsp_adapter = None
         self._vector_search = None
         self._assembler = None
+        self._executor: ThreadPoolExecutor | None = None
 
         # State
         self._lsp_available = None
@@ -133,14 +189,12 @@ class ContextRetriever:
 
     @property
     def lsp_adapter(self):
-        """Get or create LSP adapter. Returns None if not available."""
+        """Get the pooled LSP adapter (server starts on first cache miss). Returns None if not available."""
         if self._lsp_adapter is None and self._lsp_available is None:
             try:
-                from agentforge.core.lsp_adapter import get_adapter_for_project
+                from agentforge.core.lsp_pool import get_pool
 
-                adapter = get_adapter_for_project(str(self.project_path))
-                adapter.initialize()
-                self._lsp_adapter = adapter
+                self._lsp_adapter = get_pool().get_for_project(self.project_path, lazy=True)
                 self._lsp_available = True
 
             except ImportError:
@@ -172,36 +226,145 @@ class ContextRetriever:
 
         return self._vector_search
 
+    @property
+    def result_cache(self) -> RetrievalCache | None:
+        """Shared retrieval cache for this project, or None if disabled."""
+        cache_config = self.config.get("retrieval", {}).get("cache", {})
+        if not cache_enabled() or not cache_config.get("enabled", True):
+            return None
+        return RetrievalCache.for_project(
+            self.project_path,
+            max_entries=cache_config.get("max_entries", DEFAULT_MAX_ENTRIES),
+            disk=cache_config.get("disk", True),
+        )
+
+    def _cache_key(self, query: str, entry_points: list[str] | None, budget: int,
+                   use_lsp: bool, use_vector: bool) -> str:
+        """Cache key for a request against the current index generation."""
+        generation = None
+        if use_vector and self.vector_search:
+            with contextlib.suppress(OSError):
+                generation = self.vector_search.index_generation()
+        return RetrievalCache.key(
+            "context",
+            query=normalize_query(query),
+            entry_points=list(entry_points or []),
+            budget=budget,
+            sources=[use_lsp, use_vector],
+            generation=generation,
+        )
+
+    def _candidate_files(self, lsp_symbols: list, vector_results: list, context: CodeContext) -> list[str]:
+        """Files a context was built from (its entry is dropped when any of them changes)."""
+        files = [f.path for f in context.files]
+        files.extend(getattr(r, "file_path", None) for r in vector_results)
+        files.extend(getattr(getattr(s, "location", None), "file", None) for s in lsp_symbols)
+        return list(dict.fromkeys(f for f in files if isinstance(f, str) and f))
+
     def _retrieve_lsp_symbols(self, query: str, entry_points: list[str] = None) -> list:
         """Retrieve symbols via LSP for query keywords and entry points."""
         if not self.lsp_adapter:
             return []
         try:
-            symbols = []
-            keywords = self._extract_keywords(query)
-            for keyword in keywords[:5]:
-                symbols.extend(self.lsp_adapter.get_workspace_symbols(keyword))
-            if entry_points:
-                for entry in entry_points:
-                    symbols.extend(self.lsp_adapter.get_workspace_symbols(entry))
-            return symbols
+            queries = list(dict.fromkeys(self._extract_keywords(query)[:5] + list(entry_points or [])))
+            by_query = self.lsp_adapter.get_workspace_symbols_many(queries)
+            if not self.lsp_adapter.is_ready():
+                _source_failed("lsp")  # Still indexing: the answer may be partial
+            return [symbol for q in queries for symbol in by_query.get(q, [])]
         except Exception as e:
             print(f"LSP query failed: {e}", file=sys.stderr)
+            _source_failed("lsp")
             return []
 
-    def _retrieve_vector_results(self, query: str) -> list:
-        """Retrieve results via vector search."""
+    def _retrieve_lexical_results(self, query: str, entry_points: list[str] = None) -> list:
+        """Retrieve results from the lexical (BM25) index."""
         if not self.vector_search:
             return []
         try:
             if not self.vector_search.is_indexed():
                 print("Building vector index (first run)...", file=sys.stderr)
                 self.vector_search.index()
+            return self.vector_search.lexical_search([query, *(entry_points or [])], top_k=20)
+        except Exception as e:
+            print(f"Lexical search failed: {e}", file=sys.stderr)
+            _source_failed("lexical")
+            return []
+
+    def _retrieve_search_results(self, query: str, entry_points: list[str] = None) -> list:
+        """
+        Retrieve lexical and vector results, fused by reciprocal rank.
+
+        When the query and entry points are all identifiers and the lexical
+        index has hits, the vector search (and its model) is skipped.
+        """
+        lexical = self._retrieve_lexical_results(query, entry_points)
+        if lexical and all(is_identifier_query(q) for q in [query, *(entry_points or [])]):
+            return lexical
+        vector = self._retrieve_vector_results(query, entry_points)
+        if not lexical or not vector:
+            return vector or lexical
+        k = self.config.get("retrieval", {}).get("fusion", {}).get("reciprocal_rank", {}).get("k", 60)
+        return reciprocal_rank_fusion([vector, lexical], k=k)
+
+    def _retrieve_vector_results(self, query: str, entry_points: list[str] = None) -> list:
+        """Retrieve results via vector search (query and entry points in one batch)."""
+        if not self.vector_search:
+            return []
+        try:
+            if not self.vector_search.is_indexed():
+                print("Building vector index (first run)...", file=sys.stderr)
+                self.vector_search.index()
+            if entry_points:
+                return self.vector_search.search_many([query, *entry_points], top_k=20, union=True)
             return self.vector_search.search(query, top_k=20)
         except Exception as e:
             print(f"Vector search failed: {e}", file=sys.stderr)
+            _source_failed("vector")
             return []
 
+    def _run_sources(self, sources: dict[str, Callable[[], list]],
+                     deadline_ms: float | None) -> tuple[dict[str, list], dict[str, float], list[str]]:
+        """
+        Run retrieval sources concurrently.
+
+        Returns:
+            (results per source, elapsed ms per finished source, sources that
+            missed the deadline); late sources contribute no results
+        """
+        timings: dict[str, float] = {}
+
+        def timed(name: str, source: Callable[[], list]) -> list:
+            start = time.monotonic()
+            try:
+                return source()
+            finally:
+                timings[name] = round((time.monotonic() - start) * 1000, 1)
+
+        if len(sources) == 1 and deadline_ms is None:
+            name, source = next(iter(sources.items()))
+            return {name: timed(name, source)}, dict(timings), []
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="context-retrieval")
+        # Each source runs in a copy of this context, so it reports failures to this request
+        futures = {name: self._executor.submit(contextvars.copy_context().run, timed, name, source)
+                   for name, source in sources.items()}
+        done, _ = wait(futures.values(), timeout=deadline_ms / 1000 if deadline_ms is not None else None)
+
+        results, timed_out = {}, []
+        for name, future in futures.items():
+            if future not in done:
+                results[name] = []
+                timed_out.append(name)
+                continue
+            try:
+                results[name] = future.result()
+            except Exception as e:
+                print(f"Retrieval source '{name}' failed: {e}", file=sys.stderr)
+                _source_failed(name)
+                results[name] = []
+        return results, {name: timings[name] for name in futures if name in timings}, timed_out
+
     def retrieve(
         self,
         query: str,
@@ -209,6 +372,8 @@ class ContextRetriever:
         entry_points: list[str] = None,
         use_lsp: bool = True,
         use_vector: bool = True,
+        deadline_ms: float | None = None,
+        use_cache: bool = True,
     ) -> CodeContext:
         """
         Retrieve relevant code context for a query.
@@ -219,14 +384,47 @@ class ContextRetriever:
             entry_points: Specific symbols to prioritize
             use_lsp: Whether to use LSP for structural queries
             use_vector: Whether to use vector search for semantic queries
+            deadline_ms: Latency budget; sources still running when it
+                expires are left out (default: retrieval.deadline_ms from
+                config, None waits for every source)
+            use_cache: Whether to answer from (and store in) the retrieval cache
 
         Returns:
             CodeContext with ranked, relevant code snippets
         """
-        budget = budget_tokens or self.config.get("retrieval", {}).get("budget", {}).get("default_tokens", 6000)
-
-        lsp_symbols = self._retrieve_lsp_symbols(query, entry_points) if use_lsp else []
-        vector_results = self._retrieve_vector_results(query) if use_vector else []
+        retrieval_config = self.config.get("retrieval", {})
+        budget = budget_tokens or retrieval_config.get("budget", {}).get("default_tokens", 6000)
+        if deadline_ms is None:
+            deadline_ms = retrieval_config.get("deadline_ms")
+
+        cache = self.result_cache if use_cache else None
+        if cache is not None:
+            cached = cache.get(self._cache_key(query, entry_points, budget, use_lsp, use_vector))
+            if cached is not None:
+                context = CodeContext.from_cache_dict(cached)
+                context.retrieval_metadata.update({
+                    "source_timings_ms": {},
+                    "deadline_ms": deadline_ms,
+                    "timed_out_sources": [],
+                    "failed_sources": [],
+                    "cache_hit": True,
+                })
+                return context
+
+        sources = {}
+        if use_lsp:
+            sources["lsp"] = lambda: self._retrieve_lsp_symbols(query, entry_points)
+        if use_vector:
+            sources["search"] = lambda: self._retrieve_search_results(query, entry_points)
+        failed: list[str] = []
+        token = _failed_sources.set(failed)
+        try:
+            results, timings, timed_out = self._run_sources(sources, deadline_ms) if sources else ({}, {}, [])
+        finally:
+            _failed_sources.reset(token)
+        failed = list(failed)  # Late sources may still report into the original
+        lsp_symbols = results.get("lsp", [])
+        vector_results = results.get("search", [])
 
         context = self.assembler.assemble(
             query=query,
@@ -240,8 +438,23 @@ class ContextRetriever:
             "project_path": str(self.project_path),
             "lsp_enabled": use_lsp and self._lsp_available,
             "vector_enabled": use_vector and self._vector_available,
+            "source_timings_ms": timings,
+            "deadline_ms": deadline_ms,
+            "timed_out_sources": timed_out,
+            "failed_sources": failed,
+            "cache_hit": False,
         })
 
+        # Partial results (a source missed the deadline, failed or was still
+        # indexing) are not cached; the key is recomputed because a first run
+        # may have just built the index
+        if cache is not None and not timed_out and not failed:
+            cache.put(
+                self._cache_key(query, entry_points, budget, use_lsp, use_vector),
+                context.to_cache_dict(),
+                files=self._candidate_files(lsp_symbols, vector_results, context),
+            )
+
         return context
 
     def _extract_keywords(self, query: str) -> list[str]:
@@ -312,15 +525,17 @@ class ContextRetriever:
         """Get full context for a specific file."""
         return self.assembler.assemble_from_files([file_path]).files[0] if file_path else None
 
-    def index(self, force_rebuild: bool = False) -> IndexStats:
+    def index(self, force_rebuild: bool = False, incremental: bool = False) -> IndexStats:
         """Index the codebase for faster retrieval."""
         stats = IndexStats()
 
         if self.vector_search:
             try:
-                vs_stats = self.vector_search.index(force_rebuild)
+                vs_stats = self.vector_search.index(force_rebuild, incremental=incremental)
                 stats.file_count = vs_stats.file_count
                 stats.chunk_count = vs_stats.chunk_count
+                stats.reused_chunks = vs_stats.reused_chunks
+                stats.embedded_chunks = vs_stats.embedded_chunks
                 stats.duration_ms = vs_stats.duration_ms
                 stats.errors.extend(vs_stats.errors)
             except Exception as e:
@@ -336,15 +551,15 @@ class ContextRetriever:
         }
 
         try:
-            from agentforge.core.lsp_adapter import get_adapter_for_project
+            from agentforge.core.lsp_adapters import get_adapter_for_project
+            from agentforge.core.lsp_pool import get_pool
 
-            adapter = get_adapter_for_project(str(self.project_path))
-            status["lsp"]["server"] = adapter.SERVER_NAME
-            status["lsp"]["install_instructions"] = adapter.INSTALL_INSTRUCTIONS
+            adapter_cls = type(get_adapter_for_project(str(self.project_path)))
+            status["lsp"]["server"] = adapter_cls.SERVER_NAME
+            status["lsp"]["install_instructions"] = adapter_cls.INSTALL_INSTRUCTIONS
 
-            adapter.initialize()
+            get_pool().get(adapter_cls, self.project_path).shutdown()
             status["lsp"]["available"] = True
-            adapter.shutdown()
 
         except ImportError:
             status["lsp"]["error"] = "lsp_adapter module not found"
@@ -367,6 +582,9 @@ class ContextRetriever:
 
     def shutdown(self):
         """Clean up resources."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
         if self._lsp_adapter:
             with contextlib.suppress(Exception):
                 self._lsp_adapter.shutdown()
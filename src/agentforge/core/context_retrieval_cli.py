@@ -34,12 +34,16 @@ def build_parser():
 
     idx_parser = subparsers.add_parser("index", help="Build/rebuild index")
     idx_parser.add_argument("--force", "-f", action="store_true", help="Force rebuild")
+    idx_parser.add_argument("--incremental", "-i", action="store_true",
+                            help="Re-embed only added/changed files")
 
     search_parser = subparsers.add_parser("search", help="Search for code context")
     search_parser.add_argument("query", help="Search query")
     search_parser.add_argument("--budget", "-b", type=int, default=6000, help="Token budget")
     search_parser.add_argument("--no-lsp", action="store_true", help="Disable LSP")
     search_parser.add_argument("--no-vector", action="store_true", help="Disable vector search")
+    search_parser.add_argument("--deadline-ms", type=float,
+                               help="Return the sources finished within this many ms")
     search_parser.add_argument("--format", "-f", choices=["text", "yaml", "json"], default="text")
 
     sym_parser = subparsers.add_parser("symbol", help="Get context for a symbol")
@@ -75,11 +79,12 @@ def run_check_command(retriever, project: str):
         print("  Install: pip install openai faiss-cpu")
 
 
-def run_index_command(retriever, project: str, force: bool):
+def run_index_command(retriever, project: str, force: bool, incremental: bool = False):
     """Run the index command to build vector index."""
     print(f"Indexing: {project}")
-    stats = retriever.index(force_rebuild=force)
+    stats = retriever.index(force_rebuild=force, incremental=incremental)
     print(f"\nIndex complete:\n  Files: {stats.file_count}\n  Chunks: {stats.chunk_count}\n  Duration: {stats.duration_ms}ms")
+    print(f"  Reused: {stats.reused_chunks}\n  Re-embedded: {stats.embedded_chunks}")
     if stats.errors:
         print(f"  Errors: {len(stats.errors)}")
         for err in stats.errors[:5]:
@@ -93,7 +98,8 @@ def run_search_command(retriever, args) -> int:
         args.query,
         budget_tokens=args.budget,
         use_lsp=not args.no_lsp,
-        use_vector=not args.no_vector
+        use_vector=not args.no_vector,
+        deadline_ms=args.deadline_ms,
     )
 
     if args.format == "yaml":
@@ -124,7 +130,7 @@ def dispatch_command(retriever, args) -> int:
         run_check_command(retriever, args.project)
         return 0
     if args.command == "index":
-        run_index_command(retriever, args.project, args.force)
+        run_index_command(retriever, args.project, args.force, args.incremental)
         return 0
     if args.command == "search":
         return run_search_command(retriever, args)
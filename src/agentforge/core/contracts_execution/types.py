@@ -12,8 +12,10 @@ from typing import Any
 
 try:
     from ..contracts_types import CheckResult
+    from ..repo_file_index import RepoFileIndex
 except ImportError:
     from contracts_types import CheckResult
+    from repo_file_index import RepoFileIndex
 
 
 @dataclass
@@ -52,20 +54,18 @@ def get_files_for_check(check: dict[str, Any], repo_root: Path) -> list[Path]:
         "node_modules/**",
     ]
 
+    file_index = RepoFileIndex.for_root(repo_root)
     all_files = []
     for pattern in paths:
-        all_files.extend(repo_root.glob(pattern))
+        all_files.extend(file_index.glob(pattern))
 
     result = []
-    for f in all_files:
-        if not f.is_file():
-            continue
-        relative = str(f.relative_to(repo_root))
+    for relative in dict.fromkeys(all_files):
         excluded = any(fnmatch.fnmatch(relative, exc) for exc in exclude_paths)
         if not excluded:
             excluded = any(fnmatch.fnmatch(relative, exc) for exc in global_excludes)
         if not excluded:
-            result.append(f)
+            result.append(repo_root / relative)
 
     return result
 
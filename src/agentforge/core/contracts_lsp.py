@@ -25,7 +25,7 @@ def execute_lsp_query_check(ctx: "CheckContext") -> list:
     from agentforge.core.contracts_runner import CheckResult
 
     try:
-        from agentforge.core.lsp_adapter import get_lsp_adapter
+        from agentforge.core.lsp_pool import get_lsp_adapter
     except ImportError:
         return [CheckResult(check_id=ctx.check_id, check_name=ctx.check_name, passed=False,
                            severity="warning", message="LSP adapter not available - skipping semantic check")]
@@ -36,16 +36,21 @@ def execute_lsp_query_check(ctx: "CheckContext") -> list:
     assertion = ctx.config.get("assertion", "none_exist")
     results = []
 
+    adapters = {}
     for file_path in ctx.file_paths:
         try:
-            adapter = get_lsp_adapter(file_path)
-            if adapter is None:
-                continue
+            adapter = get_lsp_adapter(file_path, search_root=ctx.repo_root)
         except Exception:
             continue
+        if adapter is not None:
+            adapters[file_path] = adapter
 
+    prefetched = _prefetch_lsp_results(adapters, query_type)
+
+    for file_path, adapter in adapters.items():
         try:
-            matches = _run_lsp_query(adapter, file_path, query_type, filter_config, exclude_config)
+            matches = _run_lsp_query(adapter, file_path, query_type, filter_config, exclude_config,
+                                     prefetched.get(file_path))
             rel_path = str(file_path.relative_to(ctx.repo_root))
 
             if assertion in ("none_exist", "count_zero"):
@@ -72,8 +77,67 @@ def execute_lsp_query_check(ctx: "CheckContext") -> list:
     return results
 
 
+def _prefetch_lsp_results(adapters: dict, query_type: str) -> dict:
+    """
+    Fetch symbols/diagnostics for all files of each adapter in one pipelined batch.
+
+    Returns:
+        {file_path: list of dicts} for files that were prefetched; others
+        fall back to per-file queries
+    """
+    bulk = {
+        "symbols": ("get_symbols_many", _symbols_to_dicts),
+        "diagnostics": ("get_diagnostics_many", _diagnostics_to_dicts),
+    }.get(query_type)
+    if bulk is None:
+        return {}
+    method_name, convert = bulk
+
+    groups: dict[int, tuple] = {}
+    for file_path, adapter in adapters.items():
+        groups.setdefault(id(adapter), (adapter, []))[1].append(file_path)
+
+    prefetched = {}
+    for adapter, files in groups.values():
+        fetch = getattr(adapter, method_name, None)
+        if fetch is None:
+            continue
+        try:
+            by_file = fetch([str(f) for f in files])
+        except Exception:
+            continue
+        for file_path in files:
+            if str(file_path) in by_file:
+                prefetched[file_path] = convert(by_file[str(file_path)])
+    return prefetched
+
+
+def _symbols_to_dicts(symbols: list, container: str | None = None) -> list[dict]:
+    """Flatten LSP Symbol trees into the dict shape used by the filters."""
+    result = []
+    for symbol in symbols:
+        result.append({
+            "name": symbol.name,
+            "kind": symbol.kind,
+            "line": symbol.location.line + 1,
+            "column": symbol.location.column + 1,
+            "container": symbol.container or container or "",
+            "detail": symbol.detail,
+        })
+        result.extend(_symbols_to_dicts(symbol.children, symbol.name))
+    return result
+
+
+def _diagnostics_to_dicts(diagnostics: list) -> list[dict]:
+    """Convert LSP Diagnostics into the dict shape used by the filters."""
+    return [
+        {"message": d.message, "severity": d.severity, "line": d.line + 1, "column": d.column + 1}
+        for d in diagnostics
+    ]
+
+
 def _run_lsp_query(adapter, file_path: Path, query_type: str,
-                   filter_config: dict, exclude_config: dict) -> list:
+                   filter_config: dict, exclude_config: dict, prefetched: list | None = None) -> list:
     """Run LSP query based on query type."""
     query_funcs = {
         "symbols": _lsp_query_symbols,
@@ -82,7 +146,7 @@ def _run_lsp_query(adapter, file_path: Path, query_type: str,
         "call_hierarchy": _lsp_query_call_hierarchy,
     }
     func = query_funcs.get(query_type)
-    return func(adapter, file_path, filter_config, exclude_config) if func else []
+    return func(adapter, file_path, filter_config, exclude_config, prefetched) if func else []
 
 
 # =============================================================================
@@ -151,12 +215,13 @@ def _symbol_excluded_by_container(symbol: dict, exclude_containers: list) -> boo
 # =============================================================================
 
 def _lsp_query_symbols(adapter, file_path: Path, filter_config: dict,
-                       exclude_config: dict) -> list[dict]:
-    """Query document symbols and filter by criteria."""
-    try:
-        symbols = adapter.document_symbols(str(file_path))
-    except Exception:
-        symbols = []
+                       exclude_config: dict, symbols: list[dict] | None = None) -> list[dict]:
+    """Query document symbols (unless prefetched) and filter by criteria."""
+    if symbols is None:
+        try:
+            symbols = _symbols_to_dicts(adapter.get_symbols(str(file_path)))
+        except Exception:
+            symbols = []
 
     matches = []
     for symbol in symbols:
@@ -182,18 +247,19 @@ def _lsp_query_symbols(adapter, file_path: Path, filter_config: dict,
 
 
 def _lsp_query_references(adapter, file_path: Path, filter_config: dict,
-                          exclude_config: dict) -> list[dict]:
+                          exclude_config: dict, prefetched: list | None = None) -> list[dict]:
     """Query references - placeholder for future implementation."""
     return []
 
 
 def _lsp_query_diagnostics(adapter, file_path: Path, filter_config: dict,
-                           exclude_config: dict) -> list[dict]:
-    """Query compiler diagnostics."""
-    try:
-        diagnostics = adapter.diagnostics(str(file_path))
-    except Exception:
-        diagnostics = []
+                           exclude_config: dict, diagnostics: list[dict] | None = None) -> list[dict]:
+    """Query compiler diagnostics (unless prefetched)."""
+    if diagnostics is None:
+        try:
+            diagnostics = _diagnostics_to_dicts(adapter.get_diagnostics(str(file_path)))
+        except Exception:
+            diagnostics = []
 
     matches = []
     for diag in diagnostics:
@@ -212,6 +278,6 @@ def _lsp_query_diagnostics(adapter, file_path: Path, filter_config: dict,
 
 
 def _lsp_query_call_hierarchy(adapter, file_path: Path, filter_config: dict,
-                              exclude_config: dict) -> list[dict]:
+                              exclude_config: dict, prefetched: list | None = None) -> list[dict]:
     """Query call hierarchy - placeholder for future implementation."""
     return []
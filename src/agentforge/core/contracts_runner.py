@@ -25,6 +25,11 @@ from pathlib import Path
 
 import yaml
 
+try:
+    from .repo_file_index import RepoFileIndex
+except ImportError:
+    from repo_file_index import RepoFileIndex
+
 
 # Extension to language mapping for fallback detection
 _EXTENSION_LANGUAGE_MAP = {
@@ -62,13 +67,11 @@ def _load_languages_from_profile(profile_path: Path) -> set[str]:
 
 def _detect_languages_from_extensions(repo_root: Path) -> set[str]:
     """Detect languages by scanning file extensions."""
-    languages = set()
-    for ext, lang in _EXTENSION_LANGUAGE_MAP.items():
-        for f in repo_root.glob(f"**/*{ext}"):
-            if not any(part in _EXCLUDE_DIRS for part in f.parts):
-                languages.add(lang)
-                break  # Found one file, move to next extension
-    return languages
+    file_index = RepoFileIndex.for_root(repo_root)
+    return {
+        lang for ext, lang in _EXTENSION_LANGUAGE_MAP.items()
+        if file_index.has_extension(ext, _EXCLUDE_DIRS)
+    }
 
 
 def _detect_project_languages(repo_root: Path) -> set[str]:
@@ -14,6 +14,7 @@ from pathlib import Path
 from typing import Any
 
 from agentforge.core.discovery.domain import Interaction, InteractionType, Zone
+from agentforge.core.repo_file_index import RepoFileIndex
 
 try:
     import yaml
@@ -33,6 +34,14 @@ class InteractionDetector:
         self.repo_root = repo_root
         self.zones = zones
         self._zone_by_path: dict[Path, Zone] = {z.path: z for z in zones}
+        self._file_index: RepoFileIndex | None = None
+
+    @property
+    def file_index(self) -> RepoFileIndex:
+        """Shared file index for the repo (refreshed once per detector)."""
+        if self._file_index is None:
+            self._file_index = RepoFileIndex.for_root(self.repo_root)
+        return self._file_index
 
     def detect_all(self) -> list[Interaction]:
         """Detect all cross-zone interactions."""
@@ -58,7 +67,7 @@ class InteractionDetector:
         ]
         compose_files: set[Path] = set()
         for pattern in patterns:
-            compose_files.update(self.repo_root.glob(pattern))
+            compose_files.update(self.file_index.glob_paths(self.repo_root, pattern))
         return compose_files
 
     def _extract_service_dependencies(self, svc_config: dict) -> list[str]:
@@ -225,18 +234,21 @@ class InteractionDetector:
         files: list[Path] = []
 
         for ext in exts:
-            files.extend(zone_path.rglob(f"*{ext}"))
+            files.extend(self.file_index.rglob_paths(zone_path, f"*{ext}"))
 
         # Limit to prevent performance issues
         return files[:100]
 
     def _detect_schema_format(self, schema_path: Path) -> str | None:
         """Detect the format of schemas in a directory."""
-        if list(schema_path.glob("*.json")):
+        def has(pattern: str) -> bool:
+            return bool(self.file_index.glob_paths(schema_path, pattern))
+
+        if has("*.json"):
             return "json-schema"
-        if list(schema_path.glob("*.yaml")) or list(schema_path.glob("*.yml")):
+        if has("*.yaml") or has("*.yml"):
             return "openapi"
-        if list(schema_path.glob("*.proto")):
+        if has("*.proto"):
             return "protobuf"
         return None
 
@@ -263,7 +275,7 @@ class InteractionDetector:
             if zone.language != "csharp":
                 continue
 
-            for csproj in self._get_zone_path(zone).rglob("*.csproj"):
+            for csproj in self.file_index.rglob_paths(self._get_zone_path(zone), "*.csproj"):
                 for ref_path in self._get_project_references(csproj):
                     ref_resolved = (csproj.parent / ref_path).resolve()
                     result = self._find_referenced_zone(ref_resolved, project_zones, zone.name)
@@ -293,7 +305,7 @@ class InteractionDetector:
                 continue
 
             zone_path = zone.path if zone.path.is_absolute() else (self.repo_root / zone.path)
-            for csproj in zone_path.rglob("*.csproj"):
+            for csproj in self.file_index.rglob_paths(zone_path, "*.csproj"):
                 project_zones[csproj] = zone.name
 
         return project_zones
@@ -10,6 +10,7 @@ from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
+from ...repo_file_index import RepoFileIndex
 from ..domain import Detection, DetectionSource, LayerInfo
 from ..providers.base import LanguageProvider
 
@@ -101,6 +102,7 @@ class StructureAnalyzer:
         self.provider = provider
         self._dir_cache: dict[Path, DirectoryInfo] = {}
         self._dotnet_projects: dict[str, dict[str, Any]] = {}
+        self._file_index: RepoFileIndex | None = None
 
     def analyze(self, root: Path) -> StructureAnalysisResult:
         """
@@ -112,6 +114,8 @@ class StructureAnalyzer:
         Returns:
             StructureAnalysisResult with detected architecture
         """
+        self._file_index = RepoFileIndex.for_root(root)
+
         # For .NET projects, detect layers from project names first
         if self.provider.language_name == "csharp":
             self._detect_dotnet_layers(root)
@@ -147,6 +151,12 @@ class StructureAnalyzer:
             signals=signals,
         )
 
+    def _index(self, root: Path) -> RepoFileIndex:
+        """File index for root (refreshed once per analyze())."""
+        if self._file_index is None or self._file_index.root != root.resolve():
+            self._file_index = RepoFileIndex.for_root(root)
+        return self._file_index
+
     def _scan_directories(self, root: Path) -> list[DirectoryInfo]:
         """Scan and catalog all directories containing source files."""
         directories = []
@@ -204,7 +214,10 @@ class StructureAnalyzer:
         score = 0.0
         signals = []
         ext = list(self.provider.file_extensions)[0]
-        files_in_dir = list(dir_path.glob(f"*{ext}"))
+        if self._file_index is not None:
+            files_in_dir = self._file_index.glob_paths(dir_path, f"*{ext}")
+        else:
+            files_in_dir = list(dir_path.glob(f"*{ext}"))
 
         for file_pattern in file_patterns:
             matching_files = [f for f in files_in_dir if file_pattern in f.stem.lower()]
@@ -349,7 +362,7 @@ class StructureAnalyzer:
         ]
 
         for pattern in patterns:
-            matches = list(root.rglob(pattern))
+            matches = self._index(root).rglob_paths(root, pattern)
             entry_points.extend(matches)
 
         # Also check for scripts in pyproject.toml
@@ -467,7 +480,7 @@ class StructureAnalyzer:
         }
 
         # Find all csproj files
-        for csproj in root.rglob("*.csproj"):
+        for csproj in self._index(root).rglob_paths(root, "*.csproj"):
             project_name = csproj.stem.lower()
             project_dir = csproj.parent
 
@@ -511,7 +524,7 @@ class StructureAnalyzer:
         """Find .NET application entry points."""
         entry_points = []
 
-        for csproj in root.rglob("*.csproj"):
+        for csproj in self._index(root).rglob_paths(root, "*.csproj"):
             try:
                 content = csproj.read_text(encoding='utf-8')
 
@@ -539,7 +552,7 @@ class StructureAnalyzer:
         """Find .NET test project directories."""
         test_dirs = []
 
-        for csproj in root.rglob("*.csproj"):
+        for csproj in self._index(root).rglob_paths(root, "*.csproj"):
             project_name = csproj.stem.lower()
 
             # Check project name
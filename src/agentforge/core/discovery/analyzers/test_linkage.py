@@ -17,6 +17,7 @@ import re
 from dataclasses import dataclass, field
 from pathlib import Path
 
+from ...repo_file_index import RepoFileIndex
 from ..domain import DiscoveredTests, SourceTestLinkage, CoverageGapAnalysis
 
 
@@ -110,23 +111,23 @@ class TestLinkageAnalyzer:
 
     def _find_test_files(self) -> list[Path]:
         """Find all test files in the project."""
+        file_index = RepoFileIndex.for_root(self.root_path)
         test_files = []
         for test_dir in self.test_directories:
             test_path = self.root_path / test_dir
             if test_path.exists():
-                for f in test_path.rglob("test_*.py"):
-                    test_files.append(f)
-                for f in test_path.rglob("*_test.py"):
-                    test_files.append(f)
+                test_files.extend(file_index.rglob_paths(test_path, "test_*.py"))
+                test_files.extend(file_index.rglob_paths(test_path, "*_test.py"))
         return test_files
 
     def _find_source_files(self) -> list[Path]:
         """Find all source files (non-test Python files)."""
+        file_index = RepoFileIndex.for_root(self.root_path)
         source_files = []
         for source_dir in self.source_directories:
             source_path = self.root_path / source_dir
             if source_path.exists():
-                for f in source_path.rglob("*.py"):
+                for f in file_index.rglob_paths(source_path, "*.py"):
                     # Skip test files and __pycache__
                     if "test_" not in f.name and "__pycache__" not in str(f):
                         source_files.append(f)
@@ -20,7 +20,7 @@ def _get_lsp_adapter():
     try:
         import os
 
-        from agentforge.core.lsp_adapters import get_adapter_for_project
-        return get_adapter_for_project(os.getcwd())
+        from agentforge.core.lsp_pool import get_pool
+        return get_pool().get_for_project(os.getcwd())
     except Exception:
         return None
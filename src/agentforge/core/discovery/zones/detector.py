@@ -19,6 +19,7 @@ Detection priority:
 from pathlib import Path
 
 from agentforge.core.discovery.domain import Zone, ZoneDetectionMode
+from agentforge.core.repo_file_index import RepoFileIndex
 
 # Marker priority (higher = checked first, takes precedence)
 ZONE_MARKERS: list[tuple[str, str, int]] = [
@@ -60,6 +61,14 @@ class ZoneDetector:
 
     def __init__(self, repo_root: Path):
         self.repo_root = repo_root
+        self._file_index: RepoFileIndex | None = None
+
+    @property
+    def file_index(self) -> RepoFileIndex:
+        """Shared file index for the repo (refreshed once per detector)."""
+        if self._file_index is None:
+            self._file_index = RepoFileIndex.for_root(self.repo_root)
+        return self._file_index
 
     def detect_zones(self) -> list[Zone]:
         """
@@ -90,9 +99,9 @@ class ZoneDetector:
     def _find_markers(self, pattern: str) -> list[Path]:
         """Find all marker files matching the pattern."""
         results = []
-        for path in self.repo_root.rglob(pattern):
+        for path in self.file_index.rglob_paths(self.repo_root, pattern):
             # Skip excluded directories
-            if any(skip in path.parts for skip in SKIP_DIRECTORIES):
+            if any(skip in path.relative_to(self.repo_root).parts for skip in SKIP_DIRECTORIES):
                 continue
             results.append(path)
         return results
@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+"""
+Embedding Cache
+===============
+
+Persistent, content-addressed cache of embedding vectors.
+
+Vectors are keyed by (provider name, model name, SHA-256 of the embedded
+text), so re-indexing after a branch switch, a forced rebuild or in another
+worktree only pays for chunks whose text actually changed.
+
+Layout (one directory per provider/model under the cache root):
+    rows.log     - append-only journal of row assignments, frees and resizes
+    vectors.f32  - memory-mapped float32 matrix (capacity x dimension)
+    ticks.i64    - memory-mapped last-use timestamps for LRU eviction
+    lock         - flock target: writers take it exclusively, readers shared
+
+A put appends one journal line per new row instead of rewriting the whole
+row map; other processes replay only the lines added since they last
+looked. The journal is compacted once it is mostly superseded lines.
+
+Usage:
+    cache = EmbeddingCache.for_provider("local", "all-MiniLM-L6-v2")
+    provider = CachedEmbeddingProvider(get_embedding_provider("local"), cache)
+    vectors = provider.embed(texts)  # Only cache misses reach the model
+"""
+
+import fcntl
+import hashlib
+import os
+import re
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+import numpy as np
+
+try:
+    from .embedding_providers import EmbeddingProvider
+except ImportError:
+    from embedding_providers import EmbeddingProvider
+
+
+DEFAULT_CACHE_ROOT = Path.home() / ".agentforge" / "embedding_cache"
+DEFAULT_MAX_SIZE_MB = 1024
+
+
+class EmbeddingCache:
+    """
+    Size-bounded LRU store of embedding vectors for one provider/model.
+
+    The hash->row map is replayed from a small append-only journal; vectors
+    and last-use ticks live in memory-mapped arrays so lookups touch only
+    the rows they need.
+    """
+
+    INITIAL_CAPACITY = 1024
+    EVICTION_SLACK = 0.1  # Fraction of capacity freed beyond what a put needs
+    COMPACT_FACTOR = 4  # Compact once the journal has this many lines per live row
+    COMPACT_MIN_LINES = 4096
+
+    def __init__(self, cache_dir: Path, max_size_mb: int = DEFAULT_MAX_SIZE_MB):
+        """
+        Initialize cache.
+
+        Args:
+            cache_dir: Directory holding this provider/model's cache files
+            max_size_mb: Upper bound on the vector file size
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_size_mb * 1024 * 1024
+
+        self.dimension: int | None = None
+        self.capacity = 0
+        self._rows: dict[str, int] = {}
+        self._row_keys: dict[int, str] = {}
+        self._free: set[int] = set()
+        self._journal_id: tuple[int, int] | None = None  # (device, inode) replayed
+        self._journal_offset = 0
+        self._journal_lines = 0
+        self._vectors: np.memmap | None = None
+        self._ticks: np.memmap | None = None
+
+    @classmethod
+    def for_provider(cls, provider_name: str, model_name: str, root: Path | None = None,
+                     max_size_mb: int = DEFAULT_MAX_SIZE_MB) -> "EmbeddingCache":
+        """Create the cache for a provider/model under the shared cache root."""
+        slug = re.sub(r"[^A-Za-z0-9_.-]+", "_", f"{provider_name}-{model_name}")
+        return cls(Path(root or DEFAULT_CACHE_ROOT).expanduser() / slug, max_size_mb)
+
+    @staticmethod
+    def content_key(text: str) -> str:
+        """Content address of an embedded text."""
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    @property
+    def journal_file(self) -> Path:
+        return self.cache_dir / "rows.log"
+
+    @property
+    def max_rows(self) -> int:
+        if not self.dimension:
+            return 0
+        return max(1, self.max_bytes // (self.dimension * 4))
+
+    def __len__(self) -> int:
+        with self._lock(fcntl.LOCK_SH):
+            self._refresh()
+            return len(self._rows)
+
+    # -------------------------------------------------------------------------
+    # Lookup
+    # -------------------------------------------------------------------------
+
+    def get_many(self, keys: list[str]) -> dict[str, np.ndarray]:
+        """Return cached vectors for the keys that are present."""
+        # Shared lock: a writer can't evict and reuse a row while it is read
+        with self._lock(fcntl.LOCK_SH):
+            self._refresh()
+            hits = {k: self._rows[k] for k in keys if k in self._rows}
+            if not hits:
+                return {}
+            rows = np.fromiter(hits.values(), dtype=np.int64, count=len(hits))
+            vectors = np.array(self._vectors[rows])
+            self._ticks[rows] = time.time_ns()
+        return dict(zip(hits, vectors, strict=True))
+
+    # -------------------------------------------------------------------------
+    # Insertion
+    # -------------------------------------------------------------------------
+
+    def put_many(self, keys: list[str], vectors: np.ndarray) -> None:
+        """Store vectors, evicting least recently used rows when full."""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if not keys:
+            return
+        with self._lock(fcntl.LOCK_EX):
+            self._refresh()
+            if self.dimension is None:
+                self.dimension = int(vectors.shape[1])
+            elif vectors.shape[1] != self.dimension:
+                raise ValueError(
+                    f"Embedding dimension {vectors.shape[1]} does not match cache "
+                    f"dimension {self.dimension} in {self.cache_dir}"
+                )
+
+            new = {}
+            for key, vector in zip(keys, vectors, strict=True):
+                if key not in self._rows:
+                    new[key] = vector
+            new_items = list(new.items())[-self.max_rows:]
+            if not new_items:
+                return
+
+            journal: list[str] = []
+            free_rows = self._reserve_rows(len(new_items), journal)
+            rows = np.array(free_rows, dtype=np.int64)
+            self._vectors[rows] = np.stack([v for _, v in new_items])
+            self._ticks[rows] = time.time_ns()
+            for (key, _), row in zip(new_items, free_rows, strict=True):
+                self._assign(key, row)
+                journal.append(f"{key} {row}\n")
+
+            self._vectors.flush()
+            self._ticks.flush()
+            self._append_journal(journal)
+
+    def _reserve_rows(self, needed: int, journal: list[str]) -> list[int]:
+        """Take `needed` free rows, growing or evicting as required."""
+        if len(self._free) < needed:
+            target = min(self.max_rows, max(self.INITIAL_CAPACITY, self.capacity * 2,
+                                            len(self._rows) + needed))
+            if target > self.capacity:
+                self._resize(target)
+                journal.append(f"= {self.capacity} {self.dimension}\n")
+
+        if len(self._free) < needed:
+            evict_count = needed - len(self._free) + int(self.capacity * self.EVICTION_SLACK)
+            used = np.fromiter(self._row_keys, dtype=np.int64, count=len(self._row_keys))
+            oldest = used[np.argsort(self._ticks[used], kind="stable")[:evict_count]]
+            for row in oldest.tolist():
+                self._release(row)
+                journal.append(f"- {row}\n")
+
+        return [self._free.pop() for _ in range(needed)]
+
+    def _assign(self, key: str, row: int) -> None:
+        previous = self._row_keys.get(row)
+        if previous is not None:
+            self._rows.pop(previous, None)
+        old_row = self._rows.get(key)
+        if old_row is not None and old_row != row:
+            self._release(old_row)
+        self._rows[key] = row
+        self._row_keys[row] = key
+        self._free.discard(row)
+
+    def _release(self, row: int) -> None:
+        key = self._row_keys.pop(row, None)
+        if key is not None:
+            self._rows.pop(key, None)
+        if row < self.capacity:
+            self._free.add(row)
+
+    # -------------------------------------------------------------------------
+    # Persistence
+    # -------------------------------------------------------------------------
+
+    @contextmanager
+    def _lock(self, mode: int):
+        """flock on the cache directory: LOCK_EX for writers, LOCK_SH for readers."""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.cache_dir / "lock", "a") as lock_file:
+            fcntl.flock(lock_file.fileno(), mode)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def _refresh(self) -> None:
+        """Replay journal lines appended (by any process) since the last refresh."""
+        try:
+            with open(self.journal_file, "rb") as f:
+                st = os.fstat(f.fileno())
+                journal_id = (st.st_dev, st.st_ino)
+                if journal_id != self._journal_id or st.st_size < self._journal_offset:
+                    self._reset_state()  # Compacted (replaced) since we last read
+                    self._journal_id = journal_id
+                if st.st_size == self._journal_offset:
+                    return
+                f.seek(self._journal_offset)
+                data = f.read()
+        except FileNotFoundError:
+            return
+
+        complete = data.rfind(b"\n") + 1  # A line is only replayed once fully written
+        for line in data[:complete].decode("utf-8").splitlines():
+            self._replay(line)
+        self._journal_offset += complete
+
+    def _replay(self, line: str) -> None:
+        head, _, tail = line.partition(" ")
+        self._journal_lines += 1
+        if head == "=":
+            capacity, dimension = (int(v) for v in tail.split())
+            self.dimension = dimension
+            if capacity > self.capacity:
+                self._resize(capacity)
+        elif head == "-":
+            self._release(int(tail))
+        elif head and tail:
+            self._assign(head, int(tail))
+
+    def _reset_state(self) -> None:
+        self.dimension = None
+        self.capacity = 0
+        self._rows = {}
+        self._row_keys = {}
+        self._free = set()
+        self._journal_offset = 0
+        self._journal_lines = 0
+
+    def _resize(self, capacity: int) -> None:
+        """Map the vector and tick files, extending them to `capacity` rows."""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        for name, row_bytes in (("vectors.f32", self.dimension * 4), ("ticks.i64", 8)):
+            path = self.cache_dir / name
+            with open(path, "ab") as f:
+                if f.tell() < capacity * row_bytes:
+                    f.truncate(capacity * row_bytes)
+        self._vectors = np.memmap(self.cache_dir / "vectors.f32", dtype=np.float32,
+                                  mode="r+", shape=(capacity, self.dimension))
+        self._ticks = np.memmap(self.cache_dir / "ticks.i64", dtype=np.int64,
+                                mode="r+", shape=(capacity,))
+        self._free.update(range(self.capacity, capacity))
+        self.capacity = capacity
+
+    def _append_journal(self, lines: list[str]) -> None:
+        """Append lines (caller holds the exclusive lock); compact when mostly stale."""
+        if self._journal_lines + len(lines) > max(self.COMPACT_MIN_LINES,
+                                                  self.COMPACT_FACTOR * len(self._rows)):
+            self._compact()
+            return
+        if self._journal_id is None:
+            (self.cache_dir / "index.json").unlink(missing_ok=True)  # Pre-journal row map
+        with open(self.journal_file, "ab") as f:
+            f.write("".join(lines).encode("utf-8"))
+            st = os.fstat(f.fileno())
+        self._journal_id = (st.st_dev, st.st_ino)
+        self._journal_offset = st.st_size
+        self._journal_lines += len(lines)
+
+    def _compact(self) -> None:
+        """Atomically replace the journal with one line per live row."""
+        lines = [f"= {self.capacity} {self.dimension}\n"]
+        lines.extend(f"{key} {row}\n" for key, row in self._rows.items())
+        tmp = self.journal_file.with_suffix(".tmp")
+        with open(tmp, "wb") as f:
+            f.write("".join(lines).encode("utf-8"))
+        os.replace(tmp, self.journal_file)
+        st = self.journal_file.stat()
+        self._journal_id = (st.st_dev, st.st_ino)
+        self._journal_offset = st.st_size
+        self._journal_lines = len(lines)
+
+
+class CachedEmbeddingProvider(EmbeddingProvider):
+    """
+    Embedding provider wrapper that only forwards cache misses.
+
+    Exposes the wrapped provider's name and dimension so index paths and
+    FAISS dimensions are unchanged.
+    """
+
+    def __init__(self, provider: EmbeddingProvider, cache: EmbeddingCache):
+        self.provider = provider
+        self.cache = cache
+        self.name = provider.name
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def dimension(self) -> int:
+        return self.provider.dimension
+
+    @property
+    def model_id(self) -> str:
+        return self.provider.model_id
+
+    @property
+    def requires_api_key(self) -> bool:
+        return self.provider.requires_api_key
+
+    @property
+    def install_instructions(self) -> str:
+        return self.provider.install_instructions
+
+    def is_available(self) -> bool:
+        return self.provider.is_available()
+
+    def embed(self, texts: list[str]) -> np.ndarray:
+        keys = [EmbeddingCache.content_key(t) for t in texts]
+        cached = self.cache.get_many(keys)
+
+        miss_index: dict[str, int] = {}
+        for i, key in enumerate(keys):
+            if key not in cached and key not in miss_index:
+                miss_index[key] = i
+        self.hits += len(texts) - len(miss_index)
+        self.misses += len(miss_index)
+
+        if miss_index:
+            fresh = np.asarray(
+                self.provider.embed([texts[i] for i in miss_index.values()]), dtype=np.float32
+            )
+            self.cache.put_many(list(miss_index), fresh)
+            cached.update(zip(miss_index, fresh, strict=True))
+
+        if not texts:
+            return np.zeros((0, self.dimension), dtype=np.float32)
+        return np.stack([cached[k] for k in keys])
@@ -19,9 +19,12 @@ Providers:
        - Code stays on machine
        - Works offline
        - Good quality (~80MB model download on first use)
+       - Uses a running embedding server (embedding_server.py) instead of
+         loading the model in-process, when one is listening
 
     2. OPENAI (optional) - text-embedding-3-small
        - Requires OPENAI_API_KEY
+       - Concurrent batched requests with backoff (remote_embedding.py)
        - Excellent quality
        - ~$0.02/1M tokens
 
@@ -73,6 +76,11 @@ class EmbeddingProvider(ABC):
         """Instructions for installing this provider."""
         return ""
 
+    @property
+    def model_id(self) -> str:
+        """Model identifier (part of the embedding cache key)."""
+        return self.name
+
 
 class LocalEmbeddingProvider(EmbeddingProvider):
     """
@@ -84,6 +92,10 @@ class LocalEmbeddingProvider(EmbeddingProvider):
     - all-MiniLM-L6-v2: 80MB, fast, good quality (default)
     - all-mpnet-base-v2: 420MB, slower, better quality
     - codeparrot/codebert-base: 420MB, optimized for code
+
+    If an embedding server for the model is running, embed() is served by it
+    and the model is never loaded in this process. The server is used only if
+    its ping reports the same model (and, for the default model, dimension).
     """
 
     name = "local"
@@ -93,9 +105,42 @@ class LocalEmbeddingProvider(EmbeddingProvider):
 
     DEFAULT_MODEL = "all-MiniLM-L6-v2"
 
-    def __init__(self, model_name: str = None):
+    def __init__(self, model_name: str = None, socket_path: str = None, use_server: bool = True):
         self.model_name = model_name or self.DEFAULT_MODEL
+        self.socket_path = socket_path
+        self.use_server = use_server
         self._model = None
+        self._client = None
+
+    def _server_client(self):
+        """
+        Client for a server running this model, or None.
+
+        The server is pinged once; if none answers or it serves another
+        model, the server is disabled and the model is loaded in-process.
+        """
+        if not self.use_server:
+            return None
+        if self._client is None:
+            from agentforge.core.embedding_server import EmbeddingClient, default_socket_path
+            client = EmbeddingClient(self.socket_path or default_socket_path(self.model_name))
+            info = client.ping()
+            if info is None or not self._server_matches(info):
+                self.use_server = False
+                return None
+            self.dimension = info["dimension"]
+            self._client = client
+        return self._client
+
+    def _server_matches(self, info: dict) -> bool:
+        if info.get("model") != self.model_name or not isinstance(info.get("dimension"), int):
+            return False
+        # The class dimension is only known to be right for the default model
+        return self.model_name != self.DEFAULT_MODEL or info["dimension"] == type(self).dimension
+
+    @property
+    def model_id(self) -> str:
+        return self.model_name
 
     def _load_model(self):
         """Lazy load model on first use."""
@@ -115,6 +160,15 @@ class LocalEmbeddingProvider(EmbeddingProvider):
         return self._model
 
     def embed(self, texts: list[str]) -> np.ndarray:
+        client = self._server_client() if self._model is None else None
+        if client is not None:
+            from agentforge.core.embedding_server import ServerUnavailable
+            try:
+                return client.embed(texts)
+            except ServerUnavailable:
+                self.use_server = False  # Went away; load in-process from now on
+                self._client = None
+
         model = self._load_model()
         # show_progress_bar for large batches
         embeddings = model.encode(
@@ -125,6 +179,8 @@ class LocalEmbeddingProvider(EmbeddingProvider):
         return embeddings
 
     def is_available(self) -> bool:
+        if self._server_client() is not None:
+            return True
         try:
             import sentence_transformers  # noqa: F401
             return True
@@ -132,65 +188,95 @@ class LocalEmbeddingProvider(EmbeddingProvider):
             return False
 
 
-class OpenAIEmbeddingProvider(EmbeddingProvider):
+class RemoteEmbeddingProvider(EmbeddingProvider):
     """
-    OpenAI embeddings using text-embedding-3-small.
+    Base for HTTP embedding APIs.
 
-    Requires OPENAI_API_KEY environment variable.
-    Excellent quality, ~$0.02 per 1M tokens.
+    Batches are sized by text count and estimated tokens and sent
+    concurrently, with backoff on rate limits and server errors
+    (see remote_embedding.ConcurrentEmbedder).
     """
 
-    name = "openai"
-    dimension = 1536
     requires_api_key = True
-    install_instructions = "pip install openai && export OPENAI_API_KEY=your-key"
-
-    MODEL = "text-embedding-3-small"
 
-    def __init__(self):
+    MODEL: str
+    API_KEY_ENV: str
+    BASE_URL_ENV: str
+    DEFAULT_BASE_URL: str
+    MAX_BATCH_TEXTS = 100
+    MAX_BATCH_TOKENS = 100_000
+    DEFAULT_CONCURRENCY = 4
+    TIMEOUT_SECONDS = 60.0
+
+    def __init__(self, model: str = None, concurrency: int = None, base_url: str = None):
+        self.model = model or self.MODEL
+        self.concurrency = concurrency or self.DEFAULT_CONCURRENCY
+        self.base_url = (base_url or os.environ.get(self.BASE_URL_ENV) or self.DEFAULT_BASE_URL).rstrip("/")
         self._client = None
+        self._embedder = None
+
+    @property
+    def model_id(self) -> str:
+        return self.model
 
     def _get_client(self):
         if self._client is None:
-            try:
-                from openai import OpenAI
-                self._client = OpenAI()  # Uses OPENAI_API_KEY env var
-            except ImportError as e:
-                raise ImportError(
-                    "openai package not installed. "
-                    "Install with: pip install openai"
-                ) from e
+            import httpx
+            api_key = os.environ.get(self.API_KEY_ENV)
+            self._client = httpx.Client(
+                base_url=self.base_url,
+                headers={"Authorization": f"Bearer {api_key}"} if api_key else {},
+                timeout=self.TIMEOUT_SECONDS,
+            )
         return self._client
 
-    def embed(self, texts: list[str]) -> np.ndarray:
-        client = self._get_client()
+    def _payload(self, batch: list[str]) -> dict:
+        return {"model": self.model, "input": batch}
 
-        # OpenAI has a limit of 8191 tokens per request, batch if needed
-        batch_size = 100
-        all_embeddings = []
+    def _post_batch(self, batch: list[str]) -> list[list[float]]:
+        """Send one batch; returns vectors in batch order."""
+        response = self._get_client().post("/embeddings", json=self._payload(batch))
+        response.raise_for_status()
+        data = sorted(response.json()["data"], key=lambda item: item["index"])
+        return [item["embedding"] for item in data]
 
-        for i in range(0, len(texts), batch_size):
-            batch = texts[i:i + batch_size]
-            response = client.embeddings.create(
-                model=self.MODEL,
-                input=batch
+    def embed(self, texts: list[str]) -> np.ndarray:
+        if self._embedder is None:
+            from agentforge.core.remote_embedding import ConcurrentEmbedder
+            self._embedder = ConcurrentEmbedder(
+                self._post_batch,
+                concurrency=self.concurrency,
+                max_batch_texts=self.MAX_BATCH_TEXTS,
+                max_batch_tokens=self.MAX_BATCH_TOKENS,
             )
-            batch_embeddings = [item.embedding for item in response.data]
-            all_embeddings.extend(batch_embeddings)
-
-        return np.array(all_embeddings)
+        return self._embedder.embed(texts)
 
     def is_available(self) -> bool:
-        if not os.environ.get("OPENAI_API_KEY"):
-            return False
-        try:
-            import openai  # noqa: F401
-            return True
-        except ImportError:
-            return False
+        return bool(os.environ.get(self.API_KEY_ENV))
 
 
-class VoyageEmbeddingProvider(EmbeddingProvider):
+class OpenAIEmbeddingProvider(RemoteEmbeddingProvider):
+    """
+    OpenAI embeddings using text-embedding-3-small.
+
+    Requires OPENAI_API_KEY environment variable.
+    Excellent quality, ~$0.02 per 1M tokens.
+    """
+
+    name = "openai"
+    dimension = 1536
+    install_instructions = "export OPENAI_API_KEY=your-key"
+
+    MODEL = "text-embedding-3-small"
+    API_KEY_ENV = "OPENAI_API_KEY"
+    BASE_URL_ENV = "OPENAI_BASE_URL"
+    DEFAULT_BASE_URL = "https://api.openai.com/v1"
+    MAX_BATCH_TEXTS = 512      # API allows 2048 inputs per request
+    MAX_BATCH_TOKENS = 100_000  # API allows 300k; estimates are rough
+    DEFAULT_CONCURRENCY = 8
+
+
+class VoyageEmbeddingProvider(RemoteEmbeddingProvider):
     """
     Voyage AI embeddings using voyage-code-2.
 
@@ -200,48 +286,15 @@ class VoyageEmbeddingProvider(EmbeddingProvider):
 
     name = "voyage"
     dimension = 1024
-    requires_api_key = True
-    install_instructions = "pip install voyageai && export VOYAGE_API_KEY=your-key"
+    install_instructions = "export VOYAGE_API_KEY=your-key"
 
     MODEL = "voyage-code-2"
-
-    def __init__(self):
-        self._client = None
-
-    def _get_client(self):
-        if self._client is None:
-            try:
-                import voyageai
-                self._client = voyageai.Client()  # Uses VOYAGE_API_KEY env var
-            except ImportError as e:
-                raise ImportError(
-                    "voyageai package not installed. "
-                    "Install with: pip install voyageai"
-                ) from e
-        return self._client
-
-    def embed(self, texts: list[str]) -> np.ndarray:
-        client = self._get_client()
-
-        # Voyage has batch limits too
-        batch_size = 100
-        all_embeddings = []
-
-        for i in range(0, len(texts), batch_size):
-            batch = texts[i:i + batch_size]
-            result = client.embed(batch, model=self.MODEL)
-            all_embeddings.extend(result.embeddings)
-
-        return np.array(all_embeddings)
-
-    def is_available(self) -> bool:
-        if not os.environ.get("VOYAGE_API_KEY"):
-            return False
-        try:
-            import voyageai  # noqa: F401
-            return True
-        except ImportError:
-            return False
+    API_KEY_ENV = "VOYAGE_API_KEY"
+    BASE_URL_ENV = "VOYAGE_BASE_URL"
+    DEFAULT_BASE_URL = "https://api.voyageai.com/v1"
+    MAX_BATCH_TEXTS = 128
+    MAX_BATCH_TOKENS = 60_000  # voyage-code-2 allows 120k per request
+    DEFAULT_CONCURRENCY = 4
 
 
 # Provider registry
@@ -252,6 +305,29 @@ PROVIDERS = {
 }
 
 
+def _local_provider(config: dict) -> LocalEmbeddingProvider:
+    """Create the local provider from the semantic.local config section."""
+    local = config.get("local", {})
+    server = local.get("server", {})
+    return LocalEmbeddingProvider(
+        local.get("model"),
+        socket_path=server.get("socket"),
+        use_server=server.get("enabled", True),
+    )
+
+
+def _create_provider(name: str, config: dict) -> EmbeddingProvider:
+    """Create a provider from its section of the semantic config."""
+    if name == "local":
+        return _local_provider(config)
+    settings = config.get(name, {})
+    return PROVIDERS[name](
+        model=settings.get("model"),
+        concurrency=settings.get("concurrency"),
+        base_url=settings.get("base_url"),
+    )
+
+
 def get_embedding_provider(provider_name: str = None, config: dict = None) -> EmbeddingProvider:
     """
     Get an embedding provider.
@@ -276,11 +352,7 @@ def get_embedding_provider(provider_name: str = None, config: dict = None) -> Em
             raise ValueError(f"Unknown provider: {provider_name}. Available: {list(PROVIDERS.keys())}")
 
         # Create provider with config
-        if provider_name == "local":
-            model_name = config.get("local", {}).get("model")
-            provider = LocalEmbeddingProvider(model_name)
-        else:
-            provider = PROVIDERS[provider_name]()
+        provider = _create_provider(provider_name, config)
 
         if not provider.is_available():
             raise RuntimeError(
@@ -293,11 +365,7 @@ def get_embedding_provider(provider_name: str = None, config: dict = None) -> Em
     # Prefer cloud providers if API key is set (better quality for code)
     import sys
     for name in ["voyage", "openai", "local"]:
-        if name == "local":
-            model_name = config.get("local", {}).get("model")
-            provider = LocalEmbeddingProvider(model_name)
-        else:
-            provider = PROVIDERS[name]()
+        provider = _create_provider(name, config)
 
         if provider.is_available():
             print(f"Using embedding provider: {name}", file=sys.stderr)
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Embedding Server
+================
+
+Resident embedding daemon for the local (sentence-transformers) provider.
+
+Loading a model costs seconds and hundreds of MB per process. The server
+loads it once and serves embed() over a Unix domain socket, so every CLI
+call, tool handler and concurrent agent on the machine shares one copy.
+Requests arriving within a short window are embedded as one batch.
+
+LocalEmbeddingProvider connects to the server transparently when its
+socket is live and loads the model in-process otherwise.
+
+Wire format (both directions, see unix_socket): 4-byte big-endian length + payload.
+    request:  {"texts": [...]} or {"op": "ping"}              (JSON)
+    response: {"shape": [n, d]} then the float32 matrix bytes, or
+              {"error": "..."}                                 (JSON)
+
+Usage:
+    python -m agentforge.core.embedding_server                # default model
+    python -m agentforge.core.embedding_server --model all-mpnet-base-v2
+
+    client = EmbeddingClient(default_socket_path("all-MiniLM-L6-v2"))
+    vectors = client.embed(["def apply_discount(order): ..."])
+"""
+
+import argparse
+import contextlib
+import os
+import queue
+import re
+import signal
+import socket
+import socketserver
+import sys
+import threading
+import time
+from concurrent.futures import Future
+from pathlib import Path
+
+import numpy as np
+
+try:
+    from .unix_socket import UnixSocketServer, recv_frame, recv_json, send_frame, send_json
+except ImportError:
+    from unix_socket import UnixSocketServer, recv_frame, recv_json, send_frame, send_json
+
+DEFAULT_SOCKET_DIR = Path.home() / ".agentforge" / "run"
+SOCKET_ENV_VAR = "AGENTFORGE_EMBEDDING_SOCKET"
+
+DEFAULT_MAX_BATCH = 256
+DEFAULT_BATCH_WINDOW_MS = 5
+
+
+class ServerUnavailable(ConnectionError):
+    """No embedding server is listening on the socket."""
+
+
+def default_socket_path(model_name: str) -> Path:
+    """Socket for a model ($AGENTFORGE_EMBEDDING_SOCKET overrides)."""
+    if os.environ.get(SOCKET_ENV_VAR):
+        return Path(os.environ[SOCKET_ENV_VAR]).expanduser()
+    slug = re.sub(r"[^A-Za-z0-9_.-]+", "_", model_name)
+    return DEFAULT_SOCKET_DIR / f"embed-{slug}.sock"
+
+
+# =============================================================================
+# Server
+# =============================================================================
+
+class _Batcher(threading.Thread):
+    """Coalesces concurrent embed requests into one provider call."""
+
+    def __init__(self, provider, max_batch: int, window_s: float):
+        super().__init__(daemon=True, name="embedding-batcher")
+        self.provider = provider
+        self.max_batch = max_batch
+        self.window_s = window_s
+        self.requests: queue.Queue = queue.Queue()
+        self.batches = 0
+
+    def submit(self, texts: list[str]) -> Future:
+        future: Future = Future()
+        self.requests.put((texts, future))
+        return future
+
+    def run(self) -> None:
+        while True:
+            first = self.requests.get()
+            if first is None:
+                return
+            pending = [first]
+            count = len(first[0])
+            deadline = time.monotonic() + self.window_s
+            while count < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self.requests.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    self.requests.put(None)  # Finish this batch, then stop
+                    break
+                pending.append(item)
+                count += len(item[0])
+            self._embed(pending)
+
+    def _embed(self, pending: list) -> None:
+        texts = [text for request_texts, _ in pending for text in request_texts]
+        try:
+            vectors = np.asarray(self.provider.embed(texts), dtype=np.float32)
+        except Exception as e:
+            for _, future in pending:
+                future.set_exception(e)
+            return
+        self.batches += 1
+        start = 0
+        for request_texts, future in pending:
+            future.set_result(vectors[start:start + len(request_texts)])
+            start += len(request_texts)
+
+    def stop(self) -> None:
+        self.requests.put(None)
+
+
+class _RequestHandler(socketserver.BaseRequestHandler):
+    """Serves framed requests on one client connection until it closes."""
+
+    def handle(self) -> None:
+        server: EmbeddingServer = self.server.owner
+        while True:
+            try:
+                request = recv_json(self.request)
+            except (ConnectionError, OSError):
+                return
+            except ValueError as e:
+                send_json(self.request, {"error": f"Bad request: {e}"})
+                return
+
+            if request.get("op") == "ping":
+                send_json(self.request, server.info())
+                continue
+            try:
+                vectors = server.batcher.submit(list(request["texts"])).result()
+            except Exception as e:
+                send_json(self.request, {"error": str(e)})
+                continue
+            send_json(self.request, {"shape": list(vectors.shape)})
+            send_frame(self.request, np.ascontiguousarray(vectors).tobytes())
+
+
+class EmbeddingServer(UnixSocketServer):
+    """
+    Holds one embedding provider and serves it over a Unix socket.
+
+    Example:
+        server = EmbeddingServer(LocalEmbeddingProvider(use_server=False), path)
+        server.serve_forever()
+    """
+
+    handler_class = _RequestHandler
+    label = "Embedding server"
+
+    def __init__(self, provider, socket_path: Path, max_batch: int = DEFAULT_MAX_BATCH,
+                 batch_window_ms: float = DEFAULT_BATCH_WINDOW_MS):
+        super().__init__(socket_path)
+        self.provider = provider
+        self.batcher = _Batcher(provider, max_batch, batch_window_ms / 1000)
+
+    def info(self) -> dict:
+        return {
+            "provider": self.provider.name,
+            "model": self.provider.model_id,
+            "dimension": self.provider.dimension,
+            "pid": os.getpid(),
+            "batches": self.batcher.batches,
+        }
+
+    def is_live(self) -> bool:
+        return EmbeddingClient(self.socket_path).ping() is not None
+
+    def _bind(self) -> None:
+        super()._bind()
+        self.batcher.start()
+
+    def _close(self) -> None:
+        self.batcher.stop()
+        super()._close()
+
+
+# =============================================================================
+# Client
+# =============================================================================
+
+class EmbeddingClient:
+    """Client for a running EmbeddingServer (one connection per call)."""
+
+    def __init__(self, socket_path: Path, timeout: float = 300.0):
+        self.socket_path = Path(socket_path)
+        self.timeout = timeout
+
+    def _connect(self) -> socket.socket:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(str(self.socket_path))
+        except OSError as e:
+            sock.close()
+            raise ServerUnavailable(f"No embedding server at {self.socket_path}: {e}") from e
+        return sock
+
+    def ping(self) -> dict | None:
+        """Server info, or None if no server is listening."""
+        if not self.socket_path.exists():
+            return None
+        try:
+            with self._connect() as sock:
+                send_json(sock, {"op": "ping"})
+                return recv_json(sock)
+        except (ConnectionError, OSError, ValueError):
+            return None
+
+    def embed(self, texts: list[str]) -> np.ndarray:
+        """
+        Embed texts on the server.
+
+        Raises:
+            ServerUnavailable: No server is listening
+            RuntimeError: The server failed to embed
+        """
+        with self._connect() as sock:
+            send_json(sock, {"texts": list(texts)})
+            header = recv_json(sock)
+            if "error" in header:
+                raise RuntimeError(f"Embedding server error: {header['error']}")
+            data = recv_frame(sock)
+        return np.frombuffer(data, dtype=np.float32).reshape(header["shape"])
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+def main():
+    """Run the embedding server in the foreground."""
+    try:
+        from .embedding_providers import LocalEmbeddingProvider
+    except ImportError:
+        from embedding_providers import LocalEmbeddingProvider
+
+    parser = argparse.ArgumentParser(description="Resident local embedding server")
+    parser.add_argument("--model", default=LocalEmbeddingProvider.DEFAULT_MODEL,
+                        help="sentence-transformers model name")
+    parser.add_argument("--socket", help="Socket path (default: per-model under ~/.agentforge/run)")
+    parser.add_argument("--max-batch", type=int, default=DEFAULT_MAX_BATCH,
+                        help="Maximum texts per model call")
+    parser.add_argument("--batch-window-ms", type=float, default=DEFAULT_BATCH_WINDOW_MS,
+                        help="How long to wait for more requests to join a batch")
+    args = parser.parse_args()
+
+    provider = LocalEmbeddingProvider(args.model, use_server=False)
+    provider.embed(["warm up"])  # Load the model before accepting clients
+    socket_path = Path(args.socket) if args.socket else default_socket_path(args.model)
+    server = EmbeddingServer(provider, socket_path, args.max_batch, args.batch_window_ms)
+    print(f"Serving {args.model} on {socket_path}", file=sys.stderr)
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))  # Still unlinks the socket
+    with contextlib.suppress(KeyboardInterrupt):
+        server.serve_forever()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -17,6 +17,7 @@ from typing import Any
 import yaml
 
 from agentforge.core.generate.domain import GenerationContext, GenerationMode, GenerationPhase
+from agentforge.core.token_counter import count_tokens
 
 
 class PromptBuilder:
@@ -329,9 +330,9 @@ Important:
         """
         Estimate token count for prompt.
 
-        Uses ~4 chars per token approximation.
+        Uses the shared token counter.
         """
-        return len(prompt) // 4
+        return count_tokens(prompt)
 
 
 class PromptTemplates:
@@ -11,11 +11,13 @@ Abstract base class and implementations for LLM providers.
 """
 
 import asyncio
+import math
 import os
 from abc import ABC, abstractmethod
 from pathlib import Path
 
 from agentforge.core.generate.domain import APIError, TokenUsage
+from agentforge.core.token_counter import count_tokens
 
 
 class LLMProvider(ABC):
@@ -93,6 +95,11 @@ class ClaudeProvider(LLMProvider):
     BACKOFF_MULTIPLIER = 2.0
     MAX_DELAY = 30.0
 
+    # The shared counter uses an OpenAI BPE (or an estimate shaped like one),
+    # not Claude's tokenizer, which can produce more tokens for the same text. Budgets are
+    # padded by this factor so a counted prompt does not overrun the window.
+    TOKEN_SAFETY_MARGIN = 1.15
+
     def __init__(
         self,
         api_key: str | None = None,
@@ -201,14 +208,13 @@ class ClaudeProvider(LLMProvider):
 
     def count_tokens(self, text: str) -> int:
         """
-        Estimate token count for text.
+        Estimate Claude tokens for text.
 
-        Uses a simple approximation (4 chars per token for English).
-        For precise counting, use the tokenizer directly.
+        An approximation: the shared token counter is padded by
+        TOKEN_SAFETY_MARGIN to cover the difference to Claude's tokenizer.
+        Prefer the usage reported by the API where one is available.
         """
-        # Rough approximation: ~4 characters per token for English
-        # This is sufficient for budget estimation
-        return len(text) // 4
+        return math.ceil(count_tokens(text) * self.TOKEN_SAFETY_MARGIN)
 
 
 class ManualProvider(LLMProvider):
@@ -302,8 +308,8 @@ class ManualProvider(LLMProvider):
         return response, usage
 
     def count_tokens(self, text: str) -> int:
-        """Estimate token count (~4 chars per token)."""
-        return len(text) // 4
+        """Count tokens with the shared token counter."""
+        return count_tokens(text)
 
 
 def _load_dotenv_if_needed() -> None:
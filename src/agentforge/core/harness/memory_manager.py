@@ -15,6 +15,7 @@ from typing import Any
 
 from agentforge.core.harness.memory_domain import MemoryEntry, MemoryTier
 from agentforge.core.harness.memory_store import MemoryStore
+from agentforge.core.token_counter import count_tokens
 
 
 class MemoryManager:
@@ -173,21 +174,20 @@ class MemoryManager:
         # Sort by timestamp (most recent first)
         all_entries.sort(key=lambda x: x["entry"].timestamp, reverse=True)
 
-        # Build context within token limit
+        # Build context within token limit (parts are joined by newlines)
         context_parts = []
-        current_length = 0
-
-        # Rough token-to-character conversion (1 token ≈ 4 characters)
-        max_chars = max_tokens * 4
+        current_tokens = 0
+        newline_tokens = count_tokens("\n")
 
         for item in all_entries:
             entry_text = f"{item['key']}: {item['entry'].value}"
+            entry_tokens = count_tokens(entry_text) + (newline_tokens if context_parts else 0)
 
-            if current_length + len(entry_text) > max_chars:
+            if current_tokens + entry_tokens > max_tokens:
                 break
 
             context_parts.append(entry_text)
-            current_length += len(entry_text)
+            current_tokens += entry_tokens
 
         return "\n".join(context_parts)
 
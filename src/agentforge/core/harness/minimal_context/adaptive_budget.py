@@ -78,6 +78,7 @@ class AdaptiveBudget:
         ) if use_enhanced_loop_detection else None
 
         self._last_loop_detection: LoopDetection | None = None
+        self._last_observed_step: int | None = None
 
     def check_continue(
         self,
@@ -137,31 +138,54 @@ class AdaptiveBudget:
         recent_actions: list[dict[str, Any]],
         facts: list[Any] | None = None,
     ) -> LoopDetection | None:
-        """Use enhanced LoopDetector for semantic loop detection."""
+        """
+        Use enhanced LoopDetector for semantic loop detection.
+
+        Actions carrying step numbers are streamed into the detector, only
+        those newer than the last one seen, so each check costs the same
+        however long the run gets. Without step numbers the recent actions
+        are checked as a batch.
+        """
         if not self.loop_detector or not recent_actions:
             return None
 
-        action_records = []
-        for i, action_dict in enumerate(recent_actions):
-            result_str = action_dict.get("result", "success")
-            result_enum = {
-                "success": ActionResult.SUCCESS,
-                "failure": ActionResult.FAILURE,
-                "partial": ActionResult.PARTIAL,
-            }.get(result_str, ActionResult.SUCCESS)
-
-            record = ActionRecord(
-                step=action_dict.get("step", i + 1),
-                action=action_dict.get("action", "unknown"),
-                target=action_dict.get("target"),
-                parameters=action_dict.get("parameters", {}),
-                result=result_enum,
-                summary=action_dict.get("summary", ""),
-                error=action_dict.get("error"),
-            )
-            action_records.append(record)
+        action_records = [self._to_action_record(a, i + 1) for i, a in enumerate(recent_actions)]
+        if not all(isinstance(a.get("step"), int) for a in recent_actions):
+            return self.loop_detector.check(action_records, facts)
 
-        return self.loop_detector.check(action_records, facts)
+        if self._last_observed_step is not None and action_records[-1].step < self._last_observed_step:
+            self.loop_detector.reset()  # Step numbers restarted: a new run
+            self._last_observed_step = None
+        new_records = [
+            r for r in action_records
+            if self._last_observed_step is None or r.step > self._last_observed_step
+        ]
+        if not new_records:
+            return self.loop_detector.last_detection
+
+        for record in new_records[:-1]:
+            self.loop_detector.observe(record)
+        self._last_observed_step = new_records[-1].step
+        return self.loop_detector.observe(new_records[-1], facts)
+
+    @staticmethod
+    def _to_action_record(action_dict: dict[str, Any], fallback_step: int) -> ActionRecord:
+        result_str = action_dict.get("result", "success")
+        result_enum = {
+            "success": ActionResult.SUCCESS,
+            "failure": ActionResult.FAILURE,
+            "partial": ActionResult.PARTIAL,
+        }.get(result_str, ActionResult.SUCCESS)
+
+        return ActionRecord(
+            step=action_dict.get("step", fallback_step),
+            action=action_dict.get("action", "unknown"),
+            target=action_dict.get("target"),
+            parameters=action_dict.get("parameters", {}),
+            result=result_enum,
+            summary=action_dict.get("summary", ""),
+            error=action_dict.get("error"),
+        )
 
     def _detect_runaway_legacy(self, recent_actions: list[dict[str, Any]]) -> bool:
         """Legacy runaway detection: repeated identical failures."""
@@ -285,6 +309,7 @@ class AdaptiveBudget:
         self._no_progress_streak = 0
         self._last_violation_count = None
         self._last_loop_detection = None
+        self._last_observed_step = None
         if self.loop_detector:
             self.loop_detector = LoopDetector(
                 identical_threshold=self.runaway_threshold,
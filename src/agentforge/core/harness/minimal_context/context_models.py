@@ -23,6 +23,8 @@ from typing import Any
 import yaml
 from pydantic import BaseModel, ConfigDict, Field, field_validator
 
+from ...token_counter import count_tokens
+
 
 def _utc_now() -> datetime:
     """Get current UTC time (Python 3.12+ compatible)."""
@@ -315,21 +317,22 @@ class AgentContext(BaseModel):
     # Precomputed analysis (AST-derived, not LLM-derived)
     precomputed: dict[str, Any] = Field(default_factory=dict)
 
-    def estimate_tokens(self, chars_per_token: int = 4) -> int:
+    def estimate_tokens(self, chars_per_token: int | None = None) -> int:
         """
         Estimate token count for this context.
 
-        Uses a conservative chars_per_token estimate. For accurate counts,
-        use the provider's tokenizer.
+        Uses the shared token counter (tiktoken's BPE when installed).
 
         Args:
-            chars_per_token: Characters per token (default 4, conservative)
+            chars_per_token: Use a flat characters-per-token ratio instead
 
         Returns:
             Estimated token count
         """
         yaml_output = self.to_yaml()
-        return len(yaml_output) // chars_per_token
+        if chars_per_token:
+            return len(yaml_output) // chars_per_token
+        return count_tokens(yaml_output)
 
     def to_yaml(self) -> str:
         """Serialize to compact YAML for LLM context."""
@@ -214,6 +214,12 @@ class MinimalContextExecutor(
 
     def execute_step(self, task_id: str) -> StepOutcome:
         """Execute one agent step. Stateless - all context loaded from disk."""
+        # State and working memory are loaded once and written once for the whole step
+        memory = WorkingMemoryManager(self.state_store._task_dir(task_id))
+        with self.state_store.session(task_id), memory.batch():
+            return self._execute_step(task_id)
+
+    def _execute_step(self, task_id: str) -> StepOutcome:
         start_time = time.time()
         tokens_used = 0
 
@@ -10,6 +10,7 @@ from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
 from ....context import ContextAuditLogger
+from ....token_counter import count_tokens
 from ..adaptive_budget import AdaptiveBudget
 from ..context_models import ActionResult
 from ..state_store import Phase
@@ -71,8 +72,8 @@ class RunMixin:
         }
 
         token_breakdown = {
-            "action": len(str(outcome.action_params)) // 4,
-            "result": len(outcome.summary) // 4,
+            "action": count_tokens(str(outcome.action_params)),
+            "result": count_tokens(outcome.summary),
         }
 
         self.current_audit_logger.log_step(
@@ -205,17 +206,19 @@ class RunMixin:
         budget = adaptive_budget or AdaptiveBudget(base_budget=15, max_budget=max_iterations)
 
         for i in range(max_iterations):
-            outcome = self.execute_step(task_id)
-            outcomes.append(outcome)
-            self._log_step(outcome, task_id)
+            # Step bookkeeping shares one state load/save with the step itself
+            with self.state_store.session(task_id):
+                outcome = self.execute_step(task_id)
+                outcomes.append(outcome)
+                self._log_step(outcome, task_id)
 
-            if on_step:
-                on_step(outcome)
+                if on_step:
+                    on_step(outcome)
 
-            if not outcome.should_continue:
-                break
+                if not outcome.should_continue:
+                    break
 
-            should_continue, reason = self._check_loop_continuation(task_id, outcome, i + 1, budget)
+                should_continue, reason = self._check_loop_continuation(task_id, outcome, i + 1, budget)
             if not should_continue:
                 print(f"  {reason}")
                 break
@@ -15,9 +15,17 @@ Types of loops detected:
 3. ERROR_CYCLE: A fails -> B fails -> A again
 4. NO_PROGRESS: Actions succeed but nothing changes
 5. OSCILLATION: Flip-flopping between states
+
+check() analyzes a list of recent actions from scratch. observe() is the
+streaming mode: it takes one action per step and updates run-length
+counters (identical failures, agreeing error categories, non-mutating
+actions), a rolling A->B->A count over recent failures, and per-period
+match runs of action signatures, so each step costs the same however long
+the task runs. The period runs also catch longer cycles (A->B->C->A...)
+anywhere in the history, which a short window of recent actions misses.
 """
 
-from collections import defaultdict
+from collections import defaultdict, deque
 from dataclasses import dataclass, field
 from enum import Enum
 from typing import Any
@@ -108,10 +116,8 @@ class LoopDetector:
         self.cycle_threshold = cycle_threshold
         self.no_progress_threshold = no_progress_threshold
 
-        # State tracking
-        self._action_history: list[ActionSignature] = []
-        self._outcome_history: list[str] = []  # Normalized outcomes
-        self._progress_markers: set[str] = set()  # Things that indicate progress
+        # Streaming state (observe)
+        self._reset_stream()
 
     def check(
         self,
@@ -417,6 +423,203 @@ class LoopDetector:
 
         return LoopDetection(detected=False)
 
+    # ═══════════════════════════════════════════════════════════════════════════
+    # Streaming Mode
+    # ═══════════════════════════════════════════════════════════════════════════
+
+    MAX_CYCLE_PERIOD = 8  # Longest repeating cycle looked for
+    CYCLE_REPEATS = 3  # Times a cycle must occur back to back
+    CYCLE_WINDOW = 6  # Recent failures over which A->B->A patterns are counted
+    CYCLE_SPAN = 5  # Recent actions a counted pattern must lie within (the window check() is given)
+
+    def _reset_stream(self) -> None:
+        window = max(2, self.identical_threshold, self.semantic_threshold, self.no_progress_threshold)
+        self.steps_observed = 0
+        self._recent: deque[ActionRecord] = deque(maxlen=window)
+        self._recent_signatures: deque[ActionSignature] = deque(maxlen=window)
+        self._recent_keys: deque[tuple] = deque(maxlen=self.MAX_CYCLE_PERIOD)
+        self._period_runs = [0] * (self.MAX_CYCLE_PERIOD + 1)  # Trailing matches at lag p
+        self._identical_anchor: ActionRecord | None = None
+        self._identical_run = 0
+        self._failure_types: deque[tuple[int, str]] = deque(maxlen=2)  # (action index, type)
+        self._failure_signatures: deque[ActionSignature] = deque(maxlen=5)
+        self._cycle_starts: deque[int] = deque(maxlen=self.CYCLE_WINDOW)  # Index of each pattern's first A
+        self._category: str | None = None  # Error category shared by trailing failures
+        self._category_run = 0
+        self._since_category = 0  # Uncategorized failures since the last categorized one
+        self._type_run = 0  # Trailing actions of the same action type
+        self._non_mutating_run = 0
+        self._since_progress = 0  # Actions since the last successful modification
+        self.last_detection = LoopDetection(detected=False)
+
+    def observe(self, action: ActionRecord, facts: list[Fact] | None = None) -> LoopDetection:
+        """
+        Add the next action and check for loops (streaming mode).
+
+        Constant work per call; actions must be observed in order.
+
+        Args:
+            action: The action just taken
+            facts: Recent facts for context
+
+        Returns:
+            LoopDetection for the history observed so far
+        """
+        signature = self._to_signature(action)
+        self._update_runs(action, signature)
+        self.steps_observed += 1
+
+        for check in (
+            self._stream_identical,
+            self._stream_error_cycle,
+            self._stream_long_cycle,
+            lambda: self._stream_semantic(facts),
+            lambda: self._stream_no_progress(facts),
+        ):
+            result = check()
+            if result.detected:
+                self.last_detection = result
+                return result
+
+        self.last_detection = LoopDetection(detected=False)
+        return self.last_detection
+
+    def _update_runs(self, action: ActionRecord, signature: ActionSignature) -> None:
+        failed = action.result == ActionResult.FAILURE
+        previous = self._recent_signatures[-1] if self._recent_signatures else None
+
+        # Identical failures: same action, same params (or same error) as the run's first
+        anchor = self._identical_anchor
+        if not failed:
+            self._identical_anchor, self._identical_run = None, 0
+        elif anchor is not None and action.action == anchor.action and (
+            action.parameters == anchor.parameters or action.error == anchor.error
+        ):
+            self._identical_run += 1
+        else:
+            self._identical_anchor, self._identical_run = action, 1
+
+        # Trailing failures whose (non-empty) error categories all agree
+        category = signature.error_category
+        if not failed:
+            self._category, self._category_run, self._since_category = None, 0, 0
+        elif category is None:
+            self._category_run += 1
+            self._since_category += 1
+        elif self._category in (None, category):
+            self._category, self._category_run, self._since_category = category, self._category_run + 1, 0
+        else:
+            self._category, self._category_run, self._since_category = category, self._since_category + 1, 0
+
+        # A->B->A among failures
+        if failed:
+            if len(self._failure_types) == 2:
+                (start, first), (_, second) = self._failure_types
+                if first == signature.action_type != second:
+                    self._cycle_starts.append(start)
+            self._failure_types.append((self.steps_observed, signature.action_type))
+            self._failure_signatures.append(signature)
+
+        same_type = previous is not None and previous.action_type == signature.action_type
+        self._type_run = self._type_run + 1 if same_type else 1
+        mutating = action.action not in self._NON_MUTATING_ACTIONS
+        self._non_mutating_run = 0 if mutating else self._non_mutating_run + 1
+        self._since_progress = 0 if mutating and action.result == ActionResult.SUCCESS else self._since_progress + 1
+
+        # Signature matches at each lag p: a run of p * (k - 1) means the last
+        # p * k actions are one cycle repeated k times
+        key = (signature.action_type, signature.target_file, signature.target_entity,
+               signature.outcome, signature.error_category)
+        keys = self._recent_keys
+        for period in range(2, self.MAX_CYCLE_PERIOD + 1):
+            matched = len(keys) >= period and keys[-period] == key
+            self._period_runs[period] = self._period_runs[period] + 1 if matched else 0
+        keys.append(key)
+
+        self._recent.append(action)
+        self._recent_signatures.append(signature)
+
+    def _stream_identical(self) -> LoopDetection:
+        if self._identical_run < self.identical_threshold:
+            return LoopDetection(detected=False)
+        recent = list(self._recent)[-self.identical_threshold:]
+        return LoopDetection(
+            detected=True,
+            loop_type=LoopType.IDENTICAL_ACTION,
+            confidence=1.0,
+            description=f"Action '{recent[0].action}' has failed {self._identical_run} consecutive times with same parameters",
+            suggestions=self._suggest_for_identical(recent),
+            evidence=[f"Step {a.step}: {a.action} -> {a.result.value}" for a in recent],
+        )
+
+    def _stream_error_cycle(self) -> LoopDetection:
+        # Failures spread across a long successful run are not a cycle
+        oldest = self.steps_observed - self.CYCLE_SPAN
+        if sum(start >= oldest for start in self._cycle_starts) < self.cycle_threshold:
+            return LoopDetection(detected=False)
+        return LoopDetection(
+            detected=True,
+            loop_type=LoopType.ERROR_CYCLE,
+            confidence=0.9,
+            description="Detected error cycling: alternating between failed approaches",
+            suggestions=[
+                "Both approaches have failed repeatedly",
+                "Consider a fundamentally different strategy",
+                "The code structure may not support the intended refactoring",
+                "Use 'cannot_fix' if no viable approach exists",
+            ],
+            evidence=[f"{s.action_type} ({s.error_category})" for s in self._failure_signatures],
+        )
+
+    def _stream_long_cycle(self) -> LoopDetection:
+        """A cycle of period p repeated CYCLE_REPEATS times without a successful modification."""
+        for period in range(2, self.MAX_CYCLE_PERIOD + 1):
+            span = period * self.CYCLE_REPEATS
+            if self._period_runs[period] < span - period or self._since_progress < span:
+                continue
+            cycle = list(self._recent_keys)[-period:]
+            if len(set(cycle)) < 2 or all(k[3] != ActionResult.FAILURE for k in cycle):
+                continue  # Constant runs are identical loops; a cycle must include a failure
+            steps = " -> ".join(k[0] for k in cycle)
+            return LoopDetection(
+                detected=True,
+                loop_type=LoopType.OSCILLATION if period == 2 else LoopType.ERROR_CYCLE,
+                confidence=0.85,
+                description=f"Same {period}-step cycle repeated {self.CYCLE_REPEATS} times: {steps}",
+                suggestions=[
+                    "The same sequence of actions keeps producing the same results",
+                    "Change the approach rather than repeating the cycle",
+                    "Use 'escalate' or 'cannot_fix' if no viable approach exists",
+                ],
+                evidence=[f"{k[0]} {k[1] or ''} -> {k[3].value}".replace("  ", " ") for k in cycle],
+            )
+        return LoopDetection(detected=False)
+
+    def _stream_semantic(self, facts: list[Fact] | None) -> LoopDetection:
+        threshold = self.semantic_threshold
+        if self.steps_observed < threshold or self._type_run >= threshold:
+            return LoopDetection(detected=False)  # Too short, or a single action type
+        if self._category_run >= threshold and self._category and self._since_category < threshold:
+            recent = list(self._recent_signatures)[-threshold:]
+            result = self._check_same_error_category(recent)
+            if result:
+                return result
+        if facts:
+            return self._check_repeated_error_facts(facts) or LoopDetection(detected=False)
+        return LoopDetection(detected=False)
+
+    def _stream_no_progress(self, facts: list[Fact] | None) -> LoopDetection:
+        threshold = self.no_progress_threshold
+        if self.steps_observed < threshold:
+            return LoopDetection(detected=False)
+        if self._non_mutating_run >= threshold:
+            result = self._check_non_mutating_loop(list(self._recent)[-threshold:])
+            if result:
+                return result
+        if facts:
+            return self._check_unchanged_verification(facts) or LoopDetection(detected=False)
+        return LoopDetection(detected=False)
+
     def _suggest_for_identical(self, actions: list[ActionRecord]) -> list[str]:
         """Generate suggestions for breaking identical action loops."""
         action = actions[0].action
@@ -495,6 +698,4 @@ class LoopDetector:
 
     def reset(self) -> None:
         """Reset internal state."""
-        self._action_history = []
-        self._outcome_history = []
-        self._progress_markers = set()
+        self._reset_stream()
@@ -14,7 +14,7 @@ Directory structure:
 .agentforge/tasks/{task_id}/
 ├── task.yaml                 # Immutable: goal, success criteria
 ├── state.yaml                # Mutable: current phase, status, verification
-├── actions.yaml              # Append-only: complete log of all actions
+├── actions.jsonl             # Append-only: complete log of all actions
 ├── working_memory.yaml       # Rolling: last N actions for context
 └── artifacts/
     ├── inputs/               # Verified inputs (spec, violation, etc.)
@@ -29,13 +29,40 @@ When loading, older versions are automatically migrated to current.
 Version History:
 - 1.0: Initial version (legacy, no version field)
 - 2.0: Enhanced Context Engineering (phase_machine_state added)
+
+Actions Journal
+---------------
+actions.jsonl holds one JSON action record per line. Recording an action
+is a single append, and recent actions are read from the end of the file,
+so per-step cost does not grow with task length. A legacy actions.yaml is
+converted on first access.
+
+Sessions
+--------
+A step's bookkeeping (phase, step counter, verification, context data)
+can be batched with a session: the state is loaded once, every store
+method works on that in-memory copy, and state.yaml is written once
+(temp file + rename) when the outermost session exits:
+
+    with store.session(task_id) as state:
+        store.increment_step(task_id)
+        store.update_phase(task_id, Phase.IMPLEMENT)
+
+Sessions are shared by every TaskStateStore of the same project in the
+process, so tool handlers that build their own store join the open
+session instead of writing behind it.
 """
 
+import contextlib
+import json
+import os
+import threading
 import uuid
+from collections.abc import Iterator
 from dataclasses import dataclass, field
 from datetime import UTC, datetime
 from pathlib import Path
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, ClassVar
 
 import yaml
 
@@ -48,6 +75,10 @@ if TYPE_CHECKING:
 # Current schema version
 SCHEMA_VERSION = "2.0"
 
+ACTIONS_FILE = "actions.jsonl"
+LEGACY_ACTIONS_FILE = "actions.yaml"
+_TAIL_BLOCK_BYTES = 8192
+
 
 def _utc_now() -> datetime:
     """Get current UTC time (Python 3.12+ compatible)."""
@@ -193,6 +224,13 @@ class TaskState:
         self.phase_machine_state = machine.to_state().model_dump()
 
 
+@dataclass
+class _OpenSession:
+    """In-memory state of a task while a session is open."""
+    state: TaskState
+    depth: int = 1
+
+
 class TaskStateStore:
     """
     Manages task state on disk.
@@ -201,6 +239,10 @@ class TaskStateStore:
     loaded from the state store at the start of each step.
     """
 
+    # Open sessions by resolved task directory (shared across store instances)
+    _sessions: ClassVar[dict[Path, _OpenSession]] = {}
+    _sessions_lock: ClassVar[threading.RLock] = threading.RLock()
+
     def __init__(self, project_path: Path):
         self.project_path = Path(project_path)
         self.tasks_dir = self.project_path / ".agentforge" / "tasks"
@@ -208,6 +250,57 @@ class TaskStateStore:
     def _task_dir(self, task_id: str) -> Path:
         return self.tasks_dir / task_id
 
+    def _open_session(self, task_id: str) -> _OpenSession | None:
+        if not self._sessions:
+            return None
+        return self._sessions.get(self._task_dir(task_id).resolve())
+
+    @contextlib.contextmanager
+    def session(self, task_id: str) -> Iterator[TaskState | None]:
+        """
+        Load the task once, batch all state changes in memory, save once.
+
+        While the session is open, load() returns the session's state and
+        updates only change it; state.yaml is written atomically when the
+        outermost session exits (also on error, as the individual updates
+        would have been), or earlier with commit(). Nested sessions for
+        the same task join the outer one. Yields None if the task doesn't
+        exist.
+        """
+        key = self._task_dir(task_id).resolve()
+        with self._sessions_lock:
+            open_session = self._sessions.get(key)
+            if open_session is not None:
+                open_session.depth += 1
+        if open_session is not None:
+            try:
+                yield open_session.state
+            finally:
+                with self._sessions_lock:
+                    open_session.depth -= 1
+            return
+
+        state = self.load(task_id)
+        if state is None:
+            yield None
+            return
+        open_session = _OpenSession(state)
+        with self._sessions_lock:
+            self._sessions[key] = open_session
+        try:
+            yield state
+        finally:
+            with self._sessions_lock:
+                del self._sessions[key]
+            if key.exists():  # Not deleted during the session
+                self._write_state(open_session.state)
+
+    def commit(self, task_id: str) -> None:
+        """Write the open session's state now (no-op outside a session)."""
+        open_session = self._open_session(task_id)
+        if open_session is not None:
+            self._write_state(open_session.state)
+
     def create_task(
         self,
         task_type: str,
@@ -256,9 +349,8 @@ class TaskStateStore:
         # Write state.yaml (mutable)
         self._save_state(state)
 
-        # Initialize actions.yaml
-        with open(task_dir / "actions.yaml", "w") as f:
-            yaml.dump({"actions": []}, f, default_flow_style=False)
+        # Initialize actions journal
+        (task_dir / ACTIONS_FILE).touch()
 
         # Initialize working_memory.yaml
         with open(task_dir / "working_memory.yaml", "w") as f:
@@ -278,6 +370,10 @@ class TaskStateStore:
         Returns:
             TaskState if exists, None otherwise
         """
+        open_session = self._open_session(task_id)
+        if open_session is not None:
+            return open_session.state
+
         task_dir = self._task_dir(task_id)
         if not task_dir.exists():
             return None
@@ -353,11 +449,26 @@ class TaskStateStore:
         return state_data, migrated
 
     def _save_state(self, state: TaskState) -> None:
-        """Save mutable state to disk."""
+        """Save mutable state to disk (deferred to session end inside a session)."""
         state.last_updated = _utc_now()
-        task_dir = self._task_dir(state.task_id)
-        with open(task_dir / "state.yaml", "w") as f:
-            yaml.dump(state.to_state_dict(), f, default_flow_style=False)
+        open_session = self._open_session(state.task_id)
+        if open_session is not None:
+            open_session.state = state
+            return
+        self._write_state(state)
+
+    def _write_state(self, state: TaskState) -> None:
+        """Write state.yaml atomically (temp file + rename)."""
+        path = self._task_dir(state.task_id) / "state.yaml"
+        tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            with open(tmp, "w") as f:
+                yaml.dump(state.to_state_dict(), f, default_flow_style=False)
+            os.replace(tmp, path)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                tmp.unlink()
+            raise
 
     def update_phase(self, task_id: str, phase: Phase) -> None:
         """Update task phase."""
@@ -409,13 +520,12 @@ class TaskStateStore:
         Returns:
             Created ActionRecord
         """
-        task_dir = self._task_dir(task_id)
-        state = self.load(task_id)
-        if not state:
+        step = self._current_step(task_id)
+        if step is None:
             raise ValueError(f"Task not found: {task_id}")
 
         record = ActionRecord(
-            step=state.current_step,
+            step=step,
             action=action,
             target=target,
             parameters=parameters,
@@ -425,30 +535,95 @@ class TaskStateStore:
             error=error,
         )
 
-        # Append to actions.yaml
-        with open(task_dir / "actions.yaml") as f:
-            data = yaml.safe_load(f) or {"actions": []}
-
-        data["actions"].append(record.to_dict())
-
-        with open(task_dir / "actions.yaml", "w") as f:
-            yaml.dump(data, f, default_flow_style=False)
+        line = json.dumps(record.to_dict(), default=str, separators=(",", ":")).encode() + b"\n"
+        with open(self._actions_file(task_id), "ab+") as f:
+            # Start on a fresh line if a previous write was cut short
+            if f.tell() > 0:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    line = b"\n" + line
+            f.write(line)
 
         return record
 
     def get_recent_actions(self, task_id: str, limit: int = 3) -> list[ActionRecord]:
-        """Get the most recent actions."""
-        task_dir = self._task_dir(task_id)
-        actions_file = task_dir / "actions.yaml"
+        """Get the most recent actions (read from the end of the journal)."""
+        actions_file = self._actions_file(task_id)
+        if limit <= 0 or not actions_file.exists():
+            return []
 
+        records = []
+        for line in self._tail_lines(actions_file, limit):
+            try:
+                records.append(ActionRecord.from_dict(json.loads(line)))
+            except (ValueError, KeyError, TypeError):
+                continue  # Torn or corrupt line
+        return records
+
+    def get_all_actions(self, task_id: str) -> list[ActionRecord]:
+        """Get the complete action log, oldest first."""
+        actions_file = self._actions_file(task_id)
         if not actions_file.exists():
             return []
 
-        with open(actions_file) as f:
-            data = yaml.safe_load(f) or {"actions": []}
+        records = []
+        with open(actions_file, "rb") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    records.append(ActionRecord.from_dict(json.loads(line)))
+                except (ValueError, KeyError, TypeError):
+                    continue
+        return records
+
+    def _current_step(self, task_id: str) -> int | None:
+        """Current step from state.yaml alone (None if the task doesn't exist)."""
+        open_session = self._open_session(task_id)
+        if open_session is not None:
+            return open_session.state.current_step
+        state_file = self._task_dir(task_id) / "state.yaml"
+        if not state_file.exists():
+            return None
+        with open(state_file) as f:
+            return (yaml.safe_load(f) or {}).get("current_step", 0)
 
-        actions = data.get("actions", [])[-limit:]
-        return [ActionRecord.from_dict(a) for a in actions]
+    def _actions_file(self, task_id: str) -> Path:
+        """Path of the actions journal, converting a legacy actions.yaml first."""
+        task_dir = self._task_dir(task_id)
+        journal = task_dir / ACTIONS_FILE
+        legacy = task_dir / LEGACY_ACTIONS_FILE
+        if not journal.exists() and legacy.exists():
+            self._migrate_actions(legacy, journal)
+        return journal
+
+    def _migrate_actions(self, legacy: Path, journal: Path) -> None:
+        """Convert actions.yaml to the JSONL journal (atomic; legacy file removed after)."""
+        with open(legacy) as f:
+            data = yaml.safe_load(f) or {}
+        tmp = journal.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, "w") as f:
+            for action in data.get("actions") or []:
+                f.write(json.dumps(action, default=str, separators=(",", ":")) + "\n")
+        os.replace(tmp, journal)
+        legacy.unlink()
+
+    @staticmethod
+    def _tail_lines(path: Path, count: int) -> list[bytes]:
+        """Last `count` non-empty lines of a file, reading backwards in blocks."""
+        with open(path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            pos = f.tell()
+            data = b""
+            while pos > 0 and data.count(b"\n") <= count:
+                size = min(_TAIL_BLOCK_BYTES, pos)
+                pos -= size
+                f.seek(pos)
+                data = f.read(size) + data
+        if pos > 0:
+            data = data.split(b"\n", 1)[1]  # First line may be partial
+        lines = [line for line in data.split(b"\n") if line.strip()]
+        return lines[-count:]
 
     def update_verification(
         self,
@@ -38,6 +38,7 @@ from ...context import (
     FingerprintGenerator,
     get_template_for_task,
 )
+from ...token_counter import count_tokens
 from .context_models import (
     ActionRecord,
     ActionResult,
@@ -481,15 +482,15 @@ reasoning: brief explanation
     ) -> dict[str, int]:
         """Calculate token breakdown by section."""
         breakdown = {
-            "system_prompt": len(system_prompt) // 4,
+            "system_prompt": count_tokens(system_prompt),
         }
 
         for key, value in context_dict.items():
             if isinstance(value, str):
-                breakdown[key] = len(value) // 4
+                breakdown[key] = count_tokens(value)
             else:
                 yaml_str = yaml.dump(value, default_flow_style=False)
-                breakdown[key] = len(yaml_str) // 4
+                breakdown[key] = count_tokens(yaml_str)
 
         return breakdown
 
@@ -10,7 +10,8 @@ Search Handlers
 Handlers for code search operations: search_code, load_context.
 
 search_code supports both regex pattern search and semantic search
-(when a vector index is available).
+(when a vector index is available). Semantic results are cached per index
+generation and dropped when one of the matched files changes.
 
 load_context loads additional file content into the agent's working memory.
 """
@@ -21,6 +22,9 @@ import re
 from pathlib import Path
 from typing import Any
 
+from agentforge.core.repo_file_index import RepoFileIndex
+from agentforge.core.retrieval_cache import RetrievalCache, cache_enabled, normalize_query
+
 from .constants import (
     FIND_RELATED_MAX_FILES,
     SEARCH_DEFAULT_MAX_RESULTS,
@@ -58,13 +62,14 @@ def _should_exclude(path: Path, base_path: Path) -> bool:
 
 def _get_search_files(base_path: Path, file_pattern: str | None) -> list[Path]:
     """Get list of files to search, applying patterns and exclusions."""
+    file_index = RepoFileIndex.for_root(base_path)
     if file_pattern:
-        files = list(base_path.glob(file_pattern))
+        files = file_index.glob_paths(base_path, file_pattern)
     else:
         files = []
         for inc in INCLUDE_PATTERNS:
-            files.extend(base_path.rglob(inc))
-    return [f for f in files if f.is_file() and not _should_exclude(f, base_path)]
+            files.extend(file_index.rglob_paths(base_path, inc))
+    return [f for f in dict.fromkeys(files) if not _should_exclude(f, base_path)]
 
 
 def _search_file(
@@ -115,32 +120,48 @@ def _regex_search(
     return _format_search_results(results, pattern, max_results)
 
 
-def _semantic_search(base_path: Path, query: str, max_results: int) -> str:
-    """Vector-based semantic search."""
+def _semantic_search(base_path: Path, queries: list[str], max_results: int) -> str:
+    """Vector-based semantic search (several queries share one batched lookup)."""
     try:
-        from agentforge.tools.vector_search import VectorSearch
+        from agentforge.core.vector_search import VectorSearch
     except ImportError:
         return "ERROR: Vector search not available. Use search_type='regex' for pattern matching."
 
+    label = " | ".join(queries)
     try:
         vs = VectorSearch(str(base_path))
+        cache, key = None, None
+        generation = vs.index_generation()
+        if cache_enabled() and isinstance(generation, str):
+            cache = RetrievalCache.for_project(base_path)
+            key = RetrievalCache.key(
+                "semantic", queries=[normalize_query(q) for q in queries],
+                max_results=max_results, generation=generation,
+            )
+            cached = cache.get(key)
+            if cached is not None:
+                return cached
+
         if not vs.is_indexed():
             return (
                 "Semantic search requires an index. The index is not available.\n"
                 "Falling back to regex search.\nConsider running 'agentforge index' first."
             )
 
-        results = vs.search(query, top_k=max_results)
+        results = vs.search_many(queries, top_k=max_results, union=True)
         if not results:
-            return f"No semantic matches found for: {query}"
+            return f"No semantic matches found for: {label}"
 
-        output = [f"Found {len(results)} semantic matches for '{query}':\n"]
+        output = [f"Found {len(results)} semantic matches for '{label}':\n"]
         for r in results:
             score_pct = int(r.score * 100)
             output.append(f"  {r.file_path}:{r.start_line}-{r.end_line} ({score_pct}% match)")
             snippet = r.chunk[:150].replace("\n", " ")
             output.append(f"    {snippet}...")
-        return "\n".join(output)
+        text = "\n".join(output)
+        if cache is not None:
+            cache.put(key, text, files=[r.file_path for r in results])
+        return text
     except Exception as e:
         return f"ERROR: Semantic search failed: {e}"
 
@@ -151,17 +172,19 @@ def create_search_code_handler(project_path: Path | None = None) -> ActionHandle
 
     def handler(params: dict[str, Any]) -> str:
         pattern = params.get("pattern", "")
+        queries = params.get("queries") or []
         file_pattern = params.get("file_pattern")
         max_results = params.get("max_results", SEARCH_DEFAULT_MAX_RESULTS)
         search_type = params.get("search_type", "regex")
         logger.debug("search_code: pattern=%s, type=%s", pattern, search_type)
 
-        if not pattern:
+        if not pattern and not (search_type == "semantic" and queries):
             return "ERROR: pattern parameter required"
 
         try:
             if search_type == "semantic":
-                return _semantic_search(base_path, pattern, max_results)
+                all_queries = [pattern, *queries] if pattern else list(queries)
+                return _semantic_search(base_path, all_queries, max_results)
             return _regex_search(base_path, pattern, file_pattern, max_results)
         except Exception as e:
             return f"ERROR: Search failed: {e}"
@@ -12,12 +12,32 @@ Items are automatically evicted (FIFO) when the buffer is full,
 unless marked as pinned.
 
 Enhanced with fact storage for the Understanding Extraction system.
+
+Items live in a per-file in-memory index shared by every manager of the
+same task in the process (by key, by type, and facts by category), so
+reads never parse YAML. The index reloads only if working_memory.yaml was
+changed by someone else (size/mtime differ from what it last saw).
+Changes are written through immediately, or once at the end of a batch:
+
+    with WorkingMemoryManager(task_dir).batch():
+        ...  # any number of adds/reads, one write at exit
+
+At most MAX_INDEXES indexes are kept; the least recently used ones with
+nothing pending are dropped and reloaded from disk on next use. Items
+handed out by get_items()/get_by_type() are copies, so callers cannot
+change the shared index behind its back. Every change to an index, and its
+write-through, happens under the shared lock.
 """
 
-from dataclasses import dataclass, field
+import contextlib
+import copy
+import os
+import threading
+from collections.abc import Iterator
+from dataclasses import dataclass, field, replace
 from datetime import UTC, datetime
 from pathlib import Path
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, ClassVar
 
 import yaml
 
@@ -64,6 +84,10 @@ class WorkingMemoryItem:
             pinned=data.get("pinned", False),
         )
 
+    def copy(self) -> "WorkingMemoryItem":
+        """Independent copy (content included)."""
+        return replace(self, content=copy.deepcopy(self.content))
+
     def is_expired(self, current_step: int) -> bool:
         """Check if item has expired based on step count."""
         if self.expires_after_steps is None or self.step is None:
@@ -71,15 +95,62 @@ class WorkingMemoryItem:
         return (current_step - self.step) > self.expires_after_steps
 
 
+class _MemoryIndex:
+    """In-memory items of one working_memory.yaml, indexed for lookups."""
+
+    def __init__(self):
+        self.items: dict[str, WorkingMemoryItem] = {}  # key -> item, insertion order
+        self.by_type: dict[str, dict[str, WorkingMemoryItem]] = {}
+        self.facts_by_category: dict[str, dict[str, WorkingMemoryItem]] = {}
+        self.signature: tuple[int, int] | None = None  # (size, mtime_ns) last read/written
+        self.loaded = False
+        self.dirty = False
+        self.batch_depth = 0
+
+    def reset(self, items: list[WorkingMemoryItem]) -> None:
+        self.items.clear()
+        self.by_type.clear()
+        self.facts_by_category.clear()
+        for item in items:
+            self.put(item)
+
+    def put(self, item: WorkingMemoryItem) -> None:
+        """Add or replace (moving it to the end) an item."""
+        self.discard(item.key)
+        self.items[item.key] = item
+        self.by_type.setdefault(item.item_type, {})[item.key] = item
+        if item.item_type == "fact":
+            self.facts_by_category.setdefault(self._category(item), {})[item.key] = item
+
+    def discard(self, key: str) -> WorkingMemoryItem | None:
+        item = self.items.pop(key, None)
+        if item is not None:
+            self.by_type.get(item.item_type, {}).pop(key, None)
+            if item.item_type == "fact":
+                self.facts_by_category.get(self._category(item), {}).pop(key, None)
+        return item
+
+    @staticmethod
+    def _category(item: WorkingMemoryItem) -> str:
+        content = item.content if isinstance(item.content, dict) else {}
+        return content.get("category") or "other"
+
+
 class WorkingMemoryManager:
     """
     Manages a bounded rolling buffer of context items.
 
-    The working memory is persisted to disk and loaded fresh each step.
+    The working memory is persisted to disk; managers of the same task
+    share one in-memory index of it.
     Items are automatically evicted when the buffer is full (FIFO),
     unless they are pinned.
     """
 
+    MAX_INDEXES: ClassVar[int] = 64
+
+    _indexes: ClassVar[dict[Path, _MemoryIndex]] = {}  # Insertion order = LRU order
+    _indexes_lock: ClassVar[threading.RLock] = threading.RLock()
+
     def __init__(self, task_dir: Path, max_items: int = 5):
         """
         Initialize working memory manager.
@@ -92,6 +163,44 @@ class WorkingMemoryManager:
         self.max_items = max_items
         self.memory_file = self.task_dir / "working_memory.yaml"
 
+    # ───────────────────────────────────────────────────────────────────────────
+    # In-memory index and persistence
+    # ───────────────────────────────────────────────────────────────────────────
+
+    def _signature(self) -> tuple[int, int] | None:
+        try:
+            st = os.stat(self.memory_file)
+        except OSError:
+            return None
+        return st.st_size, st.st_mtime_ns
+
+    def _index(self) -> _MemoryIndex:
+        """Shared index for this file, reloaded if the file changed behind it."""
+        key = self.memory_file.resolve()
+        with self._indexes_lock:
+            index = self._indexes.pop(key, None)
+            if index is None:
+                index = _MemoryIndex()
+                self._evict_indexes()
+            self._indexes[key] = index
+            if not index.dirty:
+                signature = self._signature()
+                if not index.loaded or signature != index.signature:
+                    index.reset(self._load())
+                    index.signature = signature
+                    index.loaded = True
+            return index
+
+    @classmethod
+    def _evict_indexes(cls) -> None:
+        """Drop least recently used indexes over MAX_INDEXES, never ones with unsaved changes."""
+        excess = len(cls._indexes) + 1 - cls.MAX_INDEXES
+        if excess <= 0:
+            return
+        idle = [key for key, index in cls._indexes.items() if not index.dirty and index.batch_depth == 0]
+        for key in idle[:excess]:
+            del cls._indexes[key]
+
     def _load(self) -> list[WorkingMemoryItem]:
         """Load items from disk."""
         if not self.memory_file.exists():
@@ -104,7 +213,7 @@ class WorkingMemoryManager:
         return [WorkingMemoryItem.from_dict(item) for item in items]
 
     def _save(self, items: list[WorkingMemoryItem]) -> None:
-        """Save items to disk."""
+        """Save items to disk (atomic replace)."""
         self.task_dir.mkdir(parents=True, exist_ok=True)
 
         data = {
@@ -112,8 +221,61 @@ class WorkingMemoryManager:
             "items": [item.to_dict() for item in items],
         }
 
-        with open(self.memory_file, "w") as f:
-            yaml.dump(data, f, default_flow_style=False)
+        tmp = self.memory_file.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            with open(tmp, "w") as f:
+                yaml.dump(data, f, default_flow_style=False)
+            os.replace(tmp, self.memory_file)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                tmp.unlink()
+            raise
+
+    def _changed(self, index: _MemoryIndex) -> None:
+        """Record a change: written now, or at the end of the open batch."""
+        index.dirty = True
+        if index.batch_depth == 0:
+            self._write(index)
+
+    def _write(self, index: _MemoryIndex) -> None:
+        with self._indexes_lock:
+            if not index.dirty:
+                return
+            self._save(list(index.items.values()))
+            index.signature = self._signature()
+            index.dirty = False
+
+    def flush(self) -> None:
+        """Write pending changes to disk."""
+        with self._indexes_lock:
+            index = self._indexes.get(self.memory_file.resolve())
+        if index is not None:
+            self._write(index)
+
+    @contextlib.contextmanager
+    def batch(self) -> Iterator["WorkingMemoryManager"]:
+        """Defer writes until the outermost batch for this task exits."""
+        with self._indexes_lock:
+            index = self._index()
+            index.batch_depth += 1
+        try:
+            yield self
+        finally:
+            with self._indexes_lock:
+                index.batch_depth -= 1
+                outermost = index.batch_depth == 0
+            if outermost:
+                self._write(index)
+
+    @classmethod
+    def reset_indexes(cls) -> None:
+        """Drop all in-memory indexes (pending changes are lost)."""
+        with cls._indexes_lock:
+            cls._indexes.clear()
+
+    # ───────────────────────────────────────────────────────────────────────────
+    # Items
+    # ───────────────────────────────────────────────────────────────────────────
 
     def add(
         self,
@@ -135,26 +297,26 @@ class WorkingMemoryManager:
             expires_after_steps: Auto-remove after N steps
             pinned: If True, won't be evicted by FIFO
         """
-        items = self._load()
-
-        # Remove existing item with same key (update)
-        items = [i for i in items if i.key != key]
+        with self._indexes_lock:
+            index = self._index()
 
-        # Add new item
-        new_item = WorkingMemoryItem(
-            item_type=item_type,
-            key=key,
-            content=content,
-            step=step,
-            expires_after_steps=expires_after_steps,
-            pinned=pinned,
-        )
-        items.append(new_item)
+            # Replaces an existing item with the same key
+            index.put(WorkingMemoryItem(
+                item_type=item_type,
+                key=key,
+                content=content,
+                step=step,
+                expires_after_steps=expires_after_steps,
+                pinned=pinned,
+            ))
 
-        # Evict old items if over limit
-        items = self._evict_if_needed(items)
+            # Evict old items if over limit
+            if len(index.items) > self.max_items:
+                kept = {item.key for item in self._evict_if_needed(list(index.items.values()))}
+                for evicted in [k for k in index.items if k not in kept]:
+                    index.discard(evicted)
 
-        self._save(items)
+            self._changed(index)
 
     def add_action_result(
         self,
@@ -207,6 +369,17 @@ class WorkingMemoryManager:
             expires_after_steps=expires_after_steps,
         )
 
+    def _expire(self, index: _MemoryIndex, current_step: int | None) -> None:
+        """Drop expired items (when a step is given)."""
+        if current_step is None:
+            return
+        with self._indexes_lock:
+            expired = [k for k, i in index.items.items() if i.is_expired(current_step)]
+            if expired:
+                for key in expired:
+                    index.discard(key)
+                self._changed(index)
+
     def get_items(self, current_step: int | None = None) -> list[WorkingMemoryItem]:
         """
         Get all items, optionally filtering expired ones.
@@ -215,26 +388,27 @@ class WorkingMemoryManager:
             current_step: If provided, filters out expired items
 
         Returns:
-            List of WorkingMemoryItem
+            List of WorkingMemoryItem (copies; changing them has no effect)
         """
-        items = self._load()
-
-        if current_step is not None:
-            # Filter out expired items
-            items = [i for i in items if not i.is_expired(current_step)]
-            # Save filtered list
-            self._save(items)
-
-        return items
+        with self._indexes_lock:
+            index = self._index()
+            self._expire(index, current_step)
+            return [item.copy() for item in index.items.values()]
 
     def get_by_type(
         self,
         item_type: str,
         current_step: int | None = None,
     ) -> list[WorkingMemoryItem]:
-        """Get items of a specific type."""
-        items = self.get_items(current_step)
-        return [i for i in items if i.item_type == item_type]
+        """Get copies of the items of a specific type."""
+        return [item.copy() for item in self._of_type(item_type, current_step)]
+
+    def _of_type(self, item_type: str, current_step: int | None) -> list[WorkingMemoryItem]:
+        """Live items of a type, for readers that only build new values from them."""
+        with self._indexes_lock:
+            index = self._index()
+            self._expire(index, current_step)
+            return list(index.by_type.get(item_type, {}).values())
 
     def get_action_results(
         self,
@@ -251,7 +425,7 @@ class WorkingMemoryManager:
         Returns:
             List of action result dicts
         """
-        items = self.get_by_type("action_result", current_step)
+        items = self._of_type("action_result", current_step)
 
         # Sort by step descending, take most recent
         items = sorted(items, key=lambda x: x.step or 0, reverse=True)[:limit]
@@ -283,7 +457,7 @@ class WorkingMemoryManager:
         Returns:
             Dict of context_key -> content
         """
-        items = self.get_by_type("loaded_context", current_step)
+        items = self._of_type("loaded_context", current_step)
         return {item.key: item.content for item in items}
 
     def remove(self, key: str) -> bool:
@@ -296,14 +470,12 @@ class WorkingMemoryManager:
         Returns:
             True if item was found and removed
         """
-        items = self._load()
-        original_count = len(items)
-        items = [i for i in items if i.key != key]
-
-        if len(items) < original_count:
-            self._save(items)
+        with self._indexes_lock:
+            index = self._index()
+            if index.discard(key) is None:
+                return False
+            self._changed(index)
             return True
-        return False
 
     def clear(self, keep_pinned: bool = True) -> int:
         """
@@ -315,13 +487,14 @@ class WorkingMemoryManager:
         Returns:
             Number of items cleared
         """
-        items = self._load()
-        original_count = len(items)
-
-        items = [i for i in items if i.pinned] if keep_pinned else []
-
-        self._save(items)
-        return original_count - len(items)
+        with self._indexes_lock:
+            index = self._index()
+            cleared = [k for k, i in index.items.items() if not (keep_pinned and i.pinned)]
+            for key in cleared:
+                index.discard(key)
+            if cleared:
+                self._changed(index)
+        return len(cleared)
 
     def _evict_if_needed(
         self,
@@ -352,6 +525,16 @@ class WorkingMemoryManager:
 
         return pinned + unpinned
 
+    def _set_pinned(self, key: str, pinned: bool) -> bool:
+        with self._indexes_lock:
+            index = self._index()
+            item = index.items.get(key)
+            if item is None:
+                return False
+            item.pinned = pinned
+            self._changed(index)
+            return True
+
     def pin(self, key: str) -> bool:
         """
         Pin an item so it won't be evicted.
@@ -362,13 +545,7 @@ class WorkingMemoryManager:
         Returns:
             True if item was found and pinned
         """
-        items = self._load()
-        for item in items:
-            if item.key == key:
-                item.pinned = True
-                self._save(items)
-                return True
-        return False
+        return self._set_pinned(key, True)
 
     def unpin(self, key: str) -> bool:
         """
@@ -380,13 +557,7 @@ class WorkingMemoryManager:
         Returns:
             True if item was found and unpinned
         """
-        items = self._load()
-        for item in items:
-            if item.key == key:
-                item.pinned = False
-                self._save(items)
-                return True
-        return False
+        return self._set_pinned(key, False)
 
     # ═══════════════════════════════════════════════════════════════════════════
     # Fact Storage (Enhanced Context Engineering)
@@ -470,25 +641,20 @@ class WorkingMemoryManager:
         Returns:
             List of fact dicts
         """
-        items = self.get_by_type("fact", current_step)
+        with self._indexes_lock:
+            index = self._index()
+            self._expire(index, current_step)
+            all_facts = list(index.by_type.get("fact", {}).values())
+            candidates = list(index.facts_by_category.get(category, {}).values()) if category else all_facts
 
         facts = []
-        superseded_ids = set()
+        superseded_ids = {item.content["supersedes"] for item in all_facts if item.content.get("supersedes")}
 
-        # First pass: collect superseded IDs
-        for item in items:
-            if item.content.get("supersedes"):
-                superseded_ids.add(item.content["supersedes"])
-
-        # Second pass: filter facts
-        for item in items:
+        for item in candidates:
             fact_id = item.content.get("id")
             if fact_id in superseded_ids:
                 continue  # Skip superseded facts
 
-            if category and item.content.get("category") != category:
-                continue
-
             if item.content.get("confidence", 0) < min_confidence:
                 continue
 
@@ -561,8 +727,11 @@ class WorkingMemoryManager:
         Returns:
             Number of facts cleared
         """
-        items = self._load()
-        original_count = len([i for i in items if i.item_type == "fact"])
-        items = [i for i in items if i.item_type != "fact"]
-        self._save(items)
-        return original_count
+        with self._indexes_lock:
+            index = self._index()
+            fact_keys = list(index.by_type.get("fact", {}))
+            for key in fact_keys:
+                index.discard(key)
+            if fact_keys:
+                self._changed(index)
+        return len(fact_keys)
@@ -9,6 +9,7 @@ import subprocess
 from pathlib import Path
 from typing import Any
 
+from ..repo_file_index import RepoFileIndex
 from .llm_executor_domain import ToolResult
 
 
@@ -143,6 +144,7 @@ class RunnerTools:
             changed_files = [changed_files]
 
         # Determine related test files
+        file_index = RepoFileIndex.for_root(self.project_path)
         test_paths = []
         for file_path in changed_files:
             file_path = Path(file_path)
@@ -151,17 +153,11 @@ class RunnerTools:
             if file_path.suffix == ".py":
                 # Check for test_<name>.py pattern
                 test_name = f"test_{file_path.stem}.py"
-                potential_tests = list(
-                    self.project_path.rglob(f"**/{test_name}")
-                )
-                test_paths.extend(str(t.relative_to(self.project_path)) for t in potential_tests)
+                test_paths.extend(file_index.rglob(test_name))
 
                 # Check for <name>_test.py pattern
                 test_name = f"{file_path.stem}_test.py"
-                potential_tests = list(
-                    self.project_path.rglob(f"**/{test_name}")
-                )
-                test_paths.extend(str(t.relative_to(self.project_path)) for t in potential_tests)
+                test_paths.extend(file_index.rglob(test_name))
 
         if not test_paths:
             return ToolResult.success_result(
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Lexical Index
+=============
+
+BM25 inverted index over identifier tokens, kept beside the vector index.
+
+Many retrieval queries are exact identifiers ("OrderService",
+"apply_discount"). Those are answered here without an embedding model:
+identifiers are indexed whole and split into their camelCase / snake_case
+parts, so "OrderService" matches the class exactly and "order service"
+still finds it.
+
+The index uses the same ids as the FAISS index and is built in the same
+pass as chunking (see VectorSearch._chunk_and_embed).
+
+Usage:
+    index = LexicalIndex()
+    index.add(chunk_id, chunk)
+    index.save(path)
+    hits = LexicalIndex.load(path).search("OrderService", top_k=10)
+"""
+
+import json
+import math
+import os
+import re
+from collections import Counter
+from collections.abc import Iterable
+from pathlib import Path
+
+try:
+    from .vector_types import Chunk
+except ImportError:
+    from vector_types import Chunk
+
+
+IDENTIFIER_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+WORD_PART_RE = re.compile(r"[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|[0-9]+")
+IDENTIFIER_QUERY_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_]*(?:(?:\.|::)[A-Za-z_][A-Za-z0-9_]*)*")
+
+
+def tokenize(text: str) -> list[str]:
+    """Lower-cased identifiers plus their camelCase / snake_case parts."""
+    terms = []
+    for identifier in IDENTIFIER_RE.findall(text):
+        lower = identifier.lower()
+        if len(lower) > 1:
+            terms.append(lower)
+        parts = [p.lower() for piece in identifier.split("_") for p in WORD_PART_RE.findall(piece)]
+        if len(parts) > 1:
+            terms.extend(p for p in parts if len(p) > 1)
+    return terms
+
+
+def is_identifier_query(query: str) -> bool:
+    """
+    Whether a query is only code identifiers (OrderService, apply_discount,
+    orders.apply_discount), as opposed to natural language.
+
+    Plain lower-case words are not treated as identifiers.
+    """
+    words = query.split()
+    if not words:
+        return False
+    for word in words:
+        if not IDENTIFIER_QUERY_RE.fullmatch(word):
+            return False
+        if not ("_" in word or "." in word or "::" in word or any(c.isupper() for c in word[1:])):
+            return False
+    return True
+
+
+class LexicalIndex:
+    """In-memory BM25 index from term to {chunk id: term frequency}."""
+
+    FORMAT_VERSION = 1
+    K1 = 1.2
+    B = 0.75
+
+    def __init__(self):
+        self.postings: dict[str, dict[int, int]] = {}
+        self.doc_lengths: dict[int, int] = {}
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self.doc_lengths)
+
+    # -------------------------------------------------------------------------
+    # Building
+    # -------------------------------------------------------------------------
+
+    def add(self, chunk_id: int, chunk: Chunk) -> None:
+        """Index a chunk's path, context and content."""
+        terms = tokenize(chunk.to_embedding_text())
+        for term, tf in Counter(terms).items():
+            self.postings.setdefault(term, {})[chunk_id] = tf
+        self.doc_lengths[chunk_id] = len(terms)
+        self._total_length += len(terms)
+
+    def remove(self, chunk_ids: Iterable[int]) -> None:
+        """Drop chunks (one pass over the postings)."""
+        removed = {cid for cid in chunk_ids if cid in self.doc_lengths}
+        if not removed:
+            return
+        for cid in removed:
+            self._total_length -= self.doc_lengths.pop(cid)
+        for term in list(self.postings):
+            docs = self.postings[term]
+            for cid in removed & docs.keys():
+                del docs[cid]
+            if not docs:
+                del self.postings[term]
+
+    @classmethod
+    def from_chunks(cls, chunks: Iterable[tuple[int, Chunk]]) -> "LexicalIndex":
+        """Build an index from (id, Chunk) pairs."""
+        index = cls()
+        for chunk_id, chunk in chunks:
+            index.add(chunk_id, chunk)
+        return index
+
+    # -------------------------------------------------------------------------
+    # Search
+    # -------------------------------------------------------------------------
+
+    def search(self, query: str, top_k: int = 10) -> list[tuple[int, float]]:
+        """
+        Rank chunks by BM25 over the query's terms.
+
+        Returns:
+            (chunk id, score) pairs, best first
+        """
+        if not self.doc_lengths:
+            return []
+        n = len(self.doc_lengths)
+        avg_length = self._total_length / n or 1.0
+        scores: dict[int, float] = {}
+        for term in dict.fromkeys(tokenize(query)):
+            docs = self.postings.get(term)
+            if not docs:
+                continue
+            idf = math.log(1 + (n - len(docs) + 0.5) / (len(docs) + 0.5))
+            for cid, tf in docs.items():
+                norm = self.K1 * (1 - self.B + self.B * self.doc_lengths[cid] / avg_length)
+                scores[cid] = scores.get(cid, 0.0) + idf * tf * (self.K1 + 1) / (tf + norm)
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        return ranked[:top_k]
+
+    # -------------------------------------------------------------------------
+    # Persistence
+    # -------------------------------------------------------------------------
+
+    def save(self, path: Path) -> None:
+        """Write the index atomically as JSON."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            "version": self.FORMAT_VERSION,
+            "doc_lengths": self.doc_lengths,
+            "postings": {term: list(docs.items()) for term, docs in self.postings.items()},
+        }
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: Path) -> "LexicalIndex | None":
+        """Load an index, or return None if missing or from another version."""
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get("version") != cls.FORMAT_VERSION:
+            return None
+        index = cls()
+        index.doc_lengths = {int(cid): length for cid, length in data["doc_lengths"].items()}
+        index.postings = {term: dict(docs) for term, docs in data["postings"].items()}
+        index._total_length = sum(index.doc_lengths.values())
+        return index
@@ -26,29 +26,51 @@ Usage:
     # Find all usages of a symbol
     references = adapter.get_references("src/Domain/Order.cs", line=10, col=18)
 
+    # Many files at once (requests are pipelined, not sent one by one)
+    by_file = adapter.get_symbols_many(["src/Domain/Order.cs", "src/Domain/Customer.cs"])
+
     adapter.shutdown()
 
 LSP Protocol Notes:
 - Uses JSON-RPC 2.0 over stdin/stdout
 - Lifecycle: initialize → initialized → requests → shutdown → exit
-- Documents must be opened before querying (textDocument/didOpen)
+- Documents must be opened before querying (textDocument/didOpen); the
+  server processes messages in order, so no delay is needed after didOpen
 - Line/column numbers are 0-based in LSP (unlike editors which are 1-based)
 """
 
+import functools
+import hashlib
 import os
 import shutil
 import sys
+import threading
 import time
+from contextlib import contextmanager, suppress
 from pathlib import Path
 
+from .lsp_cache import LSPResultCache, cache_enabled
 from .lsp_client import (
     LSPClient,
+    LSPError,
     LSPInitializationError,
     LSPRequestError,
     LSPServerNotFound,
 )
 from .lsp_types import Diagnostic, HoverInfo, Location, Symbol, SymbolKind
 
+_HOVER_FAILED = object()  # Hover request errored (not cached, unlike "no hover info")
+
+
+def _request(method):
+    """Run a public query with the adapter marked in use (a pool won't stop its server meanwhile)."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.in_use():
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
 # =============================================================================
 # LSP Adapter Base Class
 # =============================================================================
@@ -62,6 +84,9 @@ class LSPAdapter:
     LANGUAGE_ID: str = "text"
     FILE_EXTENSIONS: list[str] = []
 
+    READY_TIMEOUT = 10.0  # Max wait for initial indexing ($/progress) after initialize
+    DIAGNOSTICS_TIMEOUT = 2.0  # Max wait for publishDiagnostics after didOpen
+
     def __init__(self, project_path: str):
         """
         Initialize adapter for a project.
@@ -72,13 +97,22 @@ class LSPAdapter:
         self.project_path = Path(project_path).resolve()
         self.client: LSPClient | None = None
         self._initialized = False
-        self._open_documents: set = set()
+        self._open_documents: dict[str, list] = {}  # uri -> [version, stat signature, text digest]
+        self._pool = None  # Set by LSPServerPool for shared adapters
+        self._result_cache: LSPResultCache | None = None
+        self._usage_lock = threading.Lock()
+        self._requests_in_flight = 0
 
     def initialize(self) -> bool:
-        """Initialize the language server."""
+        """Initialize the language server (through the pool for pooled adapters)."""
         if self._initialized:
             return True
+        if self._pool is not None:
+            return self._pool.connect(self)
+        return self._start_server()
 
+    def _start_server(self) -> bool:
+        """Start and initialize a local language server process."""
         # Check if server is installed
         if not self.SERVER_COMMAND or not shutil.which(self.SERVER_COMMAND[0]):
             raise LSPServerNotFound(self.SERVER_NAME, self.INSTALL_INSTRUCTIONS)
@@ -90,11 +124,11 @@ class LSPAdapter:
             self.client.send_request('initialize', init_params, timeout=60.0)
             self.client.send_notification('initialized', {})
             self._initialized = True
-            time.sleep(1.0)  # Give server time to index
+            self.client.wait_until_idle(self.READY_TIMEOUT)
             return True
 
         except Exception as e:
-            self.shutdown()
+            self.close()
             raise LSPInitializationError(f"Failed to initialize {self.SERVER_NAME}: {e}") from e
 
     def _get_initialize_params(self) -> dict:
@@ -123,52 +157,132 @@ class LSPAdapter:
         if not self._initialized:
             self.initialize()
 
+    @contextmanager
+    def in_use(self):
+        """Mark the adapter busy; pooled adapters also count as used now and when done."""
+        with self._usage_lock:
+            self._requests_in_flight += 1
+        if self._pool is not None:
+            self._pool.touch(self)
+        try:
+            yield self
+        finally:
+            with self._usage_lock:
+                self._requests_in_flight -= 1
+            if self._pool is not None:
+                self._pool.touch(self)
+
+    def stop_if_unused(self, should_stop=None) -> bool:
+        """
+        Shut the server down unless a request is in flight (used by the pool's reaper).
+
+        should_stop, if given, is re-checked while new requests are held off.
+        """
+        with self._usage_lock:
+            if self._requests_in_flight or (should_stop is not None and not should_stop()):
+                return False
+            self.close()
+            self._result_cache = None  # Flushed by close(); reloaded if the adapter is used again
+            return True
+
+    @classmethod
+    def server_identity(cls) -> str:
+        """Server name, binary and binary mtime (cached results are only valid for one build)."""
+        binary = shutil.which(cls.SERVER_COMMAND[0]) if cls.SERVER_COMMAND else None
+        try:
+            mtime_ns = os.stat(binary).st_mtime_ns if binary else 0
+        except OSError:
+            mtime_ns = 0
+        return f"{cls.SERVER_NAME}|{binary}|{mtime_ns}"
+
+    @property
+    def result_cache(self) -> LSPResultCache | None:
+        """Persistent cache of parsed results (None when disabled via $AGENTFORGE_LSP_CACHE=0)."""
+        if self._result_cache is None and cache_enabled():
+            self._result_cache = LSPResultCache.for_server(
+                self.SERVER_NAME, self.project_path, self.server_identity())
+        return self._result_cache
+
+    def is_ready(self) -> bool:
+        """Whether the server has no indexing or analysis in progress (its answers are complete)."""
+        try:
+            return self.client is not None and self.client.wait_until_idle(0.0, settle=0.0)
+        except LSPError:
+            return False
+
+    def _file_cache_key(self, file: str) -> str | None:
+        cache = self.result_cache
+        return cache.file_key(self._abs_path(file)) if cache is not None else None
+
     def _open_document(self, file_path: str):
-        """Open a document in the server."""
+        """Open a document in the server (or resend it if it changed on disk)."""
         if not self.client:
             return
 
-        abs_path = Path(file_path)
-        if not abs_path.is_absolute():
-            abs_path = self.project_path / file_path
-
+        abs_path = self._abs_path(file_path)
         uri = f"file://{abs_path}"
-        if uri in self._open_documents:
-            return
 
         try:
+            stat = abs_path.stat()
+            signature = (stat.st_mtime_ns, stat.st_size)
+            opened = self._open_documents.get(uri)
+            if opened is not None and opened[1] == signature:
+                return
+
             with open(abs_path, encoding='utf-8', errors='replace') as f:
                 content = f.read()
 
+            self.open_text(uri, content)
+            self._open_documents[uri][1] = signature
+        except Exception:
+            pass
+
+    def open_text(self, uri: str, text: str):
+        """Send document text: didOpen the first time, a full-text didChange when it differs."""
+        digest = hashlib.sha1(text.encode('utf-8', errors='replace')).hexdigest()
+        opened = self._open_documents.get(uri)
+        if opened is None:
             self.client.send_notification('textDocument/didOpen', {
                 'textDocument': {
                     'uri': uri, 'languageId': self.LANGUAGE_ID,
-                    'version': 1, 'text': content,
+                    'version': 1, 'text': text,
                 },
             })
-            self._open_documents.add(uri)
-            time.sleep(0.1)
-        except Exception:
-            pass
+            self._open_documents[uri] = [1, None, digest]
+        elif opened[2] != digest:
+            opened[0] += 1
+            opened[2] = digest
+            self.client.expect_diagnostics(self._uri_to_path(uri))
+            self.client.send_notification('textDocument/didChange', {
+                'textDocument': {'uri': uri, 'version': opened[0]},
+                'contentChanges': [{'text': text}],
+            })
+
+    def _abs_path(self, file: str) -> Path:
+        """Resolve a file relative to the project."""
+        abs_path = Path(file)
+        return abs_path if abs_path.is_absolute() else self.project_path / file
 
     def _close_document(self, file_path: str):
         """Close a document in the server."""
-        if not self.client:
-            return
+        self.close_uri(f"file://{self._abs_path(file_path)}")
 
-        abs_path = Path(file_path)
-        if not abs_path.is_absolute():
-            abs_path = self.project_path / file_path
-
-        uri = f"file://{abs_path}"
-        if uri not in self._open_documents:
+    def close_uri(self, uri: str):
+        """Send didClose for an open document."""
+        if not self.client or uri not in self._open_documents:
             return
 
         self.client.send_notification('textDocument/didClose', {'textDocument': {'uri': uri}})
-        self._open_documents.discard(uri)
+        self._open_documents.pop(uri, None)
 
+    @_request
     def get_symbols(self, file: str) -> list[Symbol]:
-        """Get all symbols defined in a file."""
+        """Get all symbols defined in a file (from the result cache when the file is unchanged)."""
+        key = self._file_cache_key(file)
+        cached = self.result_cache.get('symbols', key) if key else None
+        if cached is not None:
+            return [Symbol.from_dict(d) for d in cached]
+
         self._ensure_initialized()
         self._open_document(file)
 
@@ -180,11 +294,50 @@ class LSPAdapter:
             result = self.client.send_request('textDocument/documentSymbol', {
                 'textDocument': {'uri': f"file://{abs_path}"},
             })
-            if not result:
-                return []
-            return self._parse_document_symbols(result, str(abs_path))
         except LSPRequestError:
             return []
+        symbols = self._parse_document_symbols(result, str(abs_path)) if result else []
+        if key and self.is_ready():  # A server still indexing may answer partially
+            self.result_cache.put('symbols', key, [s.to_dict() for s in symbols])
+        return symbols
+
+    @_request
+    def get_symbols_many(self, files: list[str]) -> dict[str, list[Symbol]]:
+        """
+        Get symbols for many files with pipelined requests.
+
+        Returns:
+            Symbols per input file (empty list when a request failed)
+        """
+        by_file: dict[str, list[Symbol]] = {}
+        keys = {}
+        for file in files:
+            key = keys[file] = self._file_cache_key(file)
+            cached = self.result_cache.get('symbols', key) if key else None
+            if cached is not None:
+                by_file[file] = [Symbol.from_dict(d) for d in cached]
+        misses = [file for file in files if file not in by_file]
+        if not misses:
+            return by_file
+
+        self._ensure_initialized()
+        for file in misses:
+            self._open_document(file)
+
+        paths = [self._abs_path(file) for file in misses]
+        results = self.client.send_requests(
+            [('textDocument/documentSymbol', {'textDocument': {'uri': f"file://{path}"}}) for path in paths],
+            return_exceptions=True,
+        )
+        ready = self.is_ready()
+        for file, path, result in zip(misses, paths, results, strict=True):
+            if isinstance(result, Exception):
+                by_file[file] = []
+                continue
+            by_file[file] = self._parse_document_symbols(result, str(path)) if result else []
+            if keys[file] and ready:
+                self.result_cache.put('symbols', keys[file], [s.to_dict() for s in by_file[file]])
+        return {file: by_file[file] for file in files}
 
     def _parse_document_symbols(self, symbols: list, file_path: str, container: str = None) -> list[Symbol]:
         """Parse document symbols from LSP response."""
@@ -192,6 +345,7 @@ class LSPAdapter:
         for sym in symbols:
             if 'range' in sym:
                 range_info = sym['range']['start']
+                range_end = sym['range'].get('end', {})
                 symbol = Symbol(
                     name=sym.get('name', ''),
                     kind=SymbolKind.to_string(sym.get('kind', 0)),
@@ -199,6 +353,8 @@ class LSPAdapter:
                         file=file_path,
                         line=range_info.get('line', 0),
                         column=range_info.get('character', 0),
+                        end_line=range_end.get('line'),
+                        end_column=range_end.get('character'),
                     ),
                     container=container,
                     detail=sym.get('detail'),
@@ -211,6 +367,7 @@ class LSPAdapter:
             elif 'location' in sym:
                 loc = sym['location']
                 range_info = loc.get('range', {}).get('start', {})
+                range_end = loc.get('range', {}).get('end', {})
                 symbol = Symbol(
                     name=sym.get('name', ''),
                     kind=SymbolKind.to_string(sym.get('kind', 0)),
@@ -218,6 +375,8 @@ class LSPAdapter:
                         file=self._uri_to_path(loc.get('uri', '')),
                         line=range_info.get('line', 0),
                         column=range_info.get('character', 0),
+                        end_line=range_end.get('line'),
+                        end_column=range_end.get('character'),
                     ),
                     container=sym.get('containerName'),
                 )
@@ -232,31 +391,66 @@ class LSPAdapter:
 
     def get_workspace_symbols(self, query: str) -> list[Symbol]:
         """Search for symbols across the workspace."""
-        self._ensure_initialized()
+        return self.get_workspace_symbols_many([query])[query]
 
-        try:
-            result = self.client.send_request('workspace/symbol', {'query': query})
-            if not result:
-                return []
+    @_request
+    def get_workspace_symbols_many(self, queries: list[str]) -> dict[str, list[Symbol]]:
+        """
+        Run several workspace symbol searches with pipelined requests.
 
-            symbols = []
-            for sym in result:
-                loc = sym.get('location', {})
-                range_info = loc.get('range', {}).get('start', {})
-                symbols.append(Symbol(
-                    name=sym.get('name', ''),
-                    kind=SymbolKind.to_string(sym.get('kind', 0)),
-                    location=Location(
-                        file=self._uri_to_path(loc.get('uri', '')),
-                        line=range_info.get('line', 0),
-                        column=range_info.get('character', 0),
-                    ),
-                    container=sym.get('containerName'),
-                ))
-            return symbols
-        except LSPRequestError:
-            return []
+        Results are cached against a hash of every file the server handles,
+        so any edit in the tree invalidates them. Empty results, and any
+        result while the server is still indexing, are not cached: servers
+        answer [] until their index is built.
+        """
+        cache = self.result_cache
+        tree = cache.tree_key(self.FILE_EXTENSIONS) if cache is not None else None
+        by_query: dict[str, list[Symbol]] = {}
+        for query in queries:
+            cached = cache.get('workspace', f"{tree}:{query}") if cache is not None else None
+            if cached is not None:
+                by_query[query] = [Symbol.from_dict(d) for d in cached]
+        misses = [query for query in dict.fromkeys(queries) if query not in by_query]
+        if not misses:
+            return {query: by_query[query] for query in queries}
 
+        self._ensure_initialized()
+        results = self.client.send_requests(
+            [('workspace/symbol', {'query': query}) for query in misses],
+            return_exceptions=True,
+        )
+        ready = self.is_ready()
+        for query, result in zip(misses, results, strict=True):
+            if isinstance(result, Exception):
+                by_query[query] = []
+                continue
+            by_query[query] = self._parse_workspace_symbols(result)
+            if cache is not None and ready and by_query[query]:
+                cache.put('workspace', f"{tree}:{query}", [s.to_dict() for s in by_query[query]])
+        return {query: by_query[query] for query in queries}
+
+    def _parse_workspace_symbols(self, result: list | None) -> list[Symbol]:
+        """Parse workspace/symbol results."""
+        symbols = []
+        for sym in result or []:
+            loc = sym.get('location', {})
+            range_info = loc.get('range', {}).get('start', {})
+            range_end = loc.get('range', {}).get('end', {})
+            symbols.append(Symbol(
+                name=sym.get('name', ''),
+                kind=SymbolKind.to_string(sym.get('kind', 0)),
+                location=Location(
+                    file=self._uri_to_path(loc.get('uri', '')),
+                    line=range_info.get('line', 0),
+                    column=range_info.get('character', 0),
+                    end_line=range_end.get('line'),
+                    end_column=range_end.get('character'),
+                ),
+                container=sym.get('containerName'),
+            ))
+        return symbols
+
+    @_request
     def get_definition(self, file: str, line: int, col: int) -> Location | None:
         """Get definition location for symbol at position (0-based line/col)."""
         self._ensure_initialized()
@@ -292,6 +486,7 @@ class LSPAdapter:
         except LSPRequestError:
             return None
 
+    @_request
     def get_references(self, file: str, line: int, col: int, include_declaration: bool = True) -> list[Location]:
         """Get all references to symbol at position (0-based line/col)."""
         self._ensure_initialized()
@@ -323,8 +518,21 @@ class LSPAdapter:
         except LSPRequestError:
             return []
 
+    @_request
     def get_hover(self, file: str, line: int, col: int) -> HoverInfo | None:
         """Get hover information for symbol at position (0-based line/col)."""
+        key = self._file_cache_key(file)
+        key = f"{key}:{line}:{col}" if key else None
+        cached = self.result_cache.get('hover', key) if key else None
+        if cached is not None:
+            return HoverInfo.from_dict(cached['hover']) if cached['hover'] else None
+
+        hover = self._request_hover(file, line, col)
+        if key and hover is not _HOVER_FAILED:
+            self.result_cache.put('hover', key, {'hover': hover.to_dict() if hover else None})
+        return None if hover is _HOVER_FAILED else hover
+
+    def _request_hover(self, file: str, line: int, col: int):
         self._ensure_initialized()
         self._open_document(file)
 
@@ -356,25 +564,61 @@ class LSPAdapter:
 
             return HoverInfo(contents=text)
         except LSPRequestError:
-            return None
+            return _HOVER_FAILED
 
+    @_request
     def get_diagnostics(self, file: str) -> list[Diagnostic]:
         """Get compiler errors/warnings for a file."""
         self._ensure_initialized()
+        opened = time.monotonic()
         self._open_document(file)
 
-        abs_path = Path(file)
-        if not abs_path.is_absolute():
-            abs_path = self.project_path / file
+        if not self.client:
+            return []
+        return self.client.wait_for_diagnostics(str(self._abs_path(file)), self.DIAGNOSTICS_TIMEOUT,
+                                                since=opened)
 
-        time.sleep(0.5)  # Give server time to compute diagnostics
-        return self.client.get_diagnostics(str(abs_path)) if self.client else []
+    @_request
+    def get_diagnostics_many(self, files: list[str]) -> dict[str, list[Diagnostic]]:
+        """Open many files at once, then collect diagnostics as the server publishes them."""
+        self._ensure_initialized()
+        opened = time.monotonic()
+        for file in files:
+            self._open_document(file)
+        if not self.client:
+            return {file: [] for file in files}
+
+        deadline = time.monotonic() + self.DIAGNOSTICS_TIMEOUT
+        return {
+            file: self.client.wait_for_diagnostics(
+                str(self._abs_path(file)), max(0.0, deadline - time.monotonic()), since=opened)
+            for file in files
+        }
+
+    def attach(self, client):
+        """Use an already-initialized client (e.g. a broker connection)."""
+        self.client = client
+        self._initialized = True
+
+    def is_alive(self) -> bool:
+        """Whether the server connection is up."""
+        return self.client is not None and self.client.is_alive()
 
     def shutdown(self):
-        """Gracefully shutdown the language server."""
+        """Gracefully shutdown the language server (pooled adapters are released to their pool)."""
+        if self._pool is not None:
+            self._pool.release(self)
+            return
+        self.close()
+
+    def close(self):
+        """Shut the language server down (and write back cached results)."""
+        if self._result_cache is not None:
+            self._result_cache.flush()
         for uri in list(self._open_documents):
             if self.client:
-                self.client.send_notification('textDocument/didClose', {'textDocument': {'uri': uri}})
+                with suppress(OSError):  # The server may already have exited
+                    self.client.send_notification('textDocument/didClose', {'textDocument': {'uri': uri}})
         self._open_documents.clear()
 
         if self.client:
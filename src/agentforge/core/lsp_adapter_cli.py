@@ -42,7 +42,7 @@ def build_parser():
 
 
 def get_adapter(args):
-    """Get appropriate LSP adapter based on args."""
+    """Get appropriate (pooled, initialized) LSP adapter based on args."""
     try:
         from .lsp_adapters import (
             CSharpLSPAdapter,
@@ -50,6 +50,7 @@ def get_adapter(args):
             TypeScriptAdapter,
             get_adapter_for_project,
         )
+        from .lsp_pool import get_pool
     except ImportError:
         from lsp_adapters import (
             CSharpLSPAdapter,
@@ -57,11 +58,15 @@ def get_adapter(args):
             TypeScriptAdapter,
             get_adapter_for_project,
         )
+        from lsp_pool import get_pool
 
     if args.language:
         adapters = {"csharp": CSharpLSPAdapter, "python": PyrightAdapter, "typescript": TypeScriptAdapter}
-        return adapters[args.language](args.project)
-    return get_adapter_for_project(args.project)
+        adapter_cls = adapters[args.language]
+    else:
+        adapter_cls = type(get_adapter_for_project(args.project))
+    print(f"Using {adapter_cls.SERVER_NAME} for {args.project}")
+    return get_pool().get(adapter_cls, args.project)
 
 
 def print_symbols(adapter, args):
@@ -133,19 +138,15 @@ def main():
         parser.print_help()
         return 1
 
-    adapter = get_adapter(args)
-    print(f"Using {adapter.SERVER_NAME} for {args.project}")
-
     try:
-        print("Initializing LSP server...")
-        adapter.initialize()
-        print("Server initialized successfully")
-        run_command(adapter, args)
+        adapter = get_adapter(args)
     except (LSPServerNotFound, LSPInitializationError) as e:
         print(f"\nError: {e}")
         return 1
+
+    try:
+        run_command(adapter, args)
     finally:
-        print("\nShutting down...")
         adapter.shutdown()
 
     return 0
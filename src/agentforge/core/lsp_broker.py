@@ -0,0 +1,407 @@
+#!/usr/bin/env python3
+"""
+LSP Broker
+==========
+
+Out-of-process owner of warm language servers.
+
+Each `agentforge` invocation is a fresh process, so an in-process pool
+alone still cold-starts OmniSharp/pyright on every run. The broker keeps
+an LSPServerPool alive between runs and serves it over a Unix domain
+socket; LSPServerPool attaches to it transparently when its socket is
+live and starts local servers otherwise.
+
+The broker's pool applies the usual idle timeout and restart-on-crash, so
+a server that dies is restarted on the next request that needs it.
+
+Wire format (both directions, see unix_socket): 4-byte big-endian length + JSON payload.
+    {"op": "ping"}                                   -> broker info
+    {"op": "attach", "server": ..., "root": ...}     -> {"ok": true} or {"error": ...}
+  then, on the attached connection:
+    {"op": "requests", "requests": [[method, params], ...], "timeout": s,
+     "max_in_flight": n}                             -> {"results": [...]}
+    {"op": "notify", "method": ..., "params": ...}   (no reply)
+    {"op": "diagnostics", "file": ..., "timeout": s, "age": s}
+                                                     -> {"diagnostics": [...]}
+    {"op": "idle", "timeout": s, "settle": s}        -> {"idle": bool}
+
+Usage:
+    python -m agentforge.core.lsp_broker                      # foreground
+    python -m agentforge.core.lsp_broker --idle-timeout 3600
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict
+from pathlib import Path
+
+try:
+    from .lsp_client import LSPError, LSPRequestError, LSPTimeoutError
+    from .lsp_pool import ADAPTER_CLASSES, LSPServerPool
+    from .lsp_types import Diagnostic
+    from .unix_socket import UnixSocketServer, recv_json, send_json
+except ImportError:
+    from lsp_client import LSPError, LSPRequestError, LSPTimeoutError
+    from lsp_pool import ADAPTER_CLASSES, LSPServerPool
+    from lsp_types import Diagnostic
+    from unix_socket import UnixSocketServer, recv_json, send_json
+
+DEFAULT_SOCKET_PATH = Path.home() / ".agentforge" / "run" / "lsp-broker.sock"
+SOCKET_ENV_VAR = "AGENTFORGE_LSP_BROKER_SOCKET"
+
+DEFAULT_IDLE_TIMEOUT = 1800.0
+
+
+class BrokerUnavailable(ConnectionError):
+    """No broker is listening, or it could not provide the server."""
+
+
+def default_socket_path() -> Path:
+    """Broker socket ($AGENTFORGE_LSP_BROKER_SOCKET overrides)."""
+    if os.environ.get(SOCKET_ENV_VAR):
+        return Path(os.environ[SOCKET_ENV_VAR]).expanduser()
+    return DEFAULT_SOCKET_PATH
+
+
+# =============================================================================
+# Results
+# =============================================================================
+
+def _encode_result(result) -> dict:
+    if isinstance(result, LSPRequestError):
+        return {"error": result.error, "method": result.method}
+    if isinstance(result, LSPTimeoutError):
+        return {"timeout": str(result)}
+    if isinstance(result, Exception):
+        return {"failed": str(result)}
+    return {"result": result}
+
+
+def _decode_result(encoded: dict):
+    if "error" in encoded:
+        return LSPRequestError(encoded["method"], encoded["error"])
+    if "timeout" in encoded:
+        return LSPTimeoutError(encoded["timeout"])
+    if "failed" in encoded:
+        return LSPError(encoded["failed"])
+    return encoded.get("result")
+
+
+# =============================================================================
+# Server
+# =============================================================================
+
+class _RequestHandler(socketserver.BaseRequestHandler):
+    """Serves one client connection until it closes."""
+
+    def handle(self) -> None:
+        broker: LSPBroker = self.server.owner
+        self.key = None
+        try:
+            self._serve(broker)
+        finally:
+            if self.key is not None:
+                with contextlib.suppress(Exception):
+                    broker.release_documents(broker.pool.get(*self.key, lazy=True), id(self))
+
+    def _serve(self, broker: "LSPBroker") -> None:
+        key = None
+        while True:
+            try:
+                message = recv_json(self.request)
+            except (ConnectionError, OSError, ValueError):
+                return
+
+            op = message.get("op")
+            try:
+                if op == "ping":
+                    send_json(self.request, broker.info())
+                elif op == "attach":
+                    key = (ADAPTER_CLASSES[message["server"]], message["root"])
+                    broker.pool.get(*key)
+                    self.key = key
+                    send_json(self.request, {"ok": True})
+                elif key is None:
+                    send_json(self.request, {"error": f"Not attached (op {op!r})"})
+                else:
+                    reply = broker.dispatch(broker.pool.get(*key), message, id(self))
+                    if reply is not None:
+                        send_json(self.request, reply)
+            except (ConnectionError, OSError):
+                return
+            except Exception as e:
+                if op != "notify":
+                    with contextlib.suppress(OSError):
+                        send_json(self.request, {"error": str(e)})
+
+
+class LSPBroker(UnixSocketServer):
+    """
+    Keeps an LSPServerPool warm and serves it over a Unix socket.
+
+    Example:
+        broker = LSPBroker(default_socket_path())
+        broker.serve_forever()
+    """
+
+    handler_class = _RequestHandler
+    label = "LSP broker"
+
+    def __init__(self, socket_path: Path, idle_timeout: float = DEFAULT_IDLE_TIMEOUT):
+        super().__init__(socket_path)
+        self.pool = LSPServerPool(idle_timeout=idle_timeout, use_broker=False)
+        self._documents_lock = threading.Lock()
+        self._document_users: dict[tuple[int, str], set[int]] = {}  # (adapter, uri) -> connections
+
+    def info(self) -> dict:
+        return {"pid": os.getpid(), "servers": self.pool.stats()}
+
+    def dispatch(self, adapter, message: dict, connection: int = 0) -> dict | None:
+        """Run one op against a pooled adapter; returns the reply (None for notifications)."""
+        with adapter.in_use():  # The pool won't stop the server mid-op
+            adapter._ensure_initialized()
+            return self._dispatch(adapter, message, connection)
+
+    def _dispatch(self, adapter, message: dict, connection: int) -> dict | None:
+        op = message["op"]
+        if op == "requests":
+            results = adapter.client.send_requests(
+                [tuple(request) for request in message["requests"]],
+                timeout=message.get("timeout"), return_exceptions=True,
+                max_in_flight=message.get("max_in_flight"))
+            return {"results": [_encode_result(result) for result in results]}
+        if op == "notify":
+            self._notify(adapter, message["method"], message.get("params") or {}, connection)
+            return None
+        if op == "diagnostics":
+            since = time.monotonic() - message["age"] if message.get("age") is not None else None
+            diagnostics = adapter.client.wait_for_diagnostics(
+                message["file"], message.get("timeout", 0.0), since=since)
+            return {"diagnostics": [asdict(d) for d in diagnostics]}
+        if op == "idle":
+            return {"idle": adapter.client.wait_until_idle(message["timeout"], message.get("settle", 0.2))}
+        return {"error": f"Unknown op {op!r}"}
+
+    def _notify(self, adapter, method: str, params: dict, connection: int = 0) -> None:
+        """
+        Forward a notification.
+
+        Document sync goes through the shared adapter so several clients
+        opening the same file yield one didOpen (and didChange only when the
+        text differs). A document is closed on the server once every
+        connection that opened it has closed it or disconnected.
+        """
+        if method == "textDocument/didOpen":
+            document = params["textDocument"]
+            with self._documents_lock:
+                adapter.open_text(document["uri"], document["text"])
+                self._document_users.setdefault((id(adapter), document["uri"]), set()).add(connection)
+        elif method == "textDocument/didChange":
+            with self._documents_lock:
+                adapter.open_text(params["textDocument"]["uri"], params["contentChanges"][-1]["text"])
+        elif method == "textDocument/didClose":
+            with self._documents_lock:
+                self._close_for(adapter, params["textDocument"]["uri"], connection)
+        else:
+            adapter.client.send_notification(method, params)
+
+    def _close_for(self, adapter, uri: str, connection: int) -> None:
+        users = self._document_users.get((id(adapter), uri))
+        if users is None:
+            return
+        users.discard(connection)
+        if not users:
+            del self._document_users[(id(adapter), uri)]
+            adapter.close_uri(uri)
+
+    def release_documents(self, adapter, connection: int) -> None:
+        """Close the documents only a disconnected client still had open."""
+        with self._documents_lock:
+            uris = [uri for (adapter_id, uri), users in self._document_users.items()
+                    if adapter_id == id(adapter) and connection in users]
+            for uri in uris:
+                self._close_for(adapter, uri, connection)
+
+    def is_live(self) -> bool:
+        return ping(self.socket_path) is not None
+
+    def _close(self) -> None:
+        super()._close()
+        self.pool.shutdown_all()
+
+
+# =============================================================================
+# Client
+# =============================================================================
+
+def ping(socket_path: Path | None = None) -> dict | None:
+    """Broker info, or None if no broker is listening."""
+    socket_path = Path(socket_path or default_socket_path())
+    if not socket_path.exists():
+        return None
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(5.0)
+            sock.connect(str(socket_path))
+            send_json(sock, {"op": "ping"})
+            return recv_json(sock)
+    except (ConnectionError, OSError, ValueError):
+        return None
+
+
+class BrokerLSPClient:
+    """
+    LSPClient stand-in that talks to a server owned by the broker.
+
+    Implements the subset of LSPClient that LSPAdapter uses, over one
+    persistent connection. shutdown() only closes the connection; the
+    broker keeps the server running.
+    """
+
+    ASYNC_WORKERS = 4
+
+    def __init__(self, sock: socket.socket, timeout: float = 30.0):
+        self.timeout = timeout
+        self._sock: socket.socket | None = sock
+        self._lock = threading.Lock()
+        self._executor: ThreadPoolExecutor | None = None
+
+    @classmethod
+    def attach(cls, server_name: str, project_root: str, socket_path: Path | None = None,
+               init_timeout: float = 120.0) -> "BrokerLSPClient":
+        """
+        Connect and attach to the broker's server for (server, project root).
+
+        Raises:
+            BrokerUnavailable: No broker is listening or it can't start the server
+        """
+        socket_path = Path(socket_path or default_socket_path())
+        if not socket_path.exists():
+            raise BrokerUnavailable(f"No LSP broker at {socket_path}")
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(init_timeout)
+        try:
+            sock.connect(str(socket_path))
+            send_json(sock, {"op": "attach", "server": server_name, "root": project_root})
+            reply = recv_json(sock)
+        except (OSError, ValueError) as e:
+            sock.close()
+            raise BrokerUnavailable(f"LSP broker at {socket_path} unreachable: {e}") from e
+        if not reply.get("ok"):
+            sock.close()
+            raise BrokerUnavailable(f"LSP broker could not start {server_name}: {reply.get('error')}")
+        sock.settimeout(None)
+        return cls(sock)
+
+    def _call(self, message: dict, expect_reply: bool = True) -> dict | None:
+        with self._lock:
+            if self._sock is None:
+                raise LSPError("LSP broker connection is closed")
+            try:
+                send_json(self._sock, message)
+                reply = recv_json(self._sock) if expect_reply else None
+            except (OSError, ValueError) as e:
+                self._close_socket()
+                raise LSPError(f"LSP broker connection lost: {e}") from e
+        if reply is not None and "error" in reply:
+            raise LSPError(f"LSP broker error: {reply['error']}")
+        return reply
+
+    def send_requests(self, requests: list[tuple[str, dict]], timeout: float = None,
+                      return_exceptions: bool = False, max_in_flight: int = None) -> list:
+        """Send requests to the broker's server (pipelined there) and return results in order."""
+        reply = self._call({"op": "requests", "requests": [list(r) for r in requests],
+                            "timeout": timeout or self.timeout, "max_in_flight": max_in_flight})
+        results = [_decode_result(encoded) for encoded in reply["results"]]
+        if not return_exceptions:
+            for result in results:
+                if isinstance(result, LSPError):
+                    raise result
+        return results
+
+    def send_request(self, method: str, params: dict, timeout: float = None):
+        return self.send_requests([(method, params)], timeout)[0]
+
+    def send_request_async(self, method: str, params: dict) -> Future:
+        """Send a request from a worker thread; the Future resolves to its result."""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(self.ASYNC_WORKERS, thread_name_prefix="lsp-broker-client")
+            executor = self._executor
+        return executor.submit(self.send_request, method, params)
+
+    def send_notification(self, method: str, params: dict):
+        self._call({"op": "notify", "method": method, "params": params}, expect_reply=False)
+
+    def expect_diagnostics(self, file_path: str):
+        """No-op: the broker clears diagnostics itself when it forwards a change."""
+
+    def get_diagnostics(self, file_path: str) -> list[Diagnostic]:
+        return self.wait_for_diagnostics(file_path, 0.0)
+
+    def wait_for_diagnostics(self, file_path: str, timeout: float,
+                             since: float | None = None) -> list[Diagnostic]:
+        age = time.monotonic() - since if since is not None else None  # Clocks differ per process
+        reply = self._call({"op": "diagnostics", "file": file_path, "timeout": timeout, "age": age})
+        return [Diagnostic(**d) for d in reply["diagnostics"]]
+
+    def wait_until_idle(self, timeout: float, settle: float = 0.2) -> bool:
+        return self._call({"op": "idle", "timeout": timeout, "settle": settle})["idle"]
+
+    def is_alive(self) -> bool:
+        return self._sock is not None
+
+    def _close_socket(self):
+        if self._sock is not None:
+            with contextlib.suppress(OSError):
+                self._sock.close()
+            self._sock = None
+
+    def shutdown(self):
+        """Disconnect (the broker keeps the server warm)."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+        with self._lock:
+            self._close_socket()
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+def main():
+    """Run the LSP broker in the foreground."""
+    parser = argparse.ArgumentParser(description="Keep language servers warm across agentforge runs")
+    parser.add_argument("--socket", help="Socket path (default: ~/.agentforge/run/lsp-broker.sock)")
+    parser.add_argument("--idle-timeout", type=float, default=DEFAULT_IDLE_TIMEOUT,
+                        help="Seconds a server may sit unused before it is shut down")
+    parser.add_argument("--status", action="store_true", help="Print the running broker's servers and exit")
+    args = parser.parse_args()
+
+    socket_path = Path(args.socket) if args.socket else default_socket_path()
+    if args.status:
+        info = ping(socket_path)
+        print(json.dumps(info, indent=2) if info else f"No LSP broker on {socket_path}")
+        return 0 if info else 1
+
+    broker = LSPBroker(socket_path, args.idle_timeout)
+    print(f"LSP broker listening on {socket_path}", file=sys.stderr)
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))  # Still unlinks the socket
+    with contextlib.suppress(KeyboardInterrupt):
+        broker.serve_forever()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
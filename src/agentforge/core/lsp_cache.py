@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+LSP Result Cache
+================
+
+Persistent cache of parsed LSP results, so unchanged files never reach the
+language server (and a run that only hits the cache never starts one).
+
+Keys:
+    symbols    (file, SHA-256 of the file's content)
+    hover      (file, content hash, line, column)
+    workspace  (query, tree hash over every file the server handles)
+
+Every entry belongs to one server identity (server name, binary path and
+binary mtime); upgrading the server discards the cache. File content
+hashes are memoized by (size, mtime) so an unchanged tree is hashed with
+stats only; the list of files comes from the shared RepoFileIndex. A tree
+key is reused for TREE_KEY_TTL seconds, and memoized hashes are pruned to
+the files in the index whenever it is recomputed.
+
+Layout (one file per server and project under the cache root):
+    <root>/<project-slug>-<hash>/<server>.json.gz
+    <root>/<project-slug>-<hash>/lock     - flock target for writers
+
+Entries are kept in memory and written back by flush() (adapters flush
+when they are closed), merged with whatever other processes wrote since.
+
+Usage:
+    cache = LSPResultCache.for_server("pyright", project_root, server_id)
+    key = cache.file_key(path)
+    symbols = cache.get("symbols", key)
+"""
+
+import contextlib
+import fcntl
+import gzip
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from pathlib import Path
+
+try:
+    from .repo_file_index import RepoFileIndex
+except ImportError:
+    from repo_file_index import RepoFileIndex
+
+DEFAULT_CACHE_ROOT = Path.home() / ".agentforge" / "lsp_cache"
+CACHE_DIR_ENV_VAR = "AGENTFORGE_LSP_CACHE_DIR"
+CACHE_ENV_VAR = "AGENTFORGE_LSP_CACHE"  # "0" disables the cache
+
+DEFAULT_MAX_ENTRIES = 50_000
+
+
+def cache_enabled() -> bool:
+    return os.environ.get(CACHE_ENV_VAR) != "0"
+
+
+def default_cache_root() -> Path:
+    """Cache root ($AGENTFORGE_LSP_CACHE_DIR overrides)."""
+    return Path(os.environ.get(CACHE_DIR_ENV_VAR) or DEFAULT_CACHE_ROOT).expanduser()
+
+
+class LSPResultCache:
+    """LRU store of JSON-serializable LSP results for one server and project."""
+
+    FORMAT_VERSION = 1
+    TREE_KEY_TTL = 2.0  # Seconds a tree key is reused before files are stat'ed again
+
+    def __init__(self, cache_file: Path, project_root: Path, server_id: str,
+                 max_entries: int = DEFAULT_MAX_ENTRIES):
+        """
+        Initialize cache (loaded lazily on first use).
+
+        Args:
+            cache_file: gzip'd JSON file holding this server/project's entries
+            project_root: Project whose files are keyed
+            server_id: Server identity; entries from another identity are dropped
+            max_entries: Least recently used entries beyond this are evicted
+        """
+        self.cache_file = Path(cache_file)
+        self.project_root = Path(project_root).resolve()
+        self.server_id = server_id
+        self.max_entries = max_entries
+        self._entries: dict[str, object] = {}  # Insertion order = LRU order
+        self._hashes: dict[str, list] = {}  # rel path -> [size, mtime_ns, sha256]
+        self._tree_keys: dict[frozenset[str], tuple[float, str]] = {}  # extensions -> (time, key)
+        self._indexed: set[str] | None = None  # Paths in the index at the last tree_key
+        self._dirty = False
+        self._loaded = False
+        self._lock = threading.RLock()
+
+    @classmethod
+    def for_server(cls, server_name: str, project_root: str | Path, server_id: str,
+                   root: Path | None = None) -> "LSPResultCache":
+        """Create the cache for a server and project under the shared cache root."""
+        project_root = Path(project_root).resolve()
+        digest = hashlib.sha1(str(project_root).encode()).hexdigest()[:12]
+        project_dir = f"{re.sub(r'[^A-Za-z0-9_.-]+', '_', project_root.name)}-{digest}"
+        server_file = f"{re.sub(r'[^A-Za-z0-9_.-]+', '_', server_name)}.json.gz"
+        return cls(Path(root or default_cache_root()) / project_dir / server_file, project_root, server_id)
+
+    def __len__(self) -> int:
+        self._ensure_loaded()
+        return len(self._entries)
+
+    # -------------------------------------------------------------------------
+    # Keys
+    # -------------------------------------------------------------------------
+
+    def _relative(self, path: Path) -> str:
+        try:
+            return path.relative_to(self.project_root).as_posix()
+        except ValueError:
+            return str(path)
+
+    def _hash_file(self, path: Path, rel: str, size: int, mtime_ns: int) -> str | None:
+        memo = self._hashes.get(rel)
+        if memo is not None and memo[0] == size and memo[1] == mtime_ns:
+            return memo[2]
+        try:
+            digest = hashlib.sha256(path.read_bytes()).hexdigest()
+        except OSError:
+            return None
+        self._hashes[rel] = [size, mtime_ns, digest]
+        self._dirty = True
+        return digest
+
+    def file_key(self, path: str | Path) -> str | None:
+        """Key for a file's current content, or None if it can't be read."""
+        path = Path(path)
+        if not path.is_absolute():
+            path = self.project_root / path
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        with self._lock:
+            self._ensure_loaded()
+            rel = self._relative(path)
+            digest = self._hash_file(path, rel, stat.st_size, stat.st_mtime_ns)
+        return f"{rel}@{digest}" if digest else None
+
+    def tree_key(self, extensions: list[str]) -> str:
+        """
+        Key over the content of every project file with these extensions.
+
+        Reused for TREE_KEY_TTL seconds, so a burst of workspace lookups
+        stats the tree once.
+        """
+        exts = frozenset(e.lower() for e in extensions)
+        with self._lock:
+            memo = self._tree_keys.get(exts)
+            if memo is not None and time.monotonic() - memo[0] < self.TREE_KEY_TTL:
+                return memo[1]
+            self._ensure_loaded()
+            entries = RepoFileIndex.for_root(self.project_root).entries()
+            tree = hashlib.sha256()
+            for entry in entries:
+                if entry.extension not in exts:
+                    continue
+                # The index lists files; in-place edits don't touch directory
+                # mtimes, so each file is stat'ed for its current size/mtime
+                path = self.project_root / entry.path
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                digest = self._hash_file(path, entry.path, stat.st_size, stat.st_mtime_ns)
+                tree.update(f"{entry.path}\0{digest}\n".encode())
+            key = tree.hexdigest()
+            self._tree_keys[exts] = (time.monotonic(), key)
+            self._indexed = {entry.path for entry in entries}
+            self._prune_hashes()
+        return key
+
+    def _prune_hashes(self) -> None:
+        """Forget hashes of files that are no longer in the index."""
+        stale = [rel for rel in self._hashes if rel not in self._indexed]
+        for rel in stale:
+            del self._hashes[rel]
+        if stale:
+            self._dirty = True
+
+    # -------------------------------------------------------------------------
+    # Lookup / insertion
+    # -------------------------------------------------------------------------
+
+    def get(self, kind: str, key: str):
+        """Cached value, or None on a miss."""
+        with self._lock:
+            self._ensure_loaded()
+            value = self._entries.pop(f"{kind}:{key}", None)
+            if value is not None:
+                self._entries[f"{kind}:{key}"] = value  # Most recently used
+            return value
+
+    def put(self, kind: str, key: str, value) -> None:
+        with self._lock:
+            self._ensure_loaded()
+            full_key = f"{kind}:{key}"
+            self._entries.pop(full_key, None)
+            self._entries[full_key] = value
+            self._dirty = True
+            while len(self._entries) > self.max_entries:
+                self._entries.pop(next(iter(self._entries)))
+
+    # -------------------------------------------------------------------------
+    # Persistence
+    # -------------------------------------------------------------------------
+
+    def _read(self) -> dict | None:
+        try:
+            with gzip.open(self.cache_file, "rt", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError, EOFError):
+            return None
+        if data.get("version") != self.FORMAT_VERSION or data.get("server") != self.server_id:
+            return None
+        return data
+
+    def _ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        data = self._read()
+        if data is not None:
+            self._entries = data["entries"]
+            self._hashes = data["hashes"]
+
+    @contextlib.contextmanager
+    def _write_lock(self):
+        """Exclusive lock so concurrent runs merge instead of overwriting each other."""
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.cache_file.parent / "lock", "w") as lock_file:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def flush(self) -> None:
+        """Write new entries back, merged with entries other processes added."""
+        with self._lock:
+            if not self._dirty:
+                return
+            try:
+                with self._write_lock():
+                    on_disk = self._read() or {"entries": {}, "hashes": {}}
+                    entries = {k: v for k, v in on_disk["entries"].items() if k not in self._entries}
+                    entries.update(self._entries)
+                    while len(entries) > self.max_entries:
+                        entries.pop(next(iter(entries)))
+                    hashes = {**on_disk["hashes"], **self._hashes}
+                    if self._indexed is not None:
+                        hashes = {rel: memo for rel, memo in hashes.items() if rel in self._indexed}
+                    tmp = self.cache_file.with_suffix(".tmp")
+                    with gzip.open(tmp, "wt", encoding="utf-8", compresslevel=6) as f:
+                        json.dump({"version": self.FORMAT_VERSION, "server": self.server_id,
+                                   "entries": entries, "hashes": hashes}, f, separators=(",", ":"))
+                    os.replace(tmp, self.cache_file)
+            except OSError:
+                return
+            self._entries, self._hashes = entries, hashes
+            self._dirty = False
@@ -8,14 +8,20 @@ Low-level JSON-RPC 2.0 communication with language servers.
 Extracted from lsp_adapter.py for modularity.
 """
 
-import json
+import contextlib
 import os
 import queue
 import subprocess
 import sys
 import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeout
 from pathlib import Path
+from typing import BinaryIO
 
+from .lsp_transport import TRANSCRIPT_ENV_VAR, FrameParser, encode_frame, loads, read_chunk
 from .lsp_types import Diagnostic
 
 # =============================================================================
@@ -69,8 +75,23 @@ class LSPClient:
     Low-level LSP client handling JSON-RPC 2.0 communication.
 
     Manages the language server subprocess and message passing.
+
+    Requests are pipelined: send_request_async() returns a Future and any
+    number of requests may be in flight; the reader thread matches responses
+    to futures by id. Readiness is signalled by the server itself
+    ($/progress, textDocument/publishDiagnostics) rather than fixed sleeps.
+
+    Replies to server-to-client requests are queued for a writer thread:
+    the reader never waits on the write lock, so a caller blocked writing
+    into a full stdin pipe can't stall the reader that drains stdout.
+
+    Published diagnostics are stored raw and only turned into Diagnostic
+    objects for files someone asks about.
     """
 
+    MAX_IN_FLIGHT = 64
+    DIAGNOSTICS_SETTLE = 0.2  # Quiet time after server activity before giving up on a file
+
     def __init__(self, command: list[str], project_root: str, timeout: float = 30.0):
         """
         Start language server process.
@@ -85,10 +106,19 @@ class LSPClient:
         self.process: subprocess.Popen | None = None
         self.request_id = 0
         self._lock = threading.Lock()
-        self._pending_requests: dict[int, queue.Queue] = {}
+        self._write_lock = threading.Lock()
+        self._pending_requests: dict[int, tuple[str, Future]] = {}
         self._reader_thread: threading.Thread | None = None
+        self._replies: queue.Queue[dict | None] = queue.Queue()
+        self._reply_thread: threading.Thread | None = None
         self._running = False
-        self._diagnostics: dict[str, list[Diagnostic]] = {}
+        self._diagnostics: dict[str, list] = {}  # file -> [raw LSP diagnostics, parsed or None]
+        self._diagnostics_events: dict[str, threading.Event] = {}
+        self._progress = threading.Condition()
+        self._active_progress: set = set()
+        self._last_progress = 0.0
+        self._last_publish = 0.0
+        self._transcript: BinaryIO | None = None
 
         self._start_server(command)
 
@@ -109,49 +139,125 @@ class LSPClient:
                 f"Command '{' '.join(command)}' not found in PATH"
             ) from e
 
+        transcript_path = os.environ.get(TRANSCRIPT_ENV_VAR)
+        if transcript_path:
+            self._transcript = open(transcript_path, 'ab')  # noqa: SIM115 - closed in shutdown()
+
         self._running = True
         self._reader_thread = threading.Thread(target=self._read_messages, daemon=True)
         self._reader_thread.start()
+        self._reply_thread = threading.Thread(target=self._send_replies, daemon=True)
+        self._reply_thread.start()
 
     def _read_messages(self):
         """Background thread that reads messages from the server."""
-        while self._running and self.process and self.process.stdout:
-            try:
-                header_line = self.process.stdout.readline()
-                if not header_line:
+        parser = FrameParser()
+        stdout = self.process.stdout
+        try:
+            while self._running:
+                try:
+                    chunk = read_chunk(stdout)
+                except (OSError, ValueError):
+                    break
+                if not chunk:
                     break
+                transcript = self._transcript
+                if transcript:
+                    with contextlib.suppress(OSError, ValueError):  # closed by shutdown()
+                        transcript.write(chunk)
+                for payload in parser.feed(chunk):
+                    try:
+                        self._handle_message(loads(payload))
+                    except Exception as e:
+                        if self._running:
+                            print(f"LSP read error: {e}", file=sys.stderr)
+        finally:
+            self._close_transcript()
+            self._replies.put(None)  # Nobody left to reply to
 
-                header = header_line.decode('utf-8').strip()
-                if not header.startswith('Content-Length:'):
-                    continue
+        self._fail_pending(LSPError("Language server closed the connection"))
 
-                content_length = int(header.split(':')[1].strip())
-                self.process.stdout.readline()  # blank line
-                content = self.process.stdout.read(content_length).decode('utf-8')
-                message = json.loads(content)
-                self._handle_message(message)
+    def _send_replies(self):
+        """Background thread that writes replies queued by the reader."""
+        while (reply := self._replies.get()) is not None:
+            try:
+                self._send_message(reply)
+            except (OSError, ValueError):
+                return
 
-            except Exception as e:
-                if self._running:
-                    print(f"LSP read error: {e}", file=sys.stderr)
+    def _close_transcript(self):
+        """Close the wire transcript, if one is being recorded."""
+        with self._lock:
+            transcript, self._transcript = self._transcript, None
+        if transcript:
+            with contextlib.suppress(OSError):
+                transcript.close()
+
+    def _fail_pending(self, error: LSPError):
+        """Fail every outstanding request (server exited)."""
+        with self._lock:
+            pending = list(self._pending_requests.values())
+            self._pending_requests.clear()
+        for _method, future in pending:
+            future.set_exception(error)
 
     def _handle_message(self, message: dict):
         """Handle an incoming message from the server."""
         if 'id' in message and 'method' not in message:
-            request_id = message['id']
-            if request_id in self._pending_requests:
-                self._pending_requests[request_id].put(message)
+            with self._lock:
+                pending = self._pending_requests.pop(message['id'], None)
+            if pending is None:
+                return  # Cancelled or timed out
+            method, future = pending
+            if 'error' in message:
+                future.set_exception(LSPRequestError(method, message['error']))
+            else:
+                future.set_result(message.get('result'))
+
+        elif 'id' in message:
+            self._answer_server_request(message)
 
         elif 'method' in message:
             method = message['method']
+            params = message.get('params', {})
             if method == 'textDocument/publishDiagnostics':
-                params = message.get('params', {})
-                uri = params.get('uri', '')
-                diagnostics = params.get('diagnostics', [])
-                file_path = self._uri_to_path(uri)
-                self._diagnostics[file_path] = [
-                    self._parse_diagnostic(d, file_path) for d in diagnostics
-                ]
+                file_path = self._uri_to_path(params.get('uri', ''))
+                self._diagnostics[file_path] = [params.get('diagnostics', []), None]
+                self._diagnostics_event(file_path).set()
+                with self._progress:
+                    self._last_publish = time.monotonic()
+                    self._progress.notify_all()
+            elif method == '$/progress':
+                self._track_progress(params)
+
+    def _answer_server_request(self, message: dict):
+        """Queue a reply to a server-to-client request so the server doesn't stall on it."""
+        method = message['method']
+        params = message.get('params') or {}
+        if method == 'workspace/configuration':
+            reply = {'result': [None] * len(params.get('items', []))}
+        elif method in ('window/workDoneProgress/create', 'client/registerCapability',
+                        'client/unregisterCapability', 'window/showMessageRequest'):
+            reply = {'result': None}
+        else:
+            reply = {'error': {'code': -32601, 'message': f"Unsupported method: {method}"}}
+        self._replies.put({'jsonrpc': '2.0', 'id': message['id'], **reply})
+
+    def _track_progress(self, params: dict):
+        """Track active work-done progress tokens (server indexing, analysis)."""
+        token = params.get('token')
+        kind = (params.get('value') or {}).get('kind')
+        with self._progress:
+            if kind == 'begin':
+                self._active_progress.add(token)
+            elif kind == 'end':
+                self._active_progress.discard(token)
+            self._last_progress = time.monotonic()
+            self._progress.notify_all()
+
+    def _diagnostics_event(self, file_path: str) -> threading.Event:
+        with self._lock:
+            return self._diagnostics_events.setdefault(file_path, threading.Event())
 
     def _parse_diagnostic(self, diag: dict, file_path: str) -> Diagnostic:
         """Parse a diagnostic from LSP format."""
@@ -171,13 +277,55 @@ class LSPClient:
 
     def _send_message(self, message: dict):
         """Send a JSON-RPC message to the server."""
-        content = json.dumps(message)
-        header = f"Content-Length: {len(content)}\r\n\r\n"
-        full_message = header + content
+        frame = encode_frame(message)
+
+        with self._write_lock:
+            if self.process and self.process.stdin:
+                self.process.stdin.write(frame)
+                self.process.stdin.flush()
 
-        if self.process and self.process.stdin:
-            self.process.stdin.write(full_message.encode('utf-8'))
-            self.process.stdin.flush()
+    def send_request_async(self, method: str, params: dict) -> Future:
+        """
+        Send a JSON-RPC request without waiting for the response.
+
+        Returns:
+            Future resolving to the response result (LSPRequestError on error)
+        """
+        future: Future = Future()
+        with self._lock:
+            self.request_id += 1
+            request_id = self.request_id
+            self._pending_requests[request_id] = (method, future)
+
+        try:
+            self._send_message({
+                'jsonrpc': '2.0',
+                'id': request_id,
+                'method': method,
+                'params': params,
+            })
+        except Exception as e:
+            with self._lock:
+                self._pending_requests.pop(request_id, None)
+            future.set_exception(LSPError(f"Failed to send '{method}': {e}"))
+        future.request_id = request_id
+        return future
+
+    def _await(self, method: str, future: Future, timeout: float):
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeout as e:
+            self._cancel(future)
+            raise LSPTimeoutError(f"Request '{method}' timed out after {timeout}s") from e
+
+    def _cancel(self, future: Future):
+        """Forget a pending request and ask the server to drop it."""
+        request_id = getattr(future, 'request_id', None)
+        with self._lock:
+            pending = self._pending_requests.pop(request_id, None)
+        if pending is not None:
+            with contextlib.suppress(Exception):
+                self.send_notification('$/cancelRequest', {'id': request_id})
 
     def send_request(self, method: str, params: dict, timeout: float = None) -> dict:
         """
@@ -196,35 +344,49 @@ class LSPClient:
             LSPTimeoutError: If the request times out
         """
         timeout = timeout or self.timeout
+        return self._await(method, self.send_request_async(method, params), timeout)
 
-        with self._lock:
-            self.request_id += 1
-            request_id = self.request_id
-
-        response_queue: queue.Queue = queue.Queue()
-        self._pending_requests[request_id] = response_queue
-
-        try:
-            message = {
-                'jsonrpc': '2.0',
-                'id': request_id,
-                'method': method,
-                'params': params,
-            }
-            self._send_message(message)
+    def send_requests(self, requests: list[tuple[str, dict]], timeout: float = None,
+                      return_exceptions: bool = False, max_in_flight: int = None) -> list:
+        """
+        Send many requests pipelined and collect their results in order.
 
-            try:
-                response = response_queue.get(timeout=timeout)
-            except queue.Empty as e:
-                raise LSPTimeoutError(f"Request '{method}' timed out after {timeout}s") from e
+        At most max_in_flight requests are outstanding at once; the next is
+        sent as soon as the oldest completes.
 
-            if 'error' in response:
-                raise LSPRequestError(method, response['error'])
+        Args:
+            requests: (method, params) pairs
+            timeout: Timeout per request in seconds (uses default if not specified)
+            return_exceptions: Return LSPError instances in place of failed
+                results instead of raising the first one
+            max_in_flight: Pipeline depth (default MAX_IN_FLIGHT)
 
-            return response.get('result')
+        Returns:
+            Results in request order
+        """
+        timeout = timeout or self.timeout
+        window = max(1, max_in_flight or self.MAX_IN_FLIGHT)
+        in_flight: deque[tuple[str, Future]] = deque()
+        results = []
 
-        finally:
-            del self._pending_requests[request_id]
+        def collect_oldest():
+            method, future = in_flight.popleft()
+            try:
+                results.append(self._await(method, future, timeout))
+            except LSPError as e:
+                if not return_exceptions:
+                    for _method, pending in in_flight:
+                        self._cancel(pending)
+                    raise
+                results.append(e)
+
+        for method, params in requests:
+            if len(in_flight) >= window:
+                collect_oldest()
+            in_flight.append((method, self.send_request_async(method, params)))
+        while in_flight:
+            collect_oldest()
+        return results
 
     def send_notification(self, method: str, params: dict):
         """Send JSON-RPC notification (no response expected)."""
@@ -236,8 +398,80 @@ class LSPClient:
         self._send_message(message)
 
     def get_diagnostics(self, file_path: str) -> list[Diagnostic]:
-        """Get cached diagnostics for a file."""
-        return self._diagnostics.get(file_path, [])
+        """Get cached diagnostics for a file (parsed on first request)."""
+        entry = self._diagnostics.get(file_path)
+        if entry is None:
+            return []
+        if entry[1] is None:
+            entry[1] = [self._parse_diagnostic(d, file_path) for d in entry[0]]
+        return entry[1]
+
+    def expect_diagnostics(self, file_path: str):
+        """Forget published diagnostics for a file whose content is about to change."""
+        self._diagnostics.pop(file_path, None)
+        self._diagnostics_event(file_path).clear()
+
+    def wait_for_diagnostics(self, file_path: str, timeout: float,
+                             since: float | None = None) -> list[Diagnostic]:
+        """
+        Wait until the server has published diagnostics for a file, then return them.
+
+        Servers often publish nothing for clean or unsupported files, so the
+        wait also ends once the server has shown activity since `since`
+        (published for other files, or ended its work-done progress) and then
+        stayed quiet for DIAGNOSTICS_SETTLE seconds with no work in progress.
+
+        Args:
+            file_path: File whose diagnostics are wanted
+            timeout: Upper bound on the wait in seconds
+            since: monotonic time the file was opened (default: now)
+        """
+        event = self._diagnostics_event(file_path)
+        start = time.monotonic()
+        since = start if since is None else since
+        deadline = start + timeout
+        with self._progress:
+            while not event.is_set():
+                now = time.monotonic()
+                if now >= deadline:
+                    break
+                wait = deadline - now
+                quiet_since = max(self._last_publish, self._last_progress)
+                if quiet_since > since and not self._active_progress:
+                    if now - quiet_since >= self.DIAGNOSTICS_SETTLE:
+                        break  # The server finished its work without publishing for this file
+                    wait = min(wait, quiet_since + self.DIAGNOSTICS_SETTLE - now)
+                self._progress.wait(wait)
+        return self.get_diagnostics(file_path)
+
+    def wait_until_idle(self, timeout: float, settle: float = 0.2) -> bool:
+        """
+        Wait until the server reports no work in progress.
+
+        Returns once no $/progress token is active and no progress has been
+        reported for `settle` seconds (servers that never report progress
+        cost only the settle time).
+
+        Returns:
+            True if idle, False if the timeout expired first
+        """
+        start = time.monotonic()
+        deadline = start + timeout
+        with self._progress:
+            while True:
+                now = time.monotonic()
+                idle_since = max(start, self._last_progress)
+                if not self._active_progress and now - idle_since >= settle:
+                    return True
+                if now >= deadline:
+                    return False
+                wait = deadline - now if self._active_progress else idle_since + settle - now
+                self._progress.wait(min(wait, deadline - now))
+
+    def is_alive(self) -> bool:
+        """Whether the server process and reader thread are running."""
+        return (self.process is not None and self.process.poll() is None
+                and self._reader_thread is not None and self._reader_thread.is_alive())
 
     def _path_to_uri(self, path: str) -> str:
         """Convert file path to URI."""
@@ -268,3 +502,7 @@ class LSPClient:
 
         if self._reader_thread:
             self._reader_thread.join(timeout=2.0)
+        if self._reply_thread:
+            self._replies.put(None)
+            self._reply_thread.join(timeout=2.0)
+        self._close_transcript()
@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+LSP Server Pool
+===============
+
+Process-wide pool of initialized language servers keyed by
+(server, project root).
+
+Language servers take seconds to tens of seconds to start and index, so
+every caller (contract checks, discovery providers, context retrieval, the
+LSP CLI) shares one server per project instead of starting its own:
+- get() returns the pooled adapter, starting it on first use (or, with
+  lazy=True, on the first request the result cache can't answer)
+- dead servers are detected (process exited) and restarted on next use
+- servers unused for `idle_timeout` seconds are shut down; every adapter
+  query counts as use, and a server with a query in flight is never
+  stopped. A stopped adapter stays in the pool, so whoever holds it
+  restarts the server through the pool on its next query
+- servers that fail to start are not retried for `retry_after` seconds
+- adapter.shutdown() on a pooled adapter just releases it; the pool shuts
+  servers down when idle and at interpreter exit
+
+When an LSP broker (see lsp_broker.py) is running, the pool attaches to
+its already-warm servers instead of starting local ones, so repeated CLI
+invocations skip server start-up entirely.
+
+Usage:
+    adapter = get_lsp_adapter(Path("src/Domain/Order.cs"), search_root=repo_root)
+    adapter = get_pool().get_for_project("/path/to/project")
+"""
+
+import atexit
+import contextlib
+import os
+import shutil
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+try:
+    from .lsp_adapter import LSPAdapter
+    from .lsp_adapters import (
+        CSharpLSPAdapter,
+        OmniSharpAdapter,
+        PyrightAdapter,
+        TypeScriptAdapter,
+        get_adapter_for_project,
+    )
+    from .lsp_client import LSPServerNotFound
+except ImportError:
+    from lsp_adapter import LSPAdapter
+    from lsp_adapters import (
+        CSharpLSPAdapter,
+        OmniSharpAdapter,
+        PyrightAdapter,
+        TypeScriptAdapter,
+        get_adapter_for_project,
+    )
+    from lsp_client import LSPServerNotFound
+
+BROKER_ENV_VAR = "AGENTFORGE_LSP_BROKER"  # "0" disables attaching to a broker
+
+ADAPTER_CLASSES: dict[str, type[LSPAdapter]] = {
+    cls.SERVER_NAME: cls
+    for cls in (CSharpLSPAdapter, OmniSharpAdapter, PyrightAdapter, TypeScriptAdapter)
+}
+
+# Files that mark a project root, per language, in order of preference
+PROJECT_MARKERS: dict[str, list[list[str]]] = {
+    "csharp": [["*.sln"], ["*.csproj"]],
+    "python": [["pyproject.toml", "setup.py", "setup.cfg"]],
+    "typescript": [["tsconfig.json", "package.json"]],
+}
+
+
+@dataclass
+class _PoolEntry:
+    adapter: LSPAdapter
+    last_used: float
+
+
+class LSPServerPool:
+    """Shares initialized LSP adapters across callers in a process."""
+
+    DEFAULT_IDLE_TIMEOUT = 600.0
+    DEFAULT_RETRY_AFTER = 60.0
+
+    def __init__(self, idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+                 retry_after: float = DEFAULT_RETRY_AFTER, use_broker: bool | None = None):
+        """
+        Initialize pool.
+
+        Args:
+            idle_timeout: Seconds a server may sit unused before shutdown
+            retry_after: Seconds before retrying a server that failed to start
+            use_broker: Attach to a running LSP broker when available
+                (default: unless $AGENTFORGE_LSP_BROKER is "0")
+        """
+        self.idle_timeout = idle_timeout
+        self.retry_after = retry_after
+        self.use_broker = os.environ.get(BROKER_ENV_VAR) != "0" if use_broker is None else use_broker
+        self._entries: dict[tuple[str, str], _PoolEntry] = {}
+        self._failures: dict[tuple[str, str], tuple[float, Exception]] = {}
+        self._key_locks: dict[tuple[str, str], threading.Lock] = {}
+        self._lock = threading.Lock()
+        self._reaper: threading.Thread | None = None
+        self._closed = threading.Event()
+
+    # -------------------------------------------------------------------------
+    # Acquire / release
+    # -------------------------------------------------------------------------
+
+    def get(self, adapter_cls: type[LSPAdapter], project_root: str | Path, lazy: bool = False) -> LSPAdapter:
+        """
+        Get an adapter for (server, project root).
+
+        Args:
+            adapter_cls: Adapter (server) to use
+            project_root: Project the server is rooted at
+            lazy: Don't start the server until a request misses the result
+                cache (only checks that the server binary is installed)
+
+        Raises:
+            LSPServerNotFound / LSPInitializationError: Server can't be started
+                (re-raised without retrying until retry_after has passed)
+        """
+        root = str(Path(project_root).resolve())
+        key = (adapter_cls.SERVER_NAME, root)
+
+        with self._key_lock(key):
+            entry = self._entries.get(key)
+            if entry is not None and entry.adapter._initialized and not entry.adapter.is_alive():
+                print(f"LSP server {key[0]} for {root} died; restarting", file=sys.stderr)
+                entry.adapter.stop_if_unused()
+
+            if entry is None:
+                if lazy and not (adapter_cls.SERVER_COMMAND and shutil.which(adapter_cls.SERVER_COMMAND[0])):
+                    raise LSPServerNotFound(adapter_cls.SERVER_NAME, adapter_cls.INSTALL_INSTRUCTIONS)
+                adapter = adapter_cls(root)
+                adapter._pool = self
+                entry = _PoolEntry(adapter, time.monotonic())
+                with self._lock:
+                    self._entries[key] = entry
+                self._ensure_reaper()
+
+            entry.last_used = time.monotonic()
+            if not lazy:
+                self._connect(entry.adapter, key)
+            return entry.adapter
+
+    def _key_lock(self, key: tuple[str, str]) -> threading.Lock:
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.RLock())
+
+    def connect(self, adapter: LSPAdapter) -> bool:
+        """Start (or attach to a broker for) a pooled adapter's server; called by adapter.initialize()."""
+        key = (adapter.SERVER_NAME, str(adapter.project_path))
+        with self._key_lock(key):
+            return self._connect(adapter, key)
+
+    def get_for_project(self, project_path: str | Path, lazy: bool = False) -> LSPAdapter:
+        """Get the adapter for a project's primary language."""
+        return self.get(type(get_adapter_for_project(str(project_path))), project_path, lazy=lazy)
+
+    def release(self, adapter: LSPAdapter) -> None:
+        """Return an adapter to the pool (it stays running until idle)."""
+        self.touch(adapter)
+
+    def touch(self, adapter: LSPAdapter) -> None:
+        """Record use of a pooled adapter (called around every adapter query)."""
+        key = (adapter.SERVER_NAME, str(adapter.project_path))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.adapter is adapter:
+                entry.last_used = time.monotonic()
+
+    def _connect(self, adapter: LSPAdapter, key: tuple[str, str]) -> bool:
+        if adapter._initialized:
+            return True
+        failure = self._failures.get(key)
+        if failure and time.monotonic() - failure[0] < self.retry_after:
+            raise failure[1]
+        try:
+            client = self._attach_broker(adapter) if self.use_broker else None
+            if client is None:
+                adapter._start_server()
+        except Exception as e:
+            self._failures[key] = (time.monotonic(), e)
+            raise
+        self._failures.pop(key, None)
+        return True
+
+    def _attach_broker(self, adapter: LSPAdapter):
+        """Attach the adapter to a running broker's server, if there is one."""
+        try:
+            from .lsp_broker import BrokerLSPClient, BrokerUnavailable
+        except ImportError:
+            from lsp_broker import BrokerLSPClient, BrokerUnavailable
+        try:
+            client = BrokerLSPClient.attach(adapter.SERVER_NAME, str(adapter.project_path))
+        except BrokerUnavailable:
+            return None
+        adapter.attach(client)
+        return client
+
+    # -------------------------------------------------------------------------
+    # Health and shutdown
+    # -------------------------------------------------------------------------
+
+    def _discard(self, key: tuple[str, str]) -> None:
+        with self._lock:
+            entry = self._entries.pop(key, None)
+        if entry is not None:
+            entry.adapter._pool = None
+            with contextlib.suppress(Exception):
+                entry.adapter.close()
+
+    def _ensure_reaper(self) -> None:
+        with self._lock:
+            if self._reaper is None or not self._reaper.is_alive():
+                self._reaper = threading.Thread(target=self._reap, daemon=True, name="lsp-pool-reaper")
+                self._reaper.start()
+
+    def _reap(self) -> None:
+        """Shut down servers that are idle or have exited."""
+        interval = max(1.0, min(self.idle_timeout / 4, 30.0))
+        while not self._closed.wait(interval):
+            with self._lock:
+                running = [entry for entry in self._entries.values() if entry.adapter._initialized]
+            for entry in running:
+                with contextlib.suppress(Exception):
+                    entry.adapter.stop_if_unused(lambda e=entry: self._is_stale(e))
+
+    def _is_stale(self, entry: _PoolEntry) -> bool:
+        return (time.monotonic() - entry.last_used > self.idle_timeout
+                or not entry.adapter.is_alive())
+
+    def stats(self) -> list[dict]:
+        """Pooled adapters with their idle time and health (stopped ones have started=False)."""
+        now = time.monotonic()
+        with self._lock:
+            return [
+                {"server": server, "root": root, "idle_s": round(now - entry.last_used, 1),
+                 "started": entry.adapter._initialized, "alive": entry.adapter.is_alive()}
+                for (server, root), entry in self._entries.items()
+            ]
+
+    def shutdown_all(self) -> None:
+        """Shut down every pooled server."""
+        self._closed.set()
+        with self._lock:
+            keys = list(self._entries)
+        for key in keys:
+            self._discard(key)
+
+
+# =============================================================================
+# Process-wide pool
+# =============================================================================
+
+_pool: LSPServerPool | None = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> LSPServerPool:
+    """The process-wide pool (shut down at interpreter exit)."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = LSPServerPool()
+            atexit.register(_pool.shutdown_all)
+        return _pool
+
+
+def adapter_class_for_file(file_path: str | Path) -> type[LSPAdapter] | None:
+    """Adapter class serving a file's language, by extension."""
+    suffix = Path(file_path).suffix.lower()
+    if suffix in CSharpLSPAdapter.FILE_EXTENSIONS:
+        return OmniSharpAdapter if OmniSharpAdapter.is_available() else CSharpLSPAdapter
+    for cls in (PyrightAdapter, TypeScriptAdapter):
+        if suffix in cls.FILE_EXTENSIONS:
+            return cls
+    return None
+
+
+def find_project_root(file_path: str | Path, language: str, search_root: str | Path | None = None) -> Path:
+    """
+    Nearest ancestor of a file holding the language's project markers.
+
+    Ancestors above search_root are not considered; without a match the
+    search root (or the file's directory) is returned.
+    """
+    file_path = Path(file_path).resolve()
+    stop = Path(search_root).resolve() if search_root else None
+    ancestors = []
+    for parent in file_path.parents:
+        ancestors.append(parent)
+        if parent == stop:
+            break
+
+    for markers in PROJECT_MARKERS.get(language, []):
+        for parent in ancestors:
+            if any(next(parent.glob(marker), None) for marker in markers):
+                return parent
+    return stop or file_path.parent
+
+
+def get_lsp_adapter(file_path: str | Path, search_root: str | Path | None = None,
+                    lazy: bool = True) -> LSPAdapter | None:
+    """
+    Pooled adapter for a file's language and project, or None if no server
+    handles the file or the server isn't installed.
+
+    The server is started lazily (see LSPServerPool.get) unless lazy=False.
+    """
+    adapter_cls = adapter_class_for_file(file_path)
+    if adapter_cls is None:
+        return None
+    root = find_project_root(file_path, adapter_cls.LANGUAGE_ID, search_root)
+    try:
+        return get_pool().get(adapter_cls, root, lazy=lazy)
+    except Exception:
+        return None
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+LSP Transport
+=============
+
+Buffered JSON-RPC framing for LSPClient.
+
+The reader pulls large chunks from the server's stdout and cuts every
+complete `Content-Length` frame out of each chunk, instead of a readline
+per header and a read per body. Bodies are encoded once to bytes, so
+Content-Length is always the byte length (correct for non-ASCII text).
+
+JSON goes through orjson when it is installed and the stdlib otherwise.
+
+Set $AGENTFORGE_LSP_TRANSCRIPT to a file path to record the raw bytes a
+server sends; the benchmark below replays such a transcript.
+
+Usage:
+    parser = FrameParser()
+    for payload in parser.feed(chunk):
+        message = loads(payload)
+    stream.write(encode_frame({"jsonrpc": "2.0", "method": "exit"}))
+
+Benchmark:
+    python -m agentforge.core.lsp_transport transcript.bin --repeat 5
+    python -m agentforge.core.lsp_transport --synthetic 20000   # workspace/symbol-heavy
+"""
+
+import argparse
+import io
+import json
+import sys
+import time
+from pathlib import Path
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+CHUNK_SIZE = 256 * 1024
+TRANSCRIPT_ENV_VAR = "AGENTFORGE_LSP_TRANSCRIPT"
+
+_HEADER_END = b"\r\n\r\n"
+_CONTENT_LENGTH = b"content-length"
+
+
+def json_backend() -> str:
+    return "orjson" if orjson is not None else "json"
+
+
+def loads(payload: bytes):
+    """Decode a JSON-RPC body."""
+    if orjson is not None:
+        return orjson.loads(payload)
+    return json.loads(payload)
+
+
+def dumps(message) -> bytes:
+    """Encode a JSON-RPC body as UTF-8 bytes."""
+    if orjson is not None:
+        return orjson.dumps(message)
+    return json.dumps(message, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def encode_frame(message) -> bytes:
+    """Frame a message with its Content-Length header (in bytes)."""
+    body = dumps(message)
+    return b"Content-Length: %d\r\n\r\n" % len(body) + body
+
+
+class FrameParser:
+    """
+    Incremental Content-Length frame parser.
+
+    feed() accepts arbitrary chunks and returns the bodies of all frames
+    completed by that chunk; partial frames are kept for the next call.
+    Header blocks without a Content-Length are skipped.
+    """
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self._body_length: int | None = None  # Set while waiting for a body
+
+    def feed(self, data: bytes) -> list[bytes]:
+        buffer = self._buffer
+        buffer += data
+        frames = []
+        pos = 0
+        while True:
+            if self._body_length is None:
+                end = buffer.find(_HEADER_END, pos)
+                if end < 0:
+                    break
+                self._body_length = self._content_length(bytes(buffer[pos:end]))
+                pos = end + len(_HEADER_END)
+                if self._body_length is None:
+                    continue
+            if len(buffer) - pos < self._body_length:
+                break
+            frames.append(bytes(buffer[pos:pos + self._body_length]))
+            pos += self._body_length
+            self._body_length = None
+        if pos:
+            del buffer[:pos]
+        return frames
+
+    @staticmethod
+    def _content_length(header: bytes) -> int | None:
+        for line in header.split(b"\r\n"):
+            name, _, value = line.partition(b":")
+            if name.strip().lower() == _CONTENT_LENGTH:
+                try:
+                    return int(value.strip())
+                except ValueError:
+                    return None
+        return None
+
+
+def read_chunk(stream, size: int = CHUNK_SIZE) -> bytes:
+    """Read whatever is available (up to size) without waiting to fill the buffer."""
+    read1 = getattr(stream, "read1", None)
+    return read1(size) if read1 is not None else stream.read(size)
+
+
+# =============================================================================
+# Benchmark
+# =============================================================================
+
+def synthetic_transcript(symbols: int, diagnostics_files: int = 200) -> bytes:
+    """Server output dominated by one large workspace/symbol response plus diagnostics noise."""
+    result = [
+        {"name": f"Symbol{i}", "kind": 5 + i % 8, "containerName": f"Namespace{i % 50}.Class{i % 500}",
+         "location": {"uri": f"file:///repo/src/Module{i % 2000}/File{i % 300}.cs",
+                      "range": {"start": {"line": i % 900, "character": 4},
+                                "end": {"line": i % 900, "character": 20}}}}
+        for i in range(symbols)
+    ]
+    out = bytearray()
+    for i in range(diagnostics_files):
+        out += encode_frame({"jsonrpc": "2.0", "method": "textDocument/publishDiagnostics", "params": {
+            "uri": f"file:///repo/src/File{i}.cs", "diagnostics": [
+                {"range": {"start": {"line": 3, "character": 1}, "end": {"line": 3, "character": 9}},
+                 "severity": 2, "code": "CS0168", "message": "Variable declared but never used — ünused"}]}})
+    out += encode_frame({"jsonrpc": "2.0", "id": 1, "result": result})
+    return bytes(out)
+
+
+def replay(transcript: bytes, chunk_size: int = CHUNK_SIZE) -> dict:
+    """Frame and decode a transcript as the client reader would; returns throughput stats."""
+    stream = io.BufferedReader(io.BytesIO(transcript), buffer_size=chunk_size)
+    parser = FrameParser()
+    frames = 0
+    start = time.perf_counter()
+    while True:
+        chunk = read_chunk(stream, chunk_size)
+        if not chunk:
+            break
+        for payload in parser.feed(chunk):
+            loads(payload)
+            frames += 1
+    elapsed = time.perf_counter() - start
+    return {
+        "backend": json_backend(),
+        "frames": frames,
+        "bytes": len(transcript),
+        "seconds": elapsed,
+        "frames_per_s": frames / elapsed if elapsed else float("inf"),
+        "mb_per_s": len(transcript) / 1e6 / elapsed if elapsed else float("inf"),
+    }
+
+
+def main():
+    """Replay a recorded (or synthetic) server transcript and report message throughput."""
+    parser = argparse.ArgumentParser(description="LSP transport throughput benchmark")
+    parser.add_argument("transcript", nargs="?",
+                        help=f"Raw server output recorded with ${TRANSCRIPT_ENV_VAR}")
+    parser.add_argument("--synthetic", type=int, default=20000, metavar="SYMBOLS",
+                        help="Without a transcript, replay one workspace/symbol response of this size")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs (best is reported)")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="Read size in bytes")
+    args = parser.parse_args()
+
+    data = Path(args.transcript).read_bytes() if args.transcript else synthetic_transcript(args.synthetic)
+    best = min((replay(data, args.chunk_size) for _ in range(max(1, args.repeat))),
+               key=lambda stats: stats["seconds"])
+    print(f"{best['frames']} frames, {best['bytes'] / 1e6:.1f} MB in {best['seconds'] * 1000:.1f} ms "
+          f"({best['frames_per_s']:.0f} frames/s, {best['mb_per_s']:.1f} MB/s, {best['backend']})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
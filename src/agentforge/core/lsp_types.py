@@ -8,7 +8,7 @@ Data classes and enums for LSP communication.
 Extracted from lsp_adapter.py for modularity.
 """
 
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field
 from enum import IntEnum
 
 
@@ -90,6 +90,17 @@ class Symbol:
     detail: str | None = None  # Type signature
     children: list['Symbol'] = field(default_factory=list)
 
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'Symbol':
+        return cls(
+            name=data['name'], kind=data['kind'], location=Location(**data['location']),
+            container=data.get('container'), detail=data.get('detail'),
+            children=[cls.from_dict(child) for child in data.get('children', [])],
+        )
+
     def __str__(self):
         if self.container:
             return f"{self.container}.{self.name} ({self.kind})"
@@ -113,3 +124,10 @@ class HoverInfo:
     """Hover information for a symbol."""
     contents: str  # Markdown formatted
     range: Location | None = None
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'HoverInfo':
+        return cls(contents=data['contents'], range=Location(**data['range']) if data.get('range') else None)
@@ -74,6 +74,11 @@ class AnalyzeExecutor(ToolBasedStageExecutor):
                         "type": "string",
                         "enum": ["regex", "semantic"],
                     },
+                    "queries": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Additional semantic queries, searched in one batch",
+                    },
                 },
                 "required": ["pattern"],
             },
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Remote Embedding Engine
+=======================
+
+Concurrent, rate-limit-aware batching for HTTP embedding providers.
+
+Sending batches strictly one after another makes a cloud index build bound
+by round-trip latency. ConcurrentEmbedder instead:
+- packs texts (in order) into batches bounded by text count and estimated
+  tokens, so large chunks don't overflow a request's token limit
+- keeps up to `concurrency` batches in flight on a thread pool
+- retries 429 / 5xx / transport errors with jittered exponential backoff
+  (tenacity), honoring Retry-After when the server sends it
+- reassembles results in input order
+
+Usage:
+    embedder = ConcurrentEmbedder(post_batch, concurrency=8,
+                                  max_batch_texts=512, max_batch_tokens=100_000)
+    vectors = embedder.embed(texts)  # post_batch(list[str]) -> list[list[float]]
+"""
+
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from tenacity import Retrying, retry_if_exception, stop_after_attempt, wait_random_exponential
+
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token estimate (~4 chars per token)."""
+    return len(text) // 4 + 1
+
+
+def plan_batches(texts: list[str], max_texts: int, max_tokens: int) -> list[tuple[int, int]]:
+    """
+    Split texts into contiguous [start, end) batches.
+
+    Each batch holds at most max_texts texts and, unless a single text is
+    larger on its own, at most max_tokens estimated tokens.
+    """
+    batches = []
+    start = 0
+    tokens = 0
+    for i, text in enumerate(texts):
+        cost = estimate_tokens(text)
+        if i > start and (i - start >= max_texts or tokens + cost > max_tokens):
+            batches.append((start, i))
+            start, tokens = i, 0
+        tokens += cost
+    if start < len(texts):
+        batches.append((start, len(texts)))
+    return batches
+
+
+def _status_code(exc: BaseException) -> int | None:
+    """HTTP status carried by an exception (httpx or SDK style), if any."""
+    for source in (exc, getattr(exc, "response", None)):
+        for attr in ("status_code", "http_status", "status"):
+            value = getattr(source, attr, None)
+            if isinstance(value, int):
+                return value
+    return None
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """Rate limits, server errors and transport failures are worth retrying."""
+    status = _status_code(exc)
+    if status is not None:
+        return status in RETRYABLE_STATUS
+    try:
+        import httpx
+        if isinstance(exc, httpx.TransportError):
+            return True
+    except ImportError:
+        pass
+    return isinstance(exc, (ConnectionError, TimeoutError))
+
+
+def _retry_after(exc: BaseException) -> float | None:
+    """Seconds from a Retry-After header, if the error response has one."""
+    headers = getattr(getattr(exc, "response", None), "headers", None)
+    if not headers:
+        return None
+    try:
+        return max(0.0, float(headers.get("retry-after")))
+    except (TypeError, ValueError):
+        return None
+
+
+class ConcurrentEmbedder:
+    """Embeds texts through a batch function with bounded concurrency and retries."""
+
+    def __init__(
+        self,
+        post_batch: Callable[[list[str]], list[list[float]]],
+        concurrency: int = 4,
+        max_batch_texts: int = 100,
+        max_batch_tokens: int = 100_000,
+        max_attempts: int = 6,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+    ):
+        """
+        Initialize embedder.
+
+        Args:
+            post_batch: Sends one batch, returns its vectors in batch order
+            concurrency: Batches in flight at once
+            max_batch_texts: Texts per request
+            max_batch_tokens: Estimated tokens per request
+            max_attempts: Attempts per batch before the error is raised
+            backoff_base: Initial backoff in seconds (doubles per attempt, jittered)
+            backoff_max: Backoff cap in seconds
+        """
+        self.post_batch = post_batch
+        self.concurrency = max(1, concurrency)
+        self.max_batch_texts = max_batch_texts
+        self.max_batch_tokens = max_batch_tokens
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+    def _wait(self, retry_state) -> float:
+        backoff = wait_random_exponential(multiplier=self.backoff_base, max=self.backoff_max)(retry_state)
+        retry_after = _retry_after(retry_state.outcome.exception())
+        return backoff if retry_after is None else max(backoff, min(retry_after, self.backoff_max))
+
+    def _post_with_retry(self, batch: list[str]) -> list[list[float]]:
+        retrying = Retrying(
+            retry=retry_if_exception(is_retryable),
+            wait=self._wait,
+            stop=stop_after_attempt(self.max_attempts),
+            reraise=True,
+        )
+        vectors = retrying(self.post_batch, batch)
+        if len(vectors) != len(batch):
+            raise RuntimeError(f"Expected {len(batch)} embeddings, got {len(vectors)}")
+        return vectors
+
+    def embed(self, texts: list[str]) -> np.ndarray:
+        """Embed texts; rows are in input order."""
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+        batches = [texts[start:end] for start, end in
+                   plan_batches(texts, self.max_batch_texts, self.max_batch_tokens)]
+        if len(batches) == 1 or self.concurrency == 1:
+            results = [self._post_with_retry(batch) for batch in batches]
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.concurrency, len(batches))) as pool:
+                results = list(pool.map(self._post_with_retry, batches))
+        return np.array([vector for result in results for vector in result], dtype=np.float32)
@@ -0,0 +1,391 @@
+#!/usr/bin/env python3
+"""
+Repository File Index
+=====================
+
+One pruned walk of the repository tree, shared by every caller that used to
+glob it independently (vector search, contract checks, discovery analyzers,
+harness tools).
+
+The walk uses os.scandir and never descends into globally excluded
+directories (.git, node_modules, virtualenvs, caches) or paths ignored by
+.gitignore files. Each file is recorded as (relative path, size, mtime,
+extension); glob and extension queries are then answered from memory with
+compiled patterns.
+
+Refreshes are incremental: a directory whose mtime is unchanged (no entries
+added, removed or renamed) keeps its cached listing, so only its
+subdirectories are stat'ed. File sizes/mtimes are updated when their
+directory is rescanned. When the project has a .agentforge directory the
+index is persisted there between runs.
+
+Usage:
+    index = RepoFileIndex.for_root(repo_root)        # shared, refreshed
+    for rel in index.glob("**/*.py"):                 # Path.glob semantics
+        path = repo_root / rel
+    index.rglob("test_*.py", under="tests")           # Path.rglob semantics
+    index.has_extension(".cs")
+"""
+
+import contextlib
+import json
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import NamedTuple
+
+GLOBAL_EXCLUDE_DIRS = frozenset({
+    ".git", ".hg", ".svn", ".agentforge", "node_modules", "__pycache__",
+    ".venv", "venv", ".tox", ".mypy_cache", ".pytest_cache", ".ruff_cache",
+})
+
+INDEX_FILE = "file_index.json"
+RACY_WINDOW_NS = 2_000_000_000  # Listings taken this soon after a dir change are re-checked
+
+
+class FileEntry(NamedTuple):
+    """A file in the index."""
+    path: str  # Relative to the root, "/"-separated
+    size: int
+    mtime_ns: int
+
+    @property
+    def extension(self) -> str:
+        return os.path.splitext(self.path)[1].lower()
+
+
+# =============================================================================
+# Pattern compilation
+# =============================================================================
+
+def _translate_segment(segment: str) -> str:
+    """Translate one glob path segment (no "/") to a regex."""
+    out = []
+    i = 0
+    while i < len(segment):
+        c = segment[i]
+        if c == "*":
+            out.append("[^/]*")
+        elif c == "?":
+            out.append("[^/]")
+        elif c == "[":
+            end = segment.find("]", i + 1)
+            if end == -1:
+                out.append(re.escape(c))
+            else:
+                body = segment[i + 1:end]
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                out.append(f"[{body}]")
+                i = end
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return "".join(out)
+
+
+def _translate_path_glob(pattern: str) -> str:
+    """Translate a "/"-separated glob with ** to a regex body (unanchored)."""
+    parts = [p for p in pattern.strip("/").split("/") if p]
+    out = ""
+    for i, part in enumerate(parts):
+        last = i == len(parts) - 1
+        if part == "**":
+            out += ".*" if last else "(?:[^/]+/)*"
+        else:
+            out += _translate_segment(part) + ("" if last else "/")
+    return out
+
+
+@lru_cache(maxsize=512)
+def compile_glob(pattern: str) -> re.Pattern:
+    """Compile a Path.glob-style pattern, matched against relative paths."""
+    return re.compile(_translate_path_glob(pattern.replace("\\", "/")) + r"\Z")
+
+
+@dataclass
+class _IgnoreRule:
+    base: str  # Directory of the .gitignore, relative to root ("" for root)
+    regex: re.Pattern
+    negate: bool
+    dir_only: bool
+
+
+def _parse_gitignore(text: str, base: str) -> list[_IgnoreRule]:
+    """Parse .gitignore lines into rules relative to their directory."""
+    rules = []
+    for raw in text.splitlines():
+        line = raw.rstrip()
+        if not line or line.startswith("#"):
+            continue
+        negate = line.startswith("!")
+        if negate:
+            line = line[1:]
+        line = line.replace("\\", "")
+        dir_only = line.endswith("/")
+        line = line.rstrip("/")
+        if not line:
+            continue
+        anchored = "/" in line
+        body = _translate_path_glob(line)
+        regex = re.compile((body if anchored else r"(?:.*/)?" + body) + r"\Z")
+        rules.append(_IgnoreRule(base, regex, negate, dir_only))
+    return rules
+
+
+def _is_ignored(rel_path: str, is_dir: bool, rules: list[_IgnoreRule]) -> bool:
+    """Apply rules in order; the last matching rule wins."""
+    ignored = False
+    for rule in rules:
+        if rule.dir_only and not is_dir:
+            continue
+        if rule.base:
+            if not rel_path.startswith(rule.base + "/"):
+                continue
+            candidate = rel_path[len(rule.base) + 1:]
+        else:
+            candidate = rel_path
+        if rule.regex.match(candidate):
+            ignored = not rule.negate
+    return ignored
+
+
+# =============================================================================
+# Index
+# =============================================================================
+
+@dataclass
+class _DirState:
+    mtime_ns: int
+    racy: bool
+    gitignore: list | None  # [size, mtime_ns] of the directory's .gitignore
+    files: list[list] = field(default_factory=list)  # [name, size, mtime_ns]
+    subdirs: list[str] = field(default_factory=list)
+
+
+class RepoFileIndex:
+    """In-memory index of a repository's files, refreshed incrementally."""
+
+    FORMAT_VERSION = 1
+
+    _instances: dict[Path, "RepoFileIndex"] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, root: Path, use_gitignore: bool = True, persist: bool = True):
+        """
+        Initialize index (empty until refresh()).
+
+        Args:
+            root: Repository root
+            use_gitignore: Skip paths ignored by .gitignore files
+            persist: Save to <root>/.agentforge/file_index.json when that
+                directory exists
+        """
+        self.root = Path(root).resolve()
+        self.use_gitignore = use_gitignore
+        self.persist = persist
+        self._dirs: dict[str, _DirState] = {}
+        self._entries: list[FileEntry] = []
+        self._lock = threading.Lock()
+        self._loaded = False
+
+    @classmethod
+    def for_root(cls, root: Path, refresh: bool = True) -> "RepoFileIndex":
+        """Shared index for a root (one per process), refreshed by default."""
+        key = Path(root).resolve()
+        with cls._instances_lock:
+            index = cls._instances.get(key)
+            if index is None:
+                index = cls._instances[key] = cls(key)
+        if refresh:
+            index.refresh()
+        return index
+
+    @property
+    def index_file(self) -> Path:
+        return self.root / ".agentforge" / INDEX_FILE
+
+    # -------------------------------------------------------------------------
+    # Walking
+    # -------------------------------------------------------------------------
+
+    def refresh(self) -> None:
+        """Bring the index up to date with the filesystem."""
+        with self._lock:
+            if not self._loaded:
+                self._load()
+                self._loaded = True
+            new_dirs: dict[str, _DirState] = {}
+            changed = self._walk("", [], new_dirs, force=False)
+            changed = changed or new_dirs.keys() != self._dirs.keys()
+            self._dirs = new_dirs
+            if changed or not self._entries:
+                self._entries = [
+                    FileEntry(f"{rel}/{name}" if rel else name, size, mtime)
+                    for rel, state in sorted(self._dirs.items())
+                    for name, size, mtime in state.files
+                ]
+                self._save()
+
+    def _walk(self, rel: str, rules: list[_IgnoreRule], out: dict[str, _DirState], force: bool) -> bool:
+        """Scan (or reuse) one directory and recurse. Returns True if anything changed."""
+        path = self.root / rel if rel else self.root
+        try:
+            stat = path.stat()
+        except OSError:
+            return True
+
+        gitignore = None
+        if self.use_gitignore:
+            try:
+                gi_stat = (path / ".gitignore").stat()
+                gitignore = [gi_stat.st_size, gi_stat.st_mtime_ns]
+            except OSError:
+                pass
+
+        cached = self._dirs.get(rel)
+        if cached and cached.gitignore != gitignore:
+            force = True  # Ignore rules changed for this subtree
+        if gitignore is not None:
+            with contextlib.suppress(OSError):
+                rules = rules + _parse_gitignore((path / ".gitignore").read_text(errors="ignore"), rel)
+
+        reuse = (not force and cached is not None and not cached.racy
+                 and cached.mtime_ns == stat.st_mtime_ns)
+        changed = not reuse
+        state = cached if reuse else self._scan(path, rel, rules, stat.st_mtime_ns, gitignore)
+        out[rel] = state
+
+        for name in state.subdirs:
+            child = f"{rel}/{name}" if rel else name
+            changed = self._walk(child, rules, out, force) or changed
+        return changed
+
+    def _scan(self, path: Path, rel: str, rules: list[_IgnoreRule], mtime_ns: int,
+              gitignore: list | None) -> _DirState:
+        state = _DirState(
+            mtime_ns=mtime_ns,
+            racy=time.time_ns() - mtime_ns < RACY_WINDOW_NS,
+            gitignore=gitignore,
+        )
+        try:
+            entries = list(os.scandir(path))
+        except OSError:
+            return state
+        for entry in entries:
+            child = f"{rel}/{entry.name}" if rel else entry.name
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name in GLOBAL_EXCLUDE_DIRS or _is_ignored(child, True, rules):
+                        continue
+                    state.subdirs.append(entry.name)
+                elif entry.is_file():
+                    if _is_ignored(child, False, rules):
+                        continue
+                    st = entry.stat()
+                    state.files.append([entry.name, st.st_size, st.st_mtime_ns])
+            except OSError:
+                continue
+        state.subdirs.sort()
+        state.files.sort()
+        return state
+
+    # -------------------------------------------------------------------------
+    # Persistence
+    # -------------------------------------------------------------------------
+
+    def _load(self) -> None:
+        if not self.persist:
+            return
+        try:
+            with open(self.index_file, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("version") != self.FORMAT_VERSION or data.get("use_gitignore") != self.use_gitignore:
+            return
+        self._dirs = {rel: _DirState(**state) for rel, state in data["dirs"].items()}
+
+    def _save(self) -> None:
+        if not self.persist or not self.index_file.parent.is_dir():
+            return
+        data = {
+            "version": self.FORMAT_VERSION,
+            "use_gitignore": self.use_gitignore,
+            "dirs": {rel: state.__dict__ for rel, state in self._dirs.items()},
+        }
+        tmp = self.index_file.with_suffix(".tmp")
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f, separators=(",", ":"))
+            os.replace(tmp, self.index_file)
+        except OSError:
+            pass
+
+    # -------------------------------------------------------------------------
+    # Queries
+    # -------------------------------------------------------------------------
+
+    def entries(self) -> list[FileEntry]:
+        """All indexed files, sorted by path."""
+        return self._entries
+
+    def relative(self, path: Path) -> str | None:
+        """Path relative to the root ("" for the root), or None if outside it."""
+        try:
+            rel = Path(path).resolve().relative_to(self.root).as_posix()
+        except ValueError:
+            return None
+        return "" if rel == "." else rel
+
+    def files(self, under: str = "", extensions: set[str] | list[str] | None = None) -> list[str]:
+        """Relative paths of files below a directory, optionally by extension."""
+        exts = {e.lower() for e in extensions} if extensions else None
+        prefix = f"{under.strip('/')}/" if under.strip("/") else ""
+        return [
+            e.path for e in self._entries
+            if e.path.startswith(prefix) and (exts is None or e.extension in exts)
+        ]
+
+    def glob(self, pattern: str, under: str = "") -> list[str]:
+        """Relative paths matching a Path.glob pattern, evaluated from `under`."""
+        regex = compile_glob(pattern)
+        prefix = f"{under.strip('/')}/" if under.strip("/") else ""
+        return [
+            e.path for e in self._entries
+            if e.path.startswith(prefix) and regex.match(e.path, len(prefix))
+        ]
+
+    def rglob(self, pattern: str, under: str = "") -> list[str]:
+        """Relative paths matching a Path.rglob pattern below `under`."""
+        return self.glob(f"**/{pattern}", under)
+
+    def glob_paths(self, base: Path, pattern: str) -> list[Path]:
+        """
+        Equivalent of base.glob(pattern) for files, answered from the index.
+
+        Paths are built on `base` as given. Directories outside the root fall
+        back to a filesystem glob.
+        """
+        base = Path(base)
+        rel = self.relative(base)
+        if rel is None:
+            return [p for p in base.glob(pattern) if p.is_file()]
+        strip = len(rel) + 1 if rel else 0
+        return [base / path[strip:] for path in self.glob(pattern, under=rel)]
+
+    def rglob_paths(self, base: Path, pattern: str) -> list[Path]:
+        """Equivalent of base.rglob(pattern) for files, answered from the index."""
+        return self.glob_paths(base, f"**/{pattern}")
+
+    def has_extension(self, extension: str, excluded_dirs: set[str] | frozenset = frozenset()) -> bool:
+        """Whether any file has the extension (outside the excluded dir names)."""
+        extension = extension.lower()
+        return any(
+            e.extension == extension and not excluded_dirs.intersection(e.path.split("/")[:-1])
+            for e in self._entries
+        )
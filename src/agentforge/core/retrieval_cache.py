@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Retrieval Cache
+===============
+
+Caches assembled retrieval results, so an agent repeating the same (or a
+trivially reworded) context request within a task skips LSP queries,
+embedding, ANN search and file reads.
+
+Keys:
+    kind + normalized query + request parameters (entry points, budget,
+    sources) + the vector index generation
+
+Every entry also records a fingerprint of the files it was built from
+(size, mtime and SHA-256 of each candidate file). A lookup re-stats those
+files; an entry whose files changed is dropped. Rebuilding the index
+changes the generation, so its entries are simply never looked up again.
+LSP results are not fingerprinted beyond the files they point to: a new
+symbol in an untouched file shows up after the next index update.
+
+Two tiers:
+    memory   per-process LRU, shared by every retriever of a project
+    disk     <project>/.agentforge/retrieval_cache/<key>.json, so later
+             runs (and other processes) of the same task reuse results
+
+Set $AGENTFORGE_RETRIEVAL_CACHE=0 to disable the cache.
+
+Usage:
+    cache = RetrievalCache.for_project(project_root)
+    key = cache.key("context", query=normalize_query(query), generation=generation)
+    value = cache.get(key)
+    if value is None:
+        value = compute()
+        cache.put(key, value, files=["src/orders.py"])
+"""
+
+import contextlib
+import hashlib
+import json
+import os
+import threading
+from collections.abc import Iterable
+from pathlib import Path
+
+CACHE_ENV_VAR = "AGENTFORGE_RETRIEVAL_CACHE"  # "0" disables the cache
+CACHE_DIR = Path(".agentforge") / "retrieval_cache"
+
+DEFAULT_MAX_ENTRIES = 256
+DISK_ENTRIES_FACTOR = 4  # Disk tier keeps this many times the memory tier
+PRUNE_EVERY = 32  # Disk tier is pruned once per this many writes
+
+_QUERY_PUNCTUATION = " \t\n.,;:!?\"'`"
+
+
+def cache_enabled() -> bool:
+    return os.environ.get(CACHE_ENV_VAR) != "0"
+
+
+def normalize_query(query: str) -> str:
+    """Case- and whitespace-insensitive form of a query (surrounding punctuation dropped)."""
+    return " ".join(query.lower().split()).strip(_QUERY_PUNCTUATION)
+
+
+class RetrievalCache:
+    """Two-tier cache of JSON-serializable retrieval results for one project."""
+
+    FORMAT_VERSION = 1
+
+    _instances: dict[Path, "RetrievalCache"] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, project_root: str | Path, max_entries: int = DEFAULT_MAX_ENTRIES,
+                 disk_dir: Path | None = None):
+        """
+        Initialize cache.
+
+        Args:
+            project_root: Project whose files are fingerprinted
+            max_entries: Least recently used entries beyond this are evicted
+                from memory (the disk tier keeps DISK_ENTRIES_FACTOR times more)
+            disk_dir: Directory for the disk tier, None for memory only
+        """
+        self.project_root = Path(project_root).resolve()
+        self.max_entries = max_entries
+        self.disk_dir = Path(disk_dir) if disk_dir is not None else None
+        self._entries: dict[str, dict] = {}  # Insertion order = LRU order
+        self._writes = 0
+        self._lock = threading.RLock()
+
+    @classmethod
+    def for_project(cls, project_root: str | Path, max_entries: int = DEFAULT_MAX_ENTRIES,
+                    disk: bool = True) -> "RetrievalCache":
+        """Shared cache for a project (one per resolved root per process)."""
+        root = Path(project_root).resolve()
+        with cls._instances_lock:
+            cache = cls._instances.get(root)
+            if cache is None:
+                cache = cls(root, max_entries, root / CACHE_DIR if disk else None)
+                cls._instances[root] = cache
+            return cache
+
+    @classmethod
+    def reset_instances(cls) -> None:
+        """Drop shared caches (tests, or after files were rewritten wholesale)."""
+        with cls._instances_lock:
+            cls._instances.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def key(kind: str, **parts) -> str:
+        """Stable key for a request (parts must be JSON-serializable)."""
+        payload = json.dumps([kind, parts], sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    # -------------------------------------------------------------------------
+    # Fingerprints
+    # -------------------------------------------------------------------------
+
+    def _resolve(self, file_path: str) -> tuple[str, Path]:
+        path = Path(file_path)
+        if not path.is_absolute():
+            return path.as_posix(), self.project_root / path
+        try:
+            return path.relative_to(self.project_root).as_posix(), path
+        except ValueError:
+            return str(path), path
+
+    def fingerprint(self, files: Iterable[str]) -> dict[str, list | None]:
+        """rel path -> [size, mtime_ns, sha256], or None for files that don't exist."""
+        result: dict[str, list | None] = {}
+        for file_path in files:
+            rel, path = self._resolve(file_path)
+            if rel in result:
+                continue
+            try:
+                stat = path.stat()
+                result[rel] = [stat.st_size, stat.st_mtime_ns, hashlib.sha256(path.read_bytes()).hexdigest()]
+            except OSError:
+                result[rel] = None
+        return result
+
+    def _still_valid(self, files: dict[str, list | None]) -> bool:
+        """
+        True if every fingerprinted file is unchanged.
+
+        Files whose size and mtime match are not read; a touched file whose
+        content hash still matches keeps the entry (and its new stat).
+        """
+        for rel, recorded in files.items():
+            path = self.project_root / rel
+            try:
+                stat = path.stat()
+            except OSError:
+                if recorded is None:
+                    continue
+                return False
+            if recorded is None:
+                return False
+            if recorded[0] == stat.st_size and recorded[1] == stat.st_mtime_ns:
+                continue
+            try:
+                digest = hashlib.sha256(path.read_bytes()).hexdigest()
+            except OSError:
+                return False
+            if digest != recorded[2]:
+                return False
+            recorded[0], recorded[1] = stat.st_size, stat.st_mtime_ns
+        return True
+
+    # -------------------------------------------------------------------------
+    # Lookup / insertion
+    # -------------------------------------------------------------------------
+
+    def get(self, key: str):
+        """Cached value, or None on a miss (or when its files changed)."""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                entry = self._read(key)
+            if entry is None:
+                return None
+            if not self._still_valid(entry["files"]):
+                self._delete(key)
+                return None
+            self._remember(key, entry)
+            return entry["value"]
+
+    def put(self, key: str, value, files: Iterable[str] = ()) -> None:
+        """Store a JSON-serializable value built from these (project-relative or absolute) files."""
+        entry = {"files": self.fingerprint(files), "value": value}
+        with self._lock:
+            self._remember(key, entry)
+            self._write(key, entry)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            if self.disk_dir is not None:
+                for path in self.disk_dir.glob("*.json"):
+                    with contextlib.suppress(OSError):
+                        path.unlink()
+
+    def _remember(self, key: str, entry: dict) -> None:
+        self._entries[key] = entry  # Most recently used
+        while len(self._entries) > self.max_entries:
+            self._entries.pop(next(iter(self._entries)))
+
+    # -------------------------------------------------------------------------
+    # Disk tier
+    # -------------------------------------------------------------------------
+
+    def _path(self, key: str) -> Path:
+        return self.disk_dir / f"{key}.json"
+
+    def _read(self, key: str) -> dict | None:
+        if self.disk_dir is None:
+            return None
+        try:
+            with open(self._path(key), encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get("version") != self.FORMAT_VERSION:
+            return None
+        return {"files": data["files"], "value": data["value"]}
+
+    def _write(self, key: str, entry: dict) -> None:
+        if self.disk_dir is None:
+            return
+        path = self._path(key)
+        tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            self.disk_dir.mkdir(parents=True, exist_ok=True)
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"version": self.FORMAT_VERSION, **entry}, f, separators=(",", ":"), default=str)
+            os.replace(tmp, path)
+        except (OSError, TypeError, ValueError):
+            with contextlib.suppress(OSError):
+                tmp.unlink()
+            return
+        self._writes += 1
+        if self._writes % PRUNE_EVERY == 0:
+            self._prune()
+
+    def _delete(self, key: str) -> None:
+        if self.disk_dir is not None:
+            with contextlib.suppress(OSError):
+                self._path(key).unlink()
+
+    def _prune(self) -> None:
+        """Remove the oldest disk entries beyond the disk tier's size."""
+        limit = self.max_entries * DISK_ENTRIES_FACTOR
+        try:
+            paths = list(self.disk_dir.glob("*.json"))
+            if len(paths) <= limit:
+                return
+            by_age = sorted(paths, key=lambda p: p.stat().st_mtime_ns)
+        except OSError:
+            return
+        for path in by_age[:len(paths) - limit]:
+            with contextlib.suppress(OSError):
+                path.unlink()
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Token Counter
+=============
+
+Shared token accounting for every budget decision (context assembly,
+compaction, memory, prompt breakdowns, provider usage).
+
+Backends (first available):
+1. tiktoken - exact counts for the chosen BPE encoding (cl100k_base unless
+   $AGENTFORGE_TOKENIZER names another encoding). Other models' tokenizers
+   (e.g. Claude's) differ, so for them this is an approximation; providers
+   pad it where a budget must not be overrun.
+   tiktoken downloads the encoding's BPE file on first use and caches it.
+   Offline, point $TIKTOKEN_CACHE_DIR at a directory holding the cached
+   file; if it cannot be loaded the heuristic is used instead.
+2. heuristic - splits text the way BPE pre-tokenizers do (words with their
+   leading space, identifier humps, 1-3 digit runs, punctuation runs,
+   whitespace runs) and charges each piece like a BPE vocabulary would.
+   Tracks real counts on code far closer than chars / 4, which undercounts
+   punctuation- and indentation-heavy text.
+
+Counts are memoized by content hash (LRU-bounded), so re-counting an
+unchanged section is a dictionary lookup. Prompts assembled from sections
+are counted incrementally: count_joined() sums cached per-section counts,
+so only sections that changed are tokenized again.
+
+Set $AGENTFORGE_TOKENIZER=heuristic to force the fallback.
+
+Dependencies:
+    Optional: pip install agentforge[tokenizer]  (tiktoken)
+
+Usage:
+    from agentforge.core.token_counter import count_tokens, get_counter
+
+    tokens = count_tokens(text)
+    total = get_counter().count_joined(sections, separator="\\n\\n")
+    head = get_counter().truncate(text, max_tokens=500)
+"""
+
+import hashlib
+import math
+import os
+import re
+import threading
+from collections.abc import Iterable
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+TOKENIZER_ENV_VAR = "AGENTFORGE_TOKENIZER"
+DEFAULT_ENCODING = "cl100k_base"
+HEURISTIC = "heuristic"
+
+DEFAULT_MAX_ENTRIES = 20_000
+_INLINE_KEY_CHARS = 64  # Shorter texts are their own memo key (no hashing)
+
+# BPE pre-tokenizer pieces (mirrors the cl100k pattern with stdlib `re`)
+_PIECES = re.compile(
+    r"'(?:[sdmt]|ll|ve|re)"
+    r"|(?:[^\r\n\w]|_)?[^\W\d_]+"
+    r"|\d{1,3}"
+    r"| ?(?:[^\s\w]|_)+[\r\n]*"
+    r"|\s*[\r\n]+"
+    r"|\s+(?!\S)"
+    r"|\s+"
+)
+_HUMPS = re.compile(r"[A-Z]?[a-z]+|[A-Z]+(?![a-z])")
+_WORD_CHARS_PER_TOKEN = 10  # Long lowercase runs split roughly this often
+_PUNCT_CHARS_PER_TOKEN = 2  # Common operator pairs ("==", "->", "):") merge
+_UTF8_BYTES_PER_TOKEN = 3  # Non-ASCII text (one token per CJK character)
+
+
+def _piece_tokens(piece: str) -> int:
+    """BPE tokens charged for one pre-tokenized piece."""
+    if not piece.isascii():
+        return max(1, math.ceil(len(piece.encode("utf-8")) / _UTF8_BYTES_PER_TOKEN))
+    if piece.isspace():
+        return 1
+    core = piece[1:] if len(piece) > 1 and not piece[0].isalnum() else piece
+    if core.isalpha():
+        humps = _HUMPS.findall(core) or [core]
+        return sum(1 + (len(hump) - 1) // _WORD_CHARS_PER_TOKEN for hump in humps)
+    if core.isdigit():
+        return 1
+    return max(1, math.ceil(len(piece.strip()) / _PUNCT_CHARS_PER_TOKEN))
+
+
+def _heuristic_count(text: str) -> int:
+    return sum(_piece_tokens(piece) for piece in _PIECES.findall(text))
+
+
+class TokenCounter:
+    """Memoizing token counter over tiktoken or the heuristic fallback."""
+
+    def __init__(self, encoding: str | None = None, max_entries: int = DEFAULT_MAX_ENTRIES):
+        """
+        Initialize counter.
+
+        Args:
+            encoding: tiktoken encoding name, "heuristic", or None for
+                $AGENTFORGE_TOKENIZER / the default encoding
+            max_entries: Least recently used counts beyond this are evicted
+        """
+        encoding = encoding or os.environ.get(TOKENIZER_ENV_VAR) or DEFAULT_ENCODING
+        self._encoder = None
+        if encoding != HEURISTIC and tiktoken is not None:
+            try:
+                self._encoder = tiktoken.get_encoding(encoding)
+            except (KeyError, ValueError, OSError):
+                self._encoder = None  # Unknown encoding or no cached BPE file offline
+        self.backend = encoding if self._encoder is not None else HEURISTIC
+        self.max_entries = max_entries
+        self._counts: dict = {}  # Insertion order = LRU order
+        self._lock = threading.Lock()
+
+    @property
+    def exact(self) -> bool:
+        return self._encoder is not None
+
+    def _tokenize_count(self, text: str) -> int:
+        if self._encoder is not None:
+            return len(self._encoder.encode(text, disallowed_special=()))
+        return _heuristic_count(text)
+
+    @staticmethod
+    def _key(text: str):
+        if len(text) <= _INLINE_KEY_CHARS:
+            return text
+        return hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+
+    def count(self, text: str) -> int:
+        """Tokens in text (memoized by content)."""
+        if not text:
+            return 0
+        key = self._key(text)
+        with self._lock:
+            tokens = self._counts.pop(key, None)
+            if tokens is not None:
+                self._counts[key] = tokens  # Most recently used
+                return tokens
+        tokens = self._tokenize_count(text)
+        with self._lock:
+            self._counts[key] = tokens
+            if len(self._counts) > self.max_entries:
+                self._counts.pop(next(iter(self._counts)))
+        return tokens
+
+    def count_many(self, texts: Iterable[str]) -> list[int]:
+        return [self.count(text) for text in texts]
+
+    def count_joined(self, sections: Iterable[str], separator: str = "") -> int:
+        """
+        Tokens in separator.join(sections), from per-section counts.
+
+        Sections are counted (and cached) independently, so a prompt that
+        differs from the last one in a single section costs one count. Tokens
+        that would merge across a boundary are counted on both sides, so
+        the sum errs high (by at most about one token per boundary), which
+        is the safe side for a budget.
+        """
+        sections = list(sections)
+        if not sections:
+            return 0
+        separators = self.count(separator) * (len(sections) - 1) if separator else 0
+        return sum(self.count_many(sections)) + separators
+
+    def truncate(self, text: str, max_tokens: int, keep_end: bool = False) -> str:
+        """Longest prefix (or with keep_end, suffix) of text that fits in max_tokens."""
+        if max_tokens <= 0:
+            return ""
+        if self.count(text) <= max_tokens:
+            return text
+        if self._encoder is not None:
+            tokens = self._encoder.encode(text, disallowed_special=())
+            return self._encoder.decode(tokens[-max_tokens:] if keep_end else tokens[:max_tokens])
+
+        pieces = [match.group() for match in _PIECES.finditer(text)]  # Contiguous cover of text
+        if keep_end:
+            pieces.reverse()
+        used = kept = 0
+        for piece in pieces:
+            piece_tokens = _piece_tokens(piece)
+            if used + piece_tokens > max_tokens:
+                # Keep the share of an oversized piece (a long run) that fits
+                kept += len(piece) * (max_tokens - used) // piece_tokens
+                break
+            used += piece_tokens
+            kept += len(piece)
+
+        def cut(n: int) -> str:
+            return text[len(text) - n:] if keep_end else text[:n]
+
+        while kept and _heuristic_count(cut(kept)) > max_tokens:
+            kept -= max(1, kept // 20)
+        return cut(kept)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._counts.clear()
+
+
+_counter: TokenCounter | None = None
+_counter_lock = threading.Lock()
+
+
+def get_counter() -> TokenCounter:
+    """Process-wide counter (backend chosen on first use)."""
+    global _counter
+    if _counter is None:
+        with _counter_lock:
+            if _counter is None:
+                _counter = TokenCounter()
+    return _counter
+
+
+def reset_counter() -> None:
+    """Drop the process-wide counter (e.g. after changing $AGENTFORGE_TOKENIZER)."""
+    global _counter
+    with _counter_lock:
+        _counter = None
+
+
+def count_tokens(text: str) -> int:
+    """Tokens in text, using the process-wide counter."""
+    return get_counter().count(text)
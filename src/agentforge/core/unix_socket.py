@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Unix Socket Server
+==================
+
+Framing and serve/shutdown scaffolding shared by the resident daemons
+(embedding_server, lsp_broker).
+
+Wire format (both directions): 4-byte big-endian length + payload.
+
+A server binds its socket with mode 0600, replaces a stale socket left by
+a dead process (but refuses to start over a live one), serves each
+connection on its own thread and unlinks the socket on shutdown.
+
+Usage:
+    class EchoServer(UnixSocketServer):
+        handler_class = EchoHandler          # reads self.server.owner
+        label = "Echo server"
+
+        def is_live(self) -> bool:
+            return ping(self.socket_path) is not None
+
+    server = EchoServer(path).start()
+    ...
+    server.shutdown()
+"""
+
+import json
+import os
+import socket
+import socketserver
+import struct
+import threading
+from pathlib import Path
+
+LENGTH = struct.Struct(">I")
+
+
+# =============================================================================
+# Framing
+# =============================================================================
+
+def recv_exact(sock: socket.socket, size: int) -> bytes:
+    buf = bytearray()
+    while len(buf) < size:
+        part = sock.recv(size - len(buf))
+        if not part:
+            raise ConnectionError("Connection closed mid-message")
+        buf.extend(part)
+    return bytes(buf)
+
+
+def send_frame(sock: socket.socket, payload: bytes) -> None:
+    sock.sendall(LENGTH.pack(len(payload)) + payload)
+
+
+def recv_frame(sock: socket.socket) -> bytes:
+    (size,) = LENGTH.unpack(recv_exact(sock, LENGTH.size))
+    return recv_exact(sock, size)
+
+
+def send_json(sock: socket.socket, message: dict) -> None:
+    send_frame(sock, json.dumps(message).encode())
+
+
+def recv_json(sock: socket.socket) -> dict:
+    return json.loads(recv_frame(sock))
+
+
+# =============================================================================
+# Server
+# =============================================================================
+
+class UnixSocketServer:
+    """
+    Serves handler_class over a Unix socket, one thread per connection.
+
+    Handlers reach the owning object as self.server.owner. Subclasses
+    implement is_live() and may extend _bind() and _close() to start and
+    stop their own resources.
+    """
+
+    handler_class: type[socketserver.BaseRequestHandler]
+    label = "Server"
+
+    def __init__(self, socket_path: Path):
+        self.socket_path = Path(socket_path)
+        self._server: socketserver.ThreadingUnixStreamServer | None = None
+        self._thread: threading.Thread | None = None
+
+    def is_live(self) -> bool:
+        """Whether a server already answers on socket_path."""
+        raise NotImplementedError
+
+    def _bind(self) -> None:
+        """Bind the socket, replacing a stale one left by a dead server."""
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        if self.socket_path.exists():
+            if self.is_live():
+                raise RuntimeError(f"{self.label} already running on {self.socket_path}")
+            self.socket_path.unlink()
+        self._server = socketserver.ThreadingUnixStreamServer(str(self.socket_path), self.handler_class)
+        self._server.daemon_threads = True
+        self._server.owner = self
+        os.chmod(self.socket_path, 0o600)
+
+    def serve_forever(self) -> None:
+        """Serve in the calling thread until shutdown() or interrupt."""
+        self._bind()
+        try:
+            self._server.serve_forever()
+        finally:
+            self._close()
+
+    def start(self):
+        """Serve in a background thread; returns self."""
+        self._bind()
+        name = self.label.lower().replace(" ", "-")
+        self._thread = threading.Thread(target=self._server.serve_forever, kwargs={"poll_interval": 0.05},
+                                        daemon=True, name=name)
+        self._thread.start()
+        return self
+
+    def shutdown(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            if self._thread is not None:
+                self._thread.join()
+                self._close()
+
+    def _close(self) -> None:
+        self._server.server_close()
+        self._server = None
+        if self.socket_path.exists():
+            self.socket_path.unlink()
@@ -16,31 +16,80 @@ Embedding Providers (auto-selected by priority):
 
 Dependencies:
     pip install sentence-transformers faiss-cpu  # Minimal (local embeddings)
-    pip install openai                           # Optional (cloud embeddings)
-    pip install voyageai                         # Optional (code-optimized)
+    export OPENAI_API_KEY=...                    # Optional (cloud embeddings)
+    export VOYAGE_API_KEY=...                    # Optional (code-optimized)
 
 Usage:
     vs = VectorSearch("/path/to/project")
     vs.index()  # Build index (cached)
+    vs.index(incremental=True)  # Re-embed only added/changed files
     results = vs.search("discount code validation", top_k=10)
+    results = vs.lexical_search(["OrderService"])  # BM25 only, no embedding model
 """
 
 import fnmatch
-import glob
 import hashlib
 import json
+import os
 import sys
+import threading
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from functools import partial
 from pathlib import Path
 
 try:
+    from .ann_index import build_index, calibrate, supports_removal
+    from .chunk_store import ChunkStore
     from .code_chunker import CodeChunker
+    from .lexical_index import LexicalIndex
+    from .repo_file_index import RepoFileIndex
     from .vector_types import Chunk, IndexStats, SearchResult
 except ImportError:
+    from ann_index import build_index, calibrate, supports_removal
+    from chunk_store import ChunkStore
     from code_chunker import CodeChunker
+    from lexical_index import LexicalIndex
+    from repo_file_index import RepoFileIndex
     from vector_types import Chunk, IndexStats, SearchResult
 
 
+LANGUAGE_BY_EXTENSION = {
+    ".cs": "csharp", ".py": "python", ".ts": "typescript", ".tsx": "typescript",
+    ".js": "javascript", ".jsx": "javascript", ".java": "java", ".go": "go",
+}
+
+
+def _read_file(file_path: Path) -> tuple[str, str]:
+    """Read a file and return (content, content_sha256)."""
+    with open(file_path, 'rb') as f:
+        raw = f.read()
+    return raw.decode('utf-8', errors='replace'), hashlib.sha256(raw).hexdigest()
+
+
+def _chunk_file_job(job: tuple[str, str], chunker: CodeChunker) -> tuple[str, dict | None, list[Chunk], str | None]:
+    """
+    Read and chunk one file. Runs in a worker process during parallel builds.
+
+    Returns:
+        (rel_path, manifest entry or None, chunks, error or None)
+    """
+    path_str, rel_path = job
+    try:
+        stat = os.stat(path_str)  # Before reading, so a concurrent edit is re-seen next run
+        content, content_hash = _read_file(Path(path_str))
+        language = LANGUAGE_BY_EXTENSION.get(Path(path_str).suffix.lower(), "text")
+        chunks = chunker.chunk_file(rel_path, content, language)
+    except Exception as e:
+        return rel_path, None, [], f"{path_str}: {e}"
+    entry = {
+        'sha256': content_hash, 'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns, 'chunk_ids': [], 'chunk_keys': [],
+    }
+    return rel_path, entry, chunks, None
+
+
 class VectorSearch:
     """
     Semantic search over codebase using embeddings.
@@ -48,45 +97,77 @@ class VectorSearch:
     Uses pluggable embedding providers with local embeddings as default.
     """
 
+    PARALLEL_MIN_FILES = 32  # Below this, process-pool start-up outweighs the win
+
     def __init__(self, project_path: str, config: dict = None, provider: str = None):
         """
         Initialize vector search.
 
         Args:
             project_path: Root of codebase
-            config: Optional config with embedding settings, chunk_size, etc.
+            config: Optional config: the `semantic` section of context_retrieval.yaml
+                (embedding settings, chunking, index, ...) or the whole file
             provider: Force specific embedding provider ("local", "openai", "voyage")
         """
         self.project_path = Path(project_path).resolve()
-        self.config = config or {}
+        config = config or {}
+        semantic = config.get("semantic")
+        # Every setting is read from the semantic section, whichever shape was passed
+        self.config = semantic if isinstance(semantic, dict) else config
+        filters = config.get("filters", {}) if self.config is not config else {}
 
         self.chunk_size = self.config.get("chunking", {}).get("ast_aware", {}).get("max_chunk_tokens", 500)
         self.chunk_overlap = self.config.get("chunking", {}).get("sliding_window", {}).get("overlap_tokens", 50)
 
-        self._provider_name = provider or self.config.get("semantic", {}).get("embedding_provider")
+        self._provider_name = provider or self.config.get("embedding_provider")
         self._embedding_provider = None
 
-        index_base = self.config.get("semantic", {}).get("index_path", ".agentforge/vector_index")
+        index_base = self.config.get("index_path", ".agentforge/vector_index")
         self.index_base = self.project_path / index_base
         self._index_dir = None
 
         self.chunker = CodeChunker(self.chunk_size, self.chunk_overlap)
-        self._index = None
-        self._metadata: list[Chunk] = []
 
-        self.include_patterns = self.config.get("include_patterns", ["**/*.cs", "**/*.py", "**/*.ts"])
-        self.exclude_patterns = self.config.get("exclude_patterns", [
+        self.index_config = self.config.get("index", {})
+
+        indexing = self.config.get("indexing", {})
+        self.chunk_workers = indexing.get("workers") or os.cpu_count() or 1
+        self.embed_batch_size = indexing.get("embed_batch_size", 256)
+        self._index = None
+        self._chunks: ChunkStore | None = None
+        self._lexical: LexicalIndex | None = None
+        # Guards index builds and the lazy loads: retrieval runs searches on worker threads
+        self._lock = threading.RLock()
+
+        self.include_patterns = filters.get("include_patterns") or self.config.get(
+            "include_patterns", ["**/*.cs", "**/*.py", "**/*.ts"])
+        self.exclude_patterns = filters.get("exclude_patterns") or self.config.get("exclude_patterns", [
             "**/bin/**", "**/obj/**", "**/node_modules/**", "**/.git/**"
         ])
 
     @property
     def embedding_provider(self):
-        """Lazy-load embedding provider."""
-        if self._embedding_provider is None:
-            from agentforge.core.embedding_providers import get_embedding_provider
-            provider_config = self.config.get("semantic", {})
-            self._embedding_provider = get_embedding_provider(self._provider_name, config=provider_config)
-            self._index_dir = self.index_base / self._embedding_provider.name
+        """Lazy-load embedding provider (wrapped by the shared embedding cache)."""
+        if self._embedding_provider is not None:
+            return self._embedding_provider
+        with self._lock:
+            if self._embedding_provider is None:
+                from agentforge.core.embedding_providers import get_embedding_provider
+                provider = get_embedding_provider(self._provider_name, config=self.config)
+                cache_config = self.config.get("embedding_cache", {})
+                if cache_config.get("enabled", True):
+                    from agentforge.core.embedding_cache import (
+                        DEFAULT_MAX_SIZE_MB,
+                        CachedEmbeddingProvider,
+                        EmbeddingCache,
+                    )
+                    cache = EmbeddingCache.for_provider(
+                        provider.name, provider.model_id, root=cache_config.get("path"),
+                        max_size_mb=cache_config.get("max_size_mb", DEFAULT_MAX_SIZE_MB),
+                    )
+                    provider = CachedEmbeddingProvider(provider, cache)
+                self._embedding_provider = provider
+                self._index_dir = self.index_base / self._embedding_provider.name
         return self._embedding_provider
 
     @property
@@ -103,197 +184,533 @@ class VectorSearch:
 
     @property
     def metadata_file(self) -> Path:
-        """Path to metadata pickle file."""
+        """Path to chunk store header (columnar chunk metadata lives beside it)."""
+        return self.index_dir / "chunks.json"
+
+    @property
+    def legacy_metadata_file(self) -> Path:
+        """Path to the pre-chunk-store JSON metadata (migrated on first load)."""
         return self.index_dir / "metadata.pkl"
 
+    @property
+    def lexical_file(self) -> Path:
+        """Path to the BM25 lexical index (same ids as the FAISS index)."""
+        return self.index_dir / "lexical.json"
+
+    @property
+    def manifest_file(self) -> Path:
+        """Path to per-file manifest (content hashes and chunk ids)."""
+        return self.index_dir / "manifest.json"
+
     def _get_files(self) -> list[Path]:
         """Get all files matching include/exclude patterns."""
-        all_files = []
+        file_index = RepoFileIndex.for_root(self.project_path)
+        matched: set[str] = set()
         for pattern in self.include_patterns:
-            matches = glob.glob(str(self.project_path / pattern), recursive=True)
-            all_files.extend(matches)
+            matched.update(file_index.glob(pattern))
 
         result = []
-        for f in all_files:
-            if not Path(f).is_file():
-                continue
-            rel_path = str(Path(f).relative_to(self.project_path))
+        for rel_path in sorted(matched):
             excluded = any(fnmatch.fnmatch(rel_path, exc) for exc in self.exclude_patterns)
             if not excluded:
-                result.append(Path(f))
+                result.append(self.project_path / rel_path)
 
         return result
 
     def _detect_language(self, file_path: str) -> str:
         """Detect programming language from file extension."""
-        ext_map = {
-            ".cs": "csharp", ".py": "python", ".ts": "typescript", ".tsx": "typescript",
-            ".js": "javascript", ".jsx": "javascript", ".java": "java", ".go": "go",
-        }
         ext = Path(file_path).suffix.lower()
-        return ext_map.get(ext, "text")
+        return LANGUAGE_BY_EXTENSION.get(ext, "text")
+
+    def _compute_project_hash(self, files: list[Path]) -> str:
+        """Hash file paths, mtimes and sizes for cache invalidation."""
+        hasher = hashlib.sha256()
+        for f in files:
+            try:
+                stat = f.stat()
+                hasher.update(f"{f}:{stat.st_mtime}:{stat.st_size}".encode())
+            except Exception:
+                continue
+        return hasher.hexdigest()[:16]
 
     def _try_load_cache(self, project_hash: str, stats: IndexStats) -> bool:
         """Try to load index from cache. Returns True if cache was valid."""
         import faiss
-        if not self.metadata_file.exists():
+        self._migrate_legacy_metadata()
+        header = ChunkStore.read_header(self.index_dir)
+        if header is None or header.get('project_hash') != project_hash:
             return False
         try:
-            with open(self.metadata_file, encoding='utf-8') as f:
-                cached = json.load(f)
-            if cached.get('project_hash') != project_hash:
+            chunks = ChunkStore.open(self.index_dir)
+            if chunks is None:
                 return False
-            self._metadata = [Chunk.from_dict(c) for c in cached['chunks']]
+            self._chunks = chunks
             self._index = faiss.read_index(str(self.index_file))
-            stats.file_count = cached.get('file_count', 0)
-            stats.chunk_count = len(self._metadata)
+            stats.file_count = header.get('file_count', 0)
+            stats.chunk_count = len(chunks)
+            stats.reused_chunks = stats.chunk_count
             stats.duration_ms = 0
             return True
         except Exception:
             return False
 
-    def _chunk_files(self, files: list[Path], stats: IndexStats) -> list[Chunk]:
-        """Chunk all files and collect errors."""
-        all_chunks = []
-        for file_path in files:
-            try:
-                with open(file_path, encoding='utf-8', errors='replace') as f:
-                    content = f.read()
-                language = self._detect_language(str(file_path))
-                rel_path = str(file_path.relative_to(self.project_path))
-                all_chunks.extend(self.chunker.chunk_file(rel_path, content, language))
-            except Exception as e:
-                stats.errors.append(f"{file_path}: {e}")
-        return all_chunks
+    def _migrate_legacy_metadata(self) -> None:
+        """Convert a JSON metadata.pkl from older versions into a chunk store."""
+        legacy = self.legacy_metadata_file
+        if not legacy.exists() or ChunkStore.exists(self.index_dir):
+            return
+        try:
+            with open(legacy, encoding='utf-8') as f:
+                cached = json.load(f)
+            chunks = {
+                c.get('id', i): Chunk.from_dict(c) for i, c in enumerate(cached['chunks'])
+            }
+            header = {k: cached.get(k) for k in ('project_hash', 'file_count', 'created')}
+            ChunkStore.write(self.index_dir, header, chunks).close()
+            legacy.unlink()
+        except Exception:
+            return
 
-    def _build_faiss_index(self, vectors, dimension: int):
-        """Build appropriate FAISS index based on dataset size."""
-        import faiss
-        if len(vectors) < 10000:
-            index = faiss.IndexFlatIP(dimension)
+    def _iter_chunked_files(self, files: list[Path],
+                            stats: IndexStats) -> Iterator[tuple[str, dict, list[Chunk]]]:
+        """
+        Yield (rel_path, manifest entry, chunks) per file, in input order.
+
+        Files are read and chunked in a process pool when there are enough of
+        them to amortize worker start-up; results stream back as they finish
+        so the caller can embed while later files are still being chunked.
+        Per-file errors go to stats.errors.
+        """
+        jobs = [(str(f), str(f.relative_to(self.project_path))) for f in files]
+        job = partial(_chunk_file_job, chunker=self.chunker)
+        workers = min(self.chunk_workers, len(jobs))
+
+        if workers > 1 and len(jobs) >= self.PARALLEL_MIN_FILES:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = pool.map(job, jobs, chunksize=max(1, min(64, len(jobs) // (workers * 4))))
+                yield from self._collect_chunked(results, stats)
         else:
-            nlist = min(100, len(vectors) // 10)
-            quantizer = faiss.IndexFlatIP(dimension)
-            index = faiss.IndexIVFFlat(quantizer, dimension, nlist, faiss.METRIC_INNER_PRODUCT)
-            index.train(vectors)
-        index.add(vectors)
+            yield from self._collect_chunked(map(job, jobs), stats)
+
+    @staticmethod
+    def _collect_chunked(results, stats: IndexStats) -> Iterator[tuple[str, dict, list[Chunk]]]:
+        for rel_path, entry, chunks, error in results:
+            if error:
+                stats.errors.append(error)
+            else:
+                yield rel_path, entry, chunks
+
+    def _chunk_and_embed(self, files: list[Path], stats: IndexStats, manifest_files: dict,
+                         next_id: int, lexical: LexicalIndex,
+                         previous: dict | None = None) -> tuple[dict[int, Chunk], object, dict[int, Chunk]]:
+        """
+        Chunk files and embed their chunks in fixed-size batches as they arrive.
+
+        Assigns sequential FAISS ids from next_id, records them (and each
+        chunk's stable id) on the file's manifest entry and adds new chunks
+        to the lexical index. Chunks whose stable id appears in the file's
+        previous manifest entry keep their old FAISS id and are not embedded.
+
+        Returns:
+            (new chunks by id, float32 vectors in id order or None,
+             reused chunks by their existing id)
+        """
+        import numpy as np
+
+        assigned: dict[int, Chunk] = {}
+        reused: dict[int, Chunk] = {}
+        pending: list[Chunk] = []
+        vector_batches = []
+        announced = False
+
+        def flush():
+            nonlocal announced
+            if not announced:
+                print(f"  Generating embeddings with '{self.embedding_provider.name}'...", file=sys.stderr)
+                announced = True
+            vector_batches.append(self._embed_chunks(pending))
+            pending.clear()
+
+        for rel_path, entry, chunks in self._iter_chunked_files(files, stats):
+            manifest_files[rel_path] = entry
+            old = (previous or {}).get(rel_path, {})
+            reusable: dict[str, list[int]] = {}
+            for key, cid in zip(old.get('chunk_keys', []), old.get('chunk_ids', []), strict=False):
+                reusable.setdefault(key, []).append(cid)
+            for chunk in chunks:
+                key = chunk.stable_id
+                entry['chunk_keys'].append(key)
+                if reusable.get(key):
+                    cid = reusable[key].pop(0)
+                    entry['chunk_ids'].append(cid)
+                    reused[cid] = chunk
+                    continue
+                entry['chunk_ids'].append(next_id)
+                assigned[next_id] = chunk
+                lexical.add(next_id, chunk)
+                pending.append(chunk)
+                next_id += 1
+            if len(pending) >= self.embed_batch_size:
+                flush()
+        if pending:
+            flush()
+
+        vectors = np.vstack(vector_batches) if vector_batches else None
+        return assigned, vectors, reused
+
+    def _build_faiss_index(self, vectors, ids, stats: IndexStats):
+        """Build the configured (or size-appropriate) index and tune it for target recall."""
+        index, factory = build_index(vectors, ids, self.index_config)
+        calibration = calibrate(index, vectors, ids, self.index_config)
+        stats.index_type = factory
+        if calibration:
+            stats.index_type += f" ({calibration['parameter']}={calibration['value']})"
+            stats.recall = calibration['recall']
         return index
 
-    def _save_index(self, index, chunks: list[Chunk], project_hash: str, file_count: int):
-        """Save index and metadata to disk."""
+    def _embed_chunks(self, chunks: list[Chunk]):
+        """Embed chunks and return L2-normalized float32 vectors."""
+        import faiss
+        import numpy as np
+
+        embeddings = self.embedding_provider.embed([chunk.to_embedding_text() for chunk in chunks])
+        vectors = np.array(embeddings, dtype=np.float32)
+        faiss.normalize_L2(vectors)
+        return vectors
+
+    def _save_index(self, index, chunks: dict[int, Chunk], project_hash: str, file_count: int,
+                    manifest: dict | None = None, drop_ids: list[int] | None = None):
+        """
+        Save index, chunk store and manifest to disk.
+
+        If drop_ids is given, the currently loaded chunk store is updated in
+        place (stale rows dropped, new chunks appended) instead of rewritten.
+        """
         import faiss
         self.index_dir.mkdir(parents=True, exist_ok=True)
         faiss.write_index(index, str(self.index_file))
-        with open(self.metadata_file, 'w', encoding='utf-8') as f:
-            json.dump({
-                'project_hash': project_hash, 'chunks': [c.to_dict() for c in chunks],
-                'file_count': file_count, 'created': datetime.now().isoformat(),
-            }, f)
-
-    def index(self, force_rebuild: bool = False) -> IndexStats:
-        """Index or re-index the codebase."""
-        import faiss
-        import numpy as np
+        header = {
+            'project_hash': project_hash, 'file_count': file_count,
+            'created': datetime.now().isoformat(),
+        }
+        base = self._chunks if drop_ids is not None else None
+        self._chunks = ChunkStore.write(self.index_dir, header, chunks, base=base, drop_ids=drop_ids)
+        if self._lexical is not None:
+            self._lexical.save(self.lexical_file)
+        if manifest is not None:
+            with open(self.manifest_file, 'w', encoding='utf-8') as f:
+                json.dump(manifest, f)
+
+    def _load_manifest(self) -> dict | None:
+        """Load the per-file manifest, or None if missing or unreadable."""
+        if not self.manifest_file.exists():
+            return None
+        try:
+            with open(self.manifest_file, encoding='utf-8') as f:
+                manifest = json.load(f)
+            return manifest if 'files' in manifest and 'next_id' in manifest else None
+        except Exception:
+            return None
+
+    def index(self, force_rebuild: bool = False, incremental: bool = False) -> IndexStats:
+        """
+        Index or re-index the codebase.
+
+        Args:
+            force_rebuild: Ignore any cached index and rebuild from scratch
+            incremental: Re-chunk and re-embed only added or changed files,
+                dropping vectors of deleted files. Falls back to a full
+                rebuild when no manifest from a previous run exists, or
+                when the index type cannot remove vectors (HNSW).
+        """
+        with self._lock:
+            return self._index_locked(force_rebuild, incremental)
 
+    def _index_locked(self, force_rebuild: bool, incremental: bool) -> IndexStats:
+        """Body of index(); the caller holds the lock."""
         stats = IndexStats()
         start_time = datetime.now()
 
-        # Compute project hash for cache invalidation
         files = sorted(self._get_files())
-        hasher = hashlib.sha256()
-        for f in files:
-            try:
-                stat = f.stat()
-                hasher.update(f"{f}:{stat.st_mtime}:{stat.st_size}".encode())
-            except Exception:
-                continue
-        project_hash = hasher.hexdigest()[:16]
+        project_hash = self._compute_project_hash(files)
 
         if not force_rebuild and self._try_load_cache(project_hash, stats):
             return stats
 
-        files = self._get_files()
+        if incremental and not force_rebuild:
+            manifest = self._load_manifest()
+            if manifest is not None and self._load_index() and supports_removal(self._index):
+                self._index_incremental(files, manifest, project_hash, stats)
+                stats.duration_ms = int((datetime.now() - start_time).total_seconds() * 1000)
+                return stats
+
         stats.file_count = len(files)
-        all_chunks = self._chunk_files(files, stats)
-        stats.chunk_count = len(all_chunks)
+        manifest_files: dict[str, dict] = {}
+        lexical = LexicalIndex()
+        chunks, vectors, _ = self._chunk_and_embed(files, stats, manifest_files, 0, lexical)
+        stats.chunk_count = len(chunks)
 
-        if not all_chunks:
+        if not chunks:
             stats.duration_ms = int((datetime.now() - start_time).total_seconds() * 1000)
             return stats
 
-        provider = self.embedding_provider
-        print(f"  Generating embeddings with '{provider.name}' for {len(all_chunks)} chunks...", file=sys.stderr)
-        embeddings = provider.embed([chunk.to_embedding_text() for chunk in all_chunks])
+        import numpy as np
 
-        vectors = np.array(embeddings, dtype=np.float32)
-        faiss.normalize_L2(vectors)
-        index = self._build_faiss_index(vectors, provider.dimension)
+        index = self._build_faiss_index(vectors, np.array(list(chunks), dtype=np.int64), stats)
 
-        self._save_index(index, all_chunks, project_hash, stats.file_count)
+        manifest = {'files': manifest_files, 'next_id': len(chunks)}
+        self._lexical = lexical
+        self._save_index(index, chunks, project_hash, stats.file_count, manifest)
         self._index = index
-        self._metadata = all_chunks
 
-        stats.total_tokens = sum(c.token_estimate for c in all_chunks)
+        stats.embedded_chunks = len(chunks)
+        stats.total_tokens = sum(c.token_estimate for c in chunks.values())
         stats.duration_ms = int((datetime.now() - start_time).total_seconds() * 1000)
         return stats
 
+    def _diff_files(self, files: list[Path], manifest_files: dict,
+                    stats: IndexStats) -> tuple[dict[str, dict], list[Path]]:
+        """
+        Compare current files against the manifest.
+
+        Files whose size and mtime are unchanged are trusted without reading.
+        Others are hashed; only a differing content hash marks them changed.
+
+        Returns:
+            (unchanged entries by rel path, paths to re-chunk)
+        """
+        unchanged: dict[str, dict] = {}
+        changed: list[Path] = []
+        for file_path in files:
+            rel_path = str(file_path.relative_to(self.project_path))
+            entry = manifest_files.get(rel_path)
+            try:
+                stat = file_path.stat()
+                if entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+                    unchanged[rel_path] = entry
+                    continue
+                _, content_hash = _read_file(file_path) if entry else (None, None)
+            except Exception as e:
+                stats.errors.append(f"{file_path}: {e}")
+                continue
+            if entry and entry['sha256'] == content_hash:
+                unchanged[rel_path] = {**entry, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+            else:
+                changed.append(file_path)
+        return unchanged, changed
+
+    def _index_incremental(self, files: list[Path], manifest: dict, project_hash: str,
+                           stats: IndexStats) -> None:
+        """
+        Update the loaded index in place for added, changed and deleted files.
+
+        Within a changed file, chunks whose stable id (file, symbol, content
+        hash) is unchanged keep their vectors; only new or edited ones are
+        embedded.
+        """
+        import numpy as np
+
+        unchanged, changed = self._diff_files(files, manifest['files'], stats)
+
+        lexical = self._load_lexical()
+        manifest_files = dict(unchanged)
+        assigned, vectors, reused = self._chunk_and_embed(
+            changed, stats, manifest_files, manifest['next_id'], lexical, previous=manifest['files'])
+
+        stale_ids = [
+            cid for rel_path, entry in manifest['files'].items()
+            if rel_path not in unchanged for cid in entry['chunk_ids'] if cid not in reused
+        ]
+        if stale_ids:
+            self._index.remove_ids(np.array(stale_ids, dtype=np.int64))
+            lexical.remove(stale_ids)
+        if assigned:
+            self._index.add_with_ids(vectors, np.array(list(assigned), dtype=np.int64))
+            manifest['next_id'] += len(assigned)
+
+        # Reused chunks may have moved within their file; refresh their rows
+        moved = {}
+        for cid, chunk in reused.items():
+            old = self._chunks.get(cid)
+            if old is None or (old.start_line, old.end_line) != (chunk.start_line, chunk.end_line):
+                moved[cid] = chunk
+
+        manifest['files'] = manifest_files
+        self._save_index(self._index, {**moved, **assigned}, project_hash, len(manifest_files), manifest,
+                         drop_ids=stale_ids + list(moved))
+
+        stats.file_count = len(manifest_files)
+        stats.chunk_count = len(self._chunks)
+        stats.embedded_chunks = len(assigned)
+        stats.reused_chunks = stats.chunk_count - len(assigned)
+        stats.total_tokens = self._chunks.total_tokens
+
     def _load_index(self) -> bool:
         """Load index from disk if available."""
         if self._index is not None:
             return True
+        with self._lock:
+            if self._index is not None:
+                return True
 
-        if not self.index_file.exists():
-            return False
+            if not self.index_file.exists():
+                return False
 
-        try:
-            import faiss
-            self._index = faiss.read_index(str(self.index_file))
-            with open(self.metadata_file, encoding='utf-8') as f:
-                cached = json.load(f)
-                self._metadata = [Chunk.from_dict(c) for c in cached['chunks']]
-            return True
-        except Exception:
-            return False
+            try:
+                import faiss
+                self._migrate_legacy_metadata()
+                chunks = ChunkStore.open(self.index_dir)
+                if chunks is None:
+                    return False
+                self._index = faiss.read_index(str(self.index_file))
+                self._chunks = chunks
+                return True
+            except Exception:
+                return False
+
+    def _load_lexical(self) -> LexicalIndex | None:
+        """
+        Load the lexical index and chunk store, without the FAISS index or
+        embedding model. Indexes written before the lexical index existed
+        get one built from the chunk store.
+        """
+        lexical = self._lexical
+        if lexical is not None and self._chunks is not None:
+            return lexical  # Loaded: don't queue behind an index build
+        with self._lock:
+            if self._chunks is None:
+                self._migrate_legacy_metadata()
+                self._chunks = ChunkStore.open(self.index_dir)
+                if self._chunks is None:
+                    return None
+            if self._lexical is None:
+                self._lexical = LexicalIndex.load(self.lexical_file)
+                if self._lexical is None:
+                    self._lexical = LexicalIndex.from_chunks(self._chunks.iter_chunks())
+                    self._lexical.save(self.lexical_file)
+            return self._lexical
+
+    def lexical_search(self, queries: list[str], top_k: int = 10) -> list[SearchResult]:
+        """
+        BM25 search over identifier tokens of all queries combined.
+
+        Never loads the embedding model. Scores are relative to the best
+        hit (1.0), so they sit on a similar scale to cosine similarity.
+        """
+        lexical = self._load_lexical()
+        if lexical is None:
+            return []
+        hits = lexical.search(" ".join(queries), top_k=top_k)
+        if not hits:
+            return []
+        best = hits[0][1]
+        store = self._chunks  # An update may swap in a new store meanwhile
+        results = []
+        for chunk_id, score in hits:
+            chunk = store.get(chunk_id)
+            if chunk is not None:
+                results.append(SearchResult(
+                    file_path=chunk.file_path, chunk=chunk.content, score=score / best,
+                    start_line=chunk.start_line, end_line=chunk.end_line,
+                    surrounding_context=chunk.context,
+                ))
+        return results
 
     def search(self, query: str, top_k: int = 10) -> list[SearchResult]:
         """Search for code relevant to query."""
+        return self.search_many([query], top_k=top_k)[0]
+
+    def search_many(self, queries: list[str], top_k: int = 10,
+                    union: bool = False) -> list[list[SearchResult]] | list[SearchResult]:
+        """
+        Search for several queries with one embedding batch and one FAISS call.
+
+        Args:
+            queries: Search queries
+            top_k: Results per query (or in total when union=True)
+            union: Merge all hits into one list, de-duplicated by chunk and
+                keeping each chunk's best score across queries
+
+        Returns:
+            One result list per query, or a single ranked list if union=True
+        """
         try:
             import faiss
             import numpy as np
         except ImportError as e:
             raise ImportError("FAISS not installed. Run: pip install faiss-cpu") from e
 
-        if not self._load_index():
-            print("Index not found. Building...")
-            self.index(force_rebuild=True)
-
-        if self._index is None or not self._metadata:
-            return []
-
-        query_embedding = self.embedding_provider.embed([query])
-        query_embedding = np.array(query_embedding, dtype=np.float32)
-        faiss.normalize_L2(query_embedding)
-
-        k = min(top_k, len(self._metadata))
-        scores, indices = self._index.search(query_embedding, k)
-
-        results = []
-        for score, idx in zip(scores[0], indices[0], strict=False):
-            if idx < 0 or idx >= len(self._metadata):
-                continue
-            chunk = self._metadata[idx]
-            results.append(SearchResult(
-                file_path=chunk.file_path, chunk=chunk.content, score=float(score),
+        with self._lock:
+            # Concurrent searches wait for one build instead of each starting their own
+            if not self._load_index():
+                print("Index not found. Building...")
+                self.index(force_rebuild=True)
+            # An update may swap in a new store meanwhile; this search keeps reading its own
+            index, store = self._index, self._chunks
+
+        if not queries or index is None or not store:
+            return [] if union else [[] for _ in queries]
+
+        query_embeddings = np.array(self.embedding_provider.embed(list(queries)), dtype=np.float32)
+        faiss.normalize_L2(query_embeddings)
+
+        k = min(top_k, len(store))
+        scores, indices = index.search(query_embeddings, k)
+
+        chunks: dict[int, Chunk | None] = {}
+
+        def to_result(idx: int, score: float) -> SearchResult | None:
+            if idx not in chunks:
+                chunks[idx] = store.get(idx)
+            chunk = chunks[idx]
+            if chunk is None:
+                return None
+            return SearchResult(
+                file_path=chunk.file_path, chunk=chunk.content, score=score,
                 start_line=chunk.start_line, end_line=chunk.end_line,
                 surrounding_context=chunk.context,
-            ))
-
-        return results
+            )
+
+        if union:
+            best: dict[int, float] = {}
+            for row_scores, row_ids in zip(scores, indices, strict=True):
+                for score, idx in zip(row_scores, row_ids, strict=True):
+                    idx = int(idx)
+                    if idx >= 0 and score > best.get(idx, float("-inf")):
+                        best[idx] = float(score)
+            ranked = sorted(best.items(), key=lambda item: item[1], reverse=True)
+            results = [to_result(idx, score) for idx, score in ranked]
+            return [r for r in results if r is not None][:top_k]
+
+        per_query = []
+        for row_scores, row_ids in zip(scores, indices, strict=True):
+            results = [to_result(int(idx), float(score)) for score, idx in zip(row_scores, row_ids, strict=True)]
+            per_query.append([r for r in results if r is not None])
+        return per_query
 
     def is_indexed(self) -> bool:
         """Check if project is already indexed."""
         return self.index_file.exists() and self.metadata_file.exists()
 
+    def index_generation(self) -> str | None:
+        """
+        Id that changes whenever any provider's index is rebuilt or updated.
+
+        Derived from the size and mtime of the saved index files, so it is
+        cheap (no embedding provider is loaded). None if nothing is indexed.
+        """
+        signature = []
+        for header in sorted(self.index_base.glob("*/chunks.json")):
+            for path in (header, header.parent / "index.faiss", header.parent / "lexical.json"):
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                signature.append(f"{path.relative_to(self.index_base)}:{stat.st_size}:{stat.st_mtime_ns}")
+        if not signature:
+            return None
+        return hashlib.sha256("\n".join(signature).encode()).hexdigest()[:16]
+
 
 # =============================================================================
 # CLI for Testing
@@ -302,10 +719,16 @@ class VectorSearch:
 def _run_index(vs, args):
     """Run index command."""
     print(f"Indexing {args.project}...")
-    stats = vs.index(force_rebuild=args.force)
+    stats = vs.index(force_rebuild=args.force, incremental=args.incremental)
     print("\nIndex complete:")
     print(f"  Files: {stats.file_count}")
     print(f"  Chunks: {stats.chunk_count}")
+    print(f"  Reused: {stats.reused_chunks}")
+    print(f"  Re-embedded: {stats.embedded_chunks}")
+    if stats.index_type:
+        print(f"  Index: {stats.index_type}")
+    if stats.recall is not None:
+        print(f"  Calibrated recall: {stats.recall:.3f}")
     print(f"  Tokens: {stats.total_tokens}")
     print(f"  Duration: {stats.duration_ms}ms")
     if stats.errors:
@@ -352,6 +775,8 @@ def main():
 
     idx_parser = subparsers.add_parser("index", help="Index the project")
     idx_parser.add_argument("--force", "-f", action="store_true", help="Force rebuild")
+    idx_parser.add_argument("--incremental", "-i", action="store_true",
+                            help="Re-embed only added/changed files")
 
     search_parser = subparsers.add_parser("search", help="Search for code")
     search_parser.add_argument("query", help="Search query")
@@ -8,6 +8,7 @@ Data classes for vector search.
 Extracted from vector_search.py for modularity.
 """
 
+import hashlib
 from dataclasses import dataclass, field
 
 
@@ -20,6 +21,7 @@ class Chunk:
     end_line: int
     context: str = ""  # Additional context (imports, class name)
     language: str = "text"
+    symbol: str = ""  # Qualified name (e.g. "OrderService.apply") for AST chunks
 
     def to_embedding_text(self) -> str:
         """Format chunk for embedding."""
@@ -29,6 +31,17 @@ class Chunk:
         parts.append(self.content)
         return "\n".join(parts)
 
+    @property
+    def stable_id(self) -> str:
+        """
+        Position-independent identity: (file, qualified name, content hash).
+
+        Unchanged symbols keep their id when code above them moves, so
+        incremental indexing can reuse their vectors.
+        """
+        digest = hashlib.sha256(self.to_embedding_text().encode("utf-8")).hexdigest()[:16]
+        return f"{self.file_path}::{self.symbol}::{digest}"
+
     @property
     def token_estimate(self) -> int:
         """Rough token estimate."""
@@ -43,6 +56,7 @@ class Chunk:
             "end_line": self.end_line,
             "context": self.context,
             "language": self.language,
+            "symbol": self.symbol,
         }
 
     @classmethod
@@ -55,6 +69,7 @@ class Chunk:
             end_line=data["end_line"],
             context=data.get("context", ""),
             language=data.get("language", "text"),
+            symbol=data.get("symbol", ""),
         )
 
 
@@ -85,4 +100,8 @@ class IndexStats:
     chunk_count: int = 0
     total_tokens: int = 0
     duration_ms: int = 0
+    reused_chunks: int = 0  # Chunks carried over from the previous index
+    embedded_chunks: int = 0  # Chunks (re-)embedded in this run
+    index_type: str = ""  # FAISS factory string (and tuned search parameter)
+    recall: float | None = None  # Calibrated recall@k for approximate indexes
     errors: list[str] = field(default_factory=list)
@@ -8,6 +8,7 @@ Tests for CompactionManager.
 
 import pytest
 
+from agentforge.core.context import compaction
 from agentforge.core.context.compaction import (
     DEFAULT_RULES,
     PRESERVED_SECTIONS,
@@ -58,7 +59,7 @@ class TestCompactionManager:
     def test_compaction_triggers_at_threshold(self, manager):
         """Compaction triggers when over threshold."""
         # Large context over budget
-        context = {"data": "x" * 5000}  # ~1250 tokens
+        context = {"data": "word " * 1500}  # ~1500 tokens
         assert manager.needs_compaction(context), "Expected manager.needs_compaction() to be truthy"
 
     def test_preserved_sections_untouched(self, manager, sample_context):
@@ -114,6 +115,25 @@ class TestCompactionManager:
         # Should stop once under budget
         assert manager_tight.estimate_tokens(result) <= manager_tight.max_budget, "Expected manager_tight.estimate_toke... <= manager_tight.max_budget"
 
+    def test_only_changed_section_is_remeasured(self, manager, sample_context, monkeypatch):
+        """Compaction measures each section once, then only sections a rule changed."""
+        measured: list[str] = []
+        original = compaction.section_tokens
+
+        def recording(key, value):
+            measured.append(key)
+            return original(key, value)
+
+        monkeypatch.setattr(compaction, "section_tokens", recording)
+        monkeypatch.setattr(compaction.yaml, "dump", None)  # Sizes must not need YAML rendering
+
+        result, audit = manager.compact(sample_context)
+
+        assert measured[:len(sample_context)] == list(sample_context), "Expected one initial pass"
+        assert measured[len(sample_context):] == [r["section"] for r in audit.rules_applied], \
+            "Expected re-measurement of applied sections only"
+        assert audit.final_tokens == manager.estimate_tokens(result), "Expected tracked total to match"
+
 
 class TestCompactionStrategies:
     """Tests for individual compaction strategies."""
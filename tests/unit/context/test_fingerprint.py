@@ -6,6 +6,7 @@
 Tests for project fingerprint generator.
 """
 
+import os
 from pathlib import Path
 from tempfile import TemporaryDirectory
 
@@ -389,3 +390,66 @@ dependencies = ["fastapi>=0.100.0"]
 
         assert fp.identity.content_hash, "Expected fp.identity.content_hash to be truthy"
         assert len(fp.identity.content_hash) == 16, "Expected len(fp.identity.content_hash) to equal 16"
+
+
+class TestPersistentFingerprintCache:
+    """Tests for the on-disk, stat-validated fingerprint cache."""
+
+    @pytest.fixture
+    def temp_project(self):
+        """Create a temporary Python project with settled mtimes."""
+        with TemporaryDirectory() as tmpdir:
+            project = Path(tmpdir) / "test_project"
+            project.mkdir()
+            pyproject = project / "pyproject.toml"
+            pyproject.write_text('[project]\nname = "test"\ndependencies = ["pytest"]')
+            os.utime(pyproject, ns=(1_000_000_000, 1_000_000_000))  # Outside the racy window
+            yield project
+
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        FingerprintGenerator.clear_cache()
+        yield
+        FingerprintGenerator.clear_cache()
+
+    def _fail(self, *_args, **_kwargs):
+        raise AssertionError("Expected no content hashing or detection")
+
+    def test_persisted_across_processes(self, temp_project, monkeypatch):
+        """Test a new process reuses the persisted fingerprint with stat calls only."""
+        fp1 = FingerprintGenerator(temp_project).generate()
+        assert (temp_project / FingerprintGenerator.CACHE_FILE).exists(), "Expected cache file"
+
+        FingerprintGenerator.clear_cache()  # As in a fresh process
+        monkeypatch.setattr(FingerprintGenerator, "_compute_content_hash", self._fail)
+        monkeypatch.setattr(FingerprintGenerator, "_detect_technical", self._fail)
+        fp2 = FingerprintGenerator(temp_project).generate()
+
+        assert fp2 == fp1, "Expected the persisted fingerprint"
+
+    def test_touched_file_revalidated_by_hash(self, temp_project, monkeypatch):
+        """Test a changed stat with unchanged content keeps the fingerprint."""
+        generator = FingerprintGenerator(temp_project)
+        fp1 = generator.generate()
+        os.utime(temp_project / "pyproject.toml", ns=(2_000_000_000, 2_000_000_000))
+
+        monkeypatch.setattr(FingerprintGenerator, "_detect_technical", self._fail)
+        assert generator.generate() is fp1, "Expected cache kept after a touch"
+
+    def test_content_change_invalidates(self, temp_project):
+        """Test changed content regenerates the fingerprint."""
+        generator = FingerprintGenerator(temp_project)
+        generator.generate()
+        (temp_project / "package.json").write_text('{"dependencies": {"react": "1"}}')
+
+        FingerprintGenerator.clear_cache()
+        fp = generator.generate()
+
+        assert fp.technical.language == "python", "Expected pyproject detection first"
+        assert fp.structure.config_files.count("package.json") == 1, "Expected regenerated structure"
+
+    def test_persist_disabled(self, temp_project):
+        """Test persist=False keeps the cache in memory only."""
+        FingerprintGenerator(temp_project, persist=False).generate()
+
+        assert not (temp_project / FingerprintGenerator.CACHE_FILE).exists(), "Expected no cache file"
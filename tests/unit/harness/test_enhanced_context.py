@@ -449,6 +449,80 @@ class TestLoopDetector:
         assert result.detected, "Expected result.detected to be truthy"
         assert result.loop_type == LoopType.ERROR_CYCLE, "Expected result.loop_type to equal LoopType.ERROR_CYCLE"
 
+    def test_observe_matches_check(self):
+        """Test streaming detection agrees with batch detection."""
+        identical = [
+            ActionRecord(step=i, action="edit_file", parameters={"old_text": "foo"},
+                         result=ActionResult.FAILURE, summary="Edit failed", error="text not found")
+            for i in range(3)
+        ]
+        no_progress = [
+            ActionRecord(step=i, action="run_check", result=ActionResult.SUCCESS, summary="Check ran")
+            for i in range(4)
+        ]
+        cycling = [
+            ActionRecord(step=i, action="edit_file" if i % 2 == 0 else "extract_function", target="file.py",
+                         result=ActionResult.FAILURE, summary="failed", error="operation failed")
+            for i in range(5)
+        ]
+
+        for actions in (identical, no_progress, cycling):
+            detector = LoopDetector()
+            streamed = [detector.observe(a) for a in actions][-1]
+            batch = LoopDetector().check(actions)
+            assert streamed.detected and batch.detected, "Expected both modes to detect the loop"
+            assert streamed.loop_type == batch.loop_type, "Expected streaming and batch loop types to agree"
+
+    def test_observe_detects_long_cycle(self):
+        """Test a three-step cycle is caught, which a five-action window misses."""
+        detector = LoopDetector()
+        cycle = [
+            ("read_file", ActionResult.SUCCESS, None),
+            ("edit_file", ActionResult.FAILURE, "old_text not found"),
+            ("run_check", ActionResult.SUCCESS, None),
+        ]
+        actions = []
+        results = []
+        for i in range(9):
+            action, result, error = cycle[i % 3]
+            actions.append(ActionRecord(step=i + 1, action=action, target="file.py",
+                                        result=result, summary=action, error=error))
+            results.append(detector.observe(actions[-1]))
+
+        assert not any(r.detected for r in results[:-1]), "Expected no detection before the third repeat"
+        assert results[-1].detected, "Expected the repeated cycle to be detected"
+        assert results[-1].loop_type == LoopType.ERROR_CYCLE, "Expected result.loop_type to equal LoopType.ERROR_CYCLE"
+        assert not LoopDetector().check(actions[-5:]).detected, "Expected the batch window to miss the cycle"
+
+    def test_observe_ignores_failures_spread_across_successes(self):
+        """Test isolated failures far apart in a successful run are not an error cycle."""
+        detector = LoopDetector()
+        step = 0
+        results = []
+        for action in ("edit_file", "run_tests", "edit_file", "run_tests", "edit_file"):
+            step += 1
+            results.append(detector.observe(ActionRecord(step=step, action=action, target="file.py",
+                                                         result=ActionResult.FAILURE, summary="failed",
+                                                         error="operation failed")))
+            for _ in range(10):
+                step += 1
+                results.append(detector.observe(ActionRecord(step=step, action="write_file",
+                                                             parameters={"step": step},
+                                                             result=ActionResult.SUCCESS, summary="Wrote")))
+
+        assert not any(r.detected for r in results), "Expected no loop across a long successful run"
+
+    def test_observe_keeps_bounded_state(self):
+        """Test streaming state does not grow with the run."""
+        detector = LoopDetector()
+        for i in range(500):
+            detector.observe(ActionRecord(step=i, action=f"edit_file_{i}", result=ActionResult.SUCCESS,
+                                          summary="Edited"))
+
+        assert detector.steps_observed == 500, "Expected every action to be counted"
+        assert len(detector._recent) <= 4, "Expected the recent window to stay bounded"
+        assert len(detector._recent_keys) <= LoopDetector.MAX_CYCLE_PERIOD, "Expected cycle keys to stay bounded"
+
 
 class TestActionSignature:
     """Tests for ActionSignature."""
@@ -999,6 +1073,22 @@ class TestAdaptiveBudgetEnhancedLoopDetection:
         assert "Continue" in reason, "Expected 'Continue' in reason"
         assert loop_detection is None, "Expected loop_detection is None"
 
+    def test_spread_failures_do_not_stop_the_run(self):
+        """Test isolated failures between long successful stretches don't stop a streamed run."""
+        budget = AdaptiveBudget(base_budget=100, use_enhanced_loop_detection=True)
+        actions = []
+        for action in ("edit_file", "run_tests", "edit_file", "run_tests"):
+            actions.append({"action": action, "parameters": {}, "result": "failure",
+                            "summary": f"{action} failed", "error": "operation failed"})
+            actions.extend({"action": "write_file", "parameters": {"n": i}, "result": "success",
+                            "summary": "Wrote file"} for i in range(10))
+        for step, action in enumerate(actions, start=1):
+            action["step"] = step
+
+        for i in range(1, len(actions) + 1):
+            should_continue, reason, _ = budget.check_continue(i, actions[max(0, i - 5):i])
+            assert should_continue, f"Expected the run to continue at step {i}: {reason}"
+
     def test_legacy_fallback(self):
         """Test fallback to legacy detection when enhanced is disabled."""
         budget = AdaptiveBudget(
@@ -1078,6 +1168,26 @@ class TestAdaptiveBudgetEnhancedLoopDetection:
         assert not should_continue, "Assertion failed"
         assert "Budget exhausted" in reason, "Expected 'Budget exhausted' in reason"
 
+    def test_recent_windows_are_streamed_once(self):
+        """Test overlapping recent-action windows feed each step to the detector once."""
+        budget = AdaptiveBudget(base_budget=50, max_budget=50, use_enhanced_loop_detection=True)
+        cycle = [
+            {"action": "read_file", "result": "success", "summary": "Read"},
+            {"action": "edit_file", "result": "failure", "summary": "Edit failed", "error": "old_text not found"},
+            {"action": "run_check", "result": "success", "summary": "Check ran"},
+        ]
+        history = []
+        loop_detection = None
+        for step in range(1, 10):
+            history.append({"step": step, "target": "file.py", **cycle[(step - 1) % 3]})
+            should_continue, reason, loop_detection = budget.check_continue(step, history[-5:])
+            if not should_continue:
+                break
+
+        assert budget.loop_detector.steps_observed == step, "Expected each step to be observed exactly once"
+        assert loop_detection is not None and loop_detection.detected, "Expected the repeated cycle to stop the run"
+        assert step == 9, "Expected detection on the third repeat of the cycle"
+
     def test_step_outcome_includes_loop_info(self):
         """Test that StepOutcome can include loop detection info."""
         from agentforge.core.harness.minimal_context import StepOutcome
@@ -13,6 +13,7 @@ This file covers:
 TODO: Add comprehensive tests for each component.
 """
 
+import pytest
 
 
 class TestMinimalContextExecutor:
@@ -32,6 +33,94 @@ class TestTaskStateStore:
         from agentforge.core.harness.minimal_context.state_store import TaskStateStore
         assert TaskStateStore is not None, "Expected TaskStateStore is not None"
 
+    def test_actions_journal_appends_and_tails(self, tmp_path):
+        """Actions are appended as JSON lines and recent ones read from the end."""
+        from agentforge.core.harness.minimal_context.state_store import TaskStateStore
+        store = TaskStateStore(tmp_path)
+        state = store.create_task("fix_violation", "Fix it", ["Tests pass"], task_id="t1")
+
+        for i in range(500):
+            store.record_action(state.task_id, "edit_file", f"f{i}.py", {"i": i}, "success", f"edit {i}")
+
+        journal = tmp_path / ".agentforge" / "tasks" / "t1" / "actions.jsonl"
+        assert len(journal.read_text().splitlines()) == 500, "Expected one line per action"
+        recent = store.get_recent_actions("t1", limit=3)
+        assert [a.target for a in recent] == ["f497.py", "f498.py", "f499.py"], "Expected last 3 in order"
+        assert len(store.get_recent_actions("t1", limit=1000)) == 500, "Expected whole log when limit exceeds it"
+
+    def test_actions_journal_skips_torn_line(self, tmp_path):
+        """A partially written last line is skipped and the next append starts a new line."""
+        from agentforge.core.harness.minimal_context.state_store import TaskStateStore
+        store = TaskStateStore(tmp_path)
+        store.create_task("fix_violation", "Fix it", ["Tests pass"], task_id="t1")
+        store.record_action("t1", "read_file", "a.py", {}, "success", "read")
+        journal = tmp_path / ".agentforge" / "tasks" / "t1" / "actions.jsonl"
+        with open(journal, "a") as f:
+            f.write('{"step": 0, "act')
+
+        store.record_action("t1", "edit_file", "b.py", {}, "success", "edit")
+
+        assert [a.target for a in store.get_recent_actions("t1", limit=5)] == ["a.py", "b.py"], "Expected torn line skipped"
+
+    def test_legacy_actions_yaml_migrated(self, tmp_path):
+        """An existing actions.yaml is converted to the journal on first access."""
+        import yaml
+
+        from agentforge.core.harness.minimal_context.state_store import TaskStateStore
+        store = TaskStateStore(tmp_path)
+        store.create_task("fix_violation", "Fix it", ["Tests pass"], task_id="t1")
+        task_dir = tmp_path / ".agentforge" / "tasks" / "t1"
+        (task_dir / "actions.jsonl").unlink()
+        legacy = [{"step": i, "action": "run_tests", "target": None, "parameters": {}, "result": "failure",
+                   "summary": f"run {i}", "timestamp": "2025-01-01T00:00:00+00:00"} for i in range(4)]
+        (task_dir / "actions.yaml").write_text(yaml.dump({"actions": legacy}))
+
+        store.record_action("t1", "edit_file", "c.py", {}, "success", "edit")
+
+        assert not (task_dir / "actions.yaml").exists(), "Expected legacy file replaced"
+        assert [a.summary for a in store.get_all_actions("t1")] == ["run 0", "run 1", "run 2", "run 3", "edit"]
+
+
+    def test_session_loads_and_saves_once(self, tmp_path, monkeypatch):
+        """Updates inside a session stay in memory and state.yaml is written once at exit."""
+        from agentforge.core.harness.minimal_context.phase_machine import Phase
+        from agentforge.core.harness.minimal_context.state_store import TaskStateStore
+        store = TaskStateStore(tmp_path)
+        store.create_task("fix_violation", "Fix it", ["Tests pass"], task_id="t1")
+        writes, loads = [], []
+        monkeypatch.setattr(TaskStateStore, "_write_state", lambda _self, st: writes.append(st.current_step))
+        real_load = TaskStateStore._migrate_state
+        monkeypatch.setattr(TaskStateStore, "_migrate_state", lambda self, d: loads.append(1) or real_load(self, d))
+
+        with store.session("t1") as state:
+            store.increment_step("t1")
+            store.update_phase("t1", Phase.ANALYZE)
+            store.update_context_data("t1", "diagnosis", "off by one")
+            store.record_action("t1", "read_file", "a.py", {}, "success", "read")
+            store.update_verification("t1", 3, 0, True)
+            assert store.load("t1") is state, "Expected the session's state"
+
+        assert loads == [1], "Expected a single load"
+        assert writes == [1], "Expected a single write at session end"
+        assert store.get_recent_actions("t1")[0].step == 1, "Expected action recorded at the session's step"
+
+    def test_session_shared_across_stores_and_persisted(self, tmp_path):
+        """Another store instance joins the open session; the result is on disk after exit."""
+        from agentforge.core.harness.minimal_context.phase_machine import Phase
+        from agentforge.core.harness.minimal_context.state_store import TaskStateStore
+        store = TaskStateStore(tmp_path)
+        store.create_task("fix_violation", "Fix it", ["Tests pass"], task_id="t1")
+
+        with pytest.raises(RuntimeError), store.session("t1"):
+            TaskStateStore(tmp_path).update_phase("t1", Phase.IMPLEMENT)
+            store.increment_step("t1")
+            raise RuntimeError("step failed")
+
+        state = TaskStateStore(tmp_path).load("t1")
+        assert (state.phase, state.current_step) == (Phase.IMPLEMENT, 1), "Expected both updates saved"
+        task_dir = tmp_path / ".agentforge" / "tasks" / "t1"
+        assert not list(task_dir.glob("*.tmp")), "Expected no temp files left"
+
 
 class TestWorkingMemoryManager:
     """Tests for WorkingMemoryManager."""
@@ -40,3 +129,103 @@ class TestWorkingMemoryManager:
         """Verify WorkingMemoryManager can be imported."""
         from agentforge.core.harness.minimal_context.working_memory import WorkingMemoryManager
         assert WorkingMemoryManager is not None, "Expected WorkingMemoryManager is not None"
+
+    def test_batch_writes_once_and_reads_from_memory(self, tmp_path, monkeypatch):
+        """Inside a batch, changes are written once and reads never parse YAML."""
+        from agentforge.core.harness.minimal_context import working_memory
+        from agentforge.core.harness.minimal_context.working_memory import WorkingMemoryManager
+        mgr = WorkingMemoryManager(tmp_path)
+        mgr.add_fact("f0", "verification", "Check passed", 0.95, "run_check", step=1)
+        saves = []
+        real_save = WorkingMemoryManager._save
+        monkeypatch.setattr(WorkingMemoryManager, "_save", lambda self, items: saves.append(1) or real_save(self, items))
+        monkeypatch.setattr(working_memory.yaml, "safe_load", None)  # Hot path must not parse
+
+        with mgr.batch():
+            for step in range(2, 8):
+                WorkingMemoryManager(tmp_path).add_action_result("edit_file", "success", "edited", step=step)
+                mgr.get_facts_for_context(current_step=step)
+            facts = WorkingMemoryManager(tmp_path).get_facts(category="verification")
+
+        assert saves == [1], "Expected a single write at batch end"
+        assert [f["id"] for f in facts] == ["f0"], "Expected fact found by category"
+        assert [a["step"] for a in mgr.get_action_results(limit=10)] == [4, 5, 6, 7], \
+            "Expected eviction to max_items with the pinned fact kept"
+
+    def test_reloads_after_external_write(self, tmp_path):
+        """An index reloads when working_memory.yaml was changed by another writer."""
+        import yaml
+
+        from agentforge.core.harness.minimal_context.working_memory import WorkingMemoryManager
+        mgr = WorkingMemoryManager(tmp_path)
+        mgr.add("note", "n1", "first")
+        (tmp_path / "working_memory.yaml").write_text(yaml.dump({"max_items": 5, "items": [
+            {"type": "note", "key": "n2", "content": "from another process",
+             "added_at": "2025-01-01T00:00:00+00:00"}]}))
+
+        assert [i.key for i in mgr.get_items()] == ["n2"], "Expected the external change loaded"
+
+    def test_returned_items_are_copies(self, tmp_path):
+        """Changing a returned item does not change the shared index."""
+        from agentforge.core.harness.minimal_context.working_memory import WorkingMemoryManager
+        mgr = WorkingMemoryManager(tmp_path)
+        mgr.add_action_result("edit_file", "success", "edited", step=1)
+
+        item = mgr.get_by_type("action_result")[0]
+        item.content["result"] = "failure"
+        item.pinned = True
+
+        fresh = WorkingMemoryManager(tmp_path).get_items()[0]
+        assert fresh.content["result"] == "success", "Expected the index content unchanged"
+        assert not fresh.pinned, "Expected the index item unchanged"
+
+    def test_clear_with_nothing_removed_does_not_write(self, tmp_path, monkeypatch):
+        """Clearing memory that holds only pinned items leaves the file alone."""
+        from agentforge.core.harness.minimal_context.working_memory import WorkingMemoryManager
+        mgr = WorkingMemoryManager(tmp_path)
+        mgr.add("note", "keep", "pinned", pinned=True)
+        saves = []
+        monkeypatch.setattr(WorkingMemoryManager, "_save", lambda *_: saves.append(1))
+
+        assert mgr.clear() == 0, "Expected nothing cleared"
+        assert mgr.clear_facts() == 0, "Expected no facts cleared"
+        assert saves == [], "Expected no write"
+
+    def test_concurrent_adds_are_all_saved(self, tmp_path):
+        """Adds from several threads to one task all reach the index and the file."""
+        import threading
+
+        from agentforge.core.harness.minimal_context.working_memory import WorkingMemoryManager
+
+        def worker(n: int):
+            mgr = WorkingMemoryManager(tmp_path, max_items=1000)
+            for i in range(25):
+                mgr.add("note", f"n{n}-{i}", i)
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        WorkingMemoryManager.reset_indexes()
+
+        assert len(WorkingMemoryManager(tmp_path).get_items()) == 200, "Expected every add saved"
+
+    def test_indexes_are_bounded(self, tmp_path, monkeypatch):
+        """Idle indexes beyond MAX_INDEXES are dropped; batched ones are kept."""
+        from agentforge.core.harness.minimal_context.working_memory import WorkingMemoryManager
+        WorkingMemoryManager.reset_indexes()
+        monkeypatch.setattr(WorkingMemoryManager, "MAX_INDEXES", 3)
+        batched = WorkingMemoryManager(tmp_path / "batched")
+
+        with batched.batch():
+            batched.add("note", "n", "pending")
+            for i in range(5):
+                WorkingMemoryManager(tmp_path / f"t{i}").add("note", "n", i)
+
+            assert len(WorkingMemoryManager._indexes) == 3, "Expected the index count bounded"
+            assert not (tmp_path / "batched" / "working_memory.yaml").exists(), "Expected write deferred"
+
+        assert WorkingMemoryManager(tmp_path / "batched").get_items()[0].content == "pending", \
+            "Expected the batched index kept and flushed"
+        assert WorkingMemoryManager(tmp_path / "t0").get_items()[0].content == 0, "Expected evicted index reloaded"
@@ -12,6 +12,7 @@ from agentforge.core.generate.domain import (
     GenerationPhase,
 )
 from agentforge.core.generate.prompt_builder import PromptBuilder, PromptTemplates
+from agentforge.core.token_counter import count_tokens
 
 # =============================================================================
 # PromptBuilder Tests
@@ -363,10 +364,9 @@ class TestPromptBuilderTokenEstimation:
         return PromptBuilder()
 
     def test_estimate_tokens(self, builder):
-        # 400 chars should be ~100 tokens
-        prompt = "a" * 400
+        prompt = "Implement the OrderService.apply_discount method."
         estimate = builder.estimate_tokens(prompt)
-        assert estimate == 100, "Expected estimate to equal 100"
+        assert estimate == count_tokens(prompt), "Expected the shared token count"
 
     def test_estimate_tokens_empty(self, builder):
         assert builder.estimate_tokens("") == 0, "Expected builder.estimate_tokens('') to equal 0"
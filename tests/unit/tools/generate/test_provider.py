@@ -9,15 +9,16 @@ from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
-# Configure pytest-asyncio mode
-pytest_plugins = ("pytest_asyncio",)
-
 from agentforge.core.generate.domain import APIError
 from agentforge.core.generate.provider import (
     ClaudeProvider,
     ManualProvider,
     get_provider,
 )
+from agentforge.core.token_counter import count_tokens
+
+# Configure pytest-asyncio mode
+pytest_plugins = ("pytest_asyncio",)
 
 # =============================================================================
 # ClaudeProvider Tests
@@ -51,11 +52,12 @@ class TestClaudeProvider:
             provider = ClaudeProvider()
             assert provider._api_key == "env-key", "Expected provider._api_key to equal 'env-key'"
 
-    def test_count_tokens_approximation(self):
+    def test_count_tokens_pads_shared_counter(self):
         provider = ClaudeProvider(api_key=os.environ.get('TEST_API_KEY', 'test-key'))
-        # ~4 chars per token
-        text = "a" * 400
-        assert provider.count_tokens(text) == 100, "Expected provider.count_tokens(text) to equal 100"
+        text = "def apply(order):\n    return order.total * 0.9\n"
+        shared = count_tokens(text)
+        assert provider.count_tokens(text) > shared, "Expected a safety margin over the shared count"
+        assert provider.count_tokens(text) <= shared * ClaudeProvider.TOKEN_SAFETY_MARGIN + 1, "Expected margin only"
 
     @pytest.mark.asyncio
     async def test_generate_success(self):
@@ -184,10 +186,10 @@ class TestManualProvider:
         provider = ManualProvider()
         assert provider.is_available is True, "Expected provider.is_available is True"
 
-    def test_count_tokens_approximation(self):
+    def test_count_tokens_uses_shared_counter(self):
         provider = ManualProvider()
-        text = "a" * 400
-        assert provider.count_tokens(text) == 100, "Expected provider.count_tokens(text) to equal 100"
+        text = "def apply(order):\n    return order.total * 0.9\n"
+        assert provider.count_tokens(text) == count_tokens(text), "Expected the shared token count"
 
     def test_default_file_paths(self):
         provider = ManualProvider()
@@ -0,0 +1,102 @@
+"""Tests for ANN index selection and recall calibration."""
+
+import numpy as np
+import pytest
+
+from agentforge.core import ann_index
+
+faiss = pytest.importorskip("faiss")
+
+
+def _unit_vectors(n: int, dim: int = 32, seed: int = 0) -> np.ndarray:
+    vectors = np.random.default_rng(seed).standard_normal((n, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+class TestChooseFactory:
+    """Tests for factory string selection."""
+
+    def test_auto_scales_with_corpus_size(self):
+        """Test auto picks flat, then SQ8, then PQ as the corpus grows."""
+        assert ann_index.choose_factory(5_000, 384) == "Flat", "Expected exact search for small corpora"
+        assert ann_index.choose_factory(50_000, 384).endswith(",SQ8"), "Expected IVF+SQ8 for medium corpora"
+        assert ann_index.choose_factory(2_000_000, 384).endswith(",PQ96"), "Expected IVF+PQ for large corpora"
+
+    def test_too_few_vectors_to_train_falls_back(self):
+        """Test quantized types degrade gracefully on tiny corpora."""
+        assert ann_index.choose_factory(20, 32, {"type": "ivf"}) == "Flat", "Expected Flat below IVF training size"
+        assert ann_index.choose_factory(1_000, 32, {"type": "ivf_pq"}).endswith(",SQ8"), "Expected SQ8 below PQ training size"
+
+    def test_explicit_factory_wins(self):
+        """Test a raw factory string overrides the type."""
+        assert ann_index.choose_factory(10, 32, {"type": "hnsw", "factory": "IVF4,Flat"}) == "IVF4,Flat", "Expected factory override"
+
+    def test_unknown_type_raises(self):
+        """Test an unknown type is rejected."""
+        with pytest.raises(ValueError):
+            ann_index.choose_factory(10, 32, {"type": "annoy"})
+
+
+class TestCalibrate:
+    """Tests for recall-targeted search parameter tuning."""
+
+    @pytest.mark.parametrize("index_type, parameter", [("ivf", "nprobe"), ("hnsw", "efSearch")])
+    def test_reaches_target_recall(self, index_type: str, parameter: str):
+        """Test calibration picks a parameter value meeting the recall target."""
+        vectors = _unit_vectors(3_000)
+        ids = np.arange(len(vectors), dtype=np.int64) * 7
+        config = {"type": index_type, "target_recall": 0.9, "calibration_queries": 100}
+        index, _ = ann_index.build_index(vectors, ids, config)
+
+        result = ann_index.calibrate(index, vectors, ids, config)
+
+        assert result["parameter"] == parameter, f"Expected {parameter} to be tuned"
+        assert result["recall"] >= 0.9, "Expected calibrated recall to meet the target"
+
+    def test_query_itself_is_not_counted(self):
+        """Test an index that only finds the stored query vector scores no recall."""
+        vectors = _unit_vectors(50)
+        ids = np.arange(len(vectors), dtype=np.int64) * 7
+        own_ids = ids[:5]
+
+        class SelfOnlyIndex:
+            def search(self, queries, k):
+                found = np.full((len(queries), k), -1, dtype=np.int64)
+                found[:, 0] = own_ids
+                return None, found
+
+        truth = ann_index.exact_neighbors(vectors, ids, vectors[:5], 3, exclude=own_ids)
+
+        assert not any(own in row for own, row in zip(own_ids, truth, strict=True)), "Expected own ids excluded"
+        assert ann_index.measure_recall(SelfOnlyIndex(), vectors[:5], truth, exclude=own_ids) == 0.0, \
+            "Expected finding the query itself to earn no recall"
+
+    def test_parameter_survives_write_and_read(self, tmp_path):
+        """Test the tuned nprobe is persisted with the index."""
+        vectors = _unit_vectors(3_000)
+        ids = np.arange(len(vectors), dtype=np.int64)
+        index, _ = ann_index.build_index(vectors, ids, {"type": "ivf"})
+        result = ann_index.calibrate(index, vectors, ids, {"target_recall": 0.99})
+        faiss.write_index(index, str(tmp_path / "index.faiss"))
+
+        loaded = faiss.read_index(str(tmp_path / "index.faiss"))
+
+        assert faiss.extract_index_ivf(loaded).nprobe == result["value"], "Expected nprobe to persist"
+
+    def test_exact_index_not_calibrated(self):
+        """Test flat indexes have nothing to tune."""
+        vectors = _unit_vectors(100)
+        index, factory = ann_index.build_index(vectors, np.arange(100, dtype=np.int64))
+
+        assert factory == "Flat", "Expected factory to equal 'Flat'"
+        assert ann_index.calibrate(index, vectors, np.arange(100, dtype=np.int64)) == {}, "Expected no calibration"
+
+    def test_supports_removal(self):
+        """Test HNSW is reported as not supporting removal."""
+        vectors = _unit_vectors(200)
+        ids = np.arange(200, dtype=np.int64)
+        hnsw, _ = ann_index.build_index(vectors, ids, {"type": "hnsw"})
+        ivf, _ = ann_index.build_index(vectors, ids, {"type": "ivf"})
+
+        assert not ann_index.supports_removal(hnsw), "Expected HNSW to not support removal"
+        assert ann_index.supports_removal(ivf), "Expected IVF to support removal"
@@ -0,0 +1,65 @@
+"""Tests for the columnar chunk metadata store."""
+
+from pathlib import Path
+
+from agentforge.core.chunk_store import ChunkStore
+from agentforge.core.vector_types import Chunk
+
+
+def _chunk(path: str, content: str, line: int = 1) -> Chunk:
+    return Chunk(file_path=path, content=content, start_line=line, end_line=line + 2,
+                 context="Classes: Order", language="python")
+
+
+class TestChunkStore:
+    """Tests for writing and reading chunk stores."""
+
+    def test_round_trip(self, tmp_path: Path):
+        """Test chunks are returned intact by id, including non-ASCII content."""
+        chunks = {0: _chunk("a.py", "def a(): pass"), 5: _chunk("b.py", "s = 'héllo ✓'", 10)}
+        ChunkStore.write(tmp_path, {"project_hash": "h"}, chunks)
+
+        store = ChunkStore.open(tmp_path)
+
+        assert len(store) == 2, "Expected len(store) to equal 2"
+        assert store.get(5) == chunks[5], "Expected store.get(5) to equal chunks[5]"
+        assert store.get(3) is None, "Expected store.get(3) is None"
+        assert store.header["project_hash"] == "h", "Expected header to carry project_hash"
+
+    def test_incremental_write_drops_and_appends(self, tmp_path: Path):
+        """Test updating a base store drops stale ids and appends new chunks."""
+        base = ChunkStore.write(tmp_path, {}, {0: _chunk("a.py", "x" * 100), 1: _chunk("b.py", "y" * 100)})
+
+        store = ChunkStore.write(tmp_path, {}, {2: _chunk("c.py", "z" * 100)}, base=base, drop_ids=[0])
+
+        assert list(store.ids) == [1, 2], "Expected list(store.ids) to equal [1, 2]"
+        assert store.get(2).content == "z" * 100, "Expected appended content"
+        assert store.get(1).content == "y" * 100, "Expected kept content"
+
+    def test_compacts_when_mostly_dead(self, tmp_path: Path):
+        """Test the content blob is rewritten once most of it is stale."""
+        base = ChunkStore.write(tmp_path, {}, {i: _chunk(f"{i}.py", "x" * 100) for i in range(4)})
+
+        store = ChunkStore.write(tmp_path, {}, {}, base=base, drop_ids=[0, 1, 2])
+
+        assert (tmp_path / "chunks.blob").stat().st_size == 100, "Expected blob compacted to live content"
+        assert store.get(3).content == "x" * 100, "Expected surviving chunk readable"
+
+    def test_base_stays_readable_after_update(self, tmp_path: Path):
+        """Test a reader still holding the old store can read it after an update or compaction."""
+        base = ChunkStore.write(tmp_path, {}, {i: _chunk(f"{i}.py", f"{i}" * 100) for i in range(4)})
+
+        updated = ChunkStore.write(tmp_path, {}, {4: _chunk("4.py", "z" * 100)}, base=base, drop_ids=[0])
+        compacted = ChunkStore.write(tmp_path, {}, {}, base=updated, drop_ids=[1, 2, 3])
+
+        assert base.get(0).content == "0" * 100, "Expected the old store still readable"
+        assert updated.get(3).content == "3" * 100, "Expected the pre-compaction store still readable"
+        assert list(compacted.ids) == [4], "Expected only the live chunk in the new store"
+
+    def test_inconsistent_store_is_rejected(self, tmp_path: Path):
+        """Test a header whose count doesn't match the rows is treated as missing."""
+        ChunkStore.write(tmp_path, {}, {0: _chunk("a.py", "a")})
+        header = (tmp_path / "chunks.json").read_text().replace('"count": 1', '"count": 7')
+        (tmp_path / "chunks.json").write_text(header)
+
+        assert ChunkStore.open(tmp_path) is None, "Expected ChunkStore.open() to return None"
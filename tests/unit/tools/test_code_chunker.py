@@ -0,0 +1,120 @@
+"""Tests for CodeChunker's AST-based Python chunking."""
+
+from agentforge.core.code_chunker import CodeChunker
+
+SOURCE = '''"""Orders module."""
+
+import functools
+
+TAX_RATE = 0.2  # Module-level settings that should still be searchable
+
+
+class OrderService:
+    """Applies discounts to orders."""
+
+    currency = "EUR"
+
+    @functools.lru_cache
+    def apply_discount(
+        self,
+        order,
+        code,
+    ):
+        return order.total * 0.9
+
+    class Config:
+        strict = True
+
+        def validate(self):
+            return self.strict
+
+
+@staticmethod
+async def fetch_order(order_id):
+    return order_id
+'''
+
+
+def _by_symbol(content: str = SOURCE) -> dict:
+    chunks = CodeChunker().chunk_file("orders.py", content, "python")
+    return {c.symbol: c for c in chunks}
+
+
+class TestPythonASTChunking:
+    """Tests for symbol-level Python chunks."""
+
+    def test_one_chunk_per_symbol(self):
+        """Test classes, methods, nested classes and functions each get a chunk."""
+        symbols = set(_by_symbol())
+
+        assert {
+            "<module>", "OrderService", "OrderService.apply_discount",
+            "OrderService.Config", "OrderService.Config.validate", "fetch_order",
+        } <= symbols, "Expected a chunk per symbol"
+
+    def test_decorators_and_multiline_signatures_kept_whole(self):
+        """Test a decorated function with a multi-line signature is one chunk."""
+        chunk = _by_symbol()["OrderService.apply_discount"]
+
+        assert chunk.content.lstrip().startswith("@functools.lru_cache"), "Expected decorator included"
+        assert "return order.total * 0.9" in chunk.content, "Expected body included"
+        assert chunk.start_line == 13, "Expected chunk to start at the decorator line"
+
+    def test_class_chunk_excludes_methods(self):
+        """Test the class chunk holds its docstring and attributes, not its methods."""
+        chunk = _by_symbol()["OrderService"]
+
+        assert 'currency = "EUR"' in chunk.content, "Expected class attribute in class chunk"
+        assert "apply_discount" not in chunk.content, "Expected methods excluded"
+
+    def test_stable_id_survives_moves(self):
+        """Test shifting a method down the file keeps its stable id."""
+        before = _by_symbol()["fetch_order"]
+        after = _by_symbol(SOURCE.replace('TAX_RATE = 0.2', 'TAX_RATE = 0.2\nSHIPPING = 5\n'))["fetch_order"]
+
+        assert after.start_line != before.start_line, "Expected the function to move"
+        assert after.stable_id == before.stable_id, "Expected the same stable id"
+
+    def test_oversized_symbol_is_sub_chunked(self):
+        """Test a function larger than the chunk budget is split."""
+        body = "\n".join(f"    value_{i} = compute_something_long({i})" for i in range(200))
+        chunks = CodeChunker(chunk_size=100).chunk_file("big.py", f"def big():\n{body}\n", "python")
+
+        assert len(chunks) > 1, "Expected several chunks"
+        assert all(c.symbol == "big" for c in chunks), "Expected every part tagged with the symbol"
+
+    def test_sub_chunks_of_class_header_map_to_file_lines(self):
+        """Test sub-chunks of a header split by methods point at the lines they contain."""
+        fields = [f"    field_{i} = compute_something_long({i})" for i in range(60)]
+        source = "class Big:\n" + "\n".join(fields[:30]) + \
+            "\n\n    def method(self):\n        return 1\n\n" + "\n".join(fields[30:]) + "\n"
+        lines = source.split("\n")
+
+        chunks = [c for c in CodeChunker(chunk_size=100).chunk_file("big.py", source, "python")
+                  if c.symbol == "Big"]
+
+        assert len(chunks) > 1, "Expected the header to be sub-chunked"
+        for chunk in chunks:
+            chunk_lines = chunk.content.split("\n")
+            assert lines[chunk.start_line - 1] == chunk_lines[0], "Expected start_line at the first line"
+            assert lines[chunk.end_line - 1] == chunk_lines[-1], "Expected end_line at the last line"
+
+    def test_comments_between_definitions_are_kept(self):
+        """Test comments between top-level nodes land in a chunk."""
+        source = SOURCE.replace(
+            "@staticmethod",
+            "# Fetching is kept outside the service so workers can call it directly\n@staticmethod",
+        ) + "\n# Trailing notes about the order lifecycle and how refunds are handled later\n"
+
+        chunks = CodeChunker().chunk_file("orders.py", source, "python")
+        fetch = next(c for c in chunks if c.symbol == "fetch_order")
+
+        assert fetch.content.startswith("# Fetching is kept"), "Expected the leading comment with the function"
+        assert any("Trailing notes" in c.content for c in chunks), "Expected trailing comments in a chunk"
+
+    def test_syntax_error_falls_back(self):
+        """Test unparseable Python still produces chunks."""
+        chunks = CodeChunker().chunk_file("bad.py", "def broken(:\n    pass\n" * 5, "python")
+
+        assert chunks, "Expected fallback chunks"
+        assert all(c.symbol == "" for c in chunks), "Expected no symbols from the fallback"
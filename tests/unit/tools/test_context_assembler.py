@@ -7,6 +7,10 @@ import pytest
 
 from agentforge.core.context_assembler import CodeContext, ContextAssembler, FileContext
 from agentforge.core.context_assembler_types import ArchitectureLayer, PatternMatch, SymbolInfo
+from agentforge.core.context_packing import ContextPacker, PackUnit, imports_header, symbol_block
+from agentforge.core.lsp_types import Location, Symbol
+from agentforge.core.token_counter import count_tokens
+from agentforge.core.vector_types import SearchResult
 
 
 class TestContextAssemblerInit:
@@ -178,7 +182,7 @@ def hello():
 """
         tokens = assembler.estimate_tokens(code)
         assert tokens > 0, "Expected tokens > 0"
-        assert tokens == len(code) // 4, "Expected tokens to equal len(code) // 4"
+        assert tokens == count_tokens(code), "Expected the shared token count"
 
     def test_estimate_tokens_empty_string(self, tmp_path: Path):
         """Test token estimation for empty string."""
@@ -524,7 +528,8 @@ class TestProcessingMethods:
         )
 
         assert len(result_content) < len(content), "Expected len(result_content) < len(content)"
-        assert result_tokens == 500, "Expected result_tokens to equal 500"
+        assert 450 <= result_tokens <= 500, "Expected content truncated to fill the remaining budget"
+        assert result_tokens == assembler.estimate_tokens(result_content), "Expected the truncated content's count"
 
     def test_fit_content_to_budget_returns_none_when_no_room(self, tmp_path: Path):
         """Test fit_content_to_budget returns None when insufficient room (<200 tokens)."""
@@ -532,7 +537,7 @@ class TestProcessingMethods:
 
         # When remaining budget < 200 tokens, skip the file
         result_content, result_tokens = assembler._fit_content_to_budget(
-            "x" * 1000,  # Large content
+            "word " * 1000,  # Large content
             current_tokens=900,  # Only 100 tokens remaining (< 200 threshold)
             budget=1000
         )
@@ -541,6 +546,84 @@ class TestProcessingMethods:
         assert result_tokens == 0, "Expected result_tokens to equal 0"
 
 
+class TestContextPacking:
+    """Tests for symbol/chunk-granular packing."""
+
+    def _write(self, tmp_path: Path, rel: str, text: str) -> None:
+        path = tmp_path / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text)
+
+    def test_large_file_does_not_crowd_out_precise_hits(self, tmp_path: Path):
+        """Test one precise method is packed instead of a whole large file."""
+        big = "import os\n\n" + "".join(f"def helper_{i}():\n    return {i}\n\n" for i in range(400))
+        self._write(tmp_path, "src/big.py", big)
+        self._write(tmp_path, "src/orders.py",
+                    "from decimal import Decimal\n\n\nclass Orders:\n    def place_order(self):\n"
+                    "        return Decimal(1)\n\n    def cancel(self):\n        pass\n")
+        assembler = ContextAssembler(str(tmp_path))
+        symbol = Symbol("place_order", "method", Location("src/orders.py", 4, 4, end_line=5, end_column=25))
+        vector = [SearchResult("src/big.py", big, 0.4, 1, big.count("\n"))]
+
+        context = assembler.assemble("place order", lsp_symbols=[symbol], vector_results=vector, budget_tokens=500)
+
+        orders = next(f for f in context.files if f.path == "src/orders.py")
+        assert "def place_order" in orders.content, "Expected the precise hit"
+        assert "def cancel" not in orders.content, "Expected only the symbol's range"
+        assert orders.content.count("from decimal import Decimal") == 1, "Expected imports header once"
+        assert context.total_tokens <= 500, "Expected packing within budget"
+
+    def test_vector_chunks_packed_without_reading_file(self, tmp_path: Path, monkeypatch):
+        """Test chunk units carry their own text (only the file head is read)."""
+        self._write(tmp_path, "src/a.py", "import json\n\ndef a():\n    return 1\n")
+        assembler = ContextAssembler(str(tmp_path))
+        monkeypatch.setattr(assembler, "_get_file_content", Mock(side_effect=AssertionError("full read")))
+
+        context = assembler.assemble(
+            "a", vector_results=[SearchResult("src/a.py", "def a():\n    return 1", 0.9, 3, 4)])
+
+        assert context.files[0].content.startswith("import json"), "Expected header from file head"
+        assert "def a():" in context.files[0].content, "Expected chunk text"
+        assert context.retrieval_metadata["units_packed"] == 1, "Expected one unit packed"
+
+    def test_packer_respects_budget_and_prefers_density(self):
+        """Test greedy packing keeps to the budget and ranks by value per token."""
+        packer = ContextPacker(count_tokens, lambda _: "", lambda text, n: text[:n])
+        dense = PackUnit("a.py", 1, 2, "def a(): pass", 1.0)
+        sparse = PackUnit("b.py", 1, 200, "x = 1\n" * 200, 1.5)
+
+        packed, used = packer.pack([sparse, dense], budget=50)
+
+        assert packed == [dense], "Expected the dense unit only"
+        assert used <= 50, "Expected budget respected"
+
+    def test_nested_symbols_are_not_duplicated(self):
+        """Test a class packed after its method adds only the lines around the method."""
+        packer = ContextPacker(count_tokens, lambda _: "", lambda text, n: text[:n])
+        lines = ["class OrderService:", "    rate = 0.1", "", "    def __init__(self):", "        self.total = 0",
+                 "    def apply_discount(self, order):", "        order.total *= 1 - self.rate",
+                 "        return order", "", "    def cancel(self, order):", "        order.cancelled = True"]
+        cls = PackUnit("orders.py", 2, 12, "\n".join(lines), 1.0)
+        method = PackUnit("orders.py", 7, 9, "\n".join(lines[5:8]), 1.0)
+
+        packed, used = packer.pack([cls, method], budget=1000)
+
+        emitted = [line for unit in packed for line in unit.text.splitlines() if line]
+        assert emitted.count("    def apply_discount(self, order):") == 1, "Expected the method once"
+        assert sorted(emitted) == sorted(line for line in lines if line), "Expected every class line once"
+        assert [(u.start_line, u.end_line) for u in sorted(packed, key=lambda u: u.start_line)] == \
+            [(2, 6), (7, 9), (10, 12)], "Expected the class split around the method"
+        assert used == sum(u.tokens for u in packed) + 3 * packer.separator_tokens, "Expected each line charged once"
+
+    def test_imports_header_and_symbol_block(self):
+        """Test header extraction stops at definitions and blocks follow indentation."""
+        lines = ["from x import (", "    a,", ")", "import y", "", "@dec", "def f():", "    pass", "", "def g():",
+                 "    pass"]
+
+        assert imports_header("\n".join(lines)) == "from x import (\n    a,\n)\nimport y", "Expected imports"
+        assert symbol_block(lines, 6) == (5, 7), "Expected decorator through body"
+
+
 class TestCodeContextMethods:
     """Tests for CodeContext output methods."""
 
@@ -5,6 +5,7 @@
 
 """Tests for ContextRetriever class."""
 
+import time
 from pathlib import Path
 from unittest.mock import Mock, patch
 
@@ -137,10 +138,12 @@ class TestContextRetrieverRetrieve:
             total_tokens=0, retrieval_metadata={}
         )
 
-        with patch.object(retriever, '_retrieve_lsp_symbols', return_value=[]):
-            with patch.object(retriever, '_retrieve_vector_results', return_value=[]):
-                with patch.object(retriever.assembler, 'assemble', return_value=mock_context):
-                    context = retriever.retrieve("test query")
+        with (
+            patch.object(retriever, '_retrieve_lsp_symbols', return_value=[]),
+            patch.object(retriever, '_retrieve_vector_results', return_value=[]),
+            patch.object(retriever.assembler, 'assemble', return_value=mock_context),
+        ):
+            context = retriever.retrieve("test query")
 
         assert isinstance(context, CodeContext), "Expected isinstance() to be truthy"
 
@@ -153,10 +156,12 @@ class TestContextRetrieverRetrieve:
             total_tokens=0, retrieval_metadata={}
         )
 
-        with patch.object(retriever, '_retrieve_lsp_symbols', return_value=[]):
-            with patch.object(retriever, '_retrieve_vector_results', return_value=[]):
-                with patch.object(retriever.assembler, 'assemble', return_value=mock_context) as mock_assemble:
-                    retriever.retrieve("test query")
+        with (
+            patch.object(retriever, '_retrieve_lsp_symbols', return_value=[]),
+            patch.object(retriever, '_retrieve_vector_results', return_value=[]),
+            patch.object(retriever.assembler, 'assemble', return_value=mock_context) as mock_assemble,
+        ):
+            retriever.retrieve("test query")
 
         # Check budget was passed to assemble
         call_kwargs = mock_assemble.call_args[1]
@@ -171,10 +176,12 @@ class TestContextRetrieverRetrieve:
             total_tokens=0, retrieval_metadata={}
         )
 
-        with patch.object(retriever, '_retrieve_lsp_symbols', return_value=[]):
-            with patch.object(retriever, '_retrieve_vector_results', return_value=[]):
-                with patch.object(retriever.assembler, 'assemble', return_value=mock_context) as mock_assemble:
-                    retriever.retrieve("test query", budget_tokens=4000)
+        with (
+            patch.object(retriever, '_retrieve_lsp_symbols', return_value=[]),
+            patch.object(retriever, '_retrieve_vector_results', return_value=[]),
+            patch.object(retriever.assembler, 'assemble', return_value=mock_context) as mock_assemble,
+        ):
+            retriever.retrieve("test query", budget_tokens=4000)
 
         call_kwargs = mock_assemble.call_args[1]
         assert call_kwargs["budget_tokens"] == 4000, "Expected call_kwargs['budget_tokens'] to equal 4000"
@@ -188,10 +195,12 @@ class TestContextRetrieverRetrieve:
             total_tokens=0, retrieval_metadata={}
         )
 
-        with patch.object(retriever, '_retrieve_lsp_symbols', return_value=[]) as mock_lsp:
-            with patch.object(retriever, '_retrieve_vector_results', return_value=[]):
-                with patch.object(retriever.assembler, 'assemble', return_value=mock_context):
-                    retriever.retrieve("test query", entry_points=["OrderService"])
+        with (
+            patch.object(retriever, '_retrieve_lsp_symbols', return_value=[]) as mock_lsp,
+            patch.object(retriever, '_retrieve_vector_results', return_value=[]),
+            patch.object(retriever.assembler, 'assemble', return_value=mock_context),
+        ):
+            retriever.retrieve("test query", entry_points=["OrderService"])
 
         mock_lsp.assert_called_once_with("test query", ["OrderService"])
 
@@ -204,10 +213,12 @@ class TestContextRetrieverRetrieve:
             total_tokens=0, retrieval_metadata={}
         )
 
-        with patch.object(retriever, '_retrieve_lsp_symbols') as mock_lsp:
-            with patch.object(retriever, '_retrieve_vector_results', return_value=[]):
-                with patch.object(retriever.assembler, 'assemble', return_value=mock_context):
-                    retriever.retrieve("test query", use_lsp=False)
+        with (
+            patch.object(retriever, '_retrieve_lsp_symbols') as mock_lsp,
+            patch.object(retriever, '_retrieve_vector_results', return_value=[]),
+            patch.object(retriever.assembler, 'assemble', return_value=mock_context),
+        ):
+            retriever.retrieve("test query", use_lsp=False)
 
         mock_lsp.assert_not_called()
 
@@ -220,10 +231,12 @@ class TestContextRetrieverRetrieve:
             total_tokens=0, retrieval_metadata={}
         )
 
-        with patch.object(retriever, '_retrieve_lsp_symbols', return_value=[]):
-            with patch.object(retriever, '_retrieve_vector_results') as mock_vector:
-                with patch.object(retriever.assembler, 'assemble', return_value=mock_context):
-                    retriever.retrieve("test query", use_vector=False)
+        with (
+            patch.object(retriever, '_retrieve_lsp_symbols', return_value=[]),
+            patch.object(retriever, '_retrieve_vector_results') as mock_vector,
+            patch.object(retriever.assembler, 'assemble', return_value=mock_context),
+        ):
+            retriever.retrieve("test query", use_vector=False)
 
         mock_vector.assert_not_called()
 
@@ -238,16 +251,77 @@ class TestContextRetrieverRetrieve:
             total_tokens=0, retrieval_metadata={}
         )
 
-        with patch.object(retriever, '_retrieve_lsp_symbols', return_value=[]):
-            with patch.object(retriever, '_retrieve_vector_results', return_value=[]):
-                with patch.object(retriever.assembler, 'assemble', return_value=mock_context):
-                    context = retriever.retrieve("test query")
+        with (
+            patch.object(retriever, '_retrieve_lsp_symbols', return_value=[]),
+            patch.object(retriever, '_retrieve_vector_results', return_value=[]),
+            patch.object(retriever.assembler, 'assemble', return_value=mock_context),
+        ):
+            context = retriever.retrieve("test query")
 
         assert "project_path" in context.retrieval_metadata, "Expected 'project_path' in context.retrieval_metadata"
         assert context.retrieval_metadata["lsp_enabled"], "Assertion failed"
         assert context.retrieval_metadata["vector_enabled"], "Assertion failed"
 
 
+class TestConcurrentRetrieval:
+    """Tests for running sources concurrently under a deadline."""
+
+    @staticmethod
+    def _slow(delay: float, value: list):
+        def source(*_args):
+            time.sleep(delay)
+            return value
+        return source
+
+    def _retrieve(self, retriever, lsp_delay: float, search_delay: float, **kwargs):
+        with (
+            patch.object(retriever, '_retrieve_lsp_symbols', side_effect=self._slow(lsp_delay, ["lsp"])),
+            patch.object(retriever, '_retrieve_search_results', side_effect=self._slow(search_delay, ["vec"])),
+            patch.object(retriever.assembler, 'assemble',
+                         return_value=CodeContext(retrieval_metadata={})) as mock_assemble,
+        ):
+            start = time.monotonic()
+            context = retriever.retrieve("test query", **kwargs)
+            elapsed = time.monotonic() - start
+        return context, mock_assemble.call_args[1], elapsed
+
+    def test_sources_run_concurrently(self, tmp_path: Path):
+        """Test LSP and search latencies overlap instead of adding up."""
+        retriever = ContextRetriever(project_path=str(tmp_path))
+
+        context, kwargs, elapsed = self._retrieve(retriever, 0.3, 0.3)
+
+        assert elapsed < 0.55, f"Expected overlapping sources, took {elapsed:.2f}s"
+        assert kwargs["lsp_symbols"] == ["lsp"] and kwargs["vector_results"] == ["vec"], "Expected both sources"
+        timings = context.retrieval_metadata["source_timings_ms"]
+        assert set(timings) == {"lsp", "search"}, "Expected per-source timings"
+        assert timings["lsp"] >= 250, "Expected measured LSP latency"
+
+    def test_deadline_drops_late_sources(self, tmp_path: Path):
+        """Test retrieval returns the finished sources when the deadline expires."""
+        retriever = ContextRetriever(project_path=str(tmp_path))
+
+        context, kwargs, elapsed = self._retrieve(retriever, 1.0, 0.0, deadline_ms=200)
+        retriever.shutdown()
+
+        assert elapsed < 0.6, f"Expected to return at the deadline, took {elapsed:.2f}s"
+        assert kwargs["lsp_symbols"] == [], "Expected late LSP results to be dropped"
+        assert kwargs["vector_results"] == ["vec"], "Expected finished search results"
+        assert context.retrieval_metadata["timed_out_sources"] == ["lsp"], "Expected LSP reported late"
+        assert "lsp" not in context.retrieval_metadata["source_timings_ms"], "Expected no timing for late source"
+
+    def test_deadline_from_config(self, tmp_path: Path):
+        """Test retrieval.deadline_ms in config applies when no deadline is passed."""
+        retriever = ContextRetriever(project_path=str(tmp_path))
+        retriever.config.setdefault("retrieval", {})["deadline_ms"] = 100
+
+        context, _, _ = self._retrieve(retriever, 0.0, 1.0)
+        retriever.shutdown()
+
+        assert context.retrieval_metadata["deadline_ms"] == 100, "Expected config deadline"
+        assert context.retrieval_metadata["timed_out_sources"] == ["search"], "Expected search reported late"
+
+
 class TestKeywordExtraction:
     """Tests for keyword extraction from queries."""
 
@@ -382,7 +456,7 @@ class TestIndexing:
         assert stats.file_count == 0, "Expected stats.file_count to equal 0"
         assert len(stats.errors) == 0, "Expected len(stats.errors) to equal 0"
 
-    def test_index_stats_fields(self, tmp_path: Path):
+    def test_index_stats_fields(self):
         """Test IndexStats has expected fields."""
         stats = IndexStats()
 
@@ -440,3 +514,163 @@ class TestShutdown:
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
+
+
+class TestSearchFusion:
+    """Tests for lexical + vector rank fusion."""
+
+    @staticmethod
+    def _result(path: str, score: float = 0.5):
+        from agentforge.core.vector_types import SearchResult
+
+        return SearchResult(file_path=path, chunk=path, score=score, start_line=1, end_line=2)
+
+    def test_identifier_query_skips_vector_search(self, tmp_path: Path):
+        """Test identifier-only queries with lexical hits never reach vector search."""
+        retriever = ContextRetriever(project_path=str(tmp_path))
+        lexical = [self._result("orders.py")]
+
+        with (
+            patch.object(retriever, '_retrieve_lexical_results', return_value=lexical),
+            patch.object(retriever, '_retrieve_vector_results') as mock_vector,
+        ):
+            results = retriever._retrieve_search_results("OrderService", ["apply_discount"])
+
+        assert results == lexical, "Expected lexical results returned as-is"
+        mock_vector.assert_not_called()
+
+    def test_prose_query_fuses_by_reciprocal_rank(self, tmp_path: Path):
+        """Test a chunk ranked by both searches comes first."""
+        retriever = ContextRetriever(project_path=str(tmp_path))
+        vector = [self._result("a.py", 0.9), self._result("b.py", 0.8)]
+        lexical = [self._result("b.py"), self._result("c.py")]
+
+        with (
+            patch.object(retriever, '_retrieve_lexical_results', return_value=lexical),
+            patch.object(retriever, '_retrieve_vector_results', return_value=vector),
+        ):
+            results = retriever._retrieve_search_results("discount handling")
+
+        assert [r.file_path for r in results] == ["b.py", "a.py", "c.py"], "Expected b.py (in both lists) first"
+        assert results[0].score <= 1.0, "Expected fused scores scaled to at most 1.0"
+
+    def test_empty_lexical_keeps_vector_scores(self, tmp_path: Path):
+        """Test vector results pass through unchanged without lexical hits."""
+        retriever = ContextRetriever(project_path=str(tmp_path))
+        vector = [self._result("a.py", 0.9)]
+
+        with (
+            patch.object(retriever, '_retrieve_lexical_results', return_value=[]),
+            patch.object(retriever, '_retrieve_vector_results', return_value=vector),
+        ):
+            results = retriever._retrieve_search_results("OrderService")
+
+        assert results == vector, "Expected vector results unchanged"
+
+
+class TestRetrievalCache:
+    """Tests for caching assembled contexts across repeated requests."""
+
+    @staticmethod
+    def _symbol(path: str):
+        from agentforge.core.lsp_types import Location, Symbol
+
+        return Symbol(name="Orders", kind="class", location=Location(file=path, line=0, column=6))
+
+    def _retrieve(self, retriever, query: str = "order discount", **kwargs):
+        with (
+            patch.object(retriever, '_retrieve_lsp_symbols', return_value=[self._symbol("orders.py")]) as mock_lsp,
+            patch.object(retriever, '_retrieve_search_results', return_value=[]),
+        ):
+            context = retriever.retrieve(query, use_vector=False, **kwargs)
+        return context, mock_lsp.call_count
+
+    def test_repeated_query_is_served_from_cache(self, tmp_path: Path):
+        """Test a reworded-only repeat skips every source and returns the same files."""
+        (tmp_path / "orders.py").write_text("class Orders:\n    pass\n")
+        retriever = ContextRetriever(project_path=str(tmp_path))
+
+        first, first_calls = self._retrieve(retriever)
+        second, second_calls = self._retrieve(retriever, query="  Order   DISCOUNT? ")
+
+        assert first_calls == 1 and second_calls == 0, "Expected the repeat not to query LSP"
+        assert [f.path for f in second.files] == ["orders.py"], "Expected cached files"
+        assert second.files[0].content == first.files[0].content, "Expected cached content"
+        assert second.retrieval_metadata["cache_hit"], "Expected cache hit reported"
+        assert not first.retrieval_metadata["cache_hit"], "Expected first call to miss"
+
+    def test_changed_file_invalidates_entry(self, tmp_path: Path):
+        """Test editing a file the context came from forces a fresh retrieval."""
+        source = tmp_path / "orders.py"
+        source.write_text("class Orders:\n    pass\n")
+        retriever = ContextRetriever(project_path=str(tmp_path))
+        self._retrieve(retriever)
+
+        source.write_text("class Orders:\n    discount = 0.1\n")
+        context, calls = self._retrieve(retriever)
+
+        assert calls == 1, "Expected LSP queried again after the edit"
+        assert "discount = 0.1" in context.files[0].content, "Expected new content"
+
+    def test_index_generation_is_part_of_key(self, tmp_path: Path):
+        """Test a rebuilt vector index misses entries from the previous generation."""
+        retriever = ContextRetriever(project_path=str(tmp_path))
+        retriever._vector_search = Mock(index_generation=Mock(return_value="gen-1"))
+
+        first = retriever._cache_key("q", None, 6000, True, True)
+        retriever._vector_search.index_generation.return_value = "gen-2"
+
+        assert retriever._cache_key("q", None, 6000, True, True) != first, "Expected new key per generation"
+
+    def test_disk_tier_survives_process_cache(self, tmp_path: Path):
+        """Test entries are reloaded from disk once the in-process cache is gone."""
+        from agentforge.core.retrieval_cache import RetrievalCache
+
+        (tmp_path / "orders.py").write_text("class Orders:\n    pass\n")
+        self._retrieve(ContextRetriever(project_path=str(tmp_path)))
+        RetrievalCache.reset_instances()
+
+        context, calls = self._retrieve(ContextRetriever(project_path=str(tmp_path)))
+
+        assert calls == 0, "Expected the disk tier to answer"
+        assert [f.path for f in context.files] == ["orders.py"], "Expected cached files"
+
+    def _retrieve_with_adapter(self, retriever, adapter, **kwargs):
+        retriever._lsp_adapter = adapter
+        with patch.object(retriever, '_retrieve_search_results', return_value=[]):
+            return retriever.retrieve("order discount", use_vector=False, **kwargs)
+
+    def test_failed_source_is_not_cached(self, tmp_path: Path):
+        """Test a context built while a source errored is not stored."""
+        (tmp_path / "orders.py").write_text("class Orders:\n    pass\n")
+        retriever = ContextRetriever(project_path=str(tmp_path))
+        broken = Mock(get_workspace_symbols_many=Mock(side_effect=OSError("server gone")))
+
+        first = self._retrieve_with_adapter(retriever, broken, deadline_ms=5000)  # Runs on a worker thread
+        _, calls = self._retrieve(retriever)
+
+        assert first.retrieval_metadata["failed_sources"] == ["lsp"], "Expected the failure reported"
+        assert calls == 1, "Expected the failed answer not to be served from cache"
+
+    def test_source_still_indexing_is_not_cached(self, tmp_path: Path):
+        """Test a context from a server that is still indexing is not stored."""
+        (tmp_path / "orders.py").write_text("class Orders:\n    pass\n")
+        retriever = ContextRetriever(project_path=str(tmp_path))
+        symbols = {"order": [self._symbol("orders.py")]}
+        indexing = Mock(get_workspace_symbols_many=Mock(return_value=symbols), is_ready=Mock(return_value=False))
+
+        first = self._retrieve_with_adapter(retriever, indexing)
+        _, calls = self._retrieve(retriever)
+
+        assert [f.path for f in first.files] == ["orders.py"], "Expected the partial answer still used"
+        assert calls == 1, "Expected the partial answer not to be served from cache"
+
+    def test_cache_disabled_by_env(self, tmp_path: Path, monkeypatch):
+        """Test $AGENTFORGE_RETRIEVAL_CACHE=0 turns caching off."""
+        monkeypatch.setenv("AGENTFORGE_RETRIEVAL_CACHE", "0")
+        retriever = ContextRetriever(project_path=str(tmp_path))
+
+        self._retrieve(retriever)
+        _, calls = self._retrieve(retriever)
+
+        assert calls == 1, "Expected every call to query sources"
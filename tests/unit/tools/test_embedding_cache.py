@@ -0,0 +1,146 @@
+"""Tests for the content-addressed embedding cache."""
+
+from pathlib import Path
+
+import numpy as np
+
+from agentforge.core.embedding_cache import CachedEmbeddingProvider, EmbeddingCache
+from agentforge.core.embedding_providers import EmbeddingProvider
+
+
+class CountingProvider(EmbeddingProvider):
+    """Provider returning deterministic vectors and recording what it embedded."""
+
+    name = "counting"
+    dimension = 8
+    requires_api_key = False
+
+    def __init__(self):
+        self.calls: list[list[str]] = []
+
+    def embed(self, texts: list[str]) -> np.ndarray:
+        self.calls.append(list(texts))
+        return np.array([[len(t) + i for i in range(self.dimension)] for t in texts], dtype=np.float32)
+
+    def is_available(self) -> bool:
+        return True
+
+
+def _vectors(n: int, dim: int = 8) -> np.ndarray:
+    return np.arange(n * dim, dtype=np.float32).reshape(n, dim)
+
+
+class TestEmbeddingCache:
+    """Tests for EmbeddingCache storage."""
+
+    def test_put_then_get(self, tmp_path: Path):
+        """Test stored vectors are returned by content key."""
+        cache = EmbeddingCache(tmp_path / "c")
+        keys = [EmbeddingCache.content_key(t) for t in ("a", "b")]
+        cache.put_many(keys, _vectors(2))
+
+        hits = cache.get_many(keys + ["missing"])
+
+        assert set(hits) == set(keys), "Expected only stored keys to hit"
+        np.testing.assert_array_equal(hits[keys[1]], _vectors(2)[1])
+
+    def test_persists_across_instances(self, tmp_path: Path):
+        """Test a second cache instance sees vectors written by the first."""
+        EmbeddingCache(tmp_path / "c").put_many(["k1"], _vectors(1))
+
+        hits = EmbeddingCache(tmp_path / "c").get_many(["k1"])
+
+        np.testing.assert_array_equal(hits["k1"], _vectors(1)[0])
+
+    def test_lru_eviction_bounds_size(self, tmp_path: Path):
+        """Test least recently used entries are evicted once the size bound is hit."""
+        cache = EmbeddingCache(tmp_path / "c")
+        cache.max_bytes = 4 * 8 * 4  # Room for four 8-dim vectors
+        cache.put_many(["k0", "k1", "k2", "k3"], _vectors(4))
+        cache.get_many(["k0"])  # k0 becomes most recently used
+
+        cache.put_many(["k4"], _vectors(1))
+
+        assert len(cache) <= 4, "Expected len(cache) to stay within bound"
+        assert "k0" in cache.get_many(["k0"]), "Expected recently used k0 to survive"
+        assert "k4" in cache.get_many(["k4"]), "Expected new entry k4 to be stored"
+        assert "k1" not in cache.get_many(["k1"]), "Expected oldest k1 to be evicted"
+
+    def test_puts_append_to_journal(self, tmp_path: Path):
+        """Test each put appends its rows instead of rewriting the row map."""
+        cache = EmbeddingCache(tmp_path / "c")
+        cache.put_many(["k0", "k1"], _vectors(2))
+        before = cache.journal_file.read_bytes()
+
+        cache.put_many(["k2"], _vectors(1))
+
+        after = cache.journal_file.read_bytes()
+        assert after.startswith(before), "Expected the journal to only grow"
+        assert after[len(before):].decode() == f"k2 {cache._rows['k2']}\n", "Expected one line for one row"
+
+    def test_other_instance_sees_eviction(self, tmp_path: Path):
+        """Test a reader never returns another key's vector after a row is reused."""
+        writer = EmbeddingCache(tmp_path / "c")
+        writer.max_bytes = 2 * 8 * 4  # Room for two 8-dim vectors
+        reader = EmbeddingCache(tmp_path / "c")
+        writer.put_many(["k0", "k1"], _vectors(2))
+        assert set(reader.get_many(["k0", "k1"])) == {"k0", "k1"}, "Expected both keys cached"
+
+        writer.put_many(["k2"], _vectors(3)[2:])
+
+        hits = reader.get_many(["k0", "k1", "k2"])
+        np.testing.assert_array_equal(hits["k2"], _vectors(3)[2])
+        for key in set(hits) - {"k2"}:
+            np.testing.assert_array_equal(hits[key], _vectors(2)[int(key[1])])
+
+    def test_compaction_keeps_live_rows(self, tmp_path: Path):
+        """Test a compacted journal replays to the same row map."""
+        cache = EmbeddingCache(tmp_path / "c")
+        cache.COMPACT_MIN_LINES = 4
+        for i in range(6):
+            cache.put_many([f"k{i}"], _vectors(1) + i)
+
+        assert len(cache.journal_file.read_text().splitlines()) <= 7, "Expected the journal to be compacted"
+        fresh = EmbeddingCache(tmp_path / "c")
+        assert fresh.get_many([f"k{i}" for i in range(6)]).keys() == {f"k{i}" for i in range(6)}, \
+            "Expected every key after replaying the compacted journal"
+
+    def test_for_provider_separates_models(self, tmp_path: Path):
+        """Test provider/model pairs get separate cache directories."""
+        a = EmbeddingCache.for_provider("local", "all-MiniLM-L6-v2", root=tmp_path)
+        b = EmbeddingCache.for_provider("local", "codeparrot/codebert-base", root=tmp_path)
+
+        assert a.cache_dir != b.cache_dir, "Expected distinct cache directories"
+        assert b.cache_dir.parent == tmp_path, "Expected model slug to be a single directory"
+
+
+class TestCachedEmbeddingProvider:
+    """Tests for the caching provider wrapper."""
+
+    def test_only_misses_reach_provider(self, tmp_path: Path):
+        """Test the wrapped provider only sees texts not already cached."""
+        inner = CountingProvider()
+        provider = CachedEmbeddingProvider(inner, EmbeddingCache(tmp_path / "c"))
+        first = provider.embed(["alpha", "beta"])
+
+        second = provider.embed(["beta", "gamma", "alpha"])
+
+        assert inner.calls == [["alpha", "beta"], ["gamma"]], "Expected only misses forwarded"
+        np.testing.assert_array_equal(second[0], first[1])
+        np.testing.assert_array_equal(second[2], first[0])
+
+    def test_shared_across_wrappers(self, tmp_path: Path):
+        """Test a fresh wrapper (e.g. another worktree) reuses cached vectors."""
+        CachedEmbeddingProvider(CountingProvider(), EmbeddingCache(tmp_path / "c")).embed(["x"])
+        inner = CountingProvider()
+
+        CachedEmbeddingProvider(inner, EmbeddingCache(tmp_path / "c")).embed(["x"])
+
+        assert inner.calls == [], "Expected no provider calls on a warm cache"
+
+    def test_delegates_identity(self, tmp_path: Path):
+        """Test name and dimension come from the wrapped provider."""
+        provider = CachedEmbeddingProvider(CountingProvider(), EmbeddingCache(tmp_path / "c"))
+
+        assert provider.name == "counting", "Expected provider.name to equal 'counting'"
+        assert provider.dimension == 8, "Expected provider.dimension to equal 8"
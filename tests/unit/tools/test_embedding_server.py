@@ -0,0 +1,154 @@
+"""Tests for the resident embedding server and its client."""
+
+import socket
+import threading
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import numpy as np
+import pytest
+
+from agentforge.core.embedding_providers import LocalEmbeddingProvider
+from agentforge.core.embedding_server import EmbeddingClient, EmbeddingServer, ServerUnavailable
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="Unix sockets required")
+
+
+class RecordingProvider:
+    """Thread-safe provider that records each batch it embeds."""
+
+    name = "local"
+    model_id = "fake-model"
+    dimension = 4
+
+    def __init__(self):
+        self.calls: list[list[str]] = []
+        self._lock = threading.Lock()
+
+    def embed(self, texts: list[str]) -> np.ndarray:
+        with self._lock:
+            self.calls.append(list(texts))
+        return np.array([[len(t), 1, 2, 3] for t in texts], dtype=np.float32)
+
+
+@pytest.fixture
+def server(tmp_path: Path):
+    provider = RecordingProvider()
+    server = EmbeddingServer(provider, tmp_path / "e.sock", batch_window_ms=50).start()
+    yield server
+    server.shutdown()
+
+
+class TestEmbeddingServer:
+    """Tests for serving embeddings over the socket."""
+
+    def test_client_receives_vectors(self, server: EmbeddingServer):
+        """Test vectors round-trip in input order."""
+        vectors = EmbeddingClient(server.socket_path).embed(["a", "bbb"])
+
+        np.testing.assert_array_equal(vectors, [[1, 1, 2, 3], [3, 1, 2, 3]])
+
+    def test_concurrent_requests_are_batched(self, server: EmbeddingServer):
+        """Test requests from several clients share provider calls and get their own rows."""
+        texts = ["x" * n for n in range(1, 9)]
+        results: dict[str, np.ndarray] = {}
+
+        def worker(text: str):
+            results[text] = EmbeddingClient(server.socket_path).embed([text])
+
+        threads = [threading.Thread(target=worker, args=(t,)) for t in texts]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len(server.provider.calls) < len(texts), "Expected fewer provider calls than requests"
+        for text in texts:
+            assert results[text][0, 0] == len(text), f"Expected {text!r} to get its own vector"
+
+    def test_ping_reports_model(self, server: EmbeddingServer):
+        """Test ping returns server info."""
+        info = EmbeddingClient(server.socket_path).ping()
+
+        assert info["model"] == "fake-model", "Expected info['model'] to equal 'fake-model'"
+
+    def test_socket_removed_on_shutdown(self, tmp_path: Path):
+        """Test shutdown unlinks the socket."""
+        server = EmbeddingServer(RecordingProvider(), tmp_path / "e.sock").start()
+
+        server.shutdown()
+
+        assert not (tmp_path / "e.sock").exists(), "Expected the socket file to be removed"
+
+    def test_stale_socket_is_replaced(self, tmp_path: Path):
+        """Test a leftover socket file from a dead server does not block startup."""
+        (tmp_path / "e.sock").write_text("")
+        server = EmbeddingServer(RecordingProvider(), tmp_path / "e.sock").start()
+        try:
+            assert EmbeddingClient(tmp_path / "e.sock").ping() is not None, "Expected server to answer"
+        finally:
+            server.shutdown()
+
+
+class TestLocalProviderServerUse:
+    """Tests for LocalEmbeddingProvider's transparent server use."""
+
+    def test_uses_running_server(self, server: EmbeddingServer):
+        """Test the provider embeds via the server without loading a model."""
+        provider = LocalEmbeddingProvider("fake-model", socket_path=str(server.socket_path))
+
+        vectors = provider.embed(["abcd"])
+
+        assert vectors[0, 0] == 4, "Expected the server's vector"
+        assert provider._model is None, "Expected no in-process model"
+        assert provider.dimension == 4, "Expected dimension taken from the server"
+
+    def test_pings_server_once(self, server: EmbeddingServer):
+        """Test the server is checked once, not before every embed."""
+        provider = LocalEmbeddingProvider("fake-model", socket_path=str(server.socket_path))
+
+        with patch.object(EmbeddingClient, "ping", autospec=True,
+                          side_effect=EmbeddingClient.ping) as mock_ping:
+            provider.embed(["a"])
+            provider.embed(["b"])
+
+        assert mock_ping.call_count == 1, "Expected a single ping"
+
+    def test_skips_server_for_another_model(self, server: EmbeddingServer):
+        """Test a server running a different model is not used."""
+        provider = LocalEmbeddingProvider(socket_path=str(server.socket_path))
+        model = Mock()
+        model.encode.return_value = np.zeros((1, 384), dtype=np.float32)
+
+        with patch.object(provider, "_load_model", return_value=model) as mock_load:
+            vectors = provider.embed(["text"])
+
+        mock_load.assert_called_once()
+        assert vectors.shape == (1, 384), "Expected the in-process model's vectors"
+        assert server.provider.calls == [], "Expected the mismatched server to be unused"
+        assert provider.dimension == 384, "Expected the dimension to stay the model's"
+
+    def test_skips_server_with_wrong_dimension(self, server: EmbeddingServer):
+        """Test a server reporting the default model with another dimension is not used."""
+        server.provider.model_id = LocalEmbeddingProvider.DEFAULT_MODEL
+        provider = LocalEmbeddingProvider(socket_path=str(server.socket_path))
+
+        assert provider._server_client() is None, "Expected the 4-dimensional server to be rejected"
+        assert provider.use_server is False, "Expected the server to be skipped from now on"
+
+    def test_falls_back_without_server(self, tmp_path: Path):
+        """Test the provider loads the model in-process when no server is listening."""
+        provider = LocalEmbeddingProvider(socket_path=str(tmp_path / "missing.sock"))
+        model = Mock()
+        model.encode.return_value = np.zeros((1, 384), dtype=np.float32)
+
+        with patch.object(provider, "_load_model", return_value=model) as mock_load:
+            provider.embed(["text"])
+
+        mock_load.assert_called_once()
+        assert provider.use_server is False, "Expected the server to be skipped from now on"
+
+    def test_client_raises_when_unavailable(self, tmp_path: Path):
+        """Test the client reports a missing server distinctly."""
+        with pytest.raises(ServerUnavailable):
+            EmbeddingClient(tmp_path / "missing.sock").embed(["text"])
@@ -0,0 +1,69 @@
+"""Tests for the BM25 lexical index."""
+
+from pathlib import Path
+
+from agentforge.core.lexical_index import LexicalIndex, is_identifier_query, tokenize
+from agentforge.core.vector_types import Chunk
+
+
+def _chunk(path: str, content: str) -> Chunk:
+    return Chunk(file_path=path, content=content, start_line=1, end_line=1)
+
+
+def _index() -> LexicalIndex:
+    return LexicalIndex.from_chunks([
+        (0, _chunk("orders.py", "class OrderService:\n    def apply_discount(self, order): ...")),
+        (1, _chunk("users.py", "class UserService:\n    def login(self, user): ...")),
+        (2, _chunk("billing.py", "def compute_tax(invoice): return invoice.total * RATE")),
+    ])
+
+
+class TestTokenize:
+    """Tests for identifier tokenization."""
+
+    def test_splits_camel_and_snake_case(self):
+        """Test identifiers are kept whole and split into parts."""
+        terms = tokenize("OrderService apply_discount HTTPServer")
+
+        for term in ("orderservice", "order", "service", "apply_discount", "apply", "discount", "http", "server"):
+            assert term in terms, f"Expected {term!r} in terms"
+
+    def test_identifier_query_detection(self):
+        """Test identifier-shaped queries are told apart from prose."""
+        assert is_identifier_query("OrderService"), "Expected CamelCase identifier"
+        assert is_identifier_query("apply_discount orders.OrderService"), "Expected snake_case and dotted identifiers"
+        assert not is_identifier_query("discount handling"), "Expected plain words to be prose"
+        assert not is_identifier_query("where is OrderService?"), "Expected a question to be prose"
+
+
+class TestLexicalIndex:
+    """Tests for BM25 search, updates and persistence."""
+
+    def test_exact_identifier_ranks_first(self):
+        """Test an exact identifier query ranks its defining chunk first."""
+        hits = _index().search("OrderService")
+
+        assert hits[0][0] == 0, "Expected OrderService chunk first"
+        assert hits[0][1] > hits[1][1], "Expected exact match to outscore partial 'service' match"
+
+    def test_remove_drops_chunks(self):
+        """Test removed chunks no longer match."""
+        index = _index()
+
+        index.remove([0])
+
+        assert 0 not in {cid for cid, _ in index.search("apply_discount")}, "Expected chunk 0 removed"
+        assert len(index) == 2, "Expected len(index) to equal 2"
+
+    def test_save_and_load(self, tmp_path: Path):
+        """Test a saved index returns the same results after loading."""
+        index = _index()
+        index.save(tmp_path / "lexical.json")
+
+        loaded = LexicalIndex.load(tmp_path / "lexical.json")
+
+        assert loaded.search("compute_tax") == index.search("compute_tax"), "Expected identical results"
+
+    def test_load_missing_returns_none(self, tmp_path: Path):
+        """Test loading a missing file returns None."""
+        assert LexicalIndex.load(tmp_path / "missing.json") is None, "Expected None for a missing index"
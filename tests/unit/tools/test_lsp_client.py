@@ -0,0 +1,590 @@
+"""Tests for pipelined LSP requests, the server pool, the broker and the result cache against a scripted language server."""
+
+import sys
+import textwrap
+import threading
+import time
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+
+from agentforge.core.lsp_adapter import LSPAdapter
+from agentforge.core.lsp_broker import BrokerLSPClient, LSPBroker
+from agentforge.core.lsp_cache import LSPResultCache
+from agentforge.core.lsp_client import (
+    LSPClient,
+    LSPRequestError,
+    LSPServerNotFound,
+    LSPTimeoutError,
+)
+from agentforge.core.lsp_pool import ADAPTER_CLASSES, LSPServerPool
+from agentforge.core.lsp_transport import TRANSCRIPT_ENV_VAR
+
+FAKE_SERVER = textwrap.dedent('''
+    import json, sys, threading, time
+
+    out_lock = threading.Lock()
+    replies = {}
+
+    def send(message):
+        body = json.dumps(message).encode()
+        with out_lock:
+            sys.stdout.buffer.write(b"Content-Length: %d\\r\\n\\r\\n" % len(body) + body)
+            sys.stdout.buffer.flush()
+
+    def read():
+        length = None
+        while True:
+            line = sys.stdin.buffer.readline()
+            if not line:
+                return None
+            if line.startswith(b"Content-Length:"):
+                length = int(line.split(b":")[1])
+            elif line in (b"\\r\\n", b"\\n") and length is not None:
+                return json.loads(sys.stdin.buffer.read(length))
+
+    def respond_later(delay, message):
+        time.sleep(delay)
+        send(message)
+
+    def handle(msg):
+        method, mid, params = msg.get("method"), msg.get("id"), msg.get("params", {})
+        if method is None:
+            replies[mid] = msg
+        elif method == "initialize":
+            send({"jsonrpc": "2.0", "id": mid, "result": {"capabilities": {}}})
+        elif method == "initialized":
+            send({"jsonrpc": "2.0", "method": "$/progress", "params": {"token": "idx", "value": {"kind": "begin"}}})
+            threading.Thread(target=respond_later, args=(0.3, {"jsonrpc": "2.0", "method": "$/progress",
+                             "params": {"token": "idx", "value": {"kind": "end"}}})).start()
+        elif method == "textDocument/didOpen" and "clean" not in params["textDocument"]["uri"]:
+            uri = params["textDocument"]["uri"]
+            threading.Thread(target=respond_later, args=(0.1, {"jsonrpc": "2.0",
+                             "method": "textDocument/publishDiagnostics", "params": {"uri": uri, "diagnostics": [
+                             {"range": {"start": {"line": 2, "character": 4}}, "severity": 2, "message": "unused"}]}})).start()
+        elif method == "textDocument/documentSymbol":
+            name = params["textDocument"]["uri"].rsplit("/", 1)[-1].split(".")[0]
+            result = [{"name": name.title(), "kind": 5, "range": {"start": {"line": 0, "character": 0}},
+                       "children": [{"name": "run", "kind": 6, "range": {"start": {"line": 1, "character": 4}}}]}]
+            threading.Thread(target=respond_later, args=(0.2, {"jsonrpc": "2.0", "id": mid, "result": result})).start()
+        elif method == "workspace/symbol":
+            result = [{"name": params["query"], "kind": 5, "location": {"uri": "file:///w.py",
+                       "range": {"start": {"line": 0, "character": 0}}}}] if params["query"] != "missing" else []
+            send({"jsonrpc": "2.0", "id": mid, "result": result})
+        elif method == "textDocument/hover":
+            send({"jsonrpc": "2.0", "id": mid, "result": {"contents": {"kind": "markdown", "value": "def run()"}}})
+        elif method == "echo":
+            threading.Thread(target=respond_later, args=(params["delay"], {"jsonrpc": "2.0", "id": mid,
+                             "result": params["value"]})).start()
+        elif method == "fail":
+            send({"jsonrpc": "2.0", "id": mid, "error": {"code": -32000, "message": "boom"}})
+        elif method == "askConfig":
+            send({"jsonrpc": "2.0", "id": "cfg", "method": "workspace/configuration",
+                  "params": {"items": [{"section": "a"}, {"section": "b"}]}})
+            def answer():
+                while "cfg" not in replies:
+                    time.sleep(0.01)
+                send({"jsonrpc": "2.0", "id": mid, "result": replies["cfg"]["result"]})
+            threading.Thread(target=answer).start()
+        elif method == "shutdown":
+            send({"jsonrpc": "2.0", "id": mid, "result": None})
+        elif method == "exit":
+            sys.exit(0)
+
+    while True:
+        message = read()
+        if message is None:
+            break
+        handle(message)
+''')
+
+
+@pytest.fixture(autouse=True)
+def lsp_cache_dir(tmp_path: Path, monkeypatch) -> Path:
+    monkeypatch.setenv("AGENTFORGE_LSP_CACHE_DIR", str(tmp_path / "lsp_cache"))
+    return tmp_path / "lsp_cache"
+
+
+@pytest.fixture
+def server_script(tmp_path: Path) -> Path:
+    script = tmp_path / "fake_server.py"
+    script.write_text(FAKE_SERVER)
+    return script
+
+
+@pytest.fixture
+def client(server_script: Path, tmp_path: Path):
+    lsp = LSPClient([sys.executable, str(server_script)], str(tmp_path), timeout=5.0)
+    yield lsp
+    lsp.shutdown()
+
+
+class TestPipelinedRequests:
+    """Tests for concurrent in-flight requests."""
+
+    def test_send_requests_overlaps_and_keeps_order(self, client):
+        """Test many slow requests complete in about one round trip, in order."""
+        requests = [("echo", {"value": i, "delay": 0.3 if i % 2 else 0.1}) for i in range(20)]
+
+        start = time.monotonic()
+        results = client.send_requests(requests)
+        elapsed = time.monotonic() - start
+
+        assert results == list(range(20)), "Expected results in request order"
+        assert elapsed < 2.0, f"Expected pipelined requests to overlap, took {elapsed:.2f}s"
+
+    def test_pipeline_depth_is_bounded(self, client):
+        """Test max_in_flight limits outstanding requests."""
+        requests = [("echo", {"value": i, "delay": 0.1}) for i in range(4)]
+
+        start = time.monotonic()
+        results = client.send_requests(requests, max_in_flight=1)
+
+        assert results == [0, 1, 2, 3], "Expected all results"
+        assert time.monotonic() - start >= 0.4, "Expected requests to run one at a time"
+
+    def test_async_future(self, client):
+        """Test send_request_async returns a future with the result."""
+        future = client.send_request_async("echo", {"value": "hi", "delay": 0})
+
+        assert future.result(timeout=5) == "hi", "Expected echoed value"
+
+    def test_errors(self, client):
+        """Test error responses raise or are returned in place."""
+        results = client.send_requests([("echo", {"value": 1, "delay": 0}), ("fail", {})],
+                                       return_exceptions=True)
+
+        assert results[0] == 1, "Expected first result"
+        assert isinstance(results[1], LSPRequestError), "Expected error in place"
+        with pytest.raises(LSPRequestError):
+            client.send_requests([("fail", {})])
+
+    def test_timeout(self, client):
+        """Test an unanswered request times out and is forgotten."""
+        with pytest.raises(LSPTimeoutError):
+            client.send_request("echo", {"value": 1, "delay": 1.0}, timeout=0.1)
+
+        assert client._pending_requests == {}, "Expected timed-out request to be dropped"
+
+    def test_server_requests_are_answered(self, client):
+        """Test workspace/configuration from the server gets a reply."""
+        assert client.send_request("askConfig", {}) == [None, None], "Expected one null per config item"
+
+    def test_server_requests_dont_block_the_reader(self, client):
+        """Test the reader queues replies instead of waiting for a writer to finish."""
+        request = {"jsonrpc": "2.0", "id": "cfg", "method": "workspace/configuration", "params": {"items": [{}]}}
+        with client._write_lock:  # A caller mid-write, e.g. stuck on a full stdin pipe
+            handler = threading.Thread(target=client._handle_message, args=(request,))
+            handler.start()
+            handler.join(timeout=1.0)
+
+            assert not handler.is_alive(), "Expected the reader not to wait on the write lock"
+
+        assert client.send_request("echo", {"value": 1, "delay": 0}) == 1, "Expected the client still usable"
+
+    def test_transcript_is_closed_on_shutdown(self, server_script: Path, tmp_path: Path, monkeypatch):
+        """Test the wire transcript is recorded and closed with the client."""
+        transcript = tmp_path / "wire.bin"
+        monkeypatch.setenv(TRANSCRIPT_ENV_VAR, str(transcript))
+        lsp = LSPClient([sys.executable, str(server_script)], str(tmp_path), timeout=5.0)
+        recording = lsp._transcript
+
+        assert lsp.send_request("echo", {"value": 1, "delay": 0}) == 1, "Expected echoed value"
+        lsp.shutdown()
+
+        assert recording.closed, "Expected transcript to be closed"
+        assert lsp._transcript is None, "Expected client to drop the transcript"
+        assert b'"result":1' in transcript.read_bytes().replace(b" ", b""), "Expected response on the wire"
+
+
+class TestReadinessSignals:
+    """Tests for waiting on server signals instead of sleeping."""
+
+    def test_wait_for_diagnostics(self, client, tmp_path: Path):
+        """Test diagnostics are returned once published."""
+        path = tmp_path / "a.py"
+        client.send_notification("textDocument/didOpen", {"textDocument": {
+            "uri": f"file://{path}", "languageId": "python", "version": 1, "text": ""}})
+
+        diagnostics = client.wait_for_diagnostics(str(path), timeout=5.0)
+
+        assert [d.message for d in diagnostics] == ["unused"], "Expected published diagnostic"
+
+    def test_wait_until_idle_follows_progress(self, client):
+        """Test idle waits for active progress to end."""
+        client.send_notification("initialized", {})
+        time.sleep(0.05)
+
+        start = time.monotonic()
+        assert client.wait_until_idle(5.0, settle=0.05), "Expected server to become idle"
+        assert time.monotonic() - start >= 0.15, "Expected to wait for progress end"
+
+
+class _FakeAdapter(LSPAdapter):
+    SERVER_NAME = "fake"
+    LANGUAGE_ID = "python"
+    FILE_EXTENSIONS = [".py"]
+
+
+class TestBulkAdapterHelpers:
+    """Tests for adapter bulk helpers."""
+
+    def test_get_symbols_many(self, server_script: Path, tmp_path: Path):
+        """Test symbols for many files come back per file."""
+        files = []
+        for name in ("order", "customer", "invoice"):
+            (tmp_path / f"{name}.py").write_text("class X: pass\n")
+            files.append(f"{name}.py")
+        adapter = _FakeAdapter(str(tmp_path))
+        adapter.SERVER_COMMAND = [sys.executable, str(server_script)]
+        try:
+            by_file = adapter.get_symbols_many(files)
+            diagnostics = adapter.get_diagnostics_many(files)
+        finally:
+            adapter.shutdown()
+
+        assert [by_file[f][0].name for f in files] == ["Order", "Customer", "Invoice"], "Expected symbols per file"
+        assert by_file["order.py"][0].children[0].name == "run", "Expected nested symbols"
+        assert all(len(diagnostics[f]) == 1 for f in files), "Expected diagnostics per file"
+
+    def test_unpublished_file_does_not_wait_out_the_timeout(self, server_script: Path, tmp_path: Path):
+        """Test a file the server never publishes for stops waiting once the server goes quiet."""
+        for name in ("order", "clean"):
+            (tmp_path / f"{name}.py").write_text("class X: pass\n")
+        adapter = _FakeAdapter(str(tmp_path))
+        adapter.SERVER_COMMAND = [sys.executable, str(server_script)]
+        adapter.DIAGNOSTICS_TIMEOUT = 5.0
+        try:
+            start = time.monotonic()
+            diagnostics = adapter.get_diagnostics_many(["order.py", "clean.py"])
+            elapsed = time.monotonic() - start
+        finally:
+            adapter.shutdown()
+
+        assert len(diagnostics["order.py"]) == 1, "Expected published diagnostics"
+        assert diagnostics["clean.py"] == [], "Expected nothing for the unpublished file"
+        assert elapsed < 2.0, "Expected the wait to end once the server went quiet"
+
+    def test_contract_queries_fall_back_to_adapter_methods(self, server_script: Path, tmp_path: Path):
+        """Test per-file contract queries call the adapter's real methods."""
+        from agentforge.core.contracts_lsp import _run_lsp_query
+
+        path = tmp_path / "order.py"
+        path.write_text("class X: pass\n")
+        adapter = _FakeAdapter(str(tmp_path))
+        adapter.SERVER_COMMAND = [sys.executable, str(server_script)]
+        try:
+            symbols = _run_lsp_query(adapter, path, "symbols", {"kind": "class"}, {})
+            diagnostics = _run_lsp_query(adapter, path, "diagnostics", {}, {})
+        finally:
+            adapter.shutdown()
+
+        assert [s["name"] for s in symbols] == ["Order"], "Expected symbols from get_symbols"
+        assert [d["name"] for d in diagnostics] == ["unused"], "Expected diagnostics from get_diagnostics"
+
+
+@pytest.fixture
+def fake_adapter_cls(server_script: Path, monkeypatch):
+    cls = type("_PooledFakeAdapter", (_FakeAdapter,), {"SERVER_COMMAND": [sys.executable, str(server_script)]})
+    monkeypatch.setitem(ADAPTER_CLASSES, cls.SERVER_NAME, cls)
+    return cls
+
+
+class TestServerPool:
+    """Tests for sharing initialized servers."""
+
+    def test_reuses_server_per_project(self, fake_adapter_cls, tmp_path: Path):
+        """Test callers share one server and shutdown() only releases it."""
+        pool = LSPServerPool(use_broker=False)
+        try:
+            first = pool.get(fake_adapter_cls, tmp_path)
+            first.shutdown()
+            second = pool.get(fake_adapter_cls, tmp_path)
+
+            assert second is first, "Expected the pooled adapter to be reused"
+            assert second.is_alive(), "Expected released server to keep running"
+        finally:
+            pool.shutdown_all()
+
+        assert not first.is_alive(), "Expected shutdown_all to stop the server"
+
+    def test_restarts_crashed_server(self, fake_adapter_cls, tmp_path: Path):
+        """Test a server whose process died is restarted on next use."""
+        pool = LSPServerPool(use_broker=False)
+        try:
+            first = pool.get(fake_adapter_cls, tmp_path)
+            first.client.process.kill()
+            first.client.process.wait()
+            first.client._reader_thread.join(timeout=2.0)
+
+            second = pool.get(fake_adapter_cls, tmp_path)
+
+            assert second is first, "Expected the pooled adapter to be kept"
+            assert second.is_alive(), "Expected restarted server to be running"
+        finally:
+            pool.shutdown_all()
+
+    def test_idle_servers_are_shut_down(self, fake_adapter_cls, tmp_path: Path):
+        """Test the reaper stops servers unused for idle_timeout."""
+        pool = LSPServerPool(idle_timeout=0.1, use_broker=False)
+        try:
+            adapter = pool.get(fake_adapter_cls, tmp_path)
+            deadline = time.monotonic() + 5.0
+            while adapter.is_alive() and time.monotonic() < deadline:
+                time.sleep(0.1)
+
+            assert not adapter.is_alive(), "Expected idle server to be stopped"
+            assert [s["started"] for s in pool.stats()] == [False], "Expected the adapter to stay pooled"
+        finally:
+            pool.shutdown_all()
+
+    def test_stopped_adapter_restarts_through_pool(self, fake_adapter_cls, tmp_path: Path):
+        """Test a holder of a reaped adapter gets a pooled server again on its next query."""
+        (tmp_path / "order.py").write_text("class Order: pass\n")
+        pool = LSPServerPool(idle_timeout=0.1, use_broker=False)
+        try:
+            adapter = pool.get(fake_adapter_cls, tmp_path)
+            assert adapter.stop_if_unused(), "Expected an unused server to stop"
+
+            adapter.get_diagnostics("order.py")
+
+            assert adapter.is_alive(), "Expected the server to be restarted"
+            assert pool.get(fake_adapter_cls, tmp_path) is adapter, "Expected the same pooled adapter"
+        finally:
+            pool.shutdown_all()
+
+    def test_server_with_request_in_flight_is_not_reaped(self, fake_adapter_cls, tmp_path: Path):
+        """Test the reaper leaves a server alone while a query runs past idle_timeout."""
+        pool = LSPServerPool(idle_timeout=0.1, use_broker=False)
+        try:
+            adapter = pool.get(fake_adapter_cls, tmp_path)
+            with adapter.in_use():
+                time.sleep(1.5)  # Several reaper passes
+                assert adapter.is_alive(), "Expected a busy server to keep running"
+            assert not adapter.stop_if_unused(lambda: False), "Expected should_stop to be honoured"
+        finally:
+            pool.shutdown_all()
+
+    def test_failed_start_is_not_retried_immediately(self, tmp_path: Path):
+        """Test a server that can't start fails fast until retry_after passes."""
+        missing = type("_MissingAdapter", (_FakeAdapter,), {"SERVER_COMMAND": ["agentforge-no-such-server"]})
+        pool = LSPServerPool(use_broker=False)
+
+        with pytest.raises(LSPServerNotFound):
+            pool.get(missing, tmp_path)
+        with pytest.raises(LSPServerNotFound):
+            pool.get(missing, tmp_path)
+
+        assert len(pool._failures) == 1, "Expected the failure to be remembered"
+
+
+class TestBroker:
+    """Tests for attaching to servers kept warm by the broker."""
+
+    def test_pools_attach_to_broker_server(self, fake_adapter_cls, tmp_path: Path, monkeypatch):
+        """Test separate pools share the broker's single server."""
+        socket_path = tmp_path / "lsp.sock"
+        monkeypatch.setenv("AGENTFORGE_LSP_BROKER_SOCKET", str(socket_path))
+        (tmp_path / "order.py").write_text("class Order: pass\n")
+        broker = LSPBroker(socket_path).start()
+        pools = [LSPServerPool(use_broker=True), LSPServerPool(use_broker=True)]
+        try:
+            adapters = [pool.get(fake_adapter_cls, tmp_path) for pool in pools]
+            symbols = [adapter.get_symbols("order.py") for adapter in adapters]
+            diagnostics = adapters[0].get_diagnostics("order.py")
+
+            assert all(isinstance(a.client, BrokerLSPClient) for a in adapters), "Expected broker clients"
+            assert [s[0].name for s in symbols] == ["Order", "Order"], "Expected symbols via broker"
+            assert [d.message for d in diagnostics] == ["unused"], "Expected diagnostics via broker"
+            assert len(broker.pool.stats()) == 1, "Expected one shared server in the broker"
+        finally:
+            for pool in pools:
+                pool.shutdown_all()
+            broker.shutdown()
+
+        assert not socket_path.exists(), "Expected socket to be removed"
+
+    def test_documents_close_when_last_client_closes(self, fake_adapter_cls, tmp_path: Path, monkeypatch):
+        """Test the broker closes a shared document once every client has closed it."""
+        socket_path = tmp_path / "lsp.sock"
+        monkeypatch.setenv("AGENTFORGE_LSP_BROKER_SOCKET", str(socket_path))
+        (tmp_path / "order.py").write_text("class Order: pass\n")
+        broker = LSPBroker(socket_path).start()
+        pools = [LSPServerPool(use_broker=True), LSPServerPool(use_broker=True)]
+        uri = f"file://{tmp_path.resolve() / 'order.py'}"
+        try:
+            for pool in pools:
+                pool.get(fake_adapter_cls, tmp_path).get_diagnostics("order.py")
+            served = broker.pool.get(fake_adapter_cls, tmp_path)
+
+            pools[0].shutdown_all()
+            assert uri in served._open_documents, "Expected the document kept open for the other client"
+            pools[1].shutdown_all()
+            deadline = time.monotonic() + 5.0
+            while uri in served._open_documents and time.monotonic() < deadline:
+                time.sleep(0.05)
+            assert uri not in served._open_documents, "Expected the document closed on the server"
+        finally:
+            for pool in pools:
+                pool.shutdown_all()
+            broker.shutdown()
+
+    def test_async_requests_do_not_block(self, fake_adapter_cls, tmp_path: Path, monkeypatch):
+        """Test send_request_async returns before the broker replies."""
+        socket_path = tmp_path / "lsp.sock"
+        monkeypatch.setenv("AGENTFORGE_LSP_BROKER_SOCKET", str(socket_path))
+        broker = LSPBroker(socket_path).start()
+        pool = LSPServerPool(use_broker=True)
+        try:
+            client = pool.get(fake_adapter_cls, tmp_path).client
+            future = client.send_request_async("echo", {"delay": 0.5, "value": 7})
+
+            assert not future.done(), "Expected the request to still be running"
+            assert future.result(timeout=5.0) == 7, "Expected the echoed value"
+            assert client.send_requests([("echo", {"delay": 0.0, "value": 1})] * 3, max_in_flight=1) == [1, 1, 1]
+        finally:
+            pool.shutdown_all()
+            broker.shutdown()
+
+    def test_without_broker_starts_local_server(self, fake_adapter_cls, tmp_path: Path, monkeypatch):
+        """Test the pool falls back to a local server when no broker listens."""
+        monkeypatch.setenv("AGENTFORGE_LSP_BROKER_SOCKET", str(tmp_path / "missing.sock"))
+        pool = LSPServerPool(use_broker=True)
+        try:
+            adapter = pool.get(fake_adapter_cls, tmp_path)
+
+            assert isinstance(adapter.client, LSPClient), "Expected a local server"
+        finally:
+            pool.shutdown_all()
+
+
+class TestResultCache:
+    """Tests for answering unchanged files from the persistent result cache."""
+
+    @pytest.fixture
+    def project(self, tmp_path: Path) -> Path:
+        project = tmp_path / "project"
+        project.mkdir()
+        for name in ("order", "customer"):
+            (project / f"{name}.py").write_text("class X: pass\n")
+        return project
+
+    def test_unchanged_files_skip_the_server(self, fake_adapter_cls, project: Path):
+        """Test a second run over an unchanged tree never starts the server."""
+        first_pool = LSPServerPool(use_broker=False)
+        try:
+            first = first_pool.get(fake_adapter_cls, project, lazy=True)
+            expected = first.get_symbols_many(["order.py", "customer.py"])
+            hover = first.get_hover("order.py", 1, 4)
+        finally:
+            first_pool.shutdown_all()
+
+        second_pool = LSPServerPool(use_broker=False)
+        try:
+            second = second_pool.get(fake_adapter_cls, project, lazy=True)
+            cached = second.get_symbols_many(["order.py", "customer.py"])
+
+            assert cached == expected, "Expected identical symbols from the cache"
+            assert second.get_hover("order.py", 1, 4) == hover, "Expected cached hover"
+            assert not second._initialized, "Expected the server not to be started"
+        finally:
+            second_pool.shutdown_all()
+
+    def test_changed_file_is_requeried(self, fake_adapter_cls, project: Path):
+        """Test an edited file misses the cache while others still hit."""
+        adapter = fake_adapter_cls(str(project))
+        try:
+            adapter.get_symbols_many(["order.py", "customer.py"])
+            adapter.close()
+            (project / "order.py").write_text("class Order:\n    def run(self): pass\n")
+
+            adapter = fake_adapter_cls(str(project))
+            adapter.get_symbols("customer.py")
+            assert not adapter._initialized, "Expected unchanged file to hit the cache"
+            adapter.get_symbols("order.py")
+            assert adapter._initialized, "Expected changed file to reach the server"
+        finally:
+            adapter.close()
+
+    def test_workspace_symbols_invalidate_on_any_change(self, fake_adapter_cls, project: Path):
+        """Test workspace results are dropped when any handled file changes."""
+        adapter = fake_adapter_cls(str(project))
+        try:
+            assert adapter.get_workspace_symbols("Order")[0].name == "Order", "Expected server result"
+            adapter.close()
+
+            adapter = fake_adapter_cls(str(project))
+            adapter.get_workspace_symbols("Order")
+            assert not adapter._initialized, "Expected cached workspace result"
+
+            adapter.result_cache.TREE_KEY_TTL = 0  # Revalidate the tree on every lookup
+            (project / "customer.py").write_text("class Customer: pass\n")
+            adapter.get_workspace_symbols("Order")
+            assert adapter._initialized, "Expected edit to invalidate workspace results"
+        finally:
+            adapter.close()
+
+    def test_empty_workspace_results_are_not_cached(self, fake_adapter_cls, project: Path):
+        """Test an empty workspace answer (e.g. from a server still indexing) is asked again."""
+        adapter = fake_adapter_cls(str(project))
+        try:
+            assert adapter.get_workspace_symbols("missing") == [], "Expected no symbols"
+            adapter.close()
+
+            adapter = fake_adapter_cls(str(project))
+            adapter.get_workspace_symbols("missing")
+            assert adapter._initialized, "Expected the server to be asked again"
+        finally:
+            adapter.close()
+
+    def test_results_while_indexing_are_not_cached(self, fake_adapter_cls, project: Path):
+        """Test symbols answered while the server reports work in progress are not cached."""
+        adapter = fake_adapter_cls(str(project))
+        try:
+            adapter.initialize()
+            adapter.client._active_progress.add("indexing")
+            adapter.get_symbols("order.py")
+            adapter.get_workspace_symbols("Order")
+
+            assert len(adapter.result_cache) == 0, "Expected nothing cached while indexing"
+        finally:
+            adapter.close()
+
+    def test_server_change_discards_cache(self, fake_adapter_cls, project: Path, monkeypatch):
+        """Test results cached for another server build are ignored."""
+        adapter = fake_adapter_cls(str(project))
+        adapter.get_symbols("order.py")
+        adapter.close()
+
+        monkeypatch.setattr(fake_adapter_cls, "server_identity", classmethod(lambda _cls: "fake|upgraded|1"))
+        adapter = fake_adapter_cls(str(project))
+        try:
+            assert len(adapter.result_cache) == 0, "Expected an empty cache for the new server"
+        finally:
+            adapter.close()
+
+    def test_tree_key_is_reused_within_ttl(self, project: Path, tmp_path: Path):
+        """Test repeated workspace lookups don't rescan the tree each time."""
+        cache = LSPResultCache(tmp_path / "c.json.gz", project, "fake")
+        key = cache.tree_key([".py"])
+        cache._hash_file = Mock(side_effect=cache._hash_file)
+
+        assert cache.tree_key([".py"]) == key, "Expected the memoized key"
+        cache._hash_file.assert_not_called()
+
+    def test_tree_key_prunes_hashes_of_removed_files(self, project: Path, tmp_path: Path):
+        """Test memoized hashes of files gone from the index are dropped, in memory and on disk."""
+        cache = LSPResultCache(tmp_path / "c.json.gz", project, "fake")
+        cache.tree_key([".py"])
+        cache.flush()
+        (project / "customer.py").unlink()
+
+        cache.TREE_KEY_TTL = 0
+        cache.tree_key([".py"])
+        cache.flush()
+
+        assert set(cache._hashes) == {"order.py"}, "Expected the removed file's hash dropped"
+        reloaded = LSPResultCache(tmp_path / "c.json.gz", project, "fake")
+        reloaded._ensure_loaded()
+        assert set(reloaded._hashes) == {"order.py"}, "Expected the pruned hashes persisted"
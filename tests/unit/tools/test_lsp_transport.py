@@ -0,0 +1,98 @@
+"""Tests for buffered LSP framing and transcript replay."""
+
+import json
+import threading
+
+import pytest
+
+from agentforge.core import lsp_transport
+from agentforge.core.lsp_client import LSPClient
+from agentforge.core.lsp_transport import (
+    FrameParser,
+    encode_frame,
+    loads,
+    replay,
+    synthetic_transcript,
+)
+
+
+class TestFrameParser:
+    """Tests for cutting Content-Length frames out of arbitrary chunks."""
+
+    def test_many_frames_in_one_chunk(self):
+        """Test every complete frame in a chunk is returned in order."""
+        data = b"".join(encode_frame({"id": i}) for i in range(50))
+
+        frames = FrameParser().feed(data)
+
+        assert [loads(f)["id"] for f in frames] == list(range(50)), "Expected all frames in order"
+
+    def test_frames_split_across_chunks(self):
+        """Test frames split at every byte boundary are reassembled."""
+        data = encode_frame({"id": 1, "result": "x" * 100}) + encode_frame({"id": 2})
+        parser = FrameParser()
+
+        frames = [frame for i in range(len(data)) for frame in parser.feed(data[i:i + 1])]
+
+        assert [loads(f)["id"] for f in frames] == [1, 2], "Expected both frames once complete"
+
+    def test_non_ascii_uses_byte_length(self):
+        """Test Content-Length counts bytes, not characters."""
+        frame = encode_frame({"message": "naïve — ünïcödé ✓"})
+        header, body = frame.split(b"\r\n\r\n", 1)
+
+        assert int(header.split(b":")[1]) == len(body), "Expected byte length in header"
+        assert loads(FrameParser().feed(frame)[0])["message"] == "naïve — ünïcödé ✓", "Expected round trip"
+
+    def test_extra_headers_and_headerless_blocks(self):
+        """Test Content-Type headers are ignored and header blocks without a length are skipped."""
+        body = json.dumps({"id": 7}).encode()
+        data = (b"X-Noise: 1\r\n\r\n"
+                + b"Content-Type: application/vscode-jsonrpc; charset=utf-8\r\n"
+                + b"content-length: %d\r\n\r\n" % len(body) + body)
+
+        assert [loads(f) for f in FrameParser().feed(data)] == [{"id": 7}], "Expected one frame"
+
+    def test_stdlib_backend(self, monkeypatch):
+        """Test framing works without the optional JSON backend."""
+        monkeypatch.setattr(lsp_transport, "orjson", None)
+
+        frame = encode_frame({"id": 1, "text": "é"})
+
+        assert lsp_transport.json_backend() == "json", "Expected stdlib backend"
+        assert loads(FrameParser().feed(frame)[0]) == {"id": 1, "text": "é"}, "Expected round trip"
+
+
+class TestLazyDiagnostics:
+    """Tests for parsing published diagnostics only on request."""
+
+    def test_parsed_on_first_request(self):
+        """Test raw diagnostics are stored and parsed once when asked for."""
+        client = LSPClient.__new__(LSPClient)
+        client._lock = threading.Lock()
+        client._diagnostics = {}
+        client._diagnostics_events = {}
+        client._progress = threading.Condition()
+
+        client._handle_message({"method": "textDocument/publishDiagnostics", "params": {
+            "uri": "file:///a.py", "diagnostics": [
+                {"range": {"start": {"line": 1, "character": 2}}, "severity": 2, "message": "unused"}]}})
+
+        assert client._diagnostics["/a.py"][1] is None, "Expected diagnostics left unparsed"
+        diagnostics = client.get_diagnostics("/a.py")
+        assert [(d.line, d.severity, d.message) for d in diagnostics] == [(1, "warning", "unused")]
+        assert client.get_diagnostics("/a.py") is diagnostics, "Expected parsed list to be memoized"
+
+
+class TestReplay:
+    """Tests for the transcript replay benchmark."""
+
+    @pytest.mark.parametrize("chunk_size", [64, 256 * 1024])
+    def test_replay_counts_frames(self, chunk_size: int):
+        """Test replay frames and decodes every message of a transcript."""
+        transcript = synthetic_transcript(symbols=500, diagnostics_files=10)
+
+        stats = replay(transcript, chunk_size=chunk_size)
+
+        assert stats["frames"] == 11, "Expected diagnostics frames plus the symbol response"
+        assert stats["bytes"] == len(transcript), "Expected transcript size"
@@ -0,0 +1,169 @@
+"""Tests for concurrent remote embedding against a stub HTTP server."""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+
+from agentforge.core.embedding_providers import OpenAIEmbeddingProvider, VoyageEmbeddingProvider
+from agentforge.core.remote_embedding import ConcurrentEmbedder, is_retryable, plan_batches
+
+
+class StubEmbeddingAPI:
+    """OpenAI-style /embeddings endpoint with scripted failures."""
+
+    def __init__(self, failures: list[int] | None = None, delay: float = 0.0):
+        self.failures = list(failures or [])
+        self.delay = delay
+        self.requests = 0
+        self.bodies: list[dict] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                with api.lock:
+                    api.requests += 1
+                    api.bodies.append(body)
+                    status = api.failures.pop(0) if api.failures else 200
+                    api.in_flight += 1
+                    api.max_in_flight = max(api.max_in_flight, api.in_flight)
+                time.sleep(api.delay)
+                with api.lock:
+                    api.in_flight -= 1
+                if status != 200:
+                    self.send_response(status)
+                    self.send_header("Retry-After", "0")
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                # Reversed, as the API does not promise response order
+                data = [{"index": i, "embedding": [float(len(t)), 1.0]} for i, t in enumerate(body["input"])][::-1]
+                payload = json.dumps({"data": data}).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/v1"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def _provider(api: StubEmbeddingAPI, concurrency: int = 4) -> OpenAIEmbeddingProvider:
+    provider = OpenAIEmbeddingProvider(concurrency=concurrency, base_url=api.url)
+    provider.MAX_BATCH_TEXTS = 2
+    provider.embed([])  # Build the embedder, then speed up backoff for tests
+    provider._embedder.backoff_base = 0.001
+    return provider
+
+
+@pytest.fixture
+def api():
+    stub = StubEmbeddingAPI()
+    yield stub
+    stub.close()
+
+
+class TestPlanBatches:
+    """Tests for token-aware batch sizing."""
+
+    def test_limits_texts_and_tokens(self):
+        """Test batches respect both the text and the token bound, in order."""
+        texts = ["a" * 40, "b" * 40, "c" * 400, "d"]
+
+        batches = plan_batches(texts, max_texts=3, max_tokens=30)
+
+        assert batches == [(0, 2), (2, 3), (3, 4)], "Expected the large text alone in its batch"
+
+
+class TestConcurrentEmbedding:
+    """Tests for the concurrent provider against a stub server."""
+
+    def test_results_in_input_order(self, api: StubEmbeddingAPI):
+        """Test vectors come back in input order across batches."""
+        texts = ["x" * n for n in range(1, 8)]
+
+        vectors = _provider(api).embed(texts)
+
+        assert [int(v[0]) for v in vectors] == list(range(1, 8)), "Expected rows in input order"
+        assert api.requests == 4, "Expected ceil(7 / 2) requests"
+
+    def test_voyage_leaves_input_type_unset(self, api: StubEmbeddingAPI):
+        """Test Voyage requests don't mark search queries as documents."""
+        VoyageEmbeddingProvider(base_url=api.url).embed(["find the discount code"])
+
+        assert api.bodies == [{"model": "voyage-code-2", "input": ["find the discount code"]}], \
+            "Expected only model and input, as the SDK call sent"
+
+    def test_batches_in_flight_concurrently(self):
+        """Test several batches are outstanding at once."""
+        api = StubEmbeddingAPI(delay=0.1)
+        try:
+            _provider(api, concurrency=4).embed(["t"] * 8)
+        finally:
+            api.close()
+
+        assert api.max_in_flight > 1, "Expected concurrent requests"
+
+    def test_rate_limit_and_server_errors_retried(self):
+        """Test 429 and 503 responses are retried until success."""
+        api = StubEmbeddingAPI(failures=[429, 503])
+        try:
+            vectors = _provider(api, concurrency=1).embed(["abc"])
+        finally:
+            api.close()
+
+        assert api.requests == 3, "Expected two retries"
+        assert vectors[0, 0] == 3, "Expected the successful response"
+
+    def test_client_errors_not_retried(self):
+        """Test a 400 fails immediately."""
+        api = StubEmbeddingAPI(failures=[400])
+        try:
+            with pytest.raises(httpx.HTTPStatusError):
+                _provider(api, concurrency=1).embed(["abc"])
+        finally:
+            api.close()
+
+        assert api.requests == 1, "Expected no retry on 400"
+
+    def test_gives_up_after_max_attempts(self):
+        """Test persistent transport failures eventually raise."""
+        calls = []
+
+        def post_batch(batch: list[str]) -> list[list[float]]:
+            calls.append(batch)
+            raise ConnectionError("down")
+
+        embedder = ConcurrentEmbedder(post_batch, max_attempts=3, backoff_base=0.001)
+
+        with pytest.raises(ConnectionError):
+            embedder.embed(["abc"])
+        assert len(calls) == 3, "Expected max_attempts calls"
+
+    def test_retryable_classification(self):
+        """Test which errors count as transient."""
+        request = httpx.Request("POST", "http://stub/embeddings")
+
+        def status_error(code: int) -> httpx.HTTPStatusError:
+            return httpx.HTTPStatusError("", request=request, response=httpx.Response(code, request=request))
+
+        assert is_retryable(status_error(429)), "Expected 429 to be retryable"
+        assert is_retryable(httpx.ConnectTimeout("timeout")), "Expected timeouts to be retryable"
+        assert not is_retryable(status_error(401)), "Expected 401 to be permanent"
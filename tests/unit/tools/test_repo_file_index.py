@@ -0,0 +1,160 @@
+"""Tests for the shared repository file index."""
+
+import os
+from pathlib import Path
+
+from agentforge.core.repo_file_index import RepoFileIndex, compile_glob
+
+
+def _write(root: Path, rel: str, content: str = "x") -> Path:
+    path = root / rel
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+    return path
+
+
+def _age(path: Path, seconds: int = 60) -> None:
+    """Backdate a directory so its listing is not treated as racy."""
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns - seconds * 1_000_000_000))
+
+
+def _index(root: Path) -> RepoFileIndex:
+    index = RepoFileIndex(root)
+    index.refresh()
+    return index
+
+
+class TestGlob:
+    """Tests for Path.glob-compatible pattern matching."""
+
+    def test_pattern_semantics(self):
+        """Test *, ** and ? follow Path.glob rules."""
+        assert compile_glob("**/*.py").match("a.py"), "Expected ** to match zero directories"
+        assert compile_glob("**/*.py").match("a/b/c.py"), "Expected ** to match nested directories"
+        assert not compile_glob("*.py").match("a/b.py"), "Expected * not to cross directories"
+        assert compile_glob("src/?.py").match("src/a.py"), "Expected ? to match one character"
+        assert compile_glob("**/*").match("a/b"), "Expected **/* to match every file"
+
+    def test_glob_and_rglob_under_directory(self, tmp_path):
+        """Test queries relative to a subdirectory."""
+        _write(tmp_path, "main.py")
+        _write(tmp_path, "src/app/service.py")
+        _write(tmp_path, "src/app/readme.md")
+        _write(tmp_path, "tests/test_service.py")
+        index = _index(tmp_path)
+
+        assert index.glob("*.py") == ["main.py"], "Expected only top-level files for *.py"
+        assert index.rglob("*.py", under="src") == ["src/app/service.py"], "Expected rglob limited to src"
+        assert index.files(extensions={".md"}) == ["src/app/readme.md"], "Expected extension filter"
+        assert index.rglob_paths(tmp_path / "tests", "test_*.py") == [tmp_path / "tests" / "test_service.py"], \
+            "Expected paths built on the given base"
+        assert index.has_extension(".py"), "Expected .py to be present"
+        assert not index.has_extension(".cs"), "Expected .cs to be absent"
+
+
+class TestPruning:
+    """Tests for excluded and ignored paths."""
+
+    def test_global_excludes_are_not_walked(self, tmp_path):
+        """Test node_modules, .git and caches are pruned."""
+        _write(tmp_path, "app.js")
+        _write(tmp_path, "node_modules/lib/index.js")
+        _write(tmp_path, ".git/config")
+        _write(tmp_path, "pkg/__pycache__/mod.pyc")
+        index = _index(tmp_path)
+
+        assert [e.path for e in index.entries()] == ["app.js"], "Expected excluded directories to be pruned"
+
+    def test_gitignore_rules(self, tmp_path):
+        """Test root and nested .gitignore files, dir-only rules and negation."""
+        _write(tmp_path, ".gitignore", "# build output\n*.log\n!keep.log\nbuild/\n/local.py\n")
+        _write(tmp_path, "debug.log")
+        _write(tmp_path, "keep.log")
+        _write(tmp_path, "build/out.py")
+        _write(tmp_path, "local.py")
+        _write(tmp_path, "src/local.py")
+        _write(tmp_path, "src/.gitignore", "generated_*.py\n")
+        _write(tmp_path, "src/generated_api.py")
+        _write(tmp_path, "generated_top.py")
+        index = _index(tmp_path)
+
+        paths = {e.path for e in index.entries()}
+        assert paths == {".gitignore", "keep.log", "src/local.py", "src/.gitignore", "generated_top.py"}, \
+            f"Expected ignore rules applied, got {sorted(paths)}"
+
+    def test_excluded_dir_names_in_has_extension(self, tmp_path):
+        """Test has_extension skips caller-excluded directory names."""
+        _write(tmp_path, "dist/bundle.js")
+        index = _index(tmp_path)
+
+        assert not index.has_extension(".js", {"dist"}), "Expected dist to be skipped"
+        assert index.has_extension(".js"), "Expected dist to count without exclusions"
+
+
+class TestIncrementalRefresh:
+    """Tests for mtime-based incremental refresh and persistence."""
+
+    def test_refresh_sees_added_and_deleted_files(self, tmp_path):
+        """Test new and removed files are picked up on refresh."""
+        _write(tmp_path, "pkg/a.py")
+        index = _index(tmp_path)
+        _write(tmp_path, "pkg/b.py")
+        (tmp_path / "pkg" / "a.py").unlink()
+        _write(tmp_path, "pkg/sub/c.py")
+
+        index.refresh()
+
+        assert index.rglob("*.py") == ["pkg/b.py", "pkg/sub/c.py"], "Expected refresh to track changes"
+
+    def test_unchanged_directories_are_not_rescanned(self, tmp_path):
+        """Test directories with an unchanged mtime reuse their listing."""
+        _write(tmp_path, "pkg/a.py")
+        _age(tmp_path / "pkg")
+        _age(tmp_path)
+        index = _index(tmp_path)
+        scanned = []
+        original = index._scan
+        index._scan = lambda path, *args: scanned.append(path) or original(path, *args)
+
+        index.refresh()
+
+        assert scanned == [], f"Expected no rescans, got {scanned}"
+        assert index.glob("pkg/*.py") == ["pkg/a.py"], "Expected cached listing to be served"
+
+    def test_changed_gitignore_rescans_subtree(self, tmp_path):
+        """Test editing .gitignore re-evaluates ignored paths."""
+        _write(tmp_path, "pkg/a.py")
+        _write(tmp_path, ".gitignore", "")
+        _age(tmp_path / "pkg")
+        _age(tmp_path)
+        index = _index(tmp_path)
+
+        _write(tmp_path, ".gitignore", "a.py\n")
+        _age(tmp_path)
+        index.refresh()
+
+        assert index.rglob("*.py") == [], "Expected new ignore rule to apply"
+
+    def test_persists_under_agentforge_dir(self, tmp_path):
+        """Test the index is saved and reused by a new instance."""
+        (tmp_path / ".agentforge").mkdir()
+        _write(tmp_path, "pkg/a.py")
+        _age(tmp_path / "pkg")
+        _age(tmp_path)
+        _index(tmp_path)
+
+        assert (tmp_path / ".agentforge" / "file_index.json").exists(), "Expected index file to be written"
+
+        fresh = RepoFileIndex(tmp_path)
+        fresh._scan = lambda *_args: (_ for _ in ()).throw(AssertionError("rescanned"))
+        fresh.refresh()
+
+        assert fresh.rglob("*.py") == ["pkg/a.py"], "Expected persisted listing to be loaded"
+
+    def test_for_root_shares_instance(self, tmp_path):
+        """Test for_root returns one index per root."""
+        first = RepoFileIndex.for_root(tmp_path)
+        second = RepoFileIndex.for_root(tmp_path / ".")
+
+        assert first is second, "Expected the same shared instance"
@@ -0,0 +1,115 @@
+"""Tests for the shared token counter."""
+
+import pytest
+
+from agentforge.core import token_counter
+from agentforge.core.token_counter import TokenCounter, count_tokens, get_counter, reset_counter
+
+CODE = '''class OrderService:
+    def apply_discount(self, order: Order, code: str) -> Decimal:
+        if not self._codes.get(code):
+            raise ValueError(f"unknown code {code!r}")
+        return order.total * (1 - self._codes[code].rate)
+'''
+
+
+@pytest.fixture
+def heuristic() -> TokenCounter:
+    return TokenCounter(encoding="heuristic")
+
+
+class TestHeuristicCounting:
+    """Tests for the fallback used when no tokenizer is installed."""
+
+    def test_words_count_once_with_leading_space(self, heuristic: TokenCounter):
+        """Test common words cost one token each, including their leading space."""
+        assert heuristic.count("hello world") == 2, "Expected one token per word"
+        assert heuristic.count("") == 0, "Expected empty text to be free"
+
+    def test_identifiers_split_into_humps(self, heuristic: TokenCounter):
+        """Test camelCase and snake_case identifiers cost a token per part."""
+        assert heuristic.count("displayName") == 2, "Expected display + Name"
+        assert heuristic.count("get_user_name") == 3, "Expected get + _user + _name"
+
+    def test_indentation_is_one_token(self, heuristic: TokenCounter):
+        """Test a run of indentation costs one token regardless of width."""
+        assert heuristic.count("        return x") == 3, "Expected indent + return + x"
+        assert heuristic.count("    return x") == 3, "Expected indent + return + x"
+
+    def test_non_ascii(self, heuristic: TokenCounter):
+        """Test CJK text costs about a token per character."""
+        assert heuristic.count("你好世界") == 4, "Expected one token per character"
+
+
+class TestMemoization:
+    """Tests for content-keyed count caching."""
+
+    def test_counts_are_memoized(self, heuristic: TokenCounter, monkeypatch):
+        """Test the same content is tokenized once."""
+        calls = []
+        original = token_counter._heuristic_count
+        monkeypatch.setattr(token_counter, "_heuristic_count", lambda text: calls.append(text) or original(text))
+
+        first = heuristic.count(CODE * 3)
+        second = heuristic.count(CODE * 3)
+
+        assert first == second and len(calls) == 1, "Expected the second count to be a cache hit"
+
+    def test_lru_bound(self):
+        """Test the memo never grows past max_entries."""
+        counter = TokenCounter(encoding="heuristic", max_entries=10)
+
+        counter.count_many(f"text {i}" for i in range(50))
+
+        assert len(counter._counts) == 10, "Expected oldest counts evicted"
+
+    def test_joined_sections_count_incrementally(self, heuristic: TokenCounter):
+        """Test count_joined sums section counts and never undercounts the joined text."""
+        sections = [CODE, "## Task\nFix the discount bug", "- tests pass"]
+
+        total = heuristic.count_joined(sections, separator="\n\n")
+
+        assert total == sum(heuristic.count_many(sections)) + 2 * heuristic.count("\n\n"), "Expected summed counts"
+        assert total >= heuristic.count("\n\n".join(sections)), "Expected a safe upper bound"
+
+
+class TestTruncate:
+    """Tests for cutting text to a token budget."""
+
+    @pytest.mark.parametrize("keep_end", [False, True])
+    def test_truncate_fits_budget(self, heuristic: TokenCounter, keep_end: bool):
+        """Test truncated text fits the budget and keeps the requested end."""
+        text = CODE * 20
+
+        result = heuristic.truncate(text, 100, keep_end=keep_end)
+
+        assert 90 <= heuristic.count(result) <= 100, "Expected the budget to be nearly filled"
+        assert (text.endswith(result) if keep_end else text.startswith(result)), "Expected a prefix or suffix"
+
+    def test_oversized_run_is_split(self, heuristic: TokenCounter):
+        """Test a single long run is cut instead of dropped."""
+        result = heuristic.truncate("x" * 10000, 500)
+
+        assert result and heuristic.count(result) <= 500, "Expected part of the run kept"
+
+
+class TestBackendSelection:
+    """Tests for choosing between tiktoken and the heuristic."""
+
+    def test_falls_back_without_tiktoken(self, monkeypatch):
+        """Test the heuristic is used when tiktoken isn't installed."""
+        monkeypatch.setattr(token_counter, "tiktoken", None)
+
+        counter = TokenCounter()
+
+        assert counter.backend == "heuristic" and not counter.exact, "Expected heuristic backend"
+
+    def test_env_forces_heuristic(self, monkeypatch):
+        """Test $AGENTFORGE_TOKENIZER=heuristic selects the fallback for the shared counter."""
+        monkeypatch.setenv("AGENTFORGE_TOKENIZER", "heuristic")
+        reset_counter()
+        try:
+            assert get_counter().backend == "heuristic", "Expected heuristic backend"
+            assert count_tokens("hello world") == 2, "Expected shared counter to be used"
+        finally:
+            reset_counter()
@@ -0,0 +1,413 @@
+"""Tests for VectorSearch indexing and search."""
+
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from agentforge.core.vector_search import VectorSearch
+
+faiss = pytest.importorskip("faiss")
+
+
+class FakeEmbeddingProvider:
+    """Deterministic bag-of-words embeddings; counts how many texts were embedded."""
+
+    name = "fake"
+    dimension = 64
+
+    def __init__(self):
+        self.embedded = 0
+
+    def embed(self, texts: list[str]) -> np.ndarray:
+        self.embedded += len(texts)
+        vectors = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for word in text.split():
+                bucket = int(hashlib.md5(word.encode()).hexdigest(), 16) % self.dimension
+                vectors[row, bucket] += 1.0
+        return vectors
+
+
+def _make_search(project: Path) -> tuple[VectorSearch, FakeEmbeddingProvider]:
+    provider = FakeEmbeddingProvider()
+    vs = VectorSearch(str(project))
+    vs._embedding_provider = provider
+    vs._index_dir = vs.index_base / provider.name
+    return vs, provider
+
+
+def _write_module(project: Path, name: str, body: str) -> Path:
+    path = project / f"{name}.py"
+    path.write_text(f'def {name}():\n    """{body}"""\n    return "{body} {body} {body}"\n')
+    return path
+
+
+@pytest.fixture
+def project(tmp_path: Path) -> Path:
+    for name, body in [("orders", "order discount"), ("users", "user login"), ("billing", "invoice tax")]:
+        _write_module(tmp_path, name, body)
+    return tmp_path
+
+
+class TestFullIndex:
+    """Tests for building the index from scratch."""
+
+    def test_index_embeds_all_chunks(self, project: Path):
+        """Test a full build embeds every chunk and writes a manifest."""
+        vs, provider = _make_search(project)
+
+        stats = vs.index(force_rebuild=True)
+
+        assert stats.file_count == 3, "Expected stats.file_count to equal 3"
+        assert stats.embedded_chunks == stats.chunk_count == provider.embedded, "Expected all chunks embedded"
+        assert stats.reused_chunks == 0, "Expected stats.reused_chunks to equal 0"
+        assert vs.manifest_file.exists(), "Expected vs.manifest_file.exists() to be truthy"
+
+    def test_search_finds_relevant_file(self, project: Path):
+        """Test search ranks the matching file first."""
+        vs, _ = _make_search(project)
+        vs.index(force_rebuild=True)
+
+        results = vs.search("invoice tax", top_k=1)
+
+        assert results[0].file_path == "billing.py", "Expected results[0].file_path to equal 'billing.py'"
+
+    def test_unchanged_tree_uses_cache(self, project: Path):
+        """Test re-indexing an unchanged tree embeds nothing."""
+        vs, _ = _make_search(project)
+        first = vs.index()
+
+        vs2, provider2 = _make_search(project)
+        stats = vs2.index()
+
+        assert provider2.embedded == 0, "Expected provider2.embedded to equal 0"
+        assert stats.reused_chunks == first.chunk_count, "Expected all chunks reused"
+
+
+class TestIncrementalIndex:
+    """Tests for incremental per-file index updates."""
+
+    def test_changed_file_only_reembedded(self, project: Path):
+        """Test editing one file re-embeds only that file's chunks."""
+        vs, _ = _make_search(project)
+        first = vs.index()
+        _write_module(project, "users", "password reset")
+
+        vs2, provider2 = _make_search(project)
+        stats = vs2.index(incremental=True)
+
+        assert stats.embedded_chunks == 1, "Expected stats.embedded_chunks to equal 1"
+        assert provider2.embedded == 1, "Expected provider2.embedded to equal 1"
+        assert stats.reused_chunks == first.chunk_count - 1, "Expected other chunks reused"
+        assert vs2.search("password reset", top_k=1)[0].file_path == "users.py", "Expected users.py first"
+
+    def test_added_and_deleted_files(self, project: Path):
+        """Test added files are embedded and deleted files are dropped."""
+        vs, _ = _make_search(project)
+        vs.index()
+        (project / "billing.py").unlink()
+        _write_module(project, "shipping", "parcel courier")
+
+        vs2, _ = _make_search(project)
+        stats = vs2.index(incremental=True)
+        paths = {r.file_path for r in vs2.search("invoice tax parcel", top_k=10)}
+
+        assert stats.file_count == 3, "Expected stats.file_count to equal 3"
+        assert "billing.py" not in paths, "Expected 'billing.py' not in paths"
+        assert "shipping.py" in paths, "Expected 'shipping.py' in paths"
+
+    def test_touched_but_identical_file_is_reused(self, project: Path):
+        """Test a file with a new mtime but identical content is not re-embedded."""
+        vs, _ = _make_search(project)
+        vs.index()
+        path = project / "orders.py"
+        path.write_text(path.read_text())
+
+        vs2, provider2 = _make_search(project)
+        stats = vs2.index(incremental=True)
+
+        assert provider2.embedded == 0, "Expected provider2.embedded to equal 0"
+        assert stats.embedded_chunks == 0, "Expected stats.embedded_chunks to equal 0"
+
+    def test_incremental_without_manifest_rebuilds(self, project: Path):
+        """Test incremental mode falls back to a full build on first run."""
+        vs, provider = _make_search(project)
+
+        stats = vs.index(incremental=True)
+
+        assert stats.embedded_chunks == stats.chunk_count > 0, "Expected full build"
+        assert provider.embedded == stats.chunk_count, "Expected provider.embedded to equal chunk count"
+
+
+class TestChunkStorePersistence:
+    """Tests for the columnar chunk store behind the index."""
+
+    def test_cold_search_materializes_only_results(self, project: Path):
+        """Test a fresh instance searches from the mmap'd store."""
+        vs, _ = _make_search(project)
+        vs.index()
+
+        vs2, _ = _make_search(project)
+        results = vs2.search("user login", top_k=1)
+
+        assert results[0].file_path == "users.py", "Expected results[0].file_path to equal 'users.py'"
+        assert "user login" in results[0].chunk, "Expected chunk content to be loaded"
+
+    def test_legacy_json_metadata_is_migrated(self, project: Path):
+        """Test an index written with metadata.pkl JSON is converted on load."""
+        import json
+
+        vs, _ = _make_search(project)
+        vs.index()
+        chunks = [{"id": int(cid), **chunk.to_dict()} for cid, chunk in vs._chunks.iter_chunks()]
+        for name in ("chunks.json", "chunks.npy", "chunks.blob"):
+            (vs.index_dir / name).unlink()
+        vs.legacy_metadata_file.write_text(json.dumps({"project_hash": "old", "chunks": chunks}))
+
+        vs2, _ = _make_search(project)
+        results = vs2.search("invoice tax", top_k=1)
+
+        assert results[0].file_path == "billing.py", "Expected results[0].file_path to equal 'billing.py'"
+        assert not vs2.legacy_metadata_file.exists(), "Expected legacy metadata to be removed"
+
+
+class TestSearchMany:
+    """Tests for batched multi-query search."""
+
+    def test_per_query_results_match_single_search(self, project: Path):
+        """Test each query's batched results equal its individual search."""
+        vs, _ = _make_search(project)
+        vs.index()
+        queries = ["order discount", "invoice tax"]
+
+        batched = vs.search_many(queries, top_k=2)
+
+        assert len(batched) == 2, "Expected one result list per query"
+        for query, results in zip(queries, batched, strict=True):
+            single = vs.search(query, top_k=2)
+            assert [r.file_path for r in results] == [r.file_path for r in single], "Expected batched == single"
+
+    def test_embeds_queries_in_one_batch(self, project: Path):
+        """Test all queries go to the provider in a single embed call."""
+        vs, provider = _make_search(project)
+        vs.index()
+        calls = []
+        original = provider.embed
+        provider.embed = lambda texts: calls.append(list(texts)) or original(texts)
+
+        vs.search_many(["order", "user", "invoice"], top_k=1)
+
+        assert calls == [["order", "user", "invoice"]], "Expected a single batched embed call"
+
+    def test_union_deduplicates_and_ranks(self, project: Path):
+        """Test union mode merges hits across queries without duplicates."""
+        vs, _ = _make_search(project)
+        vs.index()
+
+        results = vs.search_many(["order discount", "order discount", "user login"], top_k=3, union=True)
+        keys = [(r.file_path, r.start_line) for r in results]
+
+        assert len(keys) == len(set(keys)), "Expected no duplicate chunks"
+        assert {"orders.py", "users.py"} <= {r.file_path for r in results}, "Expected hits from both queries"
+        assert [r.score for r in results] == sorted((r.score for r in results), reverse=True), "Expected ranked by score"
+
+
+class TestConcurrentSearch:
+    """Tests for searches racing on a cold index."""
+
+    def test_concurrent_searches_build_once(self, project: Path):
+        """Test threads searching an unbuilt index share a single build."""
+        vs, _ = _make_search(project)
+        builds = []
+        original = vs._index_locked
+        vs._index_locked = lambda *args: builds.append(args) or original(*args)
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            results = list(pool.map(lambda _: vs.search("invoice tax", top_k=1), range(4)))
+
+        assert len(builds) == 1, f"Expected one index build, got {len(builds)}"
+        assert all(r[0].file_path == "billing.py" for r in results), "Expected every search to see the index"
+
+
+class TestParallelChunking:
+    """Tests for the process-pool chunking pipeline."""
+
+    def test_parallel_build_matches_sequential(self, project: Path):
+        """Test worker processes produce the same chunks and ids as in-process chunking."""
+        for i in range(6):
+            _write_module(project, f"extra{i}", f"extra module {i}")
+        sequential, _ = _make_search(project)
+        sequential.chunk_workers = 1
+        sequential.index_base = project / "seq"
+        sequential._index_dir = sequential.index_base / "fake"
+        sequential.index()
+
+        parallel, _ = _make_search(project)
+        parallel.chunk_workers = 2
+        parallel.PARALLEL_MIN_FILES = 0
+        stats = parallel.index(force_rebuild=True)
+
+        assert stats.errors == [], "Expected no errors"
+        assert list(parallel._chunks.iter_chunks()) == list(sequential._chunks.iter_chunks()), "Expected identical chunk stores"
+
+    def test_embeds_in_fixed_size_batches(self, project: Path):
+        """Test chunks reach the provider in batches of embed_batch_size."""
+        vs, provider = _make_search(project)
+        vs.embed_batch_size = 1
+        calls = []
+        original = provider.embed
+        provider.embed = lambda texts: calls.append(len(texts)) or original(texts)
+
+        stats = vs.index(force_rebuild=True)
+
+        assert calls == [1] * stats.chunk_count, "Expected one embed call per chunk"
+
+    def test_per_file_errors_collected(self, project: Path):
+        """Test unreadable files are reported in stats.errors and skipped."""
+        from agentforge.core.vector_types import IndexStats
+
+        vs, _ = _make_search(project)
+        stats = IndexStats()
+
+        results = list(vs._iter_chunked_files([project / "missing.py", project / "orders.py"], stats))
+
+        assert [rel for rel, _, _ in results] == ["orders.py"], "Expected only the readable file"
+        assert len(stats.errors) == 1 and "missing.py" in stats.errors[0], "Expected missing.py error"
+
+
+class TestIndexTypes:
+    """Tests for configurable ANN index types."""
+
+    def test_hnsw_incremental_falls_back_to_rebuild(self, project: Path):
+        """Test incremental updates rebuild when the index cannot remove vectors."""
+        vs, _ = _make_search(project)
+        vs.index_config = {"type": "hnsw"}
+        vs.index()
+        _write_module(project, "users", "password reset")
+
+        vs2, provider2 = _make_search(project)
+        vs2.index_config = {"type": "hnsw"}
+        stats = vs2.index(incremental=True)
+
+        assert provider2.embedded == stats.chunk_count, "Expected a full re-embed"
+        assert vs2.search("password reset", top_k=1)[0].file_path == "users.py", "Expected users.py first"
+
+    def test_stats_report_index_type(self, project: Path):
+        """Test the built index type is reported in stats."""
+        vs, _ = _make_search(project)
+
+        stats = vs.index(force_rebuild=True)
+
+        assert stats.index_type == "Flat", "Expected stats.index_type to equal 'Flat'"
+        assert stats.recall is None, "Expected no calibration for exact search"
+
+
+class TestLexicalSearch:
+    """Tests for the lexical index kept beside the vector index."""
+
+    def test_identifier_search_skips_embedding(self, project: Path):
+        """Test lexical search on a cold instance never embeds."""
+        vs, _ = _make_search(project)
+        vs.index()
+
+        vs2, provider2 = _make_search(project)
+        results = vs2.lexical_search(["invoice"])
+
+        assert results[0].file_path == "billing.py", "Expected results[0].file_path to equal 'billing.py'"
+        assert provider2.embedded == 0, "Expected provider2.embedded to equal 0"
+        assert vs2._index is None, "Expected the FAISS index to stay unloaded"
+
+    def test_incremental_update_keeps_lexical_in_sync(self, project: Path):
+        """Test changed and deleted files are reflected in lexical results."""
+        vs, _ = _make_search(project)
+        vs.index()
+        _write_module(project, "users", "password reset")
+        (project / "billing.py").unlink()
+
+        vs2, _ = _make_search(project)
+        vs2.index(incremental=True)
+        paths = {r.file_path for r in vs2.lexical_search(["login password invoice"])}
+
+        assert paths == {"users.py"}, "Expected only the updated users.py to match"
+
+    def test_missing_lexical_index_is_rebuilt(self, project: Path):
+        """Test an index written before lexical.json existed gets one on demand."""
+        vs, _ = _make_search(project)
+        vs.index()
+        vs.lexical_file.unlink()
+
+        vs2, _ = _make_search(project)
+        results = vs2.lexical_search(["orders"])
+
+        assert results[0].file_path == "orders.py", "Expected results[0].file_path to equal 'orders.py'"
+        assert vs2.lexical_file.exists(), "Expected lexical.json to be written"
+
+
+class TestSymbolLevelIncremental:
+    """Tests for symbol-granular incremental updates."""
+
+    SOURCE = (
+        "class Cart:\n"
+        "    def add_item(self, item):\n        return self.items.append(item)\n\n"
+        "    def checkout(self, payment):\n        return payment.charge(self.total)\n"
+    )
+
+    def test_editing_one_method_reembeds_one_chunk(self, project: Path):
+        """Test only the edited method is embedded again."""
+        (project / "cart.py").write_text(self.SOURCE)
+        vs, _ = _make_search(project)
+        vs.index()
+        (project / "cart.py").write_text(self.SOURCE.replace("payment.charge", "payment.capture"))
+
+        vs2, provider2 = _make_search(project)
+        stats = vs2.index(incremental=True)
+
+        assert provider2.embedded == 1, "Expected only checkout re-embedded"
+        assert stats.embedded_chunks == 1, "Expected stats.embedded_chunks to equal 1"
+
+    def test_moved_methods_reuse_vectors_and_update_lines(self, project: Path):
+        """Test inserting code above methods re-embeds only the new code."""
+        (project / "cart.py").write_text(self.SOURCE)
+        vs, _ = _make_search(project)
+        vs.index()
+        (project / "cart.py").write_text("def helper_function_added_above():\n    return 42\n\n\n" + self.SOURCE)
+
+        vs2, provider2 = _make_search(project)
+        vs2.index(incremental=True)
+        checkout = next(r for r in vs2.search_many(["payment charge"], top_k=10)[0] if "checkout" in r.chunk)
+
+        assert provider2.embedded == 2, "Expected the new function and the query embedded, nothing else"
+        assert checkout.start_line == 9, "Expected the moved method's line numbers refreshed"
+
+
+class TestConfigShapes:
+    """Tests for accepting either the semantic section or the whole config file."""
+
+    SEMANTIC = {
+        "embedding_cache": {"enabled": False},
+        "index_path": ".cache/vectors",
+        "indexing": {"embed_batch_size": 7},
+        "index": {"type": "flat"},
+    }
+
+    def test_semantic_section(self, tmp_path: Path):
+        """Test settings are read from a semantic section passed directly."""
+        vs = VectorSearch(str(tmp_path), dict(self.SEMANTIC))
+
+        assert vs.index_base == tmp_path.resolve() / ".cache/vectors", "Expected index_path to be honoured"
+        assert vs.embed_batch_size == 7, "Expected indexing settings to be honoured"
+        assert vs.config["embedding_cache"] == {"enabled": False}, "Expected embedding_cache in config"
+
+    def test_whole_file(self, tmp_path: Path):
+        """Test the same settings are found when the whole file is passed."""
+        config = {"semantic": dict(self.SEMANTIC), "filters": {"include_patterns": ["**/*.go"]}}
+
+        vs = VectorSearch(str(tmp_path), config)
+
+        assert vs.index_base == tmp_path.resolve() / ".cache/vectors", "Expected index_path to be honoured"
+        assert vs.embed_batch_size == 7, "Expected indexing settings to be honoured"
+        assert vs.index_config == {"type": "flat"}, "Expected index settings to be honoured"
+        assert vs.include_patterns == ["**/*.go"], "Expected file filters to be honoured"